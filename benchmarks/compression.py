@@ -0,0 +1,107 @@
+"""Compression ratio and per-page encode/decode cost of stored page bodies.
+
+Usage:
+    python -m benchmarks.compression [--pages DIR] [--train 200] [--level 6]
+
+With --pages, every *.html file under DIR is used (e.g. bodies exported
+from one source); otherwise a synthetic site with shared boilerplate is
+generated. The first --train pages train the dictionary and the rest are
+measured, so the dictionary never sees the pages it is scored on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from src.infrastructure.compression import DEFAULT_DICT_SIZE, DEFAULT_LEVEL, ZstdBodyCodec
+
+
+class _MemoryDictionaries:
+    def __init__(self):
+        self.by_source: dict = {}
+        self.by_id: dict[int, bytes] = {}
+
+    def get_latest(self, source_id):
+        return self.by_source.get(source_id)
+
+    def get(self, dict_id):
+        return self.by_id.get(dict_id)
+
+    def save(self, source_id, dict_id, data, sample_count):
+        self.by_source[source_id] = data
+        self.by_id[dict_id] = data
+
+
+def synthetic_pages(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(3000)]
+    nav = "".join(f'<li class="nav-item"><a href="/docs/{i}">Topic {i}</a></li>' for i in range(120))
+    head = (
+        '<head><meta charset="utf-8"><link rel="stylesheet" href="/static/site.css">'
+        '<script src="/static/app.js" defer></script></head>'
+    )
+    pages = []
+    for i in range(n):
+        paragraphs = "".join(
+            f"<p>{' '.join(rng.choices(words, k=rng.randint(40, 120)))}</p>" for _ in range(rng.randint(3, 12))
+        )
+        pages.append(
+            f"<!doctype html><html>{head}<body><header><nav><ul>{nav}</ul></nav></header>"
+            f'<main><article id="a{i}"><h1>Page {i}</h1>{paragraphs}</article></main>'
+            f"<footer><p>&copy; Example Corp. All rights reserved.</p></footer></body></html>"
+        )
+    return pages
+
+
+def measure(codec: ZstdBodyCodec, pages: list[str], source_id) -> tuple[float, float, float]:
+    """Return (compression ratio, encode us/page, decode us/page)."""
+    start = time.perf_counter()
+    encoded = [codec.encode(p, source_id) for p in pages]
+    encode_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data in encoded:
+        codec.decode(data)
+    decode_s = time.perf_counter() - start
+
+    raw = sum(len(p.encode("utf-8")) for p in pages)
+    stored = sum(len(e) for e in encoded)
+    return raw / stored, encode_s / len(pages) * 1e6, decode_s / len(pages) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=Path, help="Directory of .html bodies to measure")
+    parser.add_argument("--count", type=int, default=1000, help="Synthetic pages to generate")
+    parser.add_argument("--train", type=int, default=200, help="Pages used to train the dictionary")
+    parser.add_argument("--dict-size", type=int, default=DEFAULT_DICT_SIZE)
+    parser.add_argument("--level", type=int, default=DEFAULT_LEVEL)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [p.read_text(encoding="utf-8", errors="replace") for p in sorted(args.pages.rglob("*.html"))]
+    else:
+        pages = synthetic_pages(args.count)
+    if len(pages) <= args.train:
+        parser.error(f"need more than --train={args.train} pages, got {len(pages)}")
+    training, measured = pages[: args.train], pages[args.train :]
+
+    source_id = uuid4()
+    plain = ZstdBodyCodec(level=args.level)
+    trained = ZstdBodyCodec(_MemoryDictionaries(), level=args.level)
+    trained.train(source_id, training, args.dict_size)
+
+    avg_kb = sum(len(p.encode("utf-8")) for p in measured) / len(measured) / 1024
+    print(f"{len(measured)} pages measured, {avg_kb:.1f} KiB average, zstd level {args.level}")
+    print(f"{'mode':<12} {'ratio':>7} {'encode us/page':>15} {'decode us/page':>15}")
+    for name, codec in (("zstd", plain), ("zstd+dict", trained)):
+        ratio, enc_us, dec_us = measure(codec, measured, source_id)
+        print(f"{name:<12} {ratio:>6.1f}x {enc_us:>15.1f} {dec_us:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
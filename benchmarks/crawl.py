@@ -0,0 +1,229 @@
+"""End-to-end crawl throughput against a local synthetic website.
+
+Usage:
+    python -m benchmarks.crawl [--pages 1000] [--engines threads,async] [--concurrency 8,32]
+        [--backends memory,sqlite] [--output results.json] [site options, see --help]
+
+Starts a synthetic site (benchmarks.synthetic_site) in a separate process
+and runs `CrawlUseCase.start_run` against it once per combination of
+engine, concurrency and backend, each in a fresh process so CPU time and
+peak RSS belong to that crawl alone. Nothing leaves the machine.
+
+Backends: "memory" uses the in-memory repositories from tests/fakes.py,
+"sqlite" a new SQLite file per crawl; anything else is passed to
+`create_repositories` (e.g. "postgres", "sqlite:PATH").
+
+Per crawl it reports pages/s, p50/p99 latency from the end of a fetch to
+its page being persisted, CPU seconds, peak RSS and time per pipeline
+stage. With --near-duplicates (and a site --clone-rate), it also reports
+the share of pages and bytes found to be near-duplicates. --output writes the site spec, the commit and every result as
+JSON for comparison across commits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.synthetic_site import SiteServer, SiteSpec, add_site_arguments, spec_from_args
+from src.domain.models import CrawlSourceCreate
+from src.domain.rules import extract_domain
+from src.ingestion.crawling import AsyncHttpClient, CrawlMetrics, HttpClient
+
+
+class _SampledMetrics(CrawlMetrics):
+    """Keeps every observation too, for exact percentiles."""
+
+    def __init__(self):
+        super().__init__()
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        super().observe(stage, seconds)
+        self.samples[stage].append(seconds)
+
+
+def _repositories(backend: str, workdir: str):
+    if backend == "memory":
+        from tests.fakes import (
+            InMemoryCrawledPageRepository,
+            InMemoryQueueRepository,
+            InMemoryRunRepository,
+            InMemorySourceRepository,
+        )
+
+        return InMemorySourceRepository(), InMemoryRunRepository(), InMemoryCrawledPageRepository(), InMemoryQueueRepository()
+
+    from src.infrastructure.backend import create_repositories
+
+    if backend == "sqlite":
+        backend = f"sqlite:{Path(workdir) / 'crawl.db'}"
+    repos = create_repositories(backend=backend)
+    return repos.source_repo, repos.run_repo, repos.page_repo, repos.queue_repo
+
+
+def _percentile(values: list[float], q: int) -> float | None:
+    if len(values) < 2:
+        return values[0] if values else None
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def run_crawl(
+    site_url: str,
+    pages: int,
+    engine: str,
+    concurrency: int,
+    backend: str,
+    near_duplicates: int | None = None,
+) -> dict:
+    """One crawl of the site; meant to run in its own process."""
+    from src.ingestion.use_cases import CrawlUseCase
+
+    # The site's 404s and 500s are expected; their warnings would bury the table
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as workdir:
+        source_repo, run_repo, page_repo, queue_repo = _repositories(backend, workdir)
+        metrics = _SampledMetrics()
+        http_client = HttpClient(max_workers=concurrency)
+        use_case = CrawlUseCase(
+            source_repo=source_repo,
+            run_repo=run_repo,
+            page_repo=page_repo,
+            queue_repo=queue_repo,
+            http_client=http_client,
+            delay=0,
+            engine=engine,
+            async_http_client=AsyncHttpClient(max_connections=concurrency) if engine == "async" else None,
+            concurrency=concurrency,
+            max_pages=pages * 2,
+            max_depth=1000,
+            metrics=metrics,
+            near_duplicate_distance=near_duplicates,
+        )
+        source = source_repo.create(
+            CrawlSourceCreate(domain=extract_domain(site_url), entry_url=f"{site_url}/", type="full_domain")
+        )
+
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        start = time.perf_counter()
+        result = use_case.start_run(source.id)
+        seconds = time.perf_counter() - start
+        after = resource.getrusage(resource.RUSAGE_SELF)
+
+    persist = metrics.samples["fetch_to_persist"]
+    snapshot = metrics.snapshot()
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss_scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "engine": engine,
+        "concurrency": concurrency,
+        "backend": backend,
+        "pages_crawled": result.pages_crawled,
+        "pages_failed": result.pages_failed,
+        "seconds": seconds,
+        "pages_per_second": (result.pages_crawled + result.pages_failed) / seconds,
+        "near_duplicates": result.near_duplicates,
+        "near_duplicate_bytes": result.near_duplicate_bytes,
+        "fetch_to_persist_p50_seconds": _percentile(persist, 50),
+        "fetch_to_persist_p99_seconds": _percentile(persist, 99),
+        "cpu_seconds": (after.ru_utime - usage.ru_utime) + (after.ru_stime - usage.ru_stime),
+        "peak_rss_mb": after.ru_maxrss * rss_scale / 2**20,
+        "fetches_by_status": snapshot["fetches_by_status"],
+        "stage_seconds": {name: stage["sum_seconds"] for name, stage in snapshot["stages"].items()},
+    }
+
+
+def _serve(spec: SiteSpec, conn) -> None:
+    server = SiteServer(spec).start()
+    conn.send(server.url)
+    # Runs until the benchmark terminates this process
+    conn.recv()
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_site_arguments(parser)
+    parser.add_argument("--engines", default="threads,async", help="Comma-separated engines")
+    parser.add_argument("--concurrency", default="8,32", help="Comma-separated fetch concurrencies")
+    parser.add_argument("--backends", default="memory,sqlite", help="Comma-separated repository backends")
+    parser.add_argument(
+        "--near-duplicates", type=int, default=None, metavar="BITS", help="Detect near-duplicates within BITS bits"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as JSON here")
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    context = multiprocessing.get_context("spawn")
+    parent, child = context.Pipe()
+    server = context.Process(target=_serve, args=(spec, child), daemon=True)
+    server.start()
+    site_url = parent.recv()
+
+    configs = list(itertools.product(
+        args.engines.split(","),
+        [int(c) for c in args.concurrency.split(",")],
+        args.backends.split(","),
+    ))
+    print(f"{spec.pages} pages of {spec.page_bytes / 1024:.0f} KiB, {spec.latency_ms:.0f} ms "
+          f"{spec.latency_distribution} latency, at {site_url}")
+    print(
+        f"{'engine':<8} {'conc':>5} {'backend':<10} {'pages/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'cpu s':>7} "
+        f"{'rss MB':>7} {'dups':>6}"
+    )
+
+    results = []
+    try:
+        for engine, concurrency, backend in configs:
+            # A fresh process per crawl keeps CPU time and peak RSS separate
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(
+                    run_crawl, site_url, spec.pages, engine, concurrency, backend, args.near_duplicates
+                ).result()
+            results.append(result)
+            p50 = result["fetch_to_persist_p50_seconds"] or 0
+            p99 = result["fetch_to_persist_p99_seconds"] or 0
+            duplicates = result["near_duplicates"] / max(result["pages_crawled"], 1)
+            print(
+                f"{engine:<8} {concurrency:>5} {backend.partition(':')[0]:<10} {result['pages_per_second']:>9.1f} "
+                f"{p50 * 1000:>8.1f} {p99 * 1000:>8.1f} {result['cpu_seconds']:>7.2f} {result['peak_rss_mb']:>7.1f} "
+                f"{duplicates:>6.1%}"
+            )
+    finally:
+        server.terminate()
+        server.join()
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({
+            "site": spec.to_dict(),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, indent=2))
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
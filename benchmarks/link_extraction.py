@@ -0,0 +1,69 @@
+"""Throughput of the CPU stage (hash + link extraction) in threads vs processes.
+
+Usage:
+    python -m benchmarks.link_extraction [--pages 400] [--anchors 3000] [--workers 1,2,4,8]
+
+Generates anchor-heavy pages and pushes them through `analyze_page` with
+N threads and with N worker processes. Threads serialise on the GIL, so
+their pages/s stays flat as N grows; processes should scale with cores.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from src.ingestion.crawling import analyze_page, create_analysis_pool
+
+BASE_URL = "https://example.com/"
+DOMAIN = "example.com"
+
+
+def anchor_heavy_pages(count: int, anchors: int) -> list[bytes]:
+    pages = []
+    for i in range(count):
+        links = "".join(
+            f'<li><a href="/section/{j % 97}/item-{i}-{j}/?ref=nav#frag">Item {j}</a></li>'
+            for j in range(anchors)
+        )
+        pages.append(f"<html><body><ul>{links}</ul></body></html>".encode())
+    return pages
+
+
+def run(executor: Executor, pages: list[bytes]) -> float:
+    start = time.perf_counter()
+    list(executor.map(analyze_page, pages, [BASE_URL] * len(pages), [DOMAIN] * len(pages), chunksize=1))
+    return len(pages) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--anchors", type=int, default=3000, help="Links per page")
+    parser.add_argument("--workers", default=None, help="Comma-separated worker counts (default: 1,2,4.. up to CPUs)")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    if args.workers:
+        counts = [int(n) for n in args.workers.split(",")]
+    else:
+        counts = [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus] or [1]
+
+    pages = anchor_heavy_pages(args.pages, args.anchors)
+    avg_kb = sum(len(p) for p in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {args.anchors} anchors each ({avg_kb:.0f} KiB), {cpus} CPUs")
+    print(f"{'workers':>7} {'threads p/s':>12} {'processes p/s':>14} {'speed-up':>9}")
+    for n in counts:
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            threads = run(pool, pages)
+        with create_analysis_pool(n) as pool:
+            # Start the workers before timing so spawn cost isn't counted
+            list(pool.map(analyze_page, pages[:n], [BASE_URL] * n, [DOMAIN] * n))
+            processes = run(pool, pages)
+        print(f"{n:>7} {threads:>12.1f} {processes:>14.1f} {processes / threads:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Storage cost of a crawl per repository backend (Supabase, Postgres, SQLite).
+
+Usage:
+    python -m benchmarks.repositories [--backends supabase,postgres,sqlite:PATH] [--pages 2000] [--batch 10]
+
+Replays the repository calls of a crawl against each backend: seed the
+queue in chunks, then per batch claim, look up validators, store pages
+and acknowledge the queue items. Both backends get identical workloads
+(same page bodies, batch sizes and order). The Supabase backend needs
+SUPABASE_URL/SUPABASE_SERVICE_KEY, the Postgres one DATABASE_URL pointing
+at the same schema; a SQLite file is created if missing. Rows are written to a throwaway source that is
+deleted afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from itertools import batched
+
+from benchmarks.compression import synthetic_pages
+from src.domain.models import CrawledPageCreate, CrawlRunCreate, CrawlSourceCreate, QueueItemCreate
+from src.domain.rules import url_hash
+from src.infrastructure.backend import Repositories, create_repositories
+from src.ingestion.use_cases.crawl import SEED_CHUNK_SIZE
+
+
+def run_workload(repos: Repositories, bodies: list[str], batch: int) -> dict[str, float]:
+    """Return seconds spent per phase."""
+    source = repos.source_repo.create(
+        CrawlSourceCreate(domain="bench.example", entry_url="https://bench.example/", type="full_domain")
+    )
+    timings = {"seed": 0.0, "claim": 0.0, "validators": 0.0, "store": 0.0, "ack": 0.0}
+    try:
+        run = repos.run_repo.create(CrawlRunCreate(source_id=source.id))
+        urls = [f"https://bench.example/p{i}" for i in range(len(bodies))]
+        items = [QueueItemCreate(run_id=run.id, url=u, url_hash=url_hash(u), depth=1) for u in urls]
+        body_by_url = dict(zip(urls, bodies))
+
+        start = time.perf_counter()
+        for chunk in batched(items, SEED_CHUNK_SIZE):
+            repos.queue_repo.add_batch(list(chunk))
+        timings["seed"] = time.perf_counter() - start
+
+        while True:
+            start = time.perf_counter()
+            claimed = repos.queue_repo.claim(run.id, "bench", batch)
+            timings["claim"] += time.perf_counter() - start
+            if not claimed:
+                break
+
+            start = time.perf_counter()
+            repos.page_repo.get_validators(source.id, [q.url_hash for q in claimed])
+            timings["validators"] += time.perf_counter() - start
+
+            pages = [
+                CrawledPageCreate(
+                    run_id=run.id,
+                    source_id=source.id,
+                    url=q.url,
+                    url_hash=q.url_hash,
+                    content_hash=url_hash(body_by_url[q.url]),
+                    content=body_by_url[q.url],
+                    status_code=200,
+                )
+                for q in claimed
+            ]
+            start = time.perf_counter()
+            repos.page_repo.create_batch(pages)
+            timings["store"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            repos.queue_repo.complete_many([q.id for q in claimed])
+            timings["ack"] += time.perf_counter() - start
+    finally:
+        repos.source_repo.delete(source.id)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="supabase,postgres", help="Comma-separated backends to compare")
+    parser.add_argument("--pages", type=int, default=2000, help="Pages per run")
+    parser.add_argument("--batch", type=int, default=10, help="Queue claim size, as --batch-size")
+    args = parser.parse_args()
+
+    bodies = synthetic_pages(args.pages)
+    avg_kb = sum(len(b.encode("utf-8")) for b in bodies) / len(bodies) / 1024
+    print(f"{args.pages} pages, {avg_kb:.1f} KiB average, claims of {args.batch}")
+    phases = ["seed", "claim", "validators", "store", "ack"]
+    print(f"{'backend':<10} " + " ".join(f"{p + ' s':>12}" for p in phases) + f" {'total s':>9} {'pages/s':>9}")
+
+    for backend in args.backends.split(","):
+        repos = create_repositories(backend=backend)
+        timings = run_workload(repos, bodies, args.batch)
+        total = sum(timings.values())
+        print(
+            f"{backend.partition(':')[0]:<10} "
+            + " ".join(f"{timings[p]:>12.2f}" for p in phases)
+            + f" {total:>9.2f} {args.pages / total:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Local HTTP server generating a synthetic website for crawl benchmarks.
+
+Usage:
+    python -m benchmarks.synthetic_site [--pages 1000] [--fan-out 8] [--port 8000]
+
+Page 0 is served at /, page i at /p{i}. Each page links to its children
+in a `fan_out`-ary tree, so every page is reachable within a few hops,
+plus `fan_out` random pages (duplicate links), one page under /private/
+that robots.txt disallows and one external link. With `clone_rate`, that
+share of pages also links to a print view at `?view=print`: the same text
+and links under another URL and title, for near-duplicate detection. Everything that varies
+(links, which pages fail, each URL's latency) is drawn from `seed`, so
+two servers with the same spec serve the same site.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+_WORDS = "crawl index page answer engine query fetch parse store link robot sitemap cache queue".split()
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    pages: int = 1000
+    fan_out: int = 8
+    page_bytes: int = 20_000
+    # Mean response latency; the distribution shapes its spread
+    latency_ms: float = 20.0
+    latency_distribution: str = "lognormal"
+    # Share of pages answering 500 and 404
+    error_rate: float = 0.01
+    not_found_rate: float = 0.01
+    # Share of pages that link to a near-duplicate print view of themselves
+    clone_rate: float = 0.0
+    robots: bool = True
+    sitemap: bool = True
+    seed: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SyntheticSite:
+    """Renders the pages of a `SiteSpec`; independent of any server."""
+
+    def __init__(self, spec: SiteSpec):
+        if spec.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of {LATENCY_DISTRIBUTIONS}")
+        self.spec = spec
+
+    def _rng(self, key: str) -> random.Random:
+        return random.Random(f"{self.spec.seed}:{key}")
+
+    def status(self, page: int) -> int:
+        if page == 0:
+            return 200
+        draw = self._rng(f"status:{page}").random()
+        if draw < self.spec.error_rate:
+            return 500
+        if draw < self.spec.error_rate + self.spec.not_found_rate:
+            return 404
+        return 200
+
+    def latency(self, path: str) -> float:
+        """Seconds to wait before answering `path`; fixed per URL."""
+        mean = self.spec.latency_ms / 1000
+        rng = self._rng(f"latency:{path}")
+        match self.spec.latency_distribution:
+            case "fixed":
+                return mean
+            case "uniform":
+                return rng.uniform(0, 2 * mean)
+            case "exponential":
+                return rng.expovariate(1 / mean) if mean else 0.0
+            case _:
+                # Median below the mean, with the long tail real servers have
+                sigma = 1.0
+                return rng.lognormvariate(0, sigma) * mean / math.exp(sigma**2 / 2)
+
+    def links(self, page: int) -> list[str]:
+        spec = self.spec
+        first_child = page * spec.fan_out + 1
+        children = range(first_child, min(first_child + spec.fan_out, spec.pages))
+        rng = self._rng(f"links:{page}")
+        extra = [rng.randrange(spec.pages) for _ in range(spec.fan_out)]
+        links = [_path(i) for i in [*children, *extra]]
+        if self.has_clone(page):
+            links.append(f"{_path(page)}?view=print")
+        links.append(f"/private/{page}")
+        links.append(f"https://elsewhere.example/{page}")
+        return links
+
+    def has_clone(self, page: int) -> bool:
+        return self._rng(f"clone:{page}").random() < self.spec.clone_rate
+
+    def page(self, page: int, clone: bool = False) -> str:
+        anchors = "".join(f'<a href="{link}">{link}</a>\n' for link in self.links(page))
+        title = f"Page {page} (print view)" if clone else f"Page {page}"
+        head = f"<html><head><title>{title}</title></head><body>\n<h1>Page {page}</h1>\n{anchors}"
+        tail = "</body></html>"
+        filler = max(0, self.spec.page_bytes - len(head) - len(tail) - 7)
+        rng = self._rng(f"text:{page}")
+        words: list[str] = []
+        size = 0
+        while size < filler:
+            word = rng.choice(_WORDS)
+            words.append(word)
+            size += len(word) + 1
+        return f"{head}<p>{' '.join(words)[:filler]}</p>{tail}"
+
+    def robots_txt(self, base_url: str) -> str:
+        lines = ["User-agent: *", "Disallow: /private/"]
+        if self.spec.sitemap:
+            lines.append(f"Sitemap: {base_url}/sitemap.xml")
+        return "\n".join(lines) + "\n"
+
+    def sitemap_xml(self, base_url: str) -> str:
+        urls = "".join(
+            f"<url><loc>{base_url}{_path(i)}</loc><lastmod>2026-01-01</lastmod></url>"
+            for i in range(self.spec.pages)
+        )
+        return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+
+    def respond(self, path: str, base_url: str) -> tuple[int, str, str]:
+        """(status, content type, body) for a request path."""
+        if path == "/robots.txt":
+            if not self.spec.robots:
+                return 404, "text/plain", "not found"
+            return 200, "text/plain", self.robots_txt(base_url)
+        if path == "/sitemap.xml" and self.spec.sitemap:
+            return 200, "application/xml", self.sitemap_xml(base_url)
+        path, _, query = path.partition("?")
+        page = _page_number(path)
+        clone = query == "view=print"
+        if page is None or page >= self.spec.pages or (query and not (clone and self.has_clone(page))):
+            return 404, "text/html", "<html><body>not found</body></html>"
+        status = self.status(page)
+        if status != 200:
+            return status, "text/html", f"<html><body>error {status}</body></html>"
+        return 200, "text/html; charset=utf-8", self.page(page, clone)
+
+
+def _path(page: int) -> str:
+    return "/" if page == 0 else f"/p{page}"
+
+
+def _page_number(path: str) -> int | None:
+    if path == "/":
+        return 0
+    if path.startswith("/p") and path[2:].isdigit():
+        return int(path[2:])
+    return None
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Read by listen(); high concurrency would overflow the default of 5
+    request_queue_size = 1024
+
+
+class SiteServer:
+    """Serves a `SyntheticSite` on 127.0.0.1 from a background thread."""
+
+    def __init__(self, spec: SiteSpec, port: int = 0):
+        site = SyntheticSite(spec)
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, as real sites allow
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                base_url = f"http://{self.headers.get('Host', 'localhost')}"
+                time.sleep(site.latency(self.path))
+                status, content_type, body = site.respond(self.path, base_url)
+                payload = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._server = _Server(("127.0.0.1", port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="synthetic-site", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> SiteServer:
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def add_site_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = SiteSpec()
+    parser.add_argument("--pages", type=int, default=defaults.pages, help="Pages on the site")
+    parser.add_argument("--fan-out", type=int, default=defaults.fan_out, help="Child links per page")
+    parser.add_argument("--page-bytes", type=int, default=defaults.page_bytes, help="Size of each page")
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Mean response latency")
+    parser.add_argument(
+        "--latency-distribution",
+        choices=LATENCY_DISTRIBUTIONS,
+        default=defaults.latency_distribution,
+        help="Spread of response latencies around --latency-ms",
+    )
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Share of pages answering 500")
+    parser.add_argument("--not-found-rate", type=float, default=defaults.not_found_rate, help="Share of pages answering 404")
+    parser.add_argument(
+        "--clone-rate", type=float, default=defaults.clone_rate, help="Share of pages with a near-duplicate print view"
+    )
+    parser.add_argument("--no-robots", action="store_true", help="Serve no robots.txt")
+    parser.add_argument("--no-sitemap", action="store_true", help="Serve no sitemap")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Seed for links, errors and latencies")
+
+
+def spec_from_args(args: argparse.Namespace) -> SiteSpec:
+    return SiteSpec(
+        pages=args.pages,
+        fan_out=args.fan_out,
+        page_bytes=args.page_bytes,
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        error_rate=args.error_rate,
+        not_found_rate=args.not_found_rate,
+        clone_rate=args.clone_rate,
+        robots=not args.no_robots,
+        sitemap=not args.no_sitemap,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_site_arguments(parser)
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    args = parser.parse_args()
+
+    server = SiteServer(spec_from_args(args), args.port).start()
+    print(f"Serving {args.pages} pages at {server.url}/ (Ctrl-C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
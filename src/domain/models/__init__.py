@@ -1,7 +1,8 @@
 from .source import CrawlSource, CrawlSourceCreate, SourceStatus, SourceType
-from .run import CrawlRun, CrawlRunCreate, RunStatus
-from .page import CrawledPage, CrawledPageCreate, ParsedPage, ParsedPageCreate
+from .run import CrawlRun, CrawlRunCreate, RunMode, RunStatsDelta, RunStatus
+from .page import CrawledPage, CrawledPageCreate, PageHistory, PageValidators, ParsedPage, ParsedPageCreate
 from .queue import QueueItem, QueueItemClaim, QueueItemCreate, QueueStatus
+from .robots import RobotsRecord
 
 __all__ = [
     "CrawlSource",
@@ -10,13 +11,18 @@ __all__ = [
     "SourceStatus",
     "CrawlRun",
     "CrawlRunCreate",
+    "RunStatsDelta",
     "RunStatus",
+    "RunMode",
     "CrawledPage",
     "CrawledPageCreate",
+    "PageValidators",
+    "PageHistory",
     "ParsedPage",
     "ParsedPageCreate",
     "QueueItem",
     "QueueItemCreate",
     "QueueItemClaim",
     "QueueStatus",
+    "RobotsRecord",
 ]
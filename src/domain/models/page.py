@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class CrawledPageCreate(BaseModel):
@@ -14,11 +14,70 @@ class CrawledPageCreate(BaseModel):
     content: str | None = None
     status_code: int | None = None
     error: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    max_age: int | None = Field(default=None, ge=0)
+    # Revalidated against an earlier crawl: the body was not fetched again
+    unchanged: bool = False
+    # Deliberately not read: content_type, too_large or deadline,
+    # carried_forward when an incremental run kept the earlier copy unfetched,
+    # or near_duplicate when the body was dropped as a clone of another page
+    skip_reason: str | None = None
+    # 64-bit SimHash of the visible text (signed), for near-duplicate lookups
+    simhash: int | None = None
 
 
 class CrawledPage(CrawledPageCreate):
     id: UUID
     crawled_at: datetime
+    # Storage format of the body; None means plain text in `content`
+    content_encoding: str | None = None
+
+    model_config = {"from_attributes": True}
+
+    _decode_body: Callable[[], str] | None = PrivateAttr(default=None)
+
+    def body(self) -> str | None:
+        """Page body, decoded on first access when it was stored encoded."""
+        if self._decode_body is not None:
+            self.content = self._decode_body()
+            self._decode_body = None
+        return self.content
+
+
+class PageValidators(BaseModel):
+    """HTTP cache validators from the latest full crawl of a URL."""
+
+    page_id: UUID
+    url_hash: str
+    content_hash: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    max_age: int | None = None
+    crawled_at: datetime
+
+    model_config = {"from_attributes": True}
+
+    def is_fresh(self, now: datetime | None = None) -> bool:
+        """Whether Cache-Control max-age says the stored copy is still current."""
+        if not self.max_age:
+            return False
+        now = now or datetime.now(self.crawled_at.tzinfo)
+        return (now - self.crawled_at).total_seconds() < self.max_age
+
+
+class PageHistory(BaseModel):
+    """What past crawls of a source saw at one URL, carried-forward rows excluded."""
+
+    url_hash: str
+    url: str
+    # Body hash at the latest crawl
+    content_hash: str
+    first_crawled_at: datetime
+    # Latest crawl that fetched or revalidated the URL
+    verified_at: datetime
+    # Crawls whose content_hash differed from the crawl before
+    changes: int = Field(default=0, ge=0)
 
     model_config = {"from_attributes": True}
 
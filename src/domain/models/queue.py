@@ -13,6 +13,9 @@ class QueueItemCreate(BaseModel):
     url_hash: str
     priority: int = 0
     depth: int = Field(default=0, ge=0)
+    # Hints from the sitemap that listed the URL, if any
+    lastmod: datetime | None = None
+    sitemap_priority: float | None = Field(default=None, ge=0, le=1)
 
 
 class QueueItem(QueueItemCreate):
@@ -22,6 +25,7 @@ class QueueItem(QueueItemCreate):
     claimed_at: datetime | None = None
     attempts: int = Field(default=0, ge=0)
     max_attempts: int = Field(default=3, ge=1)
+    error: str | None = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class RobotsRecord(BaseModel):
+    """A fetched robots.txt, kept between runs. `body` is null unless it was a 200."""
+
+    host: str
+    status_code: int | None = None
+    body: str | None = None
+    fetched_at: datetime
+    expires_at: datetime
+
+    model_config = {"from_attributes": True}
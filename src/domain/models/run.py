@@ -5,22 +5,69 @@ from uuid import UUID
 from pydantic import BaseModel, Field
 
 RunStatus = Literal["pending", "running", "completed", "failed"]
+# incremental: only URLs likely to have changed are fetched; the rest are
+# carried forward from earlier runs
+RunMode = Literal["full", "incremental"]
 
 
 class CrawlRunCreate(BaseModel):
     source_id: UUID
+    mode: RunMode = "full"
 
 
 class CrawlRun(BaseModel):
     id: UUID
     source_id: UUID
     status: RunStatus = "pending"
+    mode: RunMode = "full"
     started_at: datetime | None = None
     completed_at: datetime | None = None
     pages_found: int = Field(default=0, ge=0)
     pages_crawled: int = Field(default=0, ge=0)
     pages_failed: int = Field(default=0, ge=0)
+    bytes_downloaded: int = Field(default=0, ge=0)
+    links_discovered: int = Field(default=0, ge=0)
+    links_deduped: int = Field(default=0, ge=0)
+    # Pages per HTTP status code
+    status_codes: dict[int, int] = Field(default_factory=dict)
     error: str | None = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class RunStatsDelta(BaseModel):
+    """Counters to add to a run's totals, accumulated since the last flush."""
+
+    pages_found: int = 0
+    pages_crawled: int = 0
+    pages_failed: int = 0
+    bytes_downloaded: int = 0
+    links_discovered: int = 0
+    links_deduped: int = 0
+    status_codes: dict[int, int] = Field(default_factory=dict)
+
+    def __add__(self, other: "RunStatsDelta") -> "RunStatsDelta":
+        codes = dict(self.status_codes)
+        for code, count in other.status_codes.items():
+            codes[code] = codes.get(code, 0) + count
+        return RunStatsDelta(
+            pages_found=self.pages_found + other.pages_found,
+            pages_crawled=self.pages_crawled + other.pages_crawled,
+            pages_failed=self.pages_failed + other.pages_failed,
+            bytes_downloaded=self.bytes_downloaded + other.bytes_downloaded,
+            links_discovered=self.links_discovered + other.links_discovered,
+            links_deduped=self.links_deduped + other.links_deduped,
+            status_codes=codes,
+        )
+
+    def is_empty(self) -> bool:
+        return not any((
+            self.pages_found,
+            self.pages_crawled,
+            self.pages_failed,
+            self.bytes_downloaded,
+            self.links_discovered,
+            self.links_deduped,
+            self.status_codes,
+        ))
@@ -2,6 +2,8 @@ from .source import SourceRepository
 from .run import RunRepository
 from .page import CrawledPageRepository, ParsedPageRepository
 from .queue import QueueRepository
+from .blob import BlobStore
+from .robots import RobotsStore
 
 __all__ = [
     "SourceRepository",
@@ -9,4 +11,6 @@ __all__ = [
     "CrawledPageRepository",
     "ParsedPageRepository",
     "QueueRepository",
+    "BlobStore",
+    "RobotsStore",
 ]
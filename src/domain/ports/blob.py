@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+
+class BlobStore(Protocol):
+    """Content-addressed storage for page bodies, keyed by `content_hash`."""
+
+    def existing(self, content_hashes: list[str]) -> set[str]: ...
+
+    def put_many(self, blobs: dict[str, str]) -> int: ...
+
+    def get_many(self, content_hashes: list[str]) -> dict[str, str]: ...
@@ -6,6 +6,8 @@ from uuid import UUID
 from src.domain.models import (
     CrawledPage,
     CrawledPageCreate,
+    PageHistory,
+    PageValidators,
     ParsedPage,
     ParsedPageCreate,
 )
@@ -22,6 +24,12 @@ class CrawledPageRepository(Protocol):
 
     def get_latest_by_url(self, source_id: UUID, url_hash: str) -> CrawledPage | None: ...
 
+    def get_validators(self, source_id: UUID, url_hashes: list[str]) -> dict[str, PageValidators]: ...
+
+    def get_contents(self, ids: list[UUID]) -> dict[UUID, str]: ...
+
+    def get_history(self, source_id: UUID) -> list[PageHistory]: ...
+
 
 class ParsedPageRepository(Protocol):
     def create(self, page: ParsedPageCreate) -> ParsedPage: ...
@@ -17,6 +17,18 @@ class QueueRepository(Protocol):
 
     def fail(self, id: UUID, error: str | None = None) -> QueueItem: ...
 
+    def complete_many(self, ids: list[UUID]) -> int: ...
+
+    def fail_many(self, failures: list[tuple[UUID, str | None]]) -> int: ...
+
     def reset_stale(self, timeout_minutes: int = 5) -> int: ...
 
+    def heartbeat(self, run_id: UUID, worker_id: str) -> int: ...
+
+    def reprioritize(self, run_id: UUID, priorities: list[tuple[str, int]]) -> int: ...
+
     def get_pending_count(self, run_id: UUID) -> int: ...
+
+    def get_processing_count(self, run_id: UUID) -> int: ...
+
+    def get_url_hashes(self, run_id: UUID) -> list[str]: ...
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from src.domain.models import RobotsRecord
+
+
+class RobotsStore(Protocol):
+    """Persisted robots.txt files keyed by host (scheme://authority)."""
+
+    def get(self, host: str) -> RobotsRecord | None: ...
+
+    def save(self, record: RobotsRecord) -> None: ...
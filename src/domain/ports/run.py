@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Protocol
 from uuid import UUID
 
-from src.domain.models import CrawlRun, CrawlRunCreate, RunStatus
+from src.domain.models import CrawlRun, CrawlRunCreate, RunStatsDelta, RunStatus
 
 
 class RunRepository(Protocol):
@@ -23,6 +23,9 @@ class RunRepository(Protocol):
         pages_failed: int,
     ) -> CrawlRun: ...
 
+    # Adds to the counters atomically, so every concurrent worker's delta counts
+    def increment_stats(self, id: UUID, delta: RunStatsDelta) -> CrawlRun: ...
+
     def mark_started(self, id: UUID) -> CrawlRun: ...
 
     def mark_completed(self, id: UUID, error: str | None = None) -> CrawlRun: ...
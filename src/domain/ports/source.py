@@ -16,7 +16,7 @@ class SourceRepository(Protocol):
 
     def update_status(self, id: UUID, status: SourceStatus) -> CrawlSource: ...
 
-    def update_next_run(self, id: UUID, next_run_at: datetime) -> CrawlSource: ...
+    def update_next_run(self, id: UUID, next_run_at: datetime | None) -> CrawlSource: ...
 
     def delete(self, id: UUID) -> None: ...
 
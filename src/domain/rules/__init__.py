@@ -1,3 +1,29 @@
-from .url import normalize_url, url_hash, extract_domain, get_base_url
+from .url import (
+    CanonicalUrl,
+    UrlCanonicalizer,
+    extract_domain,
+    get_base_url,
+    hash_canonical,
+    normalize_url,
+    url_hash,
+)
+from .schedule import frequency_interval, next_run_at
+from .priority import BestFirstScorer, BreadthFirstScorer, PriorityScorer
+from .recrawl import CARRIED_FORWARD, RecrawlPolicy
 
-__all__ = ["normalize_url", "url_hash", "extract_domain", "get_base_url"]
+__all__ = [
+    "CanonicalUrl",
+    "UrlCanonicalizer",
+    "hash_canonical",
+    "normalize_url",
+    "url_hash",
+    "extract_domain",
+    "get_base_url",
+    "frequency_interval",
+    "next_run_at",
+    "PriorityScorer",
+    "BestFirstScorer",
+    "BreadthFirstScorer",
+    "CARRIED_FORWARD",
+    "RecrawlPolicy",
+]
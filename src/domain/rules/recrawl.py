@@ -0,0 +1,59 @@
+import math
+from datetime import datetime, timedelta, timezone
+
+from src.domain.models import PageHistory
+
+# skip_reason of page rows an incremental run copied from the previous crawl
+CARRIED_FORWARD = "carried_forward"
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+class RecrawlPolicy:
+    """Decides which known URLs an incremental run fetches again.
+
+    A sitemap <lastmod> is trusted when present: later than our last
+    verification means fetch, otherwise the page is carried forward. Without
+    one, the URL's past changes give a Poisson estimate of its change rate,
+    (changes + 1) / observed days, and the page is fetched once the
+    probability that it changed since it was verified reaches
+    `change_threshold`. Nothing is carried longer than `max_staleness`.
+    """
+
+    def __init__(
+        self,
+        change_threshold: float = 0.5,
+        max_staleness: timedelta = timedelta(days=30),
+        min_history_span: timedelta = timedelta(days=1),
+    ):
+        if not 0 < change_threshold <= 1:
+            raise ValueError(f"change_threshold must be in (0, 1], got {change_threshold}")
+        self.change_threshold = change_threshold
+        self.max_staleness = max_staleness
+        self.min_history_span = min_history_span
+
+    def change_probability(self, history: PageHistory, now: datetime) -> float:
+        """Probability the page changed since it was last verified."""
+        verified_at = _utc(history.verified_at)
+        span = max(verified_at - _utc(history.first_crawled_at), self.min_history_span)
+        rate = (history.changes + 1) / (span.total_seconds() / 86400)
+        age_days = max(0.0, (_utc(now) - verified_at).total_seconds() / 86400)
+        return 1 - math.exp(-rate * age_days)
+
+    def should_fetch(
+        self,
+        history: PageHistory | None,
+        lastmod: datetime | None = None,
+        now: datetime | None = None,
+    ) -> bool:
+        if history is None:
+            return True
+        now = now or datetime.now(timezone.utc)
+        verified_at = _utc(history.verified_at)
+        if _utc(now) - verified_at >= self.max_staleness:
+            return True
+        if lastmod is not None:
+            return _utc(lastmod) > verified_at
+        return self.change_probability(history, now) >= self.change_threshold
@@ -0,0 +1,31 @@
+import re
+from datetime import datetime, timedelta
+
+_NAMED = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+_INTERVAL = re.compile(r"(\d+)\s*([mhdw])")
+
+
+def frequency_interval(frequency: str) -> timedelta | None:
+    """Interval for a source `frequency`: once, hourly, daily, weekly or e.g. 6h, 30m, 2d.
+
+    Returns None for "once". Raises ValueError for anything else.
+    """
+    value = frequency.strip().lower()
+    if value == "once":
+        return None
+    if value in _NAMED:
+        return _NAMED[value]
+    match = _INTERVAL.fullmatch(value)
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError(f"Unknown crawl frequency: {frequency!r}")
+    return timedelta(**{_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def next_run_at(frequency: str, after: datetime) -> datetime | None:
+    interval = frequency_interval(frequency)
+    return after + interval if interval is not None else None
@@ -1,29 +1,195 @@
+import base64
 import hashlib
-from urllib.parse import urlparse, urlunparse
+import re
+from dataclasses import dataclass
+from urllib.parse import quote, unquote, urlsplit, urlunsplit
+
+# Query parameters that only track where a visitor came from, or carry a
+# session; matched case-insensitively
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "gclsrc", "dclid", "msclkid", "yclid", "twclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok",
+    "jsessionid", "phpsessid", "aspsessionid", "sessionid", "cfid", "cftoken",
+})
+TRACKING_PREFIXES = ("utm_", "pk_")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_ESCAPE = re.compile(r"%([0-9A-Fa-f]{2})")
+# Unreserved characters (RFC 3986) never need escaping
+_UNRESERVED = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+# Session ids some servers put in a path parameter, e.g. /a;jsessionid=123
+_PATH_SESSION = re.compile(r";(?:jsessionid|phpsessid|sid)=[^/]*", re.IGNORECASE)
+
+# Bytes of SHA-256 kept in a url_hash; 128 bits make collisions negligible
+URL_HASH_BYTES = 16
+
+
+@dataclass(frozen=True, slots=True)
+class CanonicalUrl:
+    """A URL in canonical form, with its hash and host[:port] from the same parse."""
+
+    url: str
+    url_hash: str
+    domain: str
+
+
+class UrlCanonicalizer:
+    """Rewrites equivalent URLs to one canonical form, memoising the results.
+
+    Always drops the fragment, and by default also lowercases the scheme
+    and host, drops default ports, normalises percent-escapes (uppercase
+    hex, unreserved characters decoded, unsafe ones encoded), strips the
+    trailing slash, removes tracking and session parameters and sorts what
+    is left of the query. Each URL is parsed once: `canonicalize` returns
+    the URL, its hash and its domain together, and caches them so a link
+    seen on many pages is not parsed again. The cache is cleared once it
+    holds `max_cached` URLs; `copy` gives a run its own.
+
+    Safe to share between threads: cache races only repeat work.
+    """
+
+    def __init__(
+        self,
+        strip_params: frozenset[str] = TRACKING_PARAMS,
+        strip_prefixes: tuple[str, ...] = TRACKING_PREFIXES,
+        sort_query: bool = True,
+        lowercase_host: bool = True,
+        drop_default_port: bool = True,
+        normalize_escapes: bool = True,
+        strip_trailing_slash: bool = True,
+        max_cached: int = 100_000,
+    ):
+        self.strip_params = frozenset(p.lower() for p in strip_params)
+        self.strip_prefixes = tuple(p.lower() for p in strip_prefixes)
+        self.sort_query = sort_query
+        self.lowercase_host = lowercase_host
+        self.drop_default_port = drop_default_port
+        self.normalize_escapes = normalize_escapes
+        self.strip_trailing_slash = strip_trailing_slash
+        self.max_cached = max_cached
+        self._cache: dict[str, CanonicalUrl] = {}
+
+    def copy(self) -> "UrlCanonicalizer":
+        """Same rules, empty cache."""
+        return UrlCanonicalizer(
+            self.strip_params,
+            self.strip_prefixes,
+            self.sort_query,
+            self.lowercase_host,
+            self.drop_default_port,
+            self.normalize_escapes,
+            self.strip_trailing_slash,
+            self.max_cached,
+        )
+
+    def __getstate__(self) -> dict:
+        # Sent to analysis processes without the cache
+        return {**self.__dict__, "_cache": {}}
+
+    def canonicalize(self, url: str) -> CanonicalUrl:
+        canonical = self._cache.get(url)
+        if canonical is None:
+            canonical = self._canonicalize(url)
+            if len(self._cache) >= self.max_cached:
+                self._cache.clear()
+            self._cache[url] = canonical
+            # Canonical forms are fixed points, so they hit the cache too
+            self._cache.setdefault(canonical.url, canonical)
+        return canonical
+
+    def _canonicalize(self, url: str) -> CanonicalUrl:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower() if self.lowercase_host else parts.scheme
+        domain = self._domain(parts, scheme)
+
+        path = parts.path
+        if self.strip_params:
+            path = _PATH_SESSION.sub("", path)
+        if self.normalize_escapes:
+            path = quote(_normalize_escapes(path), safe="/%:@!$&'()*+,;=-._~")
+        if self.strip_trailing_slash:
+            path = path.rstrip("/")
+        path = path or "/"
+
+        query = self._query(parts.query)
+        canonical = urlunsplit((scheme, domain, path, query, ""))
+        return CanonicalUrl(url=canonical, url_hash=hash_canonical(canonical), domain=domain)
+
+    def _domain(self, parts, scheme: str) -> str:
+        netloc = parts.netloc
+        if not netloc or not (self.lowercase_host or self.drop_default_port):
+            return netloc
+        userinfo, _, hostport = netloc.rpartition("@")
+        host, port = parts.hostname or "", None
+        try:
+            port = parts.port
+        except ValueError:
+            return netloc
+        if not self.lowercase_host:
+            # hostname is always lowercased; take the original spelling
+            host = hostport.rsplit(":", 1)[0] if port is not None else hostport
+        else:
+            host = host.rstrip(".")
+        if ":" in host and not host.startswith("["):
+            host = f"[{host}]"
+        if port is not None and not (self.drop_default_port and _DEFAULT_PORTS.get(scheme) == port):
+            host = f"{host}:{port}"
+        return f"{userinfo}@{host}" if userinfo else host
+
+    def _query(self, query: str) -> str:
+        if not query:
+            return ""
+        pairs = [pair for pair in query.split("&") if pair]
+        if self.normalize_escapes:
+            pairs = [quote(_normalize_escapes(pair), safe="/?:@!$'()*+,;=%-._~") for pair in pairs]
+        if self.strip_params or self.strip_prefixes:
+            pairs = [pair for pair in pairs if not self._is_tracking(pair)]
+        if self.sort_query:
+            pairs.sort()
+        return "&".join(pairs)
+
+    def _is_tracking(self, pair: str) -> bool:
+        key = unquote(pair.split("=", 1)[0]).lower()
+        return key in self.strip_params or key.startswith(self.strip_prefixes)
+
+
+def _normalize_escapes(value: str) -> str:
+    """Decode escaped unreserved characters and uppercase the remaining escapes."""
+    if "%" not in value:
+        return value
+
+    def replace(match: re.Match) -> str:
+        char = chr(int(match.group(1), 16))
+        return char if char in _UNRESERVED else f"%{match.group(1).upper()}"
+
+    return _ESCAPE.sub(replace, value)
+
+
+def hash_canonical(canonical_url: str) -> str:
+    """url_hash of a URL already in canonical form: 16 bytes of SHA-256, base64url (22 chars).
+
+    A third the size of a hex SHA-256, which keeps the url_hash indexes small.
+    """
+    digest = hashlib.sha256(canonical_url.encode()).digest()[:URL_HASH_BYTES]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+# Used by the module-level helpers below
+_DEFAULT = UrlCanonicalizer()
 
 
 def normalize_url(url: str) -> str:
-    parsed = urlparse(url)
-    path = parsed.path.rstrip("/") or "/"
-    return urlunparse((
-        parsed.scheme,
-        parsed.netloc,
-        path,
-        parsed.params,
-        parsed.query,
-        "",  # strip fragment
-    ))
+    return _DEFAULT.canonicalize(url).url
 
 
 def url_hash(url: str) -> str:
-    normalized = normalize_url(url)
-    return hashlib.sha256(normalized.encode()).hexdigest()
+    return _DEFAULT.canonicalize(url).url_hash
 
 
 def extract_domain(url: str) -> str:
-    return urlparse(url).netloc
+    return _DEFAULT.canonicalize(url).domain
 
 
 def get_base_url(url: str) -> str:
-    parsed = urlparse(url)
+    parsed = urlsplit(normalize_url(url))
     return f"{parsed.scheme}://{parsed.netloc}"
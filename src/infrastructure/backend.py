@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from src.domain.ports import (
+    BlobStore,
+    CrawledPageRepository,
+    ParsedPageRepository,
+    QueueRepository,
+    RobotsStore,
+    RunRepository,
+    SourceRepository,
+)
+from src.infrastructure.config import Settings, get_settings
+
+
+@dataclass
+class Repositories:
+    """Every repository of one storage backend, sharing its client or pool."""
+
+    source_repo: SourceRepository
+    run_repo: RunRepository
+    page_repo: CrawledPageRepository
+    parsed_page_repo: ParsedPageRepository
+    queue_repo: QueueRepository
+    robots_store: RobotsStore
+    # page_bodies table, for --body-store postgres (or the SQLite file)
+    blob_store: BlobStore
+
+
+def create_repositories(
+    compress: bool = False,
+    settings: Settings | None = None,
+    backend: str | None = None,
+) -> Repositories:
+    """Wire the repositories of `backend`, by default DATABASE_BACKEND.
+
+    `backend` is "supabase", "postgres" or "sqlite:PATH".
+    """
+    settings = settings or get_settings()
+    backend = backend or settings.database_backend
+
+    if backend.startswith("sqlite:"):
+        from src.infrastructure.blob_store import SqliteBlobStore
+        from src.infrastructure.db import SqliteDatabase
+        from src.infrastructure.repositories import (
+            SqliteCrawledPageRepository,
+            SqliteParsedPageRepository,
+            SqliteQueueRepository,
+            SqliteRobotsStore,
+            SqliteRunRepository,
+            SqliteSourceRepository,
+        )
+
+        db = SqliteDatabase(backend.removeprefix("sqlite:"))
+        return Repositories(
+            source_repo=SqliteSourceRepository(db),
+            run_repo=SqliteRunRepository(db),
+            page_repo=SqliteCrawledPageRepository(db, compress=compress),
+            parsed_page_repo=SqliteParsedPageRepository(db),
+            queue_repo=SqliteQueueRepository(db),
+            robots_store=SqliteRobotsStore(db),
+            blob_store=SqliteBlobStore(db),
+        )
+
+    if backend == "postgres":
+        from src.infrastructure.blob_store import PostgresBlobStore
+        from src.infrastructure.db import get_postgres_pool
+        from src.infrastructure.repositories import (
+            PostgresCrawledPageRepository,
+            PostgresParsedPageRepository,
+            PostgresQueueRepository,
+            PostgresRobotsStore,
+            PostgresRunRepository,
+            PostgresSourceRepository,
+        )
+
+        pool = get_postgres_pool()
+        return Repositories(
+            source_repo=PostgresSourceRepository(pool),
+            run_repo=PostgresRunRepository(pool),
+            page_repo=PostgresCrawledPageRepository(pool, compress=compress),
+            parsed_page_repo=PostgresParsedPageRepository(pool),
+            queue_repo=PostgresQueueRepository(pool),
+            robots_store=PostgresRobotsStore(pool),
+            blob_store=PostgresBlobStore(pool),
+        )
+
+    if backend != "supabase":
+        raise ValueError(f"Unknown database backend {backend!r}: use supabase, postgres or sqlite:PATH")
+
+    from src.infrastructure.blob_store import SupabaseBlobStore
+    from src.infrastructure.db import get_supabase_client
+    from src.infrastructure.repositories import (
+        SupabaseCrawledPageRepository,
+        SupabaseParsedPageRepository,
+        SupabaseQueueRepository,
+        SupabaseRobotsStore,
+        SupabaseRunRepository,
+        SupabaseSourceRepository,
+    )
+
+    client = get_supabase_client()
+    return Repositories(
+        source_repo=SupabaseSourceRepository(client),
+        run_repo=SupabaseRunRepository(client),
+        page_repo=SupabaseCrawledPageRepository(client, compress=compress),
+        parsed_page_repo=SupabaseParsedPageRepository(client),
+        queue_repo=SupabaseQueueRepository(client),
+        robots_store=SupabaseRobotsStore(client),
+        blob_store=SupabaseBlobStore(client),
+    )
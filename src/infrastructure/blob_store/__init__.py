@@ -0,0 +1,6 @@
+from .local import LocalBlobStore
+from .postgres import PostgresBlobStore
+from .sqlite import SqliteBlobStore
+from .supabase import SupabaseBlobStore
+
+__all__ = ["LocalBlobStore", "PostgresBlobStore", "SqliteBlobStore", "SupabaseBlobStore"]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+
+class LocalBlobStore:
+    """Bodies as files under `root`, fanned out by the first hash characters."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, content_hash: str) -> Path:
+        return self.root / content_hash[:2] / content_hash[2:4] / content_hash
+
+    def existing(self, content_hashes: list[str]) -> set[str]:
+        return {h for h in content_hashes if self._path(h).exists()}
+
+    def put_many(self, blobs: dict[str, str]) -> int:
+        written = 0
+        for content_hash, content in blobs.items():
+            path = self._path(content_hash)
+            if path.exists():
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so readers never see a partial body
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(content)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            written += 1
+        return written
+
+    def get_many(self, content_hashes: list[str]) -> dict[str, str]:
+        bodies = {}
+        for content_hash in content_hashes:
+            path = self._path(content_hash)
+            if path.exists():
+                bodies[content_hash] = path.read_text(encoding="utf-8")
+        return bodies
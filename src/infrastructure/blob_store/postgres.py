@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.infrastructure.db.postgres import insert_rows
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+
+class PostgresBlobStore:
+    """Bodies in the `page_bodies` table over a direct connection."""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def existing(self, content_hashes: list[str]) -> set[str]:
+        if not content_hashes:
+            return set()
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "select content_hash from page_bodies where content_hash = any(%s)",
+                (content_hashes,),
+            ).fetchall()
+        return {row["content_hash"] for row in rows}
+
+    def put_many(self, blobs: dict[str, str]) -> int:
+        if not blobs:
+            return 0
+        rows = [{"content_hash": h, "content": content} for h, content in blobs.items()]
+        with self.pool.connection() as conn:
+            # Another worker may have stored the same body since `existing` ran
+            insert_rows(conn, "page_bodies", rows, on_conflict="on conflict (content_hash) do nothing", returning=False)
+        return len(rows)
+
+    def get_many(self, content_hashes: list[str]) -> dict[str, str]:
+        if not content_hashes:
+            return {}
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "select content_hash, content from page_bodies where content_hash = any(%s)",
+                (content_hashes,),
+            ).fetchall()
+        return {row["content_hash"]: row["content"] for row in rows}
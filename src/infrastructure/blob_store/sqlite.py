@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+
+from src.infrastructure.db.sqlite import SqliteDatabase, timestamp
+
+
+class SqliteBlobStore:
+    """Bodies in the local `page_bodies` table, one row per distinct content_hash."""
+
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def existing(self, content_hashes: list[str]) -> set[str]:
+        if not content_hashes:
+            return set()
+        rows = self.db.read().execute(
+            "select content_hash from page_bodies where content_hash in (select value from json_each(?))",
+            (json.dumps(content_hashes),),
+        ).fetchall()
+        return {row["content_hash"] for row in rows}
+
+    def put_many(self, blobs: dict[str, str]) -> int:
+        if not blobs:
+            return 0
+        created_at = timestamp()
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "insert into page_bodies (content_hash, content, created_at) values (?, ?, ?) on conflict do nothing",
+                [(h, content, created_at) for h, content in blobs.items()],
+            )
+        return len(blobs)
+
+    def get_many(self, content_hashes: list[str]) -> dict[str, str]:
+        if not content_hashes:
+            return {}
+        rows = self.db.read().execute(
+            "select content_hash, content from page_bodies where content_hash in (select value from json_each(?))",
+            (json.dumps(content_hashes),),
+        ).fetchall()
+        return {row["content_hash"]: row["content"] for row in rows}
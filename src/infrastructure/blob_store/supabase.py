@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from postgrest.types import ReturnMethod
+from supabase import Client
+
+# Keeps `in.(...)` filters well inside URL length limits
+_LOOKUP_CHUNK = 200
+
+
+class SupabaseBlobStore:
+    """Bodies in the `page_bodies` table, one row per distinct content_hash."""
+
+    def __init__(self, client: Client):
+        self.client = client
+        self.table = client.table("page_bodies")
+
+    def existing(self, content_hashes: list[str]) -> set[str]:
+        found: set[str] = set()
+        for i in range(0, len(content_hashes), _LOOKUP_CHUNK):
+            chunk = content_hashes[i : i + _LOOKUP_CHUNK]
+            result = self.table.select("content_hash").in_("content_hash", chunk).execute()
+            found.update(row["content_hash"] for row in result.data)
+        return found
+
+    def put_many(self, blobs: dict[str, str]) -> int:
+        if not blobs:
+            return 0
+        data = [{"content_hash": h, "content": content} for h, content in blobs.items()]
+        # Another worker may have stored the same body since `existing` ran;
+        # skip echoing the bodies back, they are the bulk of the payload
+        self.table.upsert(
+            data,
+            on_conflict="content_hash",
+            ignore_duplicates=True,
+            returning=ReturnMethod.minimal,
+        ).execute()
+        return len(data)
+
+    def get_many(self, content_hashes: list[str]) -> dict[str, str]:
+        bodies: dict[str, str] = {}
+        for i in range(0, len(content_hashes), _LOOKUP_CHUNK):
+            chunk = content_hashes[i : i + _LOOKUP_CHUNK]
+            result = self.table.select("content_hash, content").in_("content_hash", chunk).execute()
+            bodies.update({row["content_hash"]: row["content"] for row in result.data})
+        return bodies
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+from typing import Protocol
+from uuid import UUID
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install 'answer-engine[compression]'
+    zstandard = None
+
+# Value of crawled_pages.content_encoding for zstd bodies. Rows where it is
+# null keep plain text in `content`; bump the suffix if the framing changes.
+ZSTD_ENCODING = "zstd-v1"
+
+DEFAULT_LEVEL = 6
+DEFAULT_DICT_SIZE = 112_640
+
+
+class DictionaryStore(Protocol):
+    def get_latest(self, source_id: UUID) -> bytes | None: ...
+
+    def get(self, dict_id: int) -> bytes | None: ...
+
+    def save(self, source_id: UUID, dict_id: int, data: bytes, sample_count: int) -> None: ...
+
+
+class ZstdBodyCodec:
+    """zstd codec for page bodies with optional per-source trained dictionaries.
+
+    Frames record the id of the dictionary they were compressed with, so
+    decoding needs no extra column: the dictionary is looked up by that id.
+    Compressor objects are not thread-safe and are cached per thread.
+    """
+
+    def __init__(self, dictionaries: DictionaryStore | None = None, level: int = DEFAULT_LEVEL):
+        if zstandard is None:
+            raise RuntimeError(
+                "zstd page compression needs the 'zstandard' package: "
+                "install answer-engine[compression]"
+            )
+        self.dictionaries = dictionaries
+        self.level = level
+        self._lock = threading.Lock()
+        self._source_dicts: dict[UUID, zstandard.ZstdCompressionDict | None] = {}
+        self._dicts_by_id: dict[int, zstandard.ZstdCompressionDict] = {}
+        self._local = threading.local()
+
+    def _dict_for_source(self, source_id: UUID) -> zstandard.ZstdCompressionDict | None:
+        with self._lock:
+            if source_id in self._source_dicts:
+                return self._source_dicts[source_id]
+        data = self.dictionaries.get_latest(source_id) if self.dictionaries else None
+        compression_dict = self._register(data) if data else None
+        with self._lock:
+            self._source_dicts[source_id] = compression_dict
+        return compression_dict
+
+    def _dict_by_id(self, dict_id: int) -> zstandard.ZstdCompressionDict:
+        with self._lock:
+            cached = self._dicts_by_id.get(dict_id)
+        if cached is not None:
+            return cached
+        data = self.dictionaries.get(dict_id) if self.dictionaries else None
+        if data is None:
+            raise LookupError(f"zstd dictionary {dict_id} not found")
+        return self._register(data)
+
+    def _register(self, data: bytes) -> zstandard.ZstdCompressionDict:
+        compression_dict = zstandard.ZstdCompressionDict(data)
+        with self._lock:
+            return self._dicts_by_id.setdefault(compression_dict.dict_id(), compression_dict)
+
+    def _compressor(self, compression_dict) -> zstandard.ZstdCompressor:
+        cache = self._local.__dict__.setdefault("compressors", {})
+        key = compression_dict.dict_id() if compression_dict is not None else 0
+        if key not in cache:
+            cache[key] = zstandard.ZstdCompressor(level=self.level, dict_data=compression_dict)
+        return cache[key]
+
+    def _decompressor(self, dict_id: int) -> zstandard.ZstdDecompressor:
+        cache = self._local.__dict__.setdefault("decompressors", {})
+        if dict_id not in cache:
+            compression_dict = self._dict_by_id(dict_id) if dict_id else None
+            cache[dict_id] = zstandard.ZstdDecompressor(dict_data=compression_dict)
+        return cache[dict_id]
+
+    def encode(self, content: str, source_id: UUID | None = None) -> bytes:
+        compression_dict = self._dict_for_source(source_id) if source_id is not None else None
+        return self._compressor(compression_dict).compress(content.encode("utf-8", errors="replace"))
+
+    def decode(self, data: bytes) -> str:
+        dict_id = zstandard.get_frame_parameters(data).dict_id
+        return self._decompressor(dict_id).decompress(data).decode("utf-8")
+
+    def train(self, source_id: UUID, samples: list[str], dict_size: int = DEFAULT_DICT_SIZE) -> int:
+        """Train and save a dictionary for a source; later encodes for it use it.
+
+        Returns the new dictionary id.
+        """
+        if self.dictionaries is None:
+            raise RuntimeError("Training a dictionary needs a dictionary store")
+        encoded = [s.encode("utf-8", errors="replace") for s in samples]
+        compression_dict = zstandard.train_dictionary(dict_size, encoded, level=self.level)
+        dict_id = compression_dict.dict_id()
+        self.dictionaries.save(source_id, dict_id, compression_dict.as_bytes(), len(samples))
+        registered = self._register(compression_dict.as_bytes())
+        with self._lock:
+            self._source_dicts[source_id] = registered
+        return dict_id
+
+
+def to_bytea(data: bytes) -> str:
+    """PostgREST accepts bytea as a `\\x`-prefixed hex string."""
+    return "\\x" + data.hex()
+
+
+def from_bytea(value: str) -> bytes:
+    return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
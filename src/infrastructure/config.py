@@ -1,17 +1,21 @@
 from functools import lru_cache
 
 from dotenv import load_dotenv
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 load_dotenv()
 
-
 class Settings(BaseSettings):
-    supabase_url: str
-    supabase_service_key: str
+    # "supabase" goes through PostgREST over HTTPS; "postgres" connects to
+    # DATABASE_URL directly with a connection pool; "sqlite:PATH" keeps
+    # everything in a local file
+    database_backend: str = "supabase"
+    supabase_url: str = ""
+    supabase_service_key: str = ""
+    database_url: str = ""
+    database_pool_size: int = 10
 
-    class Config:
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_file=".env")
 
 
 @lru_cache
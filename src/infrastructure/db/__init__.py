@@ -1,3 +1,5 @@
 from .supabase import get_supabase_client
+from .postgres import create_postgres_pool, get_postgres_pool
+from .sqlite import SqliteDatabase
 
-__all__ = ["get_supabase_client"]
+__all__ = ["get_supabase_client", "create_postgres_pool", "get_postgres_pool", "SqliteDatabase"]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import atexit
+from typing import TYPE_CHECKING, Any
+
+from src.infrastructure.config import get_settings
+
+try:
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+except ImportError:  # optional: pip install 'answer-engine[postgres]'
+    dict_row = None
+    ConnectionPool = None
+
+if TYPE_CHECKING:
+    from psycopg import Connection
+
+# Below this many rows a pipelined executemany beats setting up a COPY
+COPY_MIN_ROWS = 50
+
+_pool: ConnectionPool | None = None
+
+
+def create_postgres_pool(conninfo: str, max_size: int = 10) -> ConnectionPool:
+    if ConnectionPool is None:
+        raise RuntimeError(
+            "The postgres backend needs the 'psycopg' and 'psycopg-pool' packages: "
+            "install answer-engine[postgres]"
+        )
+    return ConnectionPool(
+        conninfo,
+        min_size=1,
+        max_size=max_size,
+        kwargs={"row_factory": dict_row},
+        open=True,
+    )
+
+
+def get_postgres_pool() -> ConnectionPool:
+    global _pool
+
+    if _pool is None:
+        settings = get_settings()
+        if not settings.database_url:
+            raise RuntimeError("DATABASE_URL environment variable required")
+        _pool = create_postgres_pool(settings.database_url, settings.database_pool_size)
+        # Worker threads would otherwise hold up interpreter exit
+        atexit.register(_pool.close)
+
+    return _pool
+
+
+def insert_rows(
+    conn: Connection,
+    table: str,
+    rows: list[dict[str, Any]],
+    on_conflict: str = "",
+    returning: bool = True,
+) -> list[dict[str, Any]]:
+    """Insert many rows in one round trip and return them as stored.
+
+    Small batches go through `executemany`, which psycopg pipelines. Larger
+    ones are streamed with COPY into a per-connection staging table shaped
+    like `table` and moved over with one INSERT ... SELECT, so `on_conflict`
+    and RETURNING still apply. Columns missing from a row are sent as null.
+    """
+    if not rows:
+        return []
+    columns = list(dict.fromkeys(column for row in rows for column in row))
+    values = [tuple(row.get(column) for column in columns) for row in rows]
+    column_list = ", ".join(columns)
+    suffix = f"{on_conflict} returning *" if returning else on_conflict
+
+    with conn.cursor() as cur:
+        if len(rows) < COPY_MIN_ROWS:
+            placeholders = ", ".join(["%s"] * len(columns))
+            cur.executemany(
+                f"insert into {table} ({column_list}) values ({placeholders}) {suffix}",
+                values,
+                returning=returning,
+            )
+            return _fetch_all_results(cur) if returning else []
+
+        staging = f"_staging_{table}"
+        # Emptied by every commit, so one table per pooled connection is reused
+        cur.execute(
+            f"create temp table if not exists {staging} "
+            f"(like {table} including defaults) on commit delete rows"
+        )
+        with cur.copy(f"copy {staging} ({column_list}) from stdin") as copy:
+            for row in values:
+                copy.write_row(row)
+        cur.execute(f"insert into {table} select * from {staging} {suffix}")
+        return cur.fetchall() if returning else []
+
+
+def _fetch_all_results(cur) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    while True:
+        rows.extend(cur.fetchall())
+        if not cur.nextset():
+            return rows
+
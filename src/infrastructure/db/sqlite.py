@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from src.domain.rules import hash_canonical
+
+# Mirrors supabase/schema.sql: same tables, columns and indexes. uuids and
+# timestamps are stored as text (timestamps as UTC ISO 8601, so they sort
+# and compare as strings), booleans as 0/1 and jsonb as JSON text.
+SCHEMA = """
+create table if not exists crawl_sources (
+    id text primary key,
+    domain text not null,
+    entry_url text not null,
+    type text not null check (type in ('single_page', 'full_domain')),
+    frequency text not null default 'once',
+    max_pages int check (max_pages is null or max_pages > 0),
+    status text not null default 'active' check (status in ('active', 'paused')),
+    created_at text not null,
+    next_run_at text
+);
+
+create table if not exists crawl_runs (
+    id text primary key,
+    source_id text not null references crawl_sources(id) on delete cascade,
+    status text not null default 'pending'
+        check (status in ('pending', 'running', 'completed', 'failed')),
+    mode text not null default 'full' check (mode in ('full', 'incremental')),
+    started_at text,
+    completed_at text,
+    pages_found int not null default 0,
+    pages_crawled int not null default 0,
+    pages_failed int not null default 0,
+    bytes_downloaded int not null default 0,
+    links_discovered int not null default 0,
+    links_deduped int not null default 0,
+    status_codes text not null default '{}',
+    error text,
+    created_at text not null
+);
+
+create index if not exists crawl_sources_domain_idx on crawl_sources(domain);
+create index if not exists crawl_sources_status_idx on crawl_sources(status);
+create index if not exists crawl_sources_next_run_idx on crawl_sources(next_run_at) where status = 'active';
+
+create index if not exists crawl_runs_source_idx on crawl_runs(source_id);
+create index if not exists crawl_runs_status_idx on crawl_runs(status);
+create index if not exists crawl_runs_created_idx on crawl_runs(created_at desc);
+
+create table if not exists crawled_pages (
+    id text primary key,
+    run_id text not null references crawl_runs(id) on delete cascade,
+    source_id text not null references crawl_sources(id) on delete cascade,
+    url text not null,
+    url_hash text not null,
+    content_hash text,
+    content text,
+    status_code int,
+    error text,
+    content_encoding text,
+    content_zstd blob,
+    etag text,
+    last_modified text,
+    max_age int,
+    unchanged int not null default 0,
+    skip_reason text,
+    simhash integer,
+    crawled_at text not null
+);
+
+create index if not exists crawled_pages_url_hash_idx on crawled_pages(url_hash);
+create index if not exists crawled_pages_source_idx on crawled_pages(source_id);
+create index if not exists crawled_pages_run_idx on crawled_pages(run_id);
+create index if not exists crawled_pages_crawled_at_idx on crawled_pages(crawled_at desc);
+create index if not exists crawled_pages_url_latest_idx on crawled_pages(url_hash, crawled_at desc);
+
+create table if not exists parsed_pages (
+    id text primary key,
+    page_id text not null unique references crawled_pages(id) on delete cascade,
+    title text,
+    description text,
+    markdown text,
+    metadata text,
+    word_count int,
+    parsed_at text not null,
+    parser_version text not null default '1.0'
+);
+
+create index if not exists parsed_pages_page_idx on parsed_pages(page_id);
+create index if not exists parsed_pages_parsed_at_idx on parsed_pages(parsed_at desc);
+
+create table if not exists page_bodies (
+    content_hash text primary key,
+    content text not null,
+    created_at text not null
+);
+
+create table if not exists compression_dictionaries (
+    dict_id int primary key,
+    source_id text not null references crawl_sources(id) on delete cascade,
+    data blob not null,
+    sample_count int not null,
+    created_at text not null
+);
+
+create index if not exists compression_dictionaries_source_idx
+    on compression_dictionaries(source_id, created_at desc);
+
+create table if not exists robots_cache (
+    host text primary key,
+    status_code int,
+    body text,
+    fetched_at text not null,
+    expires_at text not null
+);
+
+create table if not exists crawl_queue (
+    id text primary key,
+    run_id text not null references crawl_runs(id) on delete cascade,
+    url text not null,
+    url_hash text not null,
+    priority int not null default 0,
+    depth int not null default 0,
+    lastmod text,
+    sitemap_priority real,
+    status text not null default 'pending'
+        check (status in ('pending', 'processing', 'completed', 'failed')),
+    worker_id text,
+    claimed_at text,
+    attempts int not null default 0,
+    max_attempts int not null default 3,
+    error text,
+    created_at text not null
+);
+
+create unique index if not exists crawl_queue_run_url_idx on crawl_queue(run_id, url_hash);
+
+create index if not exists crawl_queue_pending_idx on crawl_queue(run_id, priority desc, created_at)
+    where status = 'pending';
+
+create index if not exists crawl_queue_stale_idx on crawl_queue(claimed_at)
+    where status = 'processing';
+"""
+
+# Columns added after the first release of SCHEMA, which `create table if
+# not exists` leaves out of older files: (table, column, definition)
+ADDED_COLUMNS = [
+    ("crawl_runs", "bytes_downloaded", "int not null default 0"),
+    ("crawl_runs", "links_discovered", "int not null default 0"),
+    ("crawl_runs", "links_deduped", "int not null default 0"),
+    ("crawl_runs", "status_codes", "text not null default '{}'"),
+    ("crawl_runs", "mode", "text not null default 'full' check (mode in ('full', 'incremental'))"),
+    ("crawled_pages", "simhash", "integer"),
+]
+
+# Bumped by each data migration `pragma user_version` tracks
+SCHEMA_VERSION = 1
+
+
+def _rekey_url_hashes(conn: sqlite3.Connection) -> None:
+    """Version 1: url_hash went from 64 hex characters to `hash_canonical`."""
+    conn.create_function("hash_canonical", 1, hash_canonical, deterministic=True)
+    conn.execute("begin immediate")
+    for table in ("crawled_pages", "crawl_queue"):
+        conn.execute(f"update {table} set url_hash = hash_canonical(url) where length(url_hash) = 64")
+    conn.execute(f"pragma user_version = {SCHEMA_VERSION}")
+    conn.execute("commit")
+
+
+def to_db(value: Any) -> Any:
+    """Python value as SQLite stores it (see SCHEMA)."""
+    if isinstance(value, datetime):
+        return timestamp(value)
+    if isinstance(value, bool):
+        return int(value)
+    if value is None or isinstance(value, (str, int, float, bytes)):
+        return value
+    return str(value)
+
+
+def timestamp(value: datetime | None = None) -> str:
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _dict_row(cursor: sqlite3.Cursor, row: tuple) -> dict[str, Any]:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class SqliteDatabase:
+    """One SQLite file in WAL mode, shared by every repository and thread.
+
+    Each thread gets its own connection. WAL lets readers run alongside the
+    single writer, and `busy_timeout` queues writers instead of failing.
+    `transaction` wraps a batch of statements in one BEGIN IMMEDIATE ...
+    COMMIT, which is also what makes a claim atomic across processes.
+    """
+
+    def __init__(self, path: str | Path, busy_timeout: float = 30.0):
+        self.path = str(path)
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        for table, column, definition in ADDED_COLUMNS:
+            existing = {row["name"] for row in conn.execute(f"pragma table_info({table})")}
+            if column not in existing:
+                conn.execute(f"alter table {table} add column {column} {definition}")
+        if conn.execute("pragma user_version").fetchone()["user_version"] < 1:
+            _rekey_url_hashes(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Transactions are opened explicitly in `transaction`
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.row_factory = _dict_row
+            conn.execute("pragma journal_mode = wal")
+            conn.execute("pragma synchronous = normal")
+            conn.execute("pragma foreign_keys = on")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        if conn.in_transaction:
+            # Nested use joins the outer transaction
+            yield conn
+            return
+        conn.execute("begin immediate")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("rollback")
+            raise
+        conn.execute("commit")
+
+    def read(self) -> sqlite3.Connection:
+        """This thread's connection, for single-statement reads."""
+        return self._connect()
+
+
+def insert_row(conn: sqlite3.Connection, table: str, row: dict[str, Any], on_conflict: str = "") -> dict[str, Any] | None:
+    """Insert one row and return it as stored, or None if `on_conflict` skipped it."""
+    columns = ", ".join(row)
+    placeholders = ", ".join("?" * len(row))
+    cursor = conn.execute(
+        f"insert into {table} ({columns}) values ({placeholders}) {on_conflict} returning *",
+        [to_db(value) for value in row.values()],
+    )
+    return cursor.fetchone()
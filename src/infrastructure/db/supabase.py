@@ -10,7 +10,7 @@ def get_supabase_client() -> Client:
 
     if _client is None:
         settings = get_settings()
-        if not settings.supabase_url and not settings.supabase_service_key:
+        if not settings.supabase_url or not settings.supabase_service_key:
             raise RuntimeError('SUPABASE_URL and SUPABASE_SERVICE_KEY environment variables required')
         _client = create_client(settings.supabase_url, settings.supabase_service_key)
 
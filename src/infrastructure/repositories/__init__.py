@@ -2,6 +2,26 @@ from .source import SupabaseSourceRepository
 from .run import SupabaseRunRepository
 from .page import SupabaseCrawledPageRepository, SupabaseParsedPageRepository
 from .queue import SupabaseQueueRepository
+from .compression_dictionary import SupabaseDictionaryStore
+from .robots_cache import SupabaseRobotsStore
+from .postgres import (
+    PostgresCrawledPageRepository,
+    PostgresDictionaryStore,
+    PostgresParsedPageRepository,
+    PostgresQueueRepository,
+    PostgresRobotsStore,
+    PostgresRunRepository,
+    PostgresSourceRepository,
+)
+from .sqlite import (
+    SqliteCrawledPageRepository,
+    SqliteDictionaryStore,
+    SqliteParsedPageRepository,
+    SqliteQueueRepository,
+    SqliteRobotsStore,
+    SqliteRunRepository,
+    SqliteSourceRepository,
+)
 
 __all__ = [
     "SupabaseSourceRepository",
@@ -9,4 +29,20 @@ __all__ = [
     "SupabaseCrawledPageRepository",
     "SupabaseParsedPageRepository",
     "SupabaseQueueRepository",
+    "SupabaseDictionaryStore",
+    "SupabaseRobotsStore",
+    "PostgresSourceRepository",
+    "PostgresRunRepository",
+    "PostgresCrawledPageRepository",
+    "PostgresParsedPageRepository",
+    "PostgresQueueRepository",
+    "PostgresDictionaryStore",
+    "PostgresRobotsStore",
+    "SqliteSourceRepository",
+    "SqliteRunRepository",
+    "SqliteCrawledPageRepository",
+    "SqliteParsedPageRepository",
+    "SqliteQueueRepository",
+    "SqliteDictionaryStore",
+    "SqliteRobotsStore",
 ]
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from supabase import Client
+
+from src.infrastructure.compression import from_bytea, to_bytea
+
+
+class SupabaseDictionaryStore:
+    """Trained zstd dictionaries, one or more per crawl source."""
+
+    def __init__(self, client: Client):
+        self.client = client
+        self.table = client.table("compression_dictionaries")
+
+    def get_latest(self, source_id: UUID) -> bytes | None:
+        result = (
+            self.table.select("data")
+            .eq("source_id", str(source_id))
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        if not result.data:
+            return None
+        return from_bytea(result.data[0]["data"])
+
+    def get(self, dict_id: int) -> bytes | None:
+        result = self.table.select("data").eq("dict_id", dict_id).execute()
+        if not result.data:
+            return None
+        return from_bytea(result.data[0]["data"])
+
+    def save(self, source_id: UUID, dict_id: int, data: bytes, sample_count: int) -> None:
+        self.table.insert({
+            "dict_id": dict_id,
+            "source_id": str(source_id),
+            "data": to_bytea(data),
+            "sample_count": sample_count,
+        }).execute()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from functools import partial
+from typing import Callable
 from uuid import UUID
 
 from supabase import Client
@@ -7,33 +9,103 @@ from supabase import Client
 from src.domain.models import (
     CrawledPage,
     CrawledPageCreate,
+    PageHistory,
+    PageValidators,
     ParsedPage,
     ParsedPageCreate,
 )
+from src.infrastructure.compression import (
+    DEFAULT_DICT_SIZE,
+    DEFAULT_LEVEL,
+    ZSTD_ENCODING,
+    DictionaryStore,
+    ZstdBodyCodec,
+    from_bytea,
+    to_bytea,
+)
+from src.infrastructure.repositories.compression_dictionary import SupabaseDictionaryStore
+
+
+class _PageBodies:
+    """Encodes bodies on write and attaches lazy decoders on read.
+
+    Rows with a null `content_encoding` are plain text, so compressed and
+    uncompressed rows can live side by side in the same table. With
+    `binary`, bytea columns are raw bytes (a native driver) rather than the
+    hex strings PostgREST speaks.
+    """
+
+    def __init__(
+        self,
+        dictionaries: Callable[[], DictionaryStore],
+        compress: bool,
+        level: int,
+        binary: bool = False,
+    ):
+        self.dictionaries = dictionaries
+        self.compress = compress
+        self.level = level
+        self.binary = binary
+        self._codec: ZstdBodyCodec | None = None
+        if compress:
+            # Fail at startup, not mid-crawl, when zstandard is missing
+            self._codec = self._make_codec()
+
+    def _make_codec(self) -> ZstdBodyCodec:
+        return ZstdBodyCodec(self.dictionaries(), level=self.level)
+
+    @property
+    def codec(self) -> ZstdBodyCodec:
+        # Created on demand so plain-text deployments never need zstandard
+        if self._codec is None:
+            self._codec = self._make_codec()
+        return self._codec
+
+    def to_row(self, page: CrawledPageCreate) -> dict:
+        data = page.model_dump(mode="python" if self.binary else "json")
+        if self.compress and page.content is not None:
+            encoded = self.codec.encode(page.content, page.source_id)
+            data["content"] = None
+            data["content_zstd"] = encoded if self.binary else to_bytea(encoded)
+            data["content_encoding"] = ZSTD_ENCODING
+        return data
+
+    def decode_stored(self, encoded) -> bytes:
+        return bytes(encoded) if self.binary else from_bytea(encoded)
+
+    def to_page(self, row: dict) -> CrawledPage:
+        encoded = row.pop("content_zstd", None)
+        page = CrawledPage.model_validate(row)
+        if page.content_encoding == ZSTD_ENCODING and encoded is not None:
+            page._decode_body = partial(self.codec.decode, self.decode_stored(encoded))
+        elif page.content_encoding is not None:
+            raise ValueError(f"Unsupported content_encoding {page.content_encoding!r} on page {page.id}")
+        return page
 
 
 class SupabaseCrawledPageRepository:
-    def __init__(self, client: Client):
+    def __init__(self, client: Client, compress: bool = False, compression_level: int = DEFAULT_LEVEL):
         self.client = client
         self.table = client.table("crawled_pages")
+        self.bodies = _PageBodies(partial(SupabaseDictionaryStore, client), compress, compression_level)
 
     def create(self, page: CrawledPageCreate) -> CrawledPage:
-        data = page.model_dump(mode="json")
+        data = self.bodies.to_row(page)
         result = self.table.insert(data).execute()
-        return CrawledPage.model_validate(result.data[0])
+        return self.bodies.to_page(result.data[0])
 
     def create_batch(self, pages: list[CrawledPageCreate]) -> list[CrawledPage]:
         if not pages:
             return []
-        data = [page.model_dump(mode="json") for page in pages]
+        data = [self.bodies.to_row(page) for page in pages]
         result = self.table.insert(data).execute()
-        return [CrawledPage.model_validate(row) for row in result.data]
+        return [self.bodies.to_page(row) for row in result.data]
 
     def get_by_id(self, id: UUID) -> CrawledPage | None:
         result = self.table.select("*").eq("id", str(id)).execute()
         if not result.data:
             return None
-        return CrawledPage.model_validate(result.data[0])
+        return self.bodies.to_page(result.data[0])
 
     def list_by_run(self, run_id: UUID) -> list[CrawledPage]:
         result = (
@@ -42,7 +114,7 @@ class SupabaseCrawledPageRepository:
             .order("crawled_at", desc=True)
             .execute()
         )
-        return [CrawledPage.model_validate(row) for row in result.data]
+        return [self.bodies.to_page(row) for row in result.data]
 
     def get_latest_by_url(self, source_id: UUID, url_hash: str) -> CrawledPage | None:
         result = (
@@ -55,7 +127,75 @@ class SupabaseCrawledPageRepository:
         )
         if not result.data:
             return None
-        return CrawledPage.model_validate(result.data[0])
+        return self.bodies.to_page(result.data[0])
+
+    def get_validators(self, source_id: UUID, url_hashes: list[str]) -> dict[str, PageValidators]:
+        if not url_hashes:
+            return {}
+        # One round trip for the whole claimed batch
+        result = self.client.rpc(
+            "get_page_validators",
+            {
+                "p_source_id": str(source_id),
+                "p_url_hashes": url_hashes,
+            },
+        ).execute()
+        validators = [PageValidators.model_validate(row) for row in result.data]
+        return {v.url_hash: v for v in validators}
+
+    def get_history(self, source_id: UUID) -> list[PageHistory]:
+        history: list[PageHistory] = []
+        # Page through the source so PostgREST's max-rows cap can't truncate it
+        page_size = 1000
+        while True:
+            result = (
+                self.client.rpc("get_page_history", {"p_source_id": str(source_id)})
+                .range(len(history), len(history) + page_size - 1)
+                .execute()
+            )
+            history.extend(PageHistory.model_validate(row) for row in result.data)
+            if len(result.data) < page_size:
+                return history
+
+    def get_contents(self, ids: list[UUID]) -> dict[UUID, str]:
+        if not ids:
+            return {}
+        result = (
+            self.table.select("id, content, content_zstd, content_encoding")
+            .in_("id", [str(id) for id in ids])
+            .execute()
+        )
+        contents = {}
+        for row in result.data:
+            if row["content_encoding"] == ZSTD_ENCODING and row["content_zstd"] is not None:
+                contents[UUID(row["id"])] = self.bodies.codec.decode(self.bodies.decode_stored(row["content_zstd"]))
+            elif row["content"] is not None:
+                contents[UUID(row["id"])] = row["content"]
+        return contents
+
+    def train_dictionary(
+        self,
+        source_id: UUID,
+        sample_size: int = 500,
+        dict_size: int = DEFAULT_DICT_SIZE,
+    ) -> int:
+        """Train a zstd dictionary from the source's most recent bodies.
+
+        Returns the dictionary id; pages written afterwards use it.
+        """
+        result = (
+            self.table.select("*")
+            .eq("source_id", str(source_id))
+            .not_.is_("content_hash", "null")
+            .eq("unchanged", False)
+            .order("crawled_at", desc=True)
+            .limit(sample_size)
+            .execute()
+        )
+        samples = [body for row in result.data if (body := self.bodies.to_page(row).body())]
+        if not samples:
+            raise ValueError(f"No stored pages to sample for source {source_id}")
+        return self.bodies.codec.train(source_id, samples, dict_size)
 
 
 class SupabaseParsedPageRepository:
@@ -63,6 +203,7 @@ class SupabaseParsedPageRepository:
         self.client = client
         self.table = client.table("parsed_pages")
         self.crawled_table = client.table("crawled_pages")
+        self.bodies = _PageBodies(partial(SupabaseDictionaryStore, client), compress=False, level=DEFAULT_LEVEL)
 
     def create(self, page: ParsedPageCreate) -> ParsedPage:
         data = page.model_dump(mode="json")
@@ -86,4 +227,4 @@ class SupabaseParsedPageRepository:
             "get_unparsed_pages",
             {"p_limit": limit},
         ).execute()
-        return [CrawledPage.model_validate(row) for row in result.data]
+        return [self.bodies.to_page(row) for row in result.data]
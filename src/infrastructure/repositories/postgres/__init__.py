@@ -0,0 +1,16 @@
+from .source import PostgresSourceRepository
+from .run import PostgresRunRepository
+from .page import PostgresCrawledPageRepository, PostgresParsedPageRepository
+from .queue import PostgresQueueRepository
+from .compression_dictionary import PostgresDictionaryStore
+from .robots_cache import PostgresRobotsStore
+
+__all__ = [
+    "PostgresSourceRepository",
+    "PostgresRunRepository",
+    "PostgresCrawledPageRepository",
+    "PostgresParsedPageRepository",
+    "PostgresQueueRepository",
+    "PostgresDictionaryStore",
+    "PostgresRobotsStore",
+]
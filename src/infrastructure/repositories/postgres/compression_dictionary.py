@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+
+class PostgresDictionaryStore:
+    """Trained zstd dictionaries, one or more per crawl source."""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def get_latest(self, source_id: UUID) -> bytes | None:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "select data from compression_dictionaries where source_id = %s order by created_at desc limit 1",
+                (source_id,),
+            ).fetchone()
+        return bytes(row["data"]) if row else None
+
+    def get(self, dict_id: int) -> bytes | None:
+        with self.pool.connection() as conn:
+            row = conn.execute("select data from compression_dictionaries where dict_id = %s", (dict_id,)).fetchone()
+        return bytes(row["data"]) if row else None
+
+    def save(self, source_id: UUID, dict_id: int, data: bytes, sample_count: int) -> None:
+        with self.pool.connection() as conn:
+            conn.execute(
+                "insert into compression_dictionaries (dict_id, source_id, data, sample_count) values (%s, %s, %s, %s)",
+                (dict_id, source_id, data, sample_count),
+            )
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+from functools import partial
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from src.domain.models import (
+    CrawledPage,
+    CrawledPageCreate,
+    PageHistory,
+    PageValidators,
+    ParsedPage,
+    ParsedPageCreate,
+)
+from src.infrastructure.compression import DEFAULT_DICT_SIZE, DEFAULT_LEVEL, ZSTD_ENCODING
+from src.infrastructure.db.postgres import insert_rows
+from src.infrastructure.repositories.page import _PageBodies
+from src.infrastructure.repositories.postgres.compression_dictionary import PostgresDictionaryStore
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+
+class PostgresCrawledPageRepository:
+    def __init__(self, pool: ConnectionPool, compress: bool = False, compression_level: int = DEFAULT_LEVEL):
+        self.pool = pool
+        self.bodies = _PageBodies(partial(PostgresDictionaryStore, pool), compress, compression_level, binary=True)
+
+    def create(self, page: CrawledPageCreate) -> CrawledPage:
+        return self.create_batch([page])[0]
+
+    def create_batch(self, pages: list[CrawledPageCreate]) -> list[CrawledPage]:
+        if not pages:
+            return []
+        with self.pool.connection() as conn:
+            rows = insert_rows(conn, "crawled_pages", [self.bodies.to_row(page) for page in pages])
+        return [self.bodies.to_page(row) for row in rows]
+
+    def get_by_id(self, id: UUID) -> CrawledPage | None:
+        with self.pool.connection() as conn:
+            row = conn.execute("select * from crawled_pages where id = %s", (id,)).fetchone()
+        return self.bodies.to_page(row) if row else None
+
+    def list_by_run(self, run_id: UUID) -> list[CrawledPage]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "select * from crawled_pages where run_id = %s order by crawled_at desc",
+                (run_id,),
+            ).fetchall()
+        return [self.bodies.to_page(row) for row in rows]
+
+    def get_latest_by_url(self, source_id: UUID, url_hash: str) -> CrawledPage | None:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                """
+                select * from crawled_pages
+                where source_id = %s and url_hash = %s
+                order by crawled_at desc
+                limit 1
+                """,
+                (source_id, url_hash),
+            ).fetchone()
+        return self.bodies.to_page(row) if row else None
+
+    def get_validators(self, source_id: UUID, url_hashes: list[str]) -> dict[str, PageValidators]:
+        if not url_hashes:
+            return {}
+        with self.pool.connection() as conn:
+            rows = conn.execute("select * from get_page_validators(%s, %s)", (source_id, url_hashes)).fetchall()
+        validators = [PageValidators.model_validate(row) for row in rows]
+        return {v.url_hash: v for v in validators}
+
+    def get_history(self, source_id: UUID) -> list[PageHistory]:
+        with self.pool.connection() as conn:
+            rows = conn.execute("select * from get_page_history(%s)", (source_id,)).fetchall()
+        return [PageHistory.model_validate(row) for row in rows]
+
+    def get_contents(self, ids: list[UUID]) -> dict[UUID, str]:
+        if not ids:
+            return {}
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "select id, content, content_zstd, content_encoding from crawled_pages where id = any(%s)",
+                (ids,),
+            ).fetchall()
+        contents = {}
+        for row in rows:
+            if row["content_encoding"] == ZSTD_ENCODING and row["content_zstd"] is not None:
+                contents[row["id"]] = self.bodies.codec.decode(self.bodies.decode_stored(row["content_zstd"]))
+            elif row["content"] is not None:
+                contents[row["id"]] = row["content"]
+        return contents
+
+    def train_dictionary(
+        self,
+        source_id: UUID,
+        sample_size: int = 500,
+        dict_size: int = DEFAULT_DICT_SIZE,
+    ) -> int:
+        """Train a zstd dictionary from the source's most recent bodies.
+
+        Returns the dictionary id; pages written afterwards use it.
+        """
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                """
+                select * from crawled_pages
+                where source_id = %s and content_hash is not null and not unchanged
+                order by crawled_at desc
+                limit %s
+                """,
+                (source_id, sample_size),
+            ).fetchall()
+        samples = [body for row in rows if (body := self.bodies.to_page(row).body())]
+        if not samples:
+            raise ValueError(f"No stored pages to sample for source {source_id}")
+        return self.bodies.codec.train(source_id, samples, dict_size)
+
+
+class PostgresParsedPageRepository:
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        self.bodies = _PageBodies(partial(PostgresDictionaryStore, pool), compress=False, level=DEFAULT_LEVEL, binary=True)
+
+    def _write(self, page: ParsedPageCreate, on_conflict: str = "") -> ParsedPage:
+        data = page.model_dump()
+        data["metadata"] = json.dumps(data["metadata"]) if data["metadata"] is not None else None
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                f"""
+                insert into parsed_pages (page_id, title, description, markdown, metadata, word_count, parser_version)
+                values (
+                    %(page_id)s, %(title)s, %(description)s, %(markdown)s,
+                    %(metadata)s::jsonb, %(word_count)s, %(parser_version)s
+                )
+                {on_conflict}
+                returning *
+                """,
+                data,
+            ).fetchone()
+        return ParsedPage.model_validate(row)
+
+    def create(self, page: ParsedPageCreate) -> ParsedPage:
+        return self._write(page)
+
+    def get_by_page_id(self, page_id: UUID) -> ParsedPage | None:
+        with self.pool.connection() as conn:
+            row = conn.execute("select * from parsed_pages where page_id = %s", (page_id,)).fetchone()
+        return ParsedPage.model_validate(row) if row else None
+
+    def upsert(self, page: ParsedPageCreate) -> ParsedPage:
+        return self._write(
+            page,
+            """
+            on conflict (page_id) do update set
+                title = excluded.title,
+                description = excluded.description,
+                markdown = excluded.markdown,
+                metadata = excluded.metadata,
+                word_count = excluded.word_count,
+                parser_version = excluded.parser_version,
+                parsed_at = now()
+            """,
+        )
+
+    def list_unparsed(self, limit: int = 100) -> list[CrawledPage]:
+        with self.pool.connection() as conn:
+            rows = conn.execute("select * from get_unparsed_pages(%s)", (limit,)).fetchall()
+        return [self.bodies.to_page(row) for row in rows]
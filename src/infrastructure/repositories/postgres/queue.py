@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from src.domain.models import QueueItem, QueueItemCreate
+from src.infrastructure.db.postgres import insert_rows
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+
+class PostgresQueueRepository:
+    """Queue on a direct connection; claims and acks call the same SQL functions as PostgREST."""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def _call(self, function: str, *args) -> int:
+        placeholders = ", ".join(["%s"] * len(args))
+        with self.pool.connection() as conn:
+            row = conn.execute(f"select {function}({placeholders}) as result", args).fetchone()
+        return row["result"] or 0
+
+    def add(self, item: QueueItemCreate) -> QueueItem:
+        with self.pool.connection() as conn:
+            (row,) = insert_rows(conn, "crawl_queue", [item.model_dump()])
+        return QueueItem.model_validate(row)
+
+    def add_batch(self, items: list[QueueItemCreate]) -> list[QueueItem]:
+        if not items:
+            return []
+        with self.pool.connection() as conn:
+            rows = insert_rows(
+                conn,
+                "crawl_queue",
+                [item.model_dump() for item in items],
+                on_conflict="on conflict (run_id, url_hash) do nothing",
+            )
+        return [QueueItem.model_validate(row) for row in rows]
+
+    def claim(self, run_id: UUID, worker_id: str, limit: int = 10) -> list[QueueItem]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "select * from claim_queue_items(%s, %s, %s)",
+                (run_id, worker_id, limit),
+            ).fetchall()
+        return [QueueItem.model_validate(row) for row in rows]
+
+    def complete(self, id: UUID) -> QueueItem:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "update crawl_queue set status = 'completed' where id = %s returning *",
+                (id,),
+            ).fetchone()
+        return QueueItem.model_validate(row)
+
+    def fail(self, id: UUID, error: str | None = None) -> QueueItem:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "update crawl_queue set status = 'failed', error = %s where id = %s returning *",
+                (error, id),
+            ).fetchone()
+        return QueueItem.model_validate(row)
+
+    def complete_many(self, ids: list[UUID]) -> int:
+        if not ids:
+            return 0
+        return self._call("ack_queue_items", ids, "completed", None)
+
+    def fail_many(self, failures: list[tuple[UUID, str | None]]) -> int:
+        if not failures:
+            return 0
+        ids = [id for id, _ in failures]
+        errors = [error for _, error in failures]
+        return self._call("ack_queue_items", ids, "failed", errors)
+
+    def reset_stale(self, timeout_minutes: int = 5) -> int:
+        return self._call("reset_stale_queue_items", timeout_minutes)
+
+    def heartbeat(self, run_id: UUID, worker_id: str) -> int:
+        return self._call("heartbeat_queue_items", run_id, worker_id)
+
+    def reprioritize(self, run_id: UUID, priorities: list[tuple[str, int]]) -> int:
+        if not priorities:
+            return 0
+        hashes = [h for h, _ in priorities]
+        values = [priority for _, priority in priorities]
+        return self._call("reprioritize_queue_items", run_id, hashes, values)
+
+    def get_pending_count(self, run_id: UUID) -> int:
+        return self._count(run_id, "pending")
+
+    def get_processing_count(self, run_id: UUID) -> int:
+        return self._count(run_id, "processing")
+
+    def _count(self, run_id: UUID, status: str) -> int:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "select count(*) as n from crawl_queue where run_id = %s and status = %s",
+                (run_id, status),
+            ).fetchone()
+        return row["n"]
+
+    def get_url_hashes(self, run_id: UUID) -> list[str]:
+        with self.pool.connection() as conn:
+            rows = conn.execute("select url_hash from crawl_queue where run_id = %s", (run_id,)).fetchall()
+        return [row["url_hash"] for row in rows]
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.domain.models import RobotsRecord
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+
+class PostgresRobotsStore:
+    """Fetched robots.txt files keyed by host, shared across runs and workers."""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def get(self, host: str) -> RobotsRecord | None:
+        with self.pool.connection() as conn:
+            row = conn.execute("select * from robots_cache where host = %s", (host,)).fetchone()
+        return RobotsRecord.model_validate(row) if row else None
+
+    def save(self, record: RobotsRecord) -> None:
+        with self.pool.connection() as conn:
+            conn.execute(
+                """
+                insert into robots_cache (host, status_code, body, fetched_at, expires_at)
+                values (%(host)s, %(status_code)s, %(body)s, %(fetched_at)s, %(expires_at)s)
+                on conflict (host) do update set
+                    status_code = excluded.status_code,
+                    body = excluded.body,
+                    fetched_at = excluded.fetched_at,
+                    expires_at = excluded.expires_at
+                """,
+                record.model_dump(),
+            )
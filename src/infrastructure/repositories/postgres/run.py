@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from src.domain.models import CrawlRun, CrawlRunCreate, RunStatsDelta, RunStatus
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+
+class PostgresRunRepository:
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def _update(self, id: UUID, assignments: str, params: tuple = ()) -> CrawlRun:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                f"update crawl_runs set {assignments} where id = %s returning *",
+                (*params, id),
+            ).fetchone()
+        return CrawlRun.model_validate(row)
+
+    def create(self, run: CrawlRunCreate) -> CrawlRun:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "insert into crawl_runs (source_id, mode) values (%s, %s) returning *",
+                (run.source_id, run.mode),
+            ).fetchone()
+        return CrawlRun.model_validate(row)
+
+    def get_by_id(self, id: UUID) -> CrawlRun | None:
+        with self.pool.connection() as conn:
+            row = conn.execute("select * from crawl_runs where id = %s", (id,)).fetchone()
+        return CrawlRun.model_validate(row) if row else None
+
+    def list_by_source(self, source_id: UUID) -> list[CrawlRun]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "select * from crawl_runs where source_id = %s order by created_at desc",
+                (source_id,),
+            ).fetchall()
+        return [CrawlRun.model_validate(row) for row in rows]
+
+    def update_status(self, id: UUID, status: RunStatus) -> CrawlRun:
+        return self._update(id, "status = %s", (status,))
+
+    def update_stats(
+        self,
+        id: UUID,
+        pages_found: int,
+        pages_crawled: int,
+        pages_failed: int,
+    ) -> CrawlRun:
+        return self._update(
+            id,
+            "pages_found = %s, pages_crawled = %s, pages_failed = %s",
+            (pages_found, pages_crawled, pages_failed),
+        )
+
+    def increment_stats(self, id: UUID, delta: RunStatsDelta) -> CrawlRun:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "select * from increment_run_stats(%s, %s, %s, %s, %s, %s, %s, %s::jsonb)",
+                (
+                    id,
+                    delta.pages_found,
+                    delta.pages_crawled,
+                    delta.pages_failed,
+                    delta.bytes_downloaded,
+                    delta.links_discovered,
+                    delta.links_deduped,
+                    json.dumps(delta.status_codes),
+                ),
+            ).fetchone()
+        return CrawlRun.model_validate(row)
+
+    def mark_started(self, id: UUID) -> CrawlRun:
+        return self._update(id, "status = 'running', started_at = now()")
+
+    def mark_completed(self, id: UUID, error: str | None = None) -> CrawlRun:
+        status = "failed" if error else "completed"
+        return self._update(id, "status = %s, completed_at = now(), error = %s", (status, error))
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+from uuid import UUID
+
+from src.domain.models import CrawlSource, CrawlSourceCreate, SourceStatus
+
+if TYPE_CHECKING:
+    from psycopg_pool import ConnectionPool
+
+
+class PostgresSourceRepository:
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def create(self, source: CrawlSourceCreate) -> CrawlSource:
+        data = source.model_dump(mode="json")
+        data["domain"] = urlparse(str(source.entry_url)).netloc
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                """
+                insert into crawl_sources (domain, entry_url, type, frequency, max_pages)
+                values (%(domain)s, %(entry_url)s, %(type)s, %(frequency)s, %(max_pages)s)
+                returning *
+                """,
+                data,
+            ).fetchone()
+        return CrawlSource.model_validate(row)
+
+    def get_by_id(self, id: UUID) -> CrawlSource | None:
+        with self.pool.connection() as conn:
+            row = conn.execute("select * from crawl_sources where id = %s", (id,)).fetchone()
+        return CrawlSource.model_validate(row) if row else None
+
+    def list(self, status: SourceStatus | None = None) -> list[CrawlSource]:
+        with self.pool.connection() as conn:
+            if status:
+                rows = conn.execute("select * from crawl_sources where status = %s", (status,)).fetchall()
+            else:
+                rows = conn.execute("select * from crawl_sources").fetchall()
+        return [CrawlSource.model_validate(row) for row in rows]
+
+    def update_status(self, id: UUID, status: SourceStatus) -> CrawlSource:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "update crawl_sources set status = %s where id = %s returning *",
+                (status, id),
+            ).fetchone()
+        return CrawlSource.model_validate(row)
+
+    def update_next_run(self, id: UUID, next_run_at: datetime | None) -> CrawlSource:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "update crawl_sources set next_run_at = %s where id = %s returning *",
+                (next_run_at, id),
+            ).fetchone()
+        return CrawlSource.model_validate(row)
+
+    def delete(self, id: UUID) -> None:
+        with self.pool.connection() as conn:
+            conn.execute("delete from crawl_sources where id = %s", (id,))
+
+    def get_due_sources(self) -> list[CrawlSource]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "select * from crawl_sources where status = 'active' and next_run_at <= now()"
+            ).fetchall()
+        return [CrawlSource.model_validate(row) for row in rows]
@@ -47,12 +47,36 @@ class SupabaseQueueRepository:
 
     def fail(self, id: UUID, error: str | None = None) -> QueueItem:
         result = (
-            self.table.update({"status": "failed"})
+            self.table.update({"status": "failed", "error": error})
             .eq("id", str(id))
             .execute()
         )
         return QueueItem.model_validate(result.data[0])
 
+    def complete_many(self, ids: list[UUID]) -> int:
+        if not ids:
+            return 0
+        return self._ack(ids, "completed")
+
+    def fail_many(self, failures: list[tuple[UUID, str | None]]) -> int:
+        if not failures:
+            return 0
+        ids = [id for id, _ in failures]
+        errors = [error for _, error in failures]
+        return self._ack(ids, "failed", errors)
+
+    def _ack(self, ids: list[UUID], status: str, errors: list[str | None] | None = None) -> int:
+        # One statement for the whole batch instead of an UPDATE per item
+        result = self.client.rpc(
+            "ack_queue_items",
+            {
+                "p_ids": [str(id) for id in ids],
+                "p_status": status,
+                "p_errors": errors,
+            },
+        ).execute()
+        return result.data or 0
+
     def reset_stale(self, timeout_minutes: int = 5) -> int:
         result = self.client.rpc(
             "reset_stale_queue_items",
@@ -60,11 +84,53 @@ class SupabaseQueueRepository:
         ).execute()
         return result.data or 0
 
+    def heartbeat(self, run_id: UUID, worker_id: str) -> int:
+        result = self.client.rpc(
+            "heartbeat_queue_items",
+            {"p_run_id": str(run_id), "p_worker_id": worker_id},
+        ).execute()
+        return result.data or 0
+
+    def reprioritize(self, run_id: UUID, priorities: list[tuple[str, int]]) -> int:
+        if not priorities:
+            return 0
+        result = self.client.rpc(
+            "reprioritize_queue_items",
+            {
+                "p_run_id": str(run_id),
+                "p_url_hashes": [h for h, _ in priorities],
+                "p_priorities": [priority for _, priority in priorities],
+            },
+        ).execute()
+        return result.data or 0
+
     def get_pending_count(self, run_id: UUID) -> int:
+        return self._count(run_id, "pending")
+
+    def get_processing_count(self, run_id: UUID) -> int:
+        return self._count(run_id, "processing")
+
+    def _count(self, run_id: UUID, status: str) -> int:
         result = (
-            self.table.select("id", count="exact")
+            self.table.select("id", count="exact", head=True)
             .eq("run_id", str(run_id))
-            .eq("status", "pending")
+            .eq("status", status)
             .execute()
         )
         return result.count or 0
+
+    def get_url_hashes(self, run_id: UUID) -> list[str]:
+        hashes: list[str] = []
+        # Page through the run so PostgREST's max-rows cap can't truncate it
+        page_size = 1000
+        while True:
+            result = (
+                self.table.select("url_hash")
+                .eq("run_id", str(run_id))
+                .order("id")
+                .range(len(hashes), len(hashes) + page_size - 1)
+                .execute()
+            )
+            hashes.extend(row["url_hash"] for row in result.data)
+            if len(result.data) < page_size:
+                return hashes
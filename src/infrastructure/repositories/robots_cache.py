@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from supabase import Client
+
+from src.domain.models import RobotsRecord
+
+
+class SupabaseRobotsStore:
+    """Fetched robots.txt files keyed by host, shared across runs and workers."""
+
+    def __init__(self, client: Client):
+        self.client = client
+        self.table = client.table("robots_cache")
+
+    def get(self, host: str) -> RobotsRecord | None:
+        result = self.table.select("*").eq("host", host).execute()
+        if not result.data:
+            return None
+        return RobotsRecord.model_validate(result.data[0])
+
+    def save(self, record: RobotsRecord) -> None:
+        self.table.upsert(record.model_dump(mode="json"), on_conflict="host").execute()
@@ -5,7 +5,7 @@ from uuid import UUID
 
 from supabase import Client
 
-from src.domain.models import CrawlRun, CrawlRunCreate, RunStatus
+from src.domain.models import CrawlRun, CrawlRunCreate, RunStatsDelta, RunStatus
 
 
 class SupabaseRunRepository:
@@ -55,6 +55,12 @@ class SupabaseRunRepository:
         )
         return CrawlRun.model_validate(result.data[0])
 
+    def increment_stats(self, id: UUID, delta: RunStatsDelta) -> CrawlRun:
+        # Server-side increment: concurrent workers' deltas never overwrite each other
+        params = {f"p_{key}": value for key, value in delta.model_dump(mode="json").items()}
+        result = self.client.rpc("increment_run_stats", {"p_run_id": str(id), **params}).execute()
+        return CrawlRun.model_validate(result.data[0])
+
     def mark_started(self, id: UUID) -> CrawlRun:
         result = (
             self.table.update({
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from urllib.parse import urlparse
 from uuid import UUID
 
@@ -37,9 +37,9 @@ class SupabaseSourceRepository:
         result = self.table.update({"status": status}).eq("id", str(id)).execute()
         return CrawlSource.model_validate(result.data[0])
 
-    def update_next_run(self, id: UUID, next_run_at: datetime) -> CrawlSource:
+    def update_next_run(self, id: UUID, next_run_at: datetime | None) -> CrawlSource:
         result = (
-            self.table.update({"next_run_at": next_run_at.isoformat()})
+            self.table.update({"next_run_at": next_run_at.isoformat() if next_run_at else None})
             .eq("id", str(id))
             .execute()
         )
@@ -52,7 +52,7 @@ class SupabaseSourceRepository:
         result = (
             self.table.select("*")
             .eq("status", "active")
-            .lte("next_run_at", datetime.now().isoformat())
+            .lte("next_run_at", datetime.now(timezone.utc).isoformat())
             .execute()
         )
         return [CrawlSource.model_validate(row) for row in result.data]
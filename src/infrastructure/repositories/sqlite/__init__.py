@@ -0,0 +1,16 @@
+from .source import SqliteSourceRepository
+from .run import SqliteRunRepository
+from .page import SqliteCrawledPageRepository, SqliteParsedPageRepository
+from .queue import SqliteQueueRepository
+from .compression_dictionary import SqliteDictionaryStore
+from .robots_cache import SqliteRobotsStore
+
+__all__ = [
+    "SqliteSourceRepository",
+    "SqliteRunRepository",
+    "SqliteCrawledPageRepository",
+    "SqliteParsedPageRepository",
+    "SqliteQueueRepository",
+    "SqliteDictionaryStore",
+    "SqliteRobotsStore",
+]
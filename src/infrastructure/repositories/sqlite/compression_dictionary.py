@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from src.infrastructure.db.sqlite import SqliteDatabase, insert_row, timestamp
+
+
+class SqliteDictionaryStore:
+    """Trained zstd dictionaries, one or more per crawl source."""
+
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def get_latest(self, source_id: UUID) -> bytes | None:
+        row = self.db.read().execute(
+            "select data from compression_dictionaries where source_id = ? order by created_at desc limit 1",
+            (str(source_id),),
+        ).fetchone()
+        return row["data"] if row else None
+
+    def get(self, dict_id: int) -> bytes | None:
+        row = self.db.read().execute("select data from compression_dictionaries where dict_id = ?", (dict_id,)).fetchone()
+        return row["data"] if row else None
+
+    def save(self, source_id: UUID, dict_id: int, data: bytes, sample_count: int) -> None:
+        with self.db.transaction() as conn:
+            insert_row(
+                conn,
+                "compression_dictionaries",
+                {
+                    "dict_id": dict_id,
+                    "source_id": source_id,
+                    "data": data,
+                    "sample_count": sample_count,
+                    "created_at": timestamp(),
+                },
+            )
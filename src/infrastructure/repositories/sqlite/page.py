@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+from functools import partial
+from uuid import UUID, uuid4
+
+from src.domain.models import (
+    CrawledPage,
+    CrawledPageCreate,
+    PageHistory,
+    PageValidators,
+    ParsedPage,
+    ParsedPageCreate,
+)
+from src.infrastructure.compression import DEFAULT_DICT_SIZE, DEFAULT_LEVEL, ZSTD_ENCODING
+from src.infrastructure.db.sqlite import SqliteDatabase, insert_row, timestamp
+from src.infrastructure.repositories.page import _PageBodies
+from src.infrastructure.repositories.sqlite.compression_dictionary import SqliteDictionaryStore
+
+
+def _ids(values) -> str:
+    """JSON array parameter for `in (select value from json_each(?))`, free of SQLite's variable limit."""
+    return json.dumps([str(value) for value in values])
+
+
+class SqliteCrawledPageRepository:
+    def __init__(self, db: SqliteDatabase, compress: bool = False, compression_level: int = DEFAULT_LEVEL):
+        self.db = db
+        self.bodies = _PageBodies(partial(SqliteDictionaryStore, db), compress, compression_level, binary=True)
+
+    def create(self, page: CrawledPageCreate) -> CrawledPage:
+        return self.create_batch([page])[0]
+
+    def create_batch(self, pages: list[CrawledPageCreate]) -> list[CrawledPage]:
+        if not pages:
+            return []
+        crawled_at = timestamp()
+        with self.db.transaction() as conn:
+            rows = [
+                insert_row(conn, "crawled_pages", {"id": uuid4(), **self.bodies.to_row(page), "crawled_at": crawled_at})
+                for page in pages
+            ]
+        return [self.bodies.to_page(row) for row in rows]
+
+    def get_by_id(self, id: UUID) -> CrawledPage | None:
+        row = self.db.read().execute("select * from crawled_pages where id = ?", (str(id),)).fetchone()
+        return self.bodies.to_page(row) if row else None
+
+    def list_by_run(self, run_id: UUID) -> list[CrawledPage]:
+        rows = self.db.read().execute(
+            "select * from crawled_pages where run_id = ? order by crawled_at desc",
+            (str(run_id),),
+        ).fetchall()
+        return [self.bodies.to_page(row) for row in rows]
+
+    def get_latest_by_url(self, source_id: UUID, url_hash: str) -> CrawledPage | None:
+        row = self.db.read().execute(
+            """
+            select * from crawled_pages
+            where source_id = ? and url_hash = ?
+            order by crawled_at desc
+            limit 1
+            """,
+            (str(source_id), url_hash),
+        ).fetchone()
+        return self.bodies.to_page(row) if row else None
+
+    def get_validators(self, source_id: UUID, url_hashes: list[str]) -> dict[str, PageValidators]:
+        if not url_hashes:
+            return {}
+        # Same selection as the get_page_validators SQL function
+        rows = self.db.read().execute(
+            """
+            select page_id, url_hash, content_hash, etag, last_modified, max_age, crawled_at
+            from (
+                select
+                    id as page_id, url_hash, content_hash, etag, last_modified, max_age, crawled_at,
+                    row_number() over (partition by url_hash order by crawled_at desc) as latest
+                from crawled_pages
+                where url_hash in (select value from json_each(?))
+                    and source_id = ?
+                    and content_hash is not null
+                    and not unchanged
+                    and (etag is not null or last_modified is not null or max_age is not null)
+            )
+            where latest = 1
+            """,
+            (json.dumps(url_hashes), str(source_id)),
+        ).fetchall()
+        validators = [PageValidators.model_validate(row) for row in rows]
+        return {v.url_hash: v for v in validators}
+
+    def get_history(self, source_id: UUID) -> list[PageHistory]:
+        # Same selection as the get_page_history SQL function
+        rows = self.db.read().execute(
+            """
+            select
+                url_hash,
+                max(case when latest = 1 then url end) as url,
+                max(case when latest = 1 then content_hash end) as content_hash,
+                min(crawled_at) as first_crawled_at,
+                max(crawled_at) as verified_at,
+                count(case when previous_hash <> content_hash then 1 end) as changes
+            from (
+                select
+                    url_hash, url, content_hash, crawled_at,
+                    lag(content_hash) over (partition by url_hash order by crawled_at) as previous_hash,
+                    row_number() over (partition by url_hash order by crawled_at desc) as latest
+                from crawled_pages
+                where source_id = ?
+                    and content_hash is not null
+                    and skip_reason is not 'carried_forward'
+            )
+            group by url_hash
+            order by url_hash
+            """,
+            (str(source_id),),
+        ).fetchall()
+        return [PageHistory.model_validate(row) for row in rows]
+
+    def get_contents(self, ids: list[UUID]) -> dict[UUID, str]:
+        if not ids:
+            return {}
+        rows = self.db.read().execute(
+            """
+            select id, content, content_zstd, content_encoding from crawled_pages
+            where id in (select value from json_each(?))
+            """,
+            (_ids(ids),),
+        ).fetchall()
+        contents = {}
+        for row in rows:
+            if row["content_encoding"] == ZSTD_ENCODING and row["content_zstd"] is not None:
+                contents[UUID(row["id"])] = self.bodies.codec.decode(self.bodies.decode_stored(row["content_zstd"]))
+            elif row["content"] is not None:
+                contents[UUID(row["id"])] = row["content"]
+        return contents
+
+    def train_dictionary(
+        self,
+        source_id: UUID,
+        sample_size: int = 500,
+        dict_size: int = DEFAULT_DICT_SIZE,
+    ) -> int:
+        """Train a zstd dictionary from the source's most recent bodies.
+
+        Returns the dictionary id; pages written afterwards use it.
+        """
+        rows = self.db.read().execute(
+            """
+            select * from crawled_pages
+            where source_id = ? and content_hash is not null and not unchanged
+            order by crawled_at desc
+            limit ?
+            """,
+            (str(source_id), sample_size),
+        ).fetchall()
+        samples = [body for row in rows if (body := self.bodies.to_page(row).body())]
+        if not samples:
+            raise ValueError(f"No stored pages to sample for source {source_id}")
+        return self.bodies.codec.train(source_id, samples, dict_size)
+
+
+class SqliteParsedPageRepository:
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+        self.bodies = _PageBodies(partial(SqliteDictionaryStore, db), compress=False, level=DEFAULT_LEVEL, binary=True)
+
+    def _write(self, page: ParsedPageCreate, on_conflict: str = "") -> ParsedPage:
+        data = page.model_dump()
+        data["metadata"] = json.dumps(data["metadata"]) if data["metadata"] is not None else None
+        with self.db.transaction() as conn:
+            row = insert_row(conn, "parsed_pages", {"id": uuid4(), **data, "parsed_at": timestamp()}, on_conflict)
+        return self._to_parsed(row)
+
+    def _to_parsed(self, row: dict) -> ParsedPage:
+        if row["metadata"] is not None:
+            row["metadata"] = json.loads(row["metadata"])
+        return ParsedPage.model_validate(row)
+
+    def create(self, page: ParsedPageCreate) -> ParsedPage:
+        return self._write(page)
+
+    def get_by_page_id(self, page_id: UUID) -> ParsedPage | None:
+        row = self.db.read().execute("select * from parsed_pages where page_id = ?", (str(page_id),)).fetchone()
+        return self._to_parsed(row) if row else None
+
+    def upsert(self, page: ParsedPageCreate) -> ParsedPage:
+        return self._write(
+            page,
+            """
+            on conflict (page_id) do update set
+                title = excluded.title,
+                description = excluded.description,
+                markdown = excluded.markdown,
+                metadata = excluded.metadata,
+                word_count = excluded.word_count,
+                parser_version = excluded.parser_version,
+                parsed_at = excluded.parsed_at
+            """,
+        )
+
+    def list_unparsed(self, limit: int = 100) -> list[CrawledPage]:
+        rows = self.db.read().execute(
+            """
+            select cp.*
+            from crawled_pages cp
+            left join parsed_pages pp on pp.page_id = cp.id
+            where pp.id is null and cp.content_hash is not null and not cp.unchanged
+            order by cp.crawled_at desc
+            limit ?
+            """,
+            (limit,),
+        ).fetchall()
+        return [self.bodies.to_page(row) for row in rows]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from src.domain.models import QueueItem, QueueItemCreate
+from src.infrastructure.db.sqlite import SqliteDatabase, insert_row, timestamp
+
+
+class SqliteQueueRepository:
+    """Queue in the local database with the claim semantics of `claim_queue_items`."""
+
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def add(self, item: QueueItemCreate) -> QueueItem:
+        with self.db.transaction() as conn:
+            row = insert_row(conn, "crawl_queue", self._row(item))
+        return QueueItem.model_validate(row)
+
+    def add_batch(self, items: list[QueueItemCreate]) -> list[QueueItem]:
+        if not items:
+            return []
+        added = []
+        # One transaction for the batch; duplicates of a queued URL are skipped
+        with self.db.transaction() as conn:
+            for item in items:
+                row = insert_row(conn, "crawl_queue", self._row(item), "on conflict (run_id, url_hash) do nothing")
+                if row is not None:
+                    added.append(QueueItem.model_validate(row))
+        return added
+
+    def _row(self, item: QueueItemCreate) -> dict:
+        return {"id": uuid4(), **item.model_dump(), "created_at": timestamp()}
+
+    def claim(self, run_id: UUID, worker_id: str, limit: int = 10) -> list[QueueItem]:
+        # A single UPDATE holds the write lock throughout, so two workers can
+        # never claim the same item (SKIP LOCKED is implicit: writers queue)
+        with self.db.transaction() as conn:
+            rows = conn.execute(
+                """
+                update crawl_queue
+                set status = 'processing', worker_id = ?, claimed_at = ?, attempts = attempts + 1
+                where id in (
+                    select id from crawl_queue
+                    where run_id = ? and status = 'pending'
+                    order by priority desc, created_at
+                    limit ?
+                )
+                returning *
+                """,
+                (worker_id, timestamp(), str(run_id), limit),
+            ).fetchall()
+        items = [QueueItem.model_validate(row) for row in rows]
+        items.sort(key=lambda q: (-q.priority, q.created_at))
+        return items
+
+    def _set_status(self, id: UUID, status: str, error: str | None = None) -> QueueItem:
+        with self.db.transaction() as conn:
+            row = conn.execute(
+                "update crawl_queue set status = ?, error = ? where id = ? returning *",
+                (status, error, str(id)),
+            ).fetchone()
+        return QueueItem.model_validate(row)
+
+    def complete(self, id: UUID) -> QueueItem:
+        return self._set_status(id, "completed")
+
+    def fail(self, id: UUID, error: str | None = None) -> QueueItem:
+        return self._set_status(id, "failed", error)
+
+    def complete_many(self, ids: list[UUID]) -> int:
+        if not ids:
+            return 0
+        return self._ack([(id, None) for id in ids], "completed")
+
+    def fail_many(self, failures: list[tuple[UUID, str | None]]) -> int:
+        if not failures:
+            return 0
+        return self._ack(failures, "failed")
+
+    def _ack(self, acks: list[tuple[UUID, str | None]], status: str) -> int:
+        with self.db.transaction() as conn:
+            cursor = conn.executemany(
+                "update crawl_queue set status = ?, error = ? where id = ?",
+                [(status, error, str(id)) for id, error in acks],
+            )
+        return cursor.rowcount
+
+    def reset_stale(self, timeout_minutes: int = 5) -> int:
+        cutoff = timestamp(datetime.now(timezone.utc) - timedelta(minutes=timeout_minutes))
+        with self.db.transaction() as conn:
+            reset = conn.execute(
+                """
+                update crawl_queue set status = 'pending', worker_id = null, claimed_at = null
+                where status = 'processing' and claimed_at < ? and attempts < max_attempts
+                """,
+                (cutoff,),
+            ).rowcount
+            exhausted = conn.execute(
+                """
+                update crawl_queue set status = 'failed', error = 'Worker stopped responding'
+                where status = 'processing' and claimed_at < ? and attempts >= max_attempts
+                """,
+                (cutoff,),
+            ).rowcount
+        return reset + exhausted
+
+    def heartbeat(self, run_id: UUID, worker_id: str) -> int:
+        with self.db.transaction() as conn:
+            return conn.execute(
+                "update crawl_queue set claimed_at = ? where run_id = ? and worker_id = ? and status = 'processing'",
+                (timestamp(), str(run_id), worker_id),
+            ).rowcount
+
+    def reprioritize(self, run_id: UUID, priorities: list[tuple[str, int]]) -> int:
+        if not priorities:
+            return 0
+        # Only raises, like reprioritize_queue_items
+        with self.db.transaction() as conn:
+            cursor = conn.executemany(
+                "update crawl_queue set priority = ? "
+                "where run_id = ? and url_hash = ? and status = 'pending' and priority < ?",
+                [(priority, str(run_id), h, priority) for h, priority in priorities],
+            )
+        return cursor.rowcount
+
+    def get_pending_count(self, run_id: UUID) -> int:
+        return self._count(run_id, "pending")
+
+    def get_processing_count(self, run_id: UUID) -> int:
+        return self._count(run_id, "processing")
+
+    def _count(self, run_id: UUID, status: str) -> int:
+        row = self.db.read().execute(
+            "select count(*) as n from crawl_queue where run_id = ? and status = ?",
+            (str(run_id), status),
+        ).fetchone()
+        return row["n"]
+
+    def get_url_hashes(self, run_id: UUID) -> list[str]:
+        rows = self.db.read().execute("select url_hash from crawl_queue where run_id = ?", (str(run_id),)).fetchall()
+        return [row["url_hash"] for row in rows]
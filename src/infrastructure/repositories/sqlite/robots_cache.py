@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from src.domain.models import RobotsRecord
+from src.infrastructure.db.sqlite import SqliteDatabase, insert_row
+
+
+class SqliteRobotsStore:
+    """Fetched robots.txt files keyed by host, shared across runs."""
+
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def get(self, host: str) -> RobotsRecord | None:
+        row = self.db.read().execute("select * from robots_cache where host = ?", (host,)).fetchone()
+        return RobotsRecord.model_validate(row) if row else None
+
+    def save(self, record: RobotsRecord) -> None:
+        with self.db.transaction() as conn:
+            insert_row(
+                conn,
+                "robots_cache",
+                record.model_dump(),
+                """
+                on conflict (host) do update set
+                    status_code = excluded.status_code,
+                    body = excluded.body,
+                    fetched_at = excluded.fetched_at,
+                    expires_at = excluded.expires_at
+                """,
+            )
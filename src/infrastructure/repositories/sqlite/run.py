@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+from uuid import UUID, uuid4
+
+from src.domain.models import CrawlRun, CrawlRunCreate, RunStatsDelta, RunStatus
+from src.infrastructure.db.sqlite import SqliteDatabase, insert_row, timestamp
+
+
+def _run(row: dict[str, Any]) -> CrawlRun:
+    return CrawlRun.model_validate({**row, "status_codes": json.loads(row["status_codes"])})
+
+
+class SqliteRunRepository:
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def _update(self, id: UUID, **fields) -> CrawlRun:
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self.db.transaction() as conn:
+            row = conn.execute(
+                f"update crawl_runs set {assignments} where id = ? returning *",
+                (*fields.values(), str(id)),
+            ).fetchone()
+        return _run(row)
+
+    def create(self, run: CrawlRunCreate) -> CrawlRun:
+        with self.db.transaction() as conn:
+            row = insert_row(
+                conn,
+                "crawl_runs",
+                {"id": uuid4(), "source_id": run.source_id, "mode": run.mode, "created_at": timestamp()},
+            )
+        return _run(row)
+
+    def get_by_id(self, id: UUID) -> CrawlRun | None:
+        row = self.db.read().execute("select * from crawl_runs where id = ?", (str(id),)).fetchone()
+        return _run(row) if row else None
+
+    def list_by_source(self, source_id: UUID) -> list[CrawlRun]:
+        rows = self.db.read().execute(
+            "select * from crawl_runs where source_id = ? order by created_at desc",
+            (str(source_id),),
+        ).fetchall()
+        return [_run(row) for row in rows]
+
+    def update_status(self, id: UUID, status: RunStatus) -> CrawlRun:
+        return self._update(id, status=status)
+
+    def update_stats(
+        self,
+        id: UUID,
+        pages_found: int,
+        pages_crawled: int,
+        pages_failed: int,
+    ) -> CrawlRun:
+        return self._update(id, pages_found=pages_found, pages_crawled=pages_crawled, pages_failed=pages_failed)
+
+    def increment_stats(self, id: UUID, delta: RunStatsDelta) -> CrawlRun:
+        # BEGIN IMMEDIATE serialises writers, so the read-merge-write of the
+        # status codes cannot interleave with another worker's
+        with self.db.transaction() as conn:
+            current = conn.execute("select status_codes from crawl_runs where id = ?", (str(id),)).fetchone()
+            codes = {int(code): count for code, count in json.loads(current["status_codes"]).items()}
+            for code, count in delta.status_codes.items():
+                codes[code] = codes.get(code, 0) + count
+            row = conn.execute(
+                """
+                update crawl_runs set
+                    pages_found = pages_found + ?,
+                    pages_crawled = pages_crawled + ?,
+                    pages_failed = pages_failed + ?,
+                    bytes_downloaded = bytes_downloaded + ?,
+                    links_discovered = links_discovered + ?,
+                    links_deduped = links_deduped + ?,
+                    status_codes = ?
+                where id = ?
+                returning *
+                """,
+                (
+                    delta.pages_found,
+                    delta.pages_crawled,
+                    delta.pages_failed,
+                    delta.bytes_downloaded,
+                    delta.links_discovered,
+                    delta.links_deduped,
+                    json.dumps(codes),
+                    str(id),
+                ),
+            ).fetchone()
+        return _run(row)
+
+    def mark_started(self, id: UUID) -> CrawlRun:
+        return self._update(id, status="running", started_at=timestamp())
+
+    def mark_completed(self, id: UUID, error: str | None = None) -> CrawlRun:
+        status = "failed" if error else "completed"
+        return self._update(id, status=status, completed_at=timestamp(), error=error)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from datetime import datetime
+from urllib.parse import urlparse
+from uuid import UUID, uuid4
+
+from src.domain.models import CrawlSource, CrawlSourceCreate, SourceStatus
+from src.infrastructure.db.sqlite import SqliteDatabase, insert_row, timestamp, to_db
+
+
+class SqliteSourceRepository:
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def create(self, source: CrawlSourceCreate) -> CrawlSource:
+        data = source.model_dump(mode="json")
+        data["domain"] = urlparse(str(source.entry_url)).netloc
+        with self.db.transaction() as conn:
+            row = insert_row(conn, "crawl_sources", {"id": uuid4(), **data, "created_at": timestamp()})
+        return CrawlSource.model_validate(row)
+
+    def get_by_id(self, id: UUID) -> CrawlSource | None:
+        row = self.db.read().execute("select * from crawl_sources where id = ?", (str(id),)).fetchone()
+        return CrawlSource.model_validate(row) if row else None
+
+    def list(self, status: SourceStatus | None = None) -> list[CrawlSource]:
+        if status:
+            rows = self.db.read().execute("select * from crawl_sources where status = ?", (status,)).fetchall()
+        else:
+            rows = self.db.read().execute("select * from crawl_sources").fetchall()
+        return [CrawlSource.model_validate(row) for row in rows]
+
+    def _update(self, id: UUID, column: str, value) -> CrawlSource:
+        with self.db.transaction() as conn:
+            row = conn.execute(
+                f"update crawl_sources set {column} = ? where id = ? returning *",
+                (to_db(value), str(id)),
+            ).fetchone()
+        return CrawlSource.model_validate(row)
+
+    def update_status(self, id: UUID, status: SourceStatus) -> CrawlSource:
+        return self._update(id, "status", status)
+
+    def update_next_run(self, id: UUID, next_run_at: datetime | None) -> CrawlSource:
+        return self._update(id, "next_run_at", next_run_at)
+
+    def delete(self, id: UUID) -> None:
+        with self.db.transaction() as conn:
+            conn.execute("delete from crawl_sources where id = ?", (str(id),))
+
+    def get_due_sources(self) -> list[CrawlSource]:
+        rows = self.db.read().execute(
+            "select * from crawl_sources where status = 'active' and next_run_at <= ?",
+            (timestamp(),),
+        ).fetchall()
+        return [CrawlSource.model_validate(row) for row in rows]
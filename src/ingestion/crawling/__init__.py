@@ -1,6 +1,39 @@
+from .fetch import FetchResult
 from .http_client import HttpClient
-from .robots import RobotsHandler, SitemapParser
+from .async_http_client import AsyncHttpClient
+from .robots import RobotsCache, RobotsHandler, RobotsRules
+from .sitemap import SitemapEntry, SitemapParser
 from .link_extractor import extract_links
-from .rate_limiter import DomainRateLimiter
+from .page_analysis import PageAnalysis, analyze_page, create_analysis_pool
+from .budget import FetchBudget
+from .rate_limiter import AsyncDomainRateLimiter, DomainRateLimiter
+from .seen_set import SeenSetStats, UrlSeenSet
+from .frontier import FrontierPriorities
+from .metrics import CrawlMetrics
+from .profiler import SamplingProfiler
+from .simhash import NearDuplicateIndex, simhash
 
-__all__ = ["HttpClient", "RobotsHandler", "SitemapParser", "extract_links", "DomainRateLimiter"]
+__all__ = [
+    "FetchResult",
+    "HttpClient",
+    "AsyncHttpClient",
+    "RobotsHandler",
+    "RobotsCache",
+    "RobotsRules",
+    "SitemapParser",
+    "SitemapEntry",
+    "extract_links",
+    "PageAnalysis",
+    "analyze_page",
+    "create_analysis_pool",
+    "DomainRateLimiter",
+    "AsyncDomainRateLimiter",
+    "FetchBudget",
+    "UrlSeenSet",
+    "SeenSetStats",
+    "FrontierPriorities",
+    "CrawlMetrics",
+    "SamplingProfiler",
+    "NearDuplicateIndex",
+    "simhash",
+]
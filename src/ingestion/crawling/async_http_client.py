@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+
+import httpx
+
+from src.domain.models import PageValidators
+from src.ingestion.crawling.fetch import (
+    DEFAULT_DEADLINE,
+    DEFAULT_MAX_BYTES,
+    HTML_CONTENT_TYPES,
+    SKIP_CONTENT_TYPE,
+    SKIP_DEADLINE,
+    SKIP_TOO_LARGE,
+    FetchResult,
+    accepts_content_type,
+    conditional_headers,
+    declared_too_large,
+)
+from src.ingestion.crawling.http_client import USER_AGENTS
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHttpClient:
+    """Asyncio counterpart of `HttpClient` with the same `download` contract.
+
+    The underlying `httpx.AsyncClient` is created lazily on first use so it is
+    bound to the event loop that actually runs the crawl, and is recreated if a
+    later run uses a new loop after `aclose()`.
+    """
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        max_connections: int = 100,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        deadline: float = DEFAULT_DEADLINE,
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    def _random_user_agent(self) -> str:
+        return random.choice(USER_AGENTS)
+
+    async def get(self, url: str, headers: dict[str, str] | None = None) -> httpx.Response:
+        return await self.client.get(
+            url,
+            headers={"User-Agent": self._random_user_agent(), **(headers or {})},
+        )
+
+    async def download(self, url: str) -> tuple[str | None, int | None, str | None]:
+        fetched = await self._stream(url, {}, allowed_types=None)
+        error = fetched.error
+        if fetched.skip_reason is not None:
+            error = f"Skipped: {fetched.skip_reason}"
+        return fetched.content, fetched.status_code, error
+
+    async def fetch(self, url: str, validators: PageValidators | None = None) -> FetchResult:
+        return await self._stream(url, conditional_headers(validators), allowed_types=HTML_CONTENT_TYPES)
+
+    async def _stream(
+        self,
+        url: str,
+        headers: dict[str, str],
+        allowed_types: tuple[str, ...] | None,
+    ) -> FetchResult:
+        status_code = None
+        try:
+            async with asyncio.timeout(self.deadline):
+                async with self.client.stream(
+                    "GET",
+                    url,
+                    headers={"User-Agent": self._random_user_agent(), **headers},
+                ) as response:
+                    status_code = response.status_code
+                    if status_code == 304:
+                        return FetchResult.from_headers(None, 304, response.headers)
+                    response.raise_for_status()
+
+                    # Decide from the headers alone before reading any of the body
+                    if not accepts_content_type(response.headers.get("Content-Type"), allowed_types):
+                        return FetchResult.skipped(SKIP_CONTENT_TYPE, status_code)
+                    if declared_too_large(response.headers.get("Content-Length"), self.max_bytes):
+                        return FetchResult.skipped(SKIP_TOO_LARGE, status_code)
+
+                    chunks = []
+                    size = 0
+                    async for chunk in response.aiter_bytes(64 * 1024):
+                        size += len(chunk)
+                        if size > self.max_bytes:
+                            return FetchResult.skipped(SKIP_TOO_LARGE, status_code)
+                        chunks.append(chunk)
+
+                    content = b"".join(chunks).decode(response.encoding or "utf-8", errors="replace")
+                    return FetchResult.from_headers(content, status_code, response.headers)
+        except TimeoutError:
+            logger.warning(f"Gave up on {url} after {self.deadline}s")
+            return FetchResult.skipped(SKIP_DEADLINE, status_code)
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"Failed to fetch {url}: {e}")
+            return FetchResult.http_error(e.response.status_code, str(e), e.response.headers)
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch {url}: {e}")
+            return FetchResult.http_error(None, str(e) or type(e).__name__)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> AsyncHttpClient:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
@@ -0,0 +1,71 @@
+import threading
+
+
+class FetchBudget:
+    """Global cap on in-flight fetches, shared fairly by the hosts using it.
+
+    Each host with requests in flight or waiting is entitled to an equal
+    share of `total`. A host may go over its share only while no other host
+    is waiting, so an idle budget is never wasted and a busy one is split
+    evenly. Thread-safe; one instance is shared by every concurrent run.
+    """
+
+    def __init__(self, total: int) -> None:
+        """Initialize the budget.
+
+        Args:
+            total: Fetches allowed in flight at once across all hosts.
+        """
+        if total < 1:
+            raise ValueError(f"total must be at least 1, got {total}")
+        self.total = total
+        self._in_flight: dict[str, int] = {}
+        self._waiting: dict[str, int] = {}
+        self._used = 0
+        self._changed = threading.Condition()
+
+    def _fair_share(self) -> int:
+        hosts = len(self._in_flight.keys() | self._waiting.keys())
+        return max(1, self.total // max(1, hosts))
+
+    def _may_start(self, host: str) -> bool:
+        if self._used >= self.total:
+            return False
+        if self._in_flight.get(host, 0) < self._fair_share():
+            return True
+        return not any(waiting for h, waiting in self._waiting.items() if h != host)
+
+    def acquire(self, host: str) -> None:
+        """Block until `host` may start another fetch.
+
+        Args:
+            host: The host the fetch goes to.
+        """
+        with self._changed:
+            self._waiting[host] = self._waiting.get(host, 0) + 1
+            try:
+                self._changed.wait_for(lambda: self._may_start(host))
+            finally:
+                self._waiting[host] -= 1
+                if not self._waiting[host]:
+                    del self._waiting[host]
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+            self._used += 1
+
+    def release(self, host: str) -> None:
+        """Return a slot taken by `acquire`.
+
+        Args:
+            host: The host passed to `acquire`.
+        """
+        with self._changed:
+            self._in_flight[host] -= 1
+            if not self._in_flight[host]:
+                del self._in_flight[host]
+            self._used -= 1
+            self._changed.notify_all()
+
+    def in_flight(self) -> dict[str, int]:
+        """Current in-flight fetches per host."""
+        with self._changed:
+            return dict(self._in_flight)
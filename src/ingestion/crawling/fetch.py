@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Mapping
+
+from src.domain.models import PageValidators
+
+# Media types the crawler parses; anything else is skipped before its body is read
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_DEADLINE = 30.0
+
+# FetchResult.skip_reason values: the URL was reachable but deliberately not read
+SKIP_CONTENT_TYPE = "content_type"
+SKIP_TOO_LARGE = "too_large"
+SKIP_DEADLINE = "deadline"
+
+# Responses that mean the server wants fewer requests
+OVERLOAD_STATUS_CODES = (429, 503)
+
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)\"?", re.IGNORECASE)
+_NO_CACHE = re.compile(r"(?:^|,)\s*(?:no-cache|no-store)\b", re.IGNORECASE)
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a crawl fetch, including the response's cache validators."""
+
+    content: str | None
+    status_code: int | None
+    error: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    max_age: int | None = None
+    skip_reason: str | None = None
+    # Seconds the server asked us to wait (429/503 Retry-After)
+    retry_after: float | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+    @property
+    def overloaded(self) -> bool:
+        """The server pushed back: 429/503, a timeout or a refused connection."""
+        if self.status_code in OVERLOAD_STATUS_CODES or self.skip_reason == SKIP_DEADLINE:
+            return True
+        return self.status_code is None and self.error is not None
+
+    @classmethod
+    def http_error(cls, status_code: int | None, error: str, headers: Mapping[str, str] | None = None) -> FetchResult:
+        retry_after = None
+        if headers is not None and status_code in OVERLOAD_STATUS_CODES:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+        return cls(content=None, status_code=status_code, error=error, retry_after=retry_after)
+
+    @classmethod
+    def skipped(cls, reason: str, status_code: int | None) -> FetchResult:
+        return cls(content=None, status_code=status_code, skip_reason=reason)
+
+    @classmethod
+    def from_headers(
+        cls,
+        content: str | None,
+        status_code: int | None,
+        headers: Mapping[str, str],
+    ) -> FetchResult:
+        return cls(
+            content=content,
+            status_code=status_code,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            max_age=parse_max_age(headers.get("Cache-Control")),
+        )
+
+    @classmethod
+    def still_fresh(cls, validators: PageValidators) -> FetchResult:
+        """Stand-in for a 304 when max-age says no request is needed at all."""
+        return cls(
+            content=None,
+            status_code=304,
+            etag=validators.etag,
+            last_modified=validators.last_modified,
+            max_age=validators.max_age,
+        )
+
+
+def accepts_content_type(content_type: str | None, allowed: tuple[str, ...] | None) -> bool:
+    """Whether a Content-Type header matches one of the allowed media types.
+
+    A missing header is accepted: many servers omit it for HTML.
+    """
+    if allowed is None or not content_type:
+        return True
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in allowed
+
+
+def declared_too_large(content_length: str | None, max_bytes: int) -> bool:
+    try:
+        return content_length is not None and int(content_length) > max_bytes
+    except ValueError:
+        return False
+
+
+def parse_max_age(cache_control: str | None) -> int | None:
+    """Return Cache-Control max-age in seconds, or None if absent or disallowed."""
+    if not cache_control or _NO_CACHE.search(cache_control):
+        return None
+    match = _MAX_AGE.search(cache_control)
+    return int(match.group(1)) if match else None
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After as seconds from now; it may be a delay or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def conditional_headers(validators: PageValidators | None) -> dict[str, str]:
+    """Request headers that let the server answer 304 Not Modified."""
+    headers = {}
+    if validators is not None:
+        if validators.etag:
+            headers["If-None-Match"] = validators.etag
+        if validators.last_modified:
+            headers["If-Modified-Since"] = validators.last_modified
+    return headers
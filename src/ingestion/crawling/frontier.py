@@ -0,0 +1,109 @@
+from src.domain.models import QueueItemCreate
+from src.domain.rules import PriorityScorer
+
+# Pending URLs whose inlinks are counted; beyond this new links are still
+# scored but keep their first priority
+DEFAULT_MAX_TRACKED = 200_000
+
+
+class FrontierPriorities:
+    """Queue priorities for a run's links, raised as more pages link to them.
+
+    New links are scored once with `scorer.score`; the crawl keeps only
+    that base score, an inlink count and the priority last written per
+    pending URL (about 200 bytes each, bounded by `max_tracked`). Every
+    further link to a tracked URL adds to its inlinks, and URLs whose
+    priority rose since it was written come back from `raised` to be
+    updated in bulk. Counts cover the links this worker discovered.
+
+    Not thread-safe: only the persisting stage should call it.
+    """
+
+    def __init__(self, scorer: PriorityScorer, max_tracked: int = DEFAULT_MAX_TRACKED) -> None:
+        """Initialize with nothing tracked.
+
+        Args:
+            scorer: Scores links and inlink counts.
+            max_tracked: Most pending URLs whose inlinks are counted.
+        """
+        if max_tracked < 0:
+            raise ValueError(f"max_tracked must not be negative, got {max_tracked}")
+        self.scorer = scorer
+        self.max_tracked = max_tracked
+        # url_hash -> [base score, inlinks, priority last written]
+        self._tracked: dict[str, list[int]] = {}
+        self._raised: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._tracked)
+
+    def _base(self, item: QueueItemCreate) -> int:
+        return self.scorer.score(item.url, item.depth, item.lastmod, item.sitemap_priority)
+
+    def _track(self, item: QueueItemCreate, inlinks: int) -> None:
+        if item.url_hash in self._tracked:
+            self._tracked[item.url_hash][1] += inlinks
+        elif len(self._tracked) < self.max_tracked:
+            self._tracked[item.url_hash] = [self._base(item), inlinks, 0]
+
+    def _current(self, url_hash: str) -> int:
+        base, inlinks, _ = self._tracked[url_hash]
+        return base + self.scorer.inlink_bonus(inlinks)
+
+    def _prioritized(self, item: QueueItemCreate, inlinks: int) -> QueueItemCreate:
+        entry = self._tracked.get(item.url_hash)
+        if entry is None:
+            priority = self._base(item) + self.scorer.inlink_bonus(inlinks)
+        else:
+            priority = entry[2] = self._current(item.url_hash)
+            self._raised.discard(item.url_hash)
+        return item.model_copy(update={"priority": priority})
+
+    def seed(self, item: QueueItemCreate) -> QueueItemCreate:
+        """Score a seed URL (no inlinks yet) and start tracking it."""
+        self._track(item, 0)
+        return self._prioritized(item, 0)
+
+    def discover(self, fresh: list[QueueItemCreate], duplicates: list[str]) -> list[QueueItemCreate]:
+        """Count one batch of discovered links and score the new ones.
+
+        Args:
+            fresh: Links not queued before; each counts as one inlink.
+            duplicates: url_hash of each link to an already queued URL.
+
+        Returns:
+            `fresh` with priorities, including inlinks from `duplicates` in
+            the same batch.
+        """
+        for item in fresh:
+            self._track(item, 1)
+        for url_hash in duplicates:
+            entry = self._tracked.get(url_hash)
+            if entry is None:
+                continue
+            entry[1] += 1
+            self._raised.add(url_hash)
+        return [self._prioritized(item, 1) for item in fresh]
+
+    def raised(self) -> list[tuple[str, int]]:
+        """(url_hash, priority) of pending URLs now scoring above what was written.
+
+        Marks them written, so each rise is returned once.
+        """
+        updates = []
+        for url_hash in self._raised:
+            entry = self._tracked.get(url_hash)
+            if entry is None:
+                continue
+            priority = self._current(url_hash)
+            if priority > entry[2]:
+                entry[2] = priority
+                updates.append((url_hash, priority))
+        self._raised.clear()
+        return updates
+
+    def forget(self, url_hashes: list[str]) -> None:
+        """Stop tracking URLs that were claimed; their priority no longer matters."""
+        for url_hash in url_hashes:
+            self._tracked.pop(url_hash, None)
+            self._raised.discard(url_hash)
@@ -3,10 +3,25 @@ from __future__ import annotations
 import logging
 import random
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
+from src.domain.models import PageValidators
+from src.ingestion.crawling.fetch import (
+    DEFAULT_DEADLINE,
+    DEFAULT_MAX_BYTES,
+    HTML_CONTENT_TYPES,
+    SKIP_CONTENT_TYPE,
+    SKIP_DEADLINE,
+    SKIP_TOO_LARGE,
+    FetchResult,
+    accepts_content_type,
+    conditional_headers,
+    declared_too_large,
+)
+
 logger = logging.getLogger(__name__)
 
 USER_AGENTS = [
@@ -19,9 +34,24 @@ USER_AGENTS = [
 
 
 class HttpClient:
-    def __init__(self, timeout: int = 10, max_workers: int = 10):
+    """Blocking HTTP client with per-thread sessions.
+
+    Bodies are streamed: `max_bytes` caps how much of one response is read
+    and `deadline` bounds the whole request in seconds, on top of the
+    per-socket `timeout`.
+    """
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        max_workers: int = 10,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        deadline: float = DEFAULT_DEADLINE,
+    ):
         self.timeout = timeout
         self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.deadline = deadline
         self._local = threading.local()
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
 
@@ -34,22 +64,101 @@ class HttpClient:
     def _random_user_agent(self) -> str:
         return random.choice(USER_AGENTS)
 
-    def get(self, url: str) -> requests.Response:
+    def get(self, url: str, headers: dict[str, str] | None = None) -> requests.Response:
         return self.session.get(
             url,
             timeout=self.timeout,
-            headers={"User-Agent": self._random_user_agent()},
+            headers={"User-Agent": self._random_user_agent(), **(headers or {})},
         )
 
     def download(self, url: str) -> tuple[str | None, int | None, str | None]:
+        """Download any text resource (robots.txt, sitemaps) within the size and time limits."""
+        fetched = self.fetch_resource(url)
+        return fetched.content, fetched.status_code, _download_error(fetched)
+
+    def fetch_resource(self, url: str) -> FetchResult:
+        """Like `download`, but keeps the response's cache headers."""
+        fetched, body, encoding = self._stream(url, {}, allowed_types=None)
+        if body is not None:
+            fetched.content = body.decode(encoding, errors="replace")
+        return fetched
+
+    def download_bytes(
+        self, url: str, max_bytes: int | None = None
+    ) -> tuple[bytes | None, int | None, str | None]:
+        """Download a resource undecoded, e.g. a gzipped sitemap.
+
+        `max_bytes` overrides the client's limit for formats with their own,
+        larger cap. Content-Encoding is still removed.
+        """
+        fetched, body, _ = self._stream(url, {}, allowed_types=None, max_bytes=max_bytes)
+        return body, fetched.status_code, _download_error(fetched)
+
+    def fetch(self, url: str, validators: PageValidators | None = None) -> FetchResult:
+        """Download an HTML page, revalidating against `validators` when given.
+
+        A 304 comes back with no content; the caller keeps its stored copy.
+        Non-HTML responses, bodies over `max_bytes` and requests past the
+        deadline come back with a `skip_reason` instead of content.
+        """
+        fetched, body, encoding = self._stream(
+            url, conditional_headers(validators), allowed_types=HTML_CONTENT_TYPES
+        )
+        if body is not None:
+            fetched.content = body.decode(encoding, errors="replace")
+        return fetched
+
+    def _stream(
+        self,
+        url: str,
+        headers: dict[str, str],
+        allowed_types: tuple[str, ...] | None,
+        max_bytes: int | None = None,
+    ) -> tuple[FetchResult, bytes | None, str]:
+        """Read a response body within the limits.
+
+        Returns the result without content, the raw body (None unless it was
+        read in full) and the charset to decode it with.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        deadline = time.monotonic() + self.deadline
         try:
-            response = self.get(url)
-            response.raise_for_status()
-            return response.text, response.status_code, None
+            with self.session.get(
+                url,
+                timeout=self.timeout,
+                headers={"User-Agent": self._random_user_agent(), **headers},
+                stream=True,
+            ) as response:
+                if response.status_code == 304:
+                    return FetchResult.from_headers(None, 304, response.headers), None, ""
+                response.raise_for_status()
+
+                status_code = response.status_code
+                # Decide from the headers alone before reading any of the body
+                if not accepts_content_type(response.headers.get("Content-Type"), allowed_types):
+                    return FetchResult.skipped(SKIP_CONTENT_TYPE, status_code), None, ""
+                if declared_too_large(response.headers.get("Content-Length"), max_bytes):
+                    return FetchResult.skipped(SKIP_TOO_LARGE, status_code), None, ""
+
+                chunks = []
+                size = 0
+                # read1 returns whatever has arrived instead of waiting for a
+                # full chunk, so a trickling server can't outlast the deadline
+                while chunk := response.raw.read1(64 * 1024, decode_content=True):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        return FetchResult.skipped(SKIP_TOO_LARGE, status_code), None, ""
+                    if time.monotonic() > deadline:
+                        return FetchResult.skipped(SKIP_DEADLINE, status_code), None, ""
+                    chunks.append(chunk)
+
+                fetched = FetchResult.from_headers(None, status_code, response.headers)
+                return fetched, b"".join(chunks), response.encoding or "utf-8"
         except requests.RequestException as e:
             logger.warning(f"Failed to fetch {url}: {e}")
-            status_code = e.response.status_code if e.response is not None else None
-            return None, status_code, str(e)
+            if e.response is not None:
+                return FetchResult.http_error(e.response.status_code, str(e), e.response.headers), None, ""
+            return FetchResult.http_error(None, str(e)), None, ""
 
     def _download_with_url(self, url: str) -> tuple[str, str | None, int | None, str | None]:
         """Download a URL and return the result with the URL included."""
@@ -77,3 +186,9 @@ class HttpClient:
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.close()
+
+
+def _download_error(fetched: FetchResult) -> str | None:
+    if fetched.skip_reason is not None:
+        return f"Skipped: {fetched.skip_reason}"
+    return fetched.error
@@ -0,0 +1,211 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency buckets, from a fast in-memory
+# stage to a slow fetch; observations above the last one land in +Inf
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram. Not thread-safe; `CrawlMetrics` locks around it."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # One slot per bucket plus +Inf, counted per bucket (not cumulative)
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[int]:
+        totals, running = [], 0
+        for count in self.counts:
+            running += count
+            totals.append(running)
+        return totals
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th observation, as Prometheus estimates it."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in zip(self.buckets, self.cumulative()):
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+class CrawlMetrics:
+    """In-process crawl metrics: stage latencies, fetch counters and gauges.
+
+    Engines time each pipeline stage (fetch, rate-limit wait, link
+    extraction, robots checks and the repository calls), count every fetch
+    by domain and status code, and track requests in flight. Queue depth is
+    read from registered callbacks only when the metrics are rendered, so it
+    costs one count query per scrape rather than per page. Recording is a
+    lock plus a bisect, cheap enough to leave on. Thread-safe; one instance
+    may be shared by every run in a process.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Initialize empty metrics.
+
+        Args:
+            buckets: Sorted upper bounds, in seconds, of the latency buckets.
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stages: dict[str, Histogram] = {}
+        self._fetches: dict[tuple[str, str], int] = {}
+        self._in_flight = 0
+        self._queues: dict[str, Callable[[], int]] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record one duration of `stage`.
+
+        Args:
+            stage: Pipeline stage name, e.g. "fetch" or "page_insert".
+            seconds: How long it took.
+        """
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Record the duration of the block as `stage`, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    @contextmanager
+    def in_flight(self) -> Iterator[None]:
+        """Count the block as one request in flight."""
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def count_fetch(self, domain: str, status_code: int | None) -> None:
+        """Count a finished fetch.
+
+        Args:
+            domain: The domain fetched from.
+            status_code: HTTP status, or None when no response came back.
+        """
+        key = (domain, str(status_code) if status_code is not None else "error")
+        with self._lock:
+            self._fetches[key] = self._fetches.get(key, 0) + 1
+
+    def track_queue(self, run_id: str, pending: Callable[[], int]) -> None:
+        """Report a run's queue depth, read through `pending` at render time.
+
+        Args:
+            run_id: The run, used as the gauge label.
+            pending: Returns the run's pending queue item count.
+        """
+        with self._lock:
+            self._queues[run_id] = pending
+
+    def untrack_queue(self, run_id: str) -> None:
+        with self._lock:
+            self._queues.pop(run_id, None)
+
+    def _queue_depths(self) -> dict[str, int]:
+        with self._lock:
+            queues = dict(self._queues)
+        depths = {}
+        for run_id, pending in queues.items():
+            try:
+                depths[run_id] = pending()
+            except Exception as e:
+                logger.debug(f"Could not read queue depth of run {run_id}: {e}")
+        return depths
+
+    def snapshot(self) -> dict[str, Any]:
+        """All metrics as plain data, for a JSON dump."""
+        depths = self._queue_depths()
+        with self._lock:
+            stages = {
+                name: {
+                    "count": h.count,
+                    "sum_seconds": h.sum,
+                    "p50_seconds": h.quantile(0.5),
+                    "p99_seconds": h.quantile(0.99),
+                    "buckets": dict(zip([*map(str, self.buckets), "+Inf"], h.counts)),
+                }
+                for name, h in sorted(self._stages.items())
+            }
+            fetches = dict(self._fetches)
+            in_flight = self._in_flight
+        status_codes: dict[str, int] = {}
+        domains: dict[str, int] = {}
+        for (domain, status), count in fetches.items():
+            status_codes[status] = status_codes.get(status, 0) + count
+            domains[domain] = domains.get(domain, 0) + count
+        return {
+            "stages": stages,
+            "fetches_by_status": dict(sorted(status_codes.items())),
+            "fetches_by_domain": dict(sorted(domains.items())),
+            "fetches_in_flight": in_flight,
+            "queue_pending": depths,
+        }
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        depths = self._queue_depths()
+        lines = [
+            "# HELP crawl_stage_seconds Time spent in each crawl pipeline stage.",
+            "# TYPE crawl_stage_seconds histogram",
+        ]
+        with self._lock:
+            for name, h in sorted(self._stages.items()):
+                stage = _label("stage", name)
+                for bound, total in zip([*map(_number, self.buckets), "+Inf"], h.cumulative()):
+                    lines.append(f'crawl_stage_seconds_bucket{{{stage},le="{bound}"}} {total}')
+                lines.append(f"crawl_stage_seconds_sum{{{stage}}} {_number(h.sum)}")
+                lines.append(f"crawl_stage_seconds_count{{{stage}}} {h.count}")
+            lines += [
+                "# HELP crawl_fetches_total Fetches finished, by domain and HTTP status.",
+                "# TYPE crawl_fetches_total counter",
+            ]
+            for (domain, status), count in sorted(self._fetches.items()):
+                lines.append(f"crawl_fetches_total{{{_label('domain', domain)},{_label('status', status)}}} {count}")
+            lines += [
+                "# HELP crawl_fetches_in_flight Requests currently waiting for a response.",
+                "# TYPE crawl_fetches_in_flight gauge",
+                f"crawl_fetches_in_flight {self._in_flight}",
+            ]
+        lines += [
+            "# HELP crawl_queue_pending Pending queue items per run.",
+            "# TYPE crawl_queue_pending gauge",
+        ]
+        for run_id, depth in sorted(depths.items()):
+            lines.append(f"crawl_queue_pending{{{_label('run_id', run_id)}}} {depth}")
+        return "\n".join(lines) + "\n"
+
+
+def _label(name: str, value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'{name}="{escaped}"'
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from src.domain.rules import UrlCanonicalizer
+from src.ingestion.crawling.link_extractor import extract_links
+from src.ingestion.crawling.simhash import simhash
+
+
+_DEFAULT_CANONICALIZER = UrlCanonicalizer()
+
+
+@dataclass
+class PageAnalysis:
+    """CPU-side result of a page: its body hash, same-domain outlinks and SimHash.
+
+    `links` holds (normalized_url, url_hash) pairs, deduplicated, so the
+    result stays small when it crosses a process boundary. `simhash` is
+    only computed on request, and None for pages with too little text.
+    """
+
+    content_hash: str
+    links: list[tuple[str, str]] = field(default_factory=list)
+    simhash: int | None = None
+
+
+def analyze_page(
+    body: bytes,
+    base_url: str,
+    domain: str,
+    extract: bool = True,
+    canonicalizer: UrlCanonicalizer | None = None,
+    fingerprint: bool = False,
+) -> PageAnalysis:
+    """Hash a UTF-8 body and extract, canonicalize and hash its same-domain links.
+
+    A plain function so it can run either in the calling thread or in a
+    worker process; both modes produce identical results. `canonicalizer`
+    defaults to the standard rules; a worker process gets a copy without
+    its cache. `fingerprint` also computes the SimHash of the page text.
+    """
+    content_hash = hashlib.sha256(body).hexdigest()
+    if not (extract or fingerprint):
+        return PageAnalysis(content_hash=content_hash)
+
+    html = body.decode("utf-8", errors="replace")
+    fp = simhash(html) if fingerprint else None
+    if not extract:
+        return PageAnalysis(content_hash=content_hash, simhash=fp)
+
+    canonicalizer = canonicalizer or _DEFAULT_CANONICALIZER
+    links = []
+    seen = set()
+    for link in extract_links(html, base_url):
+        canonical = canonicalizer.canonicalize(link)
+        if canonical.url_hash in seen or canonical.domain != domain:
+            continue
+        seen.add(canonical.url_hash)
+        links.append((canonical.url, canonical.url_hash))
+    return PageAnalysis(content_hash=content_hash, links=links, simhash=fp)
+
+
+def create_analysis_pool(workers: int | None = None) -> Executor:
+    """Process pool for `analyze_page`, started without forking the crawler's threads."""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
@@ -0,0 +1,277 @@
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Functions that mark a pipeline stage, by qualified name. A sample is
+# charged to the innermost one on its stack, so link extraction inside
+# `_build_result` counts as link extraction. Names follow the metrics stages
+# where the two overlap.
+STAGE_FUNCTIONS = {
+    "CrawlUseCase._prepare_run": "prepare_run",
+    "CrawlUseCase._seed_items": "seed",
+    "CrawlUseCase._claim": "db_claim",
+    "CrawlUseCase._build_result": "build_result",
+    "CrawlUseCase._analyze": "link_extraction",
+    "simhash": "fingerprint",
+    "NearDuplicateIndex.check": "near_duplicate_check",
+    "CrawlUseCase._queue_links": "robots_check",
+    "CrawlUseCase._persist_batch": "persist",
+    "CrawlUseCase._store_bodies": "body_store",
+    "CrawlUseCase._load_stored_bodies": "body_load",
+    "CrawlUseCase._heartbeat.<locals>.beat": "heartbeat",
+    "RunStatsAggregator.flush": "stats_flush",
+    "ThreadedCrawlEngine._reserve": "backpressure",
+    "AsyncCrawlEngine._reserve": "backpressure",
+    "DomainRateLimiter.acquire": "rate_limit_wait",
+    "AsyncDomainRateLimiter.acquire": "rate_limit_wait",
+    "FetchBudget.acquire": "rate_limit_wait",
+    "HttpClient.fetch": "fetch",
+    "AsyncHttpClient.fetch": "fetch",
+}
+
+# Modules a thread sits in while it waits for work
+_IDLE_MODULES = ("threading", "queue", "selectors", "concurrent.futures.thread", "asyncio.base_events")
+
+_THREAD_NUMBER = re.compile(r"[-_]\d+$")
+
+
+class SamplingProfiler:
+    """Samples the stacks of every thread in the process at a fixed interval.
+
+    A background thread reads `sys._current_frames()` every `interval`
+    seconds, so it sees all fetch workers, database threads and the asyncio
+    loop whatever the concurrency, and costs the crawl one stack walk per
+    thread per tick rather than a hook on every call. Each sample is
+    charged the wall time since the previous tick and the CPU time its
+    thread used meanwhile (per-thread CPU clocks; unavailable off POSIX, in
+    which case CPU columns stay at zero).
+
+    Samples are attributed three ways: to the innermost pipeline stage on
+    the stack (`STAGE_FUNCTIONS`), to the outermost repository or blob store
+    method, and to the module of the innermost Python frame. Work in a
+    `--cpu-stage processes` pool happens in other processes and shows up as
+    its caller waiting.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """Initialize an idle profiler.
+
+        Args:
+            interval: Seconds between samples.
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._labels: dict[CodeType, str] = {}
+        self._cpu_clocks: dict[int, int | None] = {}
+        self._cpu_seen: dict[int, float] = {}
+        self._wall_stacks: Counter[str] = Counter()
+        self._cpu_stacks: Counter[str] = Counter()
+        self._stages: dict[str, list[float]] = {}
+        self._repositories: dict[str, list[float]] = {}
+        self._modules: dict[str, list[float]] = {}
+        self.samples = 0
+        self.threads: set[int] = set()
+        self._started = self._last = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> "SamplingProfiler":
+        self._started = self._last = time.perf_counter()
+        self._thread = threading.Thread(target=self._loop, name="crawl-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """Take one sample of every other thread; called by the sampling thread."""
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        frames = sys._current_frames()
+        now = time.perf_counter()
+        wall = now - self._last
+        self._last = now
+        with self._lock:
+            self.samples += 1
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                self.threads.add(ident)
+                cpu = self._cpu_delta(ident)
+                thread_name = _THREAD_NUMBER.sub("", names.get(ident, "thread")).replace(";", ",")
+                self._record(thread_name, frame, wall, cpu)
+            # Thread ids are reused; forget the clocks of threads that exited
+            for ident in self._cpu_clocks.keys() - frames.keys():
+                del self._cpu_clocks[ident]
+                self._cpu_seen.pop(ident, None)
+
+    def _record(self, thread_name: str, frame: FrameType, wall: float, cpu: float) -> None:
+        codes: list[CodeType] = []
+        modules: list[str] = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            modules.append(frame.f_globals.get("__name__", "?"))
+            frame = frame.f_back
+        codes.reverse()
+        modules.reverse()
+
+        stage = None
+        repository = None
+        for code in codes:
+            name = code.co_qualname
+            stage = STAGE_FUNCTIONS.get(name, stage)
+            if repository is None and _is_repository(name):
+                repository = name
+        leaf = modules[-1] if modules else "?"
+        if stage is None:
+            stage = "idle" if leaf.startswith(_IDLE_MODULES) else "other"
+
+        _add(self._stages, stage, wall, cpu)
+        if repository is not None:
+            _add(self._repositories, repository, wall, cpu)
+        _add(self._modules, leaf, wall, cpu)
+
+        stack = ";".join([thread_name, *(self._label(code, module) for code, module in zip(codes, modules))])
+        self._wall_stacks[stack] += 1
+        if cpu > 0:
+            self._cpu_stacks[stack] += round(cpu * 1_000_000)
+
+    def _label(self, code: CodeType, module: str) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{module}:{code.co_qualname}"
+        return label
+
+    def _cpu_delta(self, ident: int) -> float:
+        """CPU seconds `ident` used since its previous sample (0 the first time)."""
+        if ident not in self._cpu_clocks:
+            try:
+                self._cpu_clocks[ident] = time.pthread_getcpuclockid(ident)
+            except (AttributeError, OSError):
+                self._cpu_clocks[ident] = None
+        clock = self._cpu_clocks[ident]
+        if clock is None:
+            return 0.0
+        try:
+            used = time.clock_gettime(clock)
+        except OSError:
+            # The thread exited between listing and reading its clock
+            return 0.0
+        previous = self._cpu_seen.get(ident, used)
+        self._cpu_seen[ident] = used
+        return max(0.0, used - previous)
+
+    def collapsed(self, weight: str = "wall") -> list[str]:
+        """Stacks in the collapsed format flamegraph.pl and speedscope read.
+
+        Args:
+            weight: "wall" counts samples; "cpu" weighs each stack by the
+                CPU microseconds its thread used.
+        """
+        if weight not in ("wall", "cpu"):
+            raise ValueError(f"weight must be 'wall' or 'cpu', got {weight!r}")
+        with self._lock:
+            stacks = self._wall_stacks if weight == "wall" else self._cpu_stacks
+            return [f"{stack} {count}" for stack, count in sorted(stacks.items())]
+
+    def summary(self) -> dict[str, Any]:
+        """Wall (thread-seconds) and CPU seconds per stage, repository method and leaf module."""
+        with self._lock:
+            return {
+                "elapsed_seconds": self.elapsed or time.perf_counter() - self._started,
+                "interval_seconds": self.interval,
+                "samples": self.samples,
+                "threads": len(self.threads),
+                "stages": _table(self._stages),
+                "repository_methods": _table(self._repositories),
+                "modules": _table(self._modules),
+            }
+
+    def format_summary(self, limit: int = 15) -> str:
+        """The summary as a plain-text report.
+
+        Args:
+            limit: Rows shown for repository methods and modules.
+        """
+        summary = self.summary()
+        total_wall = sum(row["wall_seconds"] for row in summary["stages"].values()) or 1.0
+        total_cpu = sum(row["cpu_seconds"] for row in summary["stages"].values())
+        lines = [
+            f"Profiled {summary['elapsed_seconds']:.1f} s: {summary['samples']} samples of "
+            f"{summary['threads']} threads every {self.interval * 1000:g} ms, {total_cpu:.2f} CPU s",
+            "Wall is thread-seconds, summed over threads, so it exceeds the elapsed time under concurrency.",
+        ]
+        for title, rows, shown in (
+            ("stage", summary["stages"], None),
+            ("repository method", summary["repository_methods"], limit),
+            ("module (innermost Python frame)", summary["modules"], limit),
+        ):
+            if not rows:
+                continue
+            lines += ["", f"{title:<48} {'wall s':>9} {'wall %':>7} {'cpu s':>8} {'cpu %':>6}"]
+            ranked = sorted(rows.items(), key=lambda item: (-item[1]["cpu_seconds"], -item[1]["wall_seconds"]))
+            for name, row in ranked[:shown]:
+                cpu_share = 100 * row["cpu_seconds"] / total_cpu if total_cpu else 0.0
+                lines.append(
+                    f"{name[:48]:<48} {row['wall_seconds']:>9.2f} {100 * row['wall_seconds'] / total_wall:>6.1f}%"
+                    f" {row['cpu_seconds']:>8.2f} {cpu_share:>5.1f}%"
+                )
+        return "\n".join(lines) + "\n"
+
+    def write(self, prefix: str | Path) -> list[Path]:
+        """Write PREFIX.folded (wall), PREFIX.cpu.folded and PREFIX.txt; returns the paths."""
+        prefix = Path(prefix)
+        outputs = [
+            (prefix.with_name(prefix.name + ".folded"), "\n".join(self.collapsed("wall")) + "\n"),
+            (prefix.with_name(prefix.name + ".cpu.folded"), "\n".join(self.collapsed("cpu")) + "\n"),
+            (prefix.with_name(prefix.name + ".txt"), self.format_summary()),
+        ]
+        for path, text in outputs:
+            path.write_text(text)
+        return [path for path, _ in outputs]
+
+
+def _is_repository(qualname: str) -> bool:
+    owner = qualname.split(".", 1)[0]
+    return "." in qualname and owner.endswith(("Repository", "Store"))
+
+
+def _add(totals: dict[str, list[float]], key: str, wall: float, cpu: float) -> None:
+    row = totals.get(key)
+    if row is None:
+        row = totals[key] = [0.0, 0.0, 0]
+    row[0] += wall
+    row[1] += cpu
+    row[2] += 1
+
+
+def _table(totals: dict[str, list[float]]) -> dict[str, dict[str, float]]:
+    return {
+        key: {"wall_seconds": wall, "cpu_seconds": cpu, "samples": int(samples)}
+        for key, (wall, cpu, samples) in sorted(totals.items())
+    }
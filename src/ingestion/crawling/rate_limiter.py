@@ -1,31 +1,149 @@
+import asyncio
+import logging
 import threading
 import time
-from typing import Dict
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Adaptive mode (AIMD): responses sampled per latency window
+LATENCY_WINDOW = 20
+# A window whose p95 exceeds the best p95 seen by this factor counts as congestion
+LATENCY_TOLERANCE = 1.5
+# Requests per second added after each uncongested window
+RATE_STEP = 1.0
+# Delay multiplier on congestion, 429/503 or a timeout
+BACKOFF_FACTOR = 2.0
+DEFAULT_MAX_DELAY = 30.0
+# Smallest delay a back-off lands on, even when the current one is zero
+MIN_BACKOFF_DELAY = 0.1
+# Longest Retry-After honoured, so one bad header can't stall a run
+MAX_RETRY_AFTER = 600.0
+
+
+class _DomainPacing:
+    """Pacing state for one domain, shared by the sync and async limiters.
+
+    `delay` is the spacing between request starts. In adaptive mode it moves
+    between `min_delay` and `max_delay`: additive increase of the request
+    rate while latency stays flat, multiplicative decrease on pushback.
+    """
+
+    def __init__(self, delay: float, min_delay: float, max_delay: float) -> None:
+        self.delay = delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.last_start: float | None = None
+        self.blocked_until = 0.0
+        self.in_flight = 0
+        self._samples: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._baseline_p95: float | None = None
+        self._last_backoff = float("-inf")
+
+    def wait_time(self, now: float) -> float:
+        earliest = self.blocked_until
+        if self.last_start is not None:
+            earliest = max(earliest, self.last_start + self.delay)
+        return max(0.0, earliest - now)
+
+    def record(
+        self,
+        domain: str,
+        now: float,
+        latency: float | None,
+        overloaded: bool,
+        retry_after: float | None,
+        adaptive: bool,
+    ) -> None:
+        if retry_after is not None:
+            self.blocked_until = max(self.blocked_until, now + min(retry_after, MAX_RETRY_AFTER))
+        if not adaptive:
+            return
+        if overloaded:
+            # React once per congestion event: responses to requests started
+            # before the last back-off were sent at the old rate
+            started = now - (latency or 0.0)
+            if started >= self._last_backoff:
+                self._back_off(domain, now, "server pushback")
+            return
+        if latency is None:
+            return
+
+        self._samples.append(latency)
+        if len(self._samples) < LATENCY_WINDOW:
+            return
+        ordered = sorted(self._samples)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        self._samples.clear()
+        if self._baseline_p95 is None or p95 < self._baseline_p95:
+            self._baseline_p95 = p95
+        if p95 > self._baseline_p95 * LATENCY_TOLERANCE:
+            self._back_off(domain, now, f"p95 {p95:.2f}s vs {self._baseline_p95:.2f}s")
+        else:
+            rate = 1.0 / self.delay if self.delay > 0 else float("inf")
+            self.delay = max(self.min_delay, 1.0 / (rate + RATE_STEP))
+
+    def _back_off(self, domain: str, now: float, reason: str) -> None:
+        previous = self.delay
+        self.delay = min(self.max_delay, max(self.delay * BACKOFF_FACTOR, self.min_delay, MIN_BACKOFF_DELAY))
+        self._last_backoff = now
+        self._samples.clear()
+        logger.info(f"Slowing down {domain} ({reason}): delay {previous:.2f}s -> {self.delay:.2f}s")
 
 
 class DomainRateLimiter:
-    """Per-domain rate limiter for controlling request frequency."""
+    """Per-domain rate limiter for controlling request frequency.
 
-    def __init__(self, default_delay: float = 0.5) -> None:
+    Every `acquire` must be paired with a `release` once the response is in.
+    Besides spacing request starts by the domain delay, the limiter caps
+    in-flight requests per domain (`max_connections`) and holds requests
+    back until a Retry-After has passed. In adaptive mode the delay follows
+    the server: see `_DomainPacing`.
+    """
+
+    def __init__(
+        self,
+        default_delay: float = 0.5,
+        adaptive: bool = False,
+        max_connections: int | None = None,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
         """Initialize the rate limiter.
 
         Args:
             default_delay: Default delay in seconds between requests to the same domain.
+            adaptive: Tune each domain's delay from response latency and pushback.
+            max_connections: In-flight requests allowed per domain, or None for no cap.
+            max_delay: Upper bound for the adaptive delay.
         """
         self._default_delay = default_delay
-        self._domain_delays: Dict[str, float] = {}
-        self._last_request_times: Dict[str, float] = {}
+        self._adaptive = adaptive
+        self._max_connections = max_connections
+        self._max_delay = max_delay
+        self._domains: dict[str, _DomainPacing] = {}
         self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+
+    def _pacing(self, domain: str) -> _DomainPacing:
+        pacing = self._domains.get(domain)
+        if pacing is None:
+            pacing = _DomainPacing(self._default_delay, self._default_delay, self._max_delay)
+            self._domains[domain] = pacing
+        return pacing
 
-    def set_delay(self, domain: str, delay: float) -> None:
+    def set_delay(self, domain: str, delay: float, min_delay: float | None = None) -> None:
         """Set a custom delay for a specific domain.
 
         Args:
             domain: The domain to set the delay for.
             delay: The delay in seconds between requests to this domain.
+            min_delay: Floor for the adaptive delay, e.g. the robots.txt
+                crawl-delay. Defaults to `delay`.
         """
         with self._lock:
-            self._domain_delays[domain] = delay
+            pacing = self._pacing(domain)
+            pacing.delay = delay
+            pacing.min_delay = delay if min_delay is None else min(min_delay, delay)
 
     def get_delay(self, domain: str) -> float:
         """Get the delay for a specific domain.
@@ -37,34 +155,164 @@ class DomainRateLimiter:
             The delay in seconds for the specified domain.
         """
         with self._lock:
-            return self._domain_delays.get(domain, self._default_delay)
+            pacing = self._domains.get(domain)
+            return pacing.delay if pacing is not None else self._default_delay
 
     def acquire(self, domain: str) -> None:
         """Acquire permission to make a request to the specified domain.
 
-        Blocks until enough time has passed since the last request to this domain.
+        Blocks until a connection slot is free and enough time has passed
+        since the last request to this domain.
 
         Args:
             domain: The domain to acquire permission for.
         """
         with self._lock:
-            delay = self._domain_delays.get(domain, self._default_delay)
-            last_request_time = self._last_request_times.get(domain)
-
-            if last_request_time is not None:
-                elapsed = time.monotonic() - last_request_time
-                wait_time = delay - elapsed
-                if wait_time > 0:
-                    # Reserve our slot before releasing the lock
-                    self._last_request_times[domain] = time.monotonic() + wait_time
-                    # Release lock while sleeping to allow other domains to proceed
-                    self._lock.release()
-                    try:
-                        time.sleep(wait_time)
-                    finally:
-                        self._lock.acquire()
-                    # Update to actual time after waking
-                    self._last_request_times[domain] = time.monotonic()
-                    return
-
-            self._last_request_times[domain] = time.monotonic()
+            pacing = self._pacing(domain)
+            while self._max_connections is not None and pacing.in_flight >= self._max_connections:
+                self._slot_freed.wait()
+            pacing.in_flight += 1
+            now = time.monotonic()
+            wait_time = pacing.wait_time(now)
+            # Reserve our slot before releasing the lock
+            pacing.last_start = now + wait_time
+
+        if wait_time > 0:
+            # Sleep without the lock so other domains can proceed
+            time.sleep(wait_time)
+
+    def release(
+        self,
+        domain: str,
+        latency: float | None = None,
+        overloaded: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        """Return the connection slot and report how the request went.
+
+        Args:
+            domain: The domain passed to `acquire`.
+            latency: Seconds from request start to response, if one came back.
+            overloaded: The server pushed back (429/503, timeout, refused).
+            retry_after: Seconds the server asked us to wait, if it did.
+        """
+        with self._lock:
+            pacing = self._pacing(domain)
+            pacing.in_flight -= 1
+            pacing.record(domain, time.monotonic(), latency, overloaded, retry_after, self._adaptive)
+            self._slot_freed.notify_all()
+
+
+class AsyncDomainRateLimiter:
+    """Per-domain rate limiter for coroutines sharing one event loop.
+
+    Callers for the same domain take turns under a per-domain lock, so a
+    coroutine cancelled while waiting gives up its turn instead of leaving a
+    reserved slot behind. Other domains proceed independently. Connection
+    caps, Retry-After and adaptive pacing work as in `DomainRateLimiter`.
+    """
+
+    def __init__(
+        self,
+        default_delay: float = 0.5,
+        adaptive: bool = False,
+        max_connections: int | None = None,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            default_delay: Default delay in seconds between requests to the same domain.
+            adaptive: Tune each domain's delay from response latency and pushback.
+            max_connections: In-flight requests allowed per domain, or None for no cap.
+            max_delay: Upper bound for the adaptive delay.
+        """
+        self._default_delay = default_delay
+        self._adaptive = adaptive
+        self._max_connections = max_connections
+        self._max_delay = max_delay
+        self._domains: dict[str, _DomainPacing] = {}
+        self._domain_locks: dict[str, asyncio.Lock] = {}
+        self._domain_slots: dict[str, asyncio.Semaphore] = {}
+
+    def _pacing(self, domain: str) -> _DomainPacing:
+        pacing = self._domains.get(domain)
+        if pacing is None:
+            pacing = _DomainPacing(self._default_delay, self._default_delay, self._max_delay)
+            self._domains[domain] = pacing
+        return pacing
+
+    def set_delay(self, domain: str, delay: float, min_delay: float | None = None) -> None:
+        """Set a custom delay for a specific domain.
+
+        Args:
+            domain: The domain to set the delay for.
+            delay: The delay in seconds between requests to this domain.
+            min_delay: Floor for the adaptive delay, e.g. the robots.txt
+                crawl-delay. Defaults to `delay`.
+        """
+        pacing = self._pacing(domain)
+        pacing.delay = delay
+        pacing.min_delay = delay if min_delay is None else min(min_delay, delay)
+
+    def get_delay(self, domain: str) -> float:
+        """Get the delay for a specific domain.
+
+        Args:
+            domain: The domain to get the delay for.
+
+        Returns:
+            The delay in seconds for the specified domain.
+        """
+        pacing = self._domains.get(domain)
+        return pacing.delay if pacing is not None else self._default_delay
+
+    async def acquire(self, domain: str) -> None:
+        """Acquire permission to make a request to the specified domain.
+
+        Suspends the calling coroutine until a connection slot is free and
+        enough time has passed since the last request to this domain. The
+        request time is only recorded once the wait completes.
+
+        Args:
+            domain: The domain to acquire permission for.
+        """
+        pacing = self._pacing(domain)
+        slots = None
+        if self._max_connections is not None:
+            slots = self._domain_slots.setdefault(domain, asyncio.Semaphore(self._max_connections))
+            await slots.acquire()
+        try:
+            lock = self._domain_locks.setdefault(domain, asyncio.Lock())
+            async with lock:
+                # Re-read after every sleep: a Retry-After may arrive meanwhile
+                while (wait_time := pacing.wait_time(time.monotonic())) > 0:
+                    await asyncio.sleep(wait_time)
+                pacing.last_start = time.monotonic()
+        except BaseException:
+            if slots is not None:
+                slots.release()
+            raise
+        pacing.in_flight += 1
+
+    def release(
+        self,
+        domain: str,
+        latency: float | None = None,
+        overloaded: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        """Return the connection slot and report how the request went.
+
+        Args:
+            domain: The domain passed to `acquire`.
+            latency: Seconds from request start to response, if one came back.
+            overloaded: The server pushed back (429/503, timeout, refused).
+            retry_after: Seconds the server asked us to wait, if it did.
+        """
+        pacing = self._pacing(domain)
+        pacing.in_flight -= 1
+        pacing.record(domain, time.monotonic(), latency, overloaded, retry_after, self._adaptive)
+        slots = self._domain_slots.get(domain)
+        if slots is not None:
+            slots.release()
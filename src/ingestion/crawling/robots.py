@@ -1,92 +1,310 @@
 from __future__ import annotations
 
 import logging
-from urllib.robotparser import RobotFileParser
-
-from lxml import etree
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+from urllib.parse import quote, urlsplit
 
+from src.domain.models import RobotsRecord
+from src.domain.ports import RobotsStore
 from src.ingestion.crawling.http_client import HttpClient
 
 logger = logging.getLogger(__name__)
 
+# RFC 9309 asks crawlers not to keep robots.txt longer than a day
+DEFAULT_ROBOTS_TTL = 24 * 60 * 60.0
+# After a network error or 5xx, try again sooner than that
+DEFAULT_ROBOTS_ERROR_TTL = 5 * 60.0
 
-class RobotsHandler:
-    def __init__(self, base_url: str, http_client: HttpClient):
-        self.base_url = base_url
-        self.http_client = http_client
-        self.parser = RobotFileParser()
-        self.crawl_delay: float | None = None
-        self._load()
+_ESCAPE = re.compile(r"%([0-9A-Fa-f]{2})")
+_UNRESERVED = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+_SAFE = ":/?#[]@!$&'()*+,;=-._~%"
+# Paths made only of these are already canonical (the common case)
+_CANONICAL = re.compile(r"[A-Za-z0-9\-._~:/?#\[\]@!$&'()*+,;=]*")
+
+
+def _normalize_path(path: str) -> str:
+    """Canonical percent-encoding so rules and URLs compare byte for byte.
+
+    Escapes of unreserved characters are decoded, other escapes are
+    uppercased and non-ASCII characters are encoded as UTF-8 (RFC 9309 2.2.2).
+    """
+
+    if _CANONICAL.fullmatch(path):
+        return path
+
+    def unescape(match: re.Match) -> str:
+        char = chr(int(match.group(1), 16))
+        return char if char in _UNRESERVED else f"%{match.group(1).upper()}"
+
+    return quote(_ESCAPE.sub(unescape, path), safe=_SAFE)
+
+
+def _url_path(url: str) -> str:
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return _normalize_path(path)
 
-    def _load(self):
-        robots_url = f"{self.base_url}/robots.txt"
-        self.parser.set_url(robots_url)
-        try:
-            content, status_code, _ = self.http_client.download(robots_url)
-            if status_code == 200 and content:
-                self.parser.parse(content.splitlines())
-                self.crawl_delay = self.parser.crawl_delay("*")
-                logger.info(f"Loaded robots.txt (crawl-delay: {self.crawl_delay})")
-            else:
-                self.parser.parse([])
-                logger.debug("No robots.txt found")
-        except Exception as e:
-            self.parser.parse([])
-            logger.debug(f"Failed to load robots.txt: {e}")
+
+class _Node:
+    __slots__ = ("children", "allow", "wildcards")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        # Verdict of a plain prefix rule ending here, if any
+        self.allow: bool | None = None
+        # (pattern length, allow, regex) for wildcard rules whose literal prefix ends here
+        self.wildcards: list[tuple[int, bool, re.Pattern]] = []
+
+
+class RobotsRules:
+    """Compiled Allow/Disallow rules for one user-agent group.
+
+    Rules live in a character trie keyed by their literal prefix, so a
+    lookup walks the URL path once instead of scanning every rule. Rules
+    with `*` or a trailing `$` hang off the node of their literal prefix
+    and are only tried when the path reaches it. The longest matching rule
+    wins and Allow wins a tie, as RFC 9309 specifies.
+    """
+
+    def __init__(
+        self,
+        rules: list[tuple[bool, str]] | None = None,
+        crawl_delay: float | None = None,
+        sitemaps: list[str] | None = None,
+    ):
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+        self.rule_count = 0
+        self._root = _Node()
+        for allow, pattern in rules or []:
+            self._add(allow, pattern)
+
+    @classmethod
+    def parse(cls, text: str, user_agent: str = "*") -> RobotsRules:
+        """Compile the group for `user_agent`, falling back to the `*` group."""
+        agent = user_agent.lower()
+        groups: dict[str, tuple[list[tuple[bool, str]], list[float]]] = {}
+        sitemaps: list[str] = []
+        current: list[str] = []
+        in_agents = False
+
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            field, value = (part.strip() for part in line.split(":", 1))
+            field = field.lower()
+            if field == "user-agent":
+                if not in_agents:
+                    current = []
+                    in_agents = True
+                current.append(value.lower())
+                continue
+            if field == "sitemap":
+                if value:
+                    sitemaps.append(value)
+                continue
+            in_agents = False
+            for name in current:
+                rules, delays = groups.setdefault(name, ([], []))
+                if field in ("allow", "disallow") and value:
+                    rules.append((field == "allow", value))
+                elif field == "crawl-delay":
+                    try:
+                        delays.append(float(value))
+                    except ValueError:
+                        pass
+
+        rules, delays = groups.get(agent) or groups.get("*") or ([], [])
+        return cls(rules, crawl_delay=delays[0] if delays else None, sitemaps=sitemaps)
+
+    def _add(self, allow: bool, pattern: str) -> None:
+        if not pattern.startswith("/") and not pattern.startswith("*"):
+            pattern = "/" + pattern
+        anchored = pattern.endswith("$")
+        body = pattern[:-1] if anchored else pattern
+        pieces = [_normalize_path(piece) for piece in body.split("*")]
+        literal = pieces[0]
+
+        node = self._root
+        for char in literal:
+            node = node.children.setdefault(char, _Node())
+
+        if len(pieces) == 1 and not anchored:
+            # Same path listed as both Allow and Disallow: Allow wins
+            node.allow = allow if node.allow is None else node.allow or allow
+        else:
+            regex = re.compile(".*".join(re.escape(p) for p in pieces) + ("$" if anchored else ""))
+            length = len("*".join(pieces)) + anchored
+            node.wildcards.append((length, allow, regex))
+        self.rule_count += 1
+
+    def is_allowed(self, path: str) -> bool:
+        """Verdict for a normalized path (with query), e.g. from `can_fetch`."""
+        best_length = -1
+        best_allow = True
+        node = self._root
+        depth = 0
+        while True:
+            if node.allow is not None and (
+                depth > best_length or (depth == best_length and node.allow)
+            ):
+                best_length, best_allow = depth, node.allow
+            for length, allow, regex in node.wildcards:
+                if (length > best_length or (length == best_length and allow)) and regex.match(path):
+                    best_length, best_allow = length, allow
+            if depth == len(path):
+                break
+            child = node.children.get(path[depth])
+            if child is None:
+                break
+            node = child
+            depth += 1
+        return best_allow
 
     def can_fetch(self, url: str) -> bool:
-        try:
-            return self.parser.can_fetch("*", url)
-        except Exception:
+        path = _url_path(url)
+        if path == "/robots.txt":
             return True
+        return self.is_allowed(path)
 
-    def get_sitemaps(self) -> list[str]:
-        sitemaps = self.parser.site_maps()
-        if sitemaps:
-            return list(sitemaps)
-        return [f"{self.base_url}/sitemap.xml"]
 
+@dataclass
+class _CacheEntry:
+    rules: RobotsRules
+    expires_at: float
 
-class SitemapParser:
-    def __init__(self, http_client: HttpClient):
-        self.http_client = http_client
 
-    def parse(self, sitemap_url: str) -> list[str]:
-        urls: list[str] = []
-        visited: set[str] = set()
-        self._parse_recursive(sitemap_url, urls, visited, depth=0)
-        return urls
+class RobotsCache:
+    """Process-wide robots.txt cache keyed by host (scheme and authority).
 
-    def _parse_recursive(
-        self, sitemap_url: str, urls: list[str], visited: set[str], depth: int, max_depth: int = 10
+    Every source on a host shares one download and one compiled rule set.
+    An entry lives for the response's Cache-Control max-age, capped at
+    `ttl`; failed fetches are retried after `error_ttl`. With a `store`,
+    entries survive restarts and are shared by every worker using it.
+    Concurrent misses for one host wait for a single download.
+    """
+
+    def __init__(
+        self,
+        http_client: HttpClient,
+        store: RobotsStore | None = None,
+        ttl: float = DEFAULT_ROBOTS_TTL,
+        error_ttl: float = DEFAULT_ROBOTS_ERROR_TTL,
+        user_agent: str = "*",
+        clock: Callable[[], float] = time.time,
     ):
-        if sitemap_url in visited:
-            return
-        visited.add(sitemap_url)
+        self.http_client = http_client
+        self.store = store
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.user_agent = user_agent
+        self._clock = clock
+        self._entries: dict[str, _CacheEntry] = {}
+        self._host_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, base_url: str) -> RobotsRules:
+        host = base_url.rstrip("/").lower()
+        entry = self._fresh(host)
+        if entry is not None:
+            return entry.rules
+
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            # Another thread may have loaded it while we waited
+            entry = self._fresh(host) or self._load_stored(host) or self._download(host)
+            with self._lock:
+                self._entries[host] = entry
+            return entry.rules
 
-        if depth >= max_depth:
-            logger.warning(f"Max sitemap depth ({max_depth}) reached at: {sitemap_url}")
-            return
+    def _fresh(self, host: str) -> _CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(host)
+        if entry is not None and entry.expires_at > self._clock():
+            return entry
+        return None
 
+    def _load_stored(self, host: str) -> _CacheEntry | None:
+        if self.store is None:
+            return None
         try:
-            content, status_code, _ = self.http_client.download(sitemap_url)
-            if status_code != 200 or not content:
-                return
-
-            root = etree.fromstring(content.encode('utf-8', errors='replace'))
-            ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-
-            # Handle sitemap index (nested sitemaps)
-            sitemap_refs = root.xpath(
-                "//sm:sitemap/sm:loc/text()", namespaces=ns
-            ) or root.xpath("//sitemap/loc/text()")
-            for ref in sitemap_refs:
-                self._parse_recursive(ref, urls, visited, depth + 1, max_depth)
-
-            # Extract URLs
-            found_urls = root.xpath(
-                "//sm:url/sm:loc/text()", namespaces=ns
-            ) or root.xpath("//url/loc/text()")
-            urls.extend(found_urls)
+            record = self.store.get(host)
         except Exception as e:
-            logger.warning(f"Failed to parse sitemap {sitemap_url}: {e}")
+            logger.warning(f"Could not read cached robots.txt for {host}: {e}")
+            return None
+        if record is None or record.expires_at.timestamp() <= self._clock():
+            return None
+        logger.debug(f"Using stored robots.txt for {host}")
+        return _CacheEntry(self._compile(record.status_code, record.body), record.expires_at.timestamp())
+
+    def _download(self, host: str) -> _CacheEntry:
+        now = self._clock()
+        try:
+            fetched = self.http_client.fetch_resource(f"{host}/robots.txt")
+        except Exception as e:
+            logger.debug(f"Failed to load robots.txt: {e}")
+            return _CacheEntry(RobotsRules(), now + self.error_ttl)
+
+        status_code, body = fetched.status_code, fetched.content
+        if status_code is None or status_code >= 500:
+            ttl = self.error_ttl
+        elif fetched.max_age is not None:
+            ttl = min(fetched.max_age, self.ttl)
+        else:
+            ttl = self.ttl
+        rules = self._compile(status_code, body)
+        if status_code == 200:
+            logger.info(f"Loaded robots.txt for {host} ({rules.rule_count} rules, crawl-delay: {rules.crawl_delay})")
+        else:
+            logger.debug(f"No robots.txt found for {host}")
+
+        if self.store is not None:
+            record = RobotsRecord(
+                host=host,
+                status_code=status_code,
+                body=body if status_code == 200 else None,
+                fetched_at=datetime.fromtimestamp(now, timezone.utc),
+                expires_at=datetime.fromtimestamp(now + ttl, timezone.utc),
+            )
+            try:
+                self.store.save(record)
+            except Exception as e:
+                logger.warning(f"Could not store robots.txt for {host}: {e}")
+        return _CacheEntry(rules, now + ttl)
+
+    def _compile(self, status_code: int | None, body: str | None) -> RobotsRules:
+        # Anything but a readable 200 means no restrictions
+        if status_code == 200 and body:
+            return RobotsRules.parse(body, self.user_agent)
+        return RobotsRules()
+
+
+class RobotsHandler:
+    """robots.txt rules for one site as a crawl run uses them."""
+
+    def __init__(self, base_url: str, http_client: HttpClient, cache: RobotsCache | None = None):
+        self.base_url = base_url
+        self.http_client = http_client
+        cache = cache or RobotsCache(http_client)
+        self.rules = cache.get(base_url)
+        self.crawl_delay: float | None = self.rules.crawl_delay
+
+    def can_fetch(self, url: str) -> bool:
+        try:
+            return self.rules.can_fetch(url)
+        except Exception:
+            return True
+
+    def get_sitemaps(self) -> list[str]:
+        if self.rules.sitemaps:
+            return list(self.rules.sitemaps)
+        return [f"{self.base_url}/sitemap.xml"]
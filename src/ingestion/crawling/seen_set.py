@@ -0,0 +1,107 @@
+import base64
+import math
+from dataclasses import dataclass
+
+
+@dataclass
+class SeenSetStats:
+    """Counters reported by `UrlSeenSet`."""
+
+    checked: int
+    hits: int
+    added: int
+    size_bytes: int
+    estimated_false_positive_rate: float
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.checked if self.checked else 0.0
+
+
+class UrlSeenSet:
+    """Bloom filter over `url_hash` values for in-process frontier dedupe.
+
+    A hit means the URL was *probably* seen before; a miss is always exact.
+    False positives drop a genuinely new link, so size the filter for the
+    number of distinct URLs a run is expected to discover. At the default
+    1% error rate the filter costs about 1.2 bytes per URL.
+
+    Not thread-safe: only the persisting stage should call `add`.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """Initialize an empty filter.
+
+        Args:
+            capacity: Number of distinct URLs the filter is sized for.
+            error_rate: Target false-positive rate once `capacity` URLs are added.
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+
+        num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._num_bits = max(8, num_bits)
+        self._num_hashes = max(1, round(self._num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self._num_bits + 7) // 8)
+        self._bits_set = 0
+        self._checked = 0
+        self._hits = 0
+        self._added = 0
+
+    def _positions(self, url_hash: str) -> list[int]:
+        # url_hash is already 128 bits of SHA-256, so its two 64-bit halves
+        # give independent hashes for double hashing without hashing again
+        digest = base64.urlsafe_b64decode(url_hash + "==")
+        h1 = int.from_bytes(digest[:8])
+        h2 = int.from_bytes(digest[8:16]) | 1
+        return [(h1 + i * h2) % self._num_bits for i in range(self._num_hashes)]
+
+    def __contains__(self, url_hash: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(url_hash))
+
+    def add(self, url_hash: str) -> bool:
+        """Record a URL hash.
+
+        Args:
+            url_hash: Hash of the canonical URL (see `hash_canonical`).
+
+        Returns:
+            True if the hash was not (probably) seen before, False on a hit.
+        """
+        self._checked += 1
+        new = False
+        for p in self._positions(url_hash):
+            mask = 1 << (p & 7)
+            if not self._bits[p >> 3] & mask:
+                self._bits[p >> 3] |= mask
+                self._bits_set += 1
+                new = True
+        if new:
+            self._added += 1
+        else:
+            self._hits += 1
+        return new
+
+    def update(self, url_hashes) -> None:
+        """Pre-warm the filter without counting the hashes as lookups.
+
+        Args:
+            url_hashes: Iterable of URL hashes already known to the run.
+        """
+        checked, hits = self._checked, self._hits
+        for h in url_hashes:
+            self.add(h)
+        self._checked, self._hits = checked, hits
+
+    def stats(self) -> SeenSetStats:
+        """Return lookup counters and the current estimated false-positive rate."""
+        fill = self._bits_set / self._num_bits
+        return SeenSetStats(
+            checked=self._checked,
+            hits=self._hits,
+            added=self._added,
+            size_bytes=len(self._bits),
+            estimated_false_positive_rate=fill**self._num_hashes,
+        )
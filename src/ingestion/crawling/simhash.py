@@ -0,0 +1,138 @@
+import hashlib
+import re
+import string
+import threading
+from array import array
+
+FINGERPRINT_BITS = 64
+_MASK = (1 << FINGERPRINT_BITS) - 1
+
+# skip_reason of page rows whose body was dropped as a near-duplicate
+NEAR_DUPLICATE = "near_duplicate"
+
+# Markup and the text of scripts and styles carry no page content
+_MARKUP = re.compile(r"<(script|style)\b.*?</\1\s*>|<!--.*?-->|<[^>]*>", re.IGNORECASE | re.DOTALL)
+# ASCII punctuation separates words; str.split is much faster than a \w+ regex
+_PUNCTUATION = str.maketrans({char: " " for char in string.punctuation})
+
+_FEATURE_BYTES = FINGERPRINT_BITS // 8
+
+
+def simhash(html: str, shingle_size: int = 3, min_shingles: int = 16) -> int | None:
+    """64-bit SimHash of a page's visible text.
+
+    Features are the runs of `shingle_size` lowercased words, weighted by
+    how often they occur. A shingle's hash XORs one BLAKE2b-derived hash
+    per word and position, so the fingerprint is stable across processes,
+    runs and platforms. Pages whose text differs in a few places get
+    fingerprints a few bits apart.
+
+    Args:
+        html: Page body.
+        shingle_size: Words per feature.
+        min_shingles: Pages with fewer features return None; their
+            fingerprints are too coarse to compare.
+
+    Returns:
+        The fingerprint as an unsigned integer, or None for short pages.
+    """
+    if shingle_size < 1:
+        raise ValueError(f"shingle_size must be at least 1, got {shingle_size}")
+    words = _MARKUP.sub(" ", html).lower().translate(_PUNCTUATION).split()
+    count = len(words) - shingle_size + 1
+    if count < max(min_shingles, 1):
+        return None
+
+    # Every distinct word is hashed once, into one 8-byte lane per shingle
+    # position. Lane k of all words, offset by k, lines up with shingle
+    # starts, so XORing the lanes as big integers hashes every shingle at
+    # once instead of word by word.
+    digest_size = _FEATURE_BYTES * shingle_size
+    digests = {word: hashlib.blake2b(word.encode(), digest_size=digest_size).digest() for word in set(words)}
+    lanes = array("Q")
+    lanes.frombytes(b"".join(map(digests.__getitem__, words)))
+    combined = 0
+    for k in range(shingle_size):
+        lane = lanes[k::shingle_size][k:k + count]
+        combined ^= int.from_bytes(lane.tobytes(), "little")
+
+    # Bit 8i+j of the fingerprint is set when most features have bit j set
+    # in their byte i; masks pick bit j out of every byte of a column
+    features = combined.to_bytes(count * _FEATURE_BYTES, "little")
+    masks = [int.from_bytes(bytes([1 << j]) * count, "little") for j in range(8)]
+    half = count // 2
+    fingerprint = 0
+    for i in range(_FEATURE_BYTES):
+        column = int.from_bytes(features[i::_FEATURE_BYTES], "little")
+        for j, mask in enumerate(masks):
+            if (column & mask).bit_count() > half:
+                fingerprint |= 1 << (8 * i + j)
+    return fingerprint
+
+
+def to_signed(fingerprint: int) -> int:
+    """The fingerprint as a signed 64-bit integer, the way bigint columns store it."""
+    return fingerprint - (1 << FINGERPRINT_BITS) if fingerprint >> (FINGERPRINT_BITS - 1) else fingerprint
+
+
+class NearDuplicateIndex:
+    """Finds pages whose SimHash is within `max_distance` bits of an earlier page.
+
+    Two fingerprints at most k bits apart agree exactly on at least one of
+    k + 1 bands (pigeonhole), so each fingerprint is filed under its k + 1
+    band values and a lookup compares only the pages sharing a band. At the
+    default distance of 3 the bands are 16 bits wide, which keeps candidate
+    lists short well past a million pages. Memory is bounded by
+    `max_entries`; past it, pages are still checked but no longer added.
+
+    Thread-safe: fetch workers check pages concurrently.
+    """
+
+    def __init__(self, max_distance: int = 3, max_entries: int = 200_000) -> None:
+        """Initialize an empty index.
+
+        Args:
+            max_distance: Most differing bits for two pages to count as near-duplicates.
+            max_entries: Most fingerprints kept.
+        """
+        if not 0 <= max_distance < FINGERPRINT_BITS // 2:
+            raise ValueError(f"max_distance must be between 0 and {FINGERPRINT_BITS // 2 - 1}, got {max_distance}")
+        if max_entries < 0:
+            raise ValueError(f"max_entries must not be negative, got {max_entries}")
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        bands = max_distance + 1
+        # (shift, mask) per band; the first FINGERPRINT_BITS % bands bands get a spare bit
+        width, spare = divmod(FINGERPRINT_BITS, bands)
+        self._bands: list[tuple[int, int]] = []
+        shift = 0
+        for band in range(bands):
+            bits = width + (band < spare)
+            self._bands.append((shift, (1 << bits) - 1))
+            shift += bits
+        self._tables: list[dict[int, list[tuple[int, str]]]] = [{} for _ in range(bands)]
+        self._entries = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def check(self, fingerprint: int, key: str) -> str | None:
+        """Return the key of an earlier near-duplicate, or record this page and return None.
+
+        Args:
+            fingerprint: The page's SimHash (signed or unsigned).
+            key: What identifies the page, e.g. its URL; returned for later matches.
+        """
+        fingerprint &= _MASK
+        bands = [(fingerprint >> shift) & mask for shift, mask in self._bands]
+        with self._lock:
+            for table, band in zip(self._tables, bands):
+                for other, other_key in table.get(band, ()):
+                    if (fingerprint ^ other).bit_count() <= self.max_distance:
+                        return other_key
+            if self._entries < self.max_entries:
+                for table, band in zip(self._tables, bands):
+                    table.setdefault(band, []).append((fingerprint, key))
+                self._entries += 1
+        return None
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import gzip
+import io
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from typing import IO, Iterator
+
+from lxml import etree
+
+from src.ingestion.crawling.http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+# The sitemap protocol caps a file at 50 MiB uncompressed, well above the
+# page limit, and gzip files are checked against it after decompression
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_SITEMAP_WORKERS = 4
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+@dataclass(frozen=True)
+class SitemapEntry:
+    """A `<url>` from a sitemap with the hints published alongside it."""
+
+    url: str
+    lastmod: datetime | None = None
+    priority: float | None = None
+
+
+class SitemapParser:
+    """Streams URLs out of a sitemap tree.
+
+    Child sitemaps of an index are downloaded concurrently on a small thread
+    pool, and each document is parsed incrementally with `iterparse`,
+    clearing elements once read, so memory stays flat however many URLs a
+    sitemap lists. Plain and gzipped (`.xml.gz`) sitemaps are both accepted.
+    """
+
+    def __init__(
+        self,
+        http_client: HttpClient,
+        max_workers: int = DEFAULT_SITEMAP_WORKERS,
+        max_depth: int = 10,
+        max_bytes: int = SITEMAP_MAX_BYTES,
+    ):
+        self.http_client = http_client
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+
+    def parse(self, sitemap_url: str) -> list[str]:
+        return [entry.url for entry in self.iter_entries([sitemap_url])]
+
+    def iter_entries(self, sitemap_urls: list[str]) -> Iterator[SitemapEntry]:
+        """Yield entries from every sitemap reachable from `sitemap_urls`.
+
+        Entries come out as soon as their document is downloaded, in
+        completion order. Closing the generator early cancels pending downloads.
+        """
+        visited: set[str] = set()
+        pending: dict[Future, tuple[str, int]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sitemap") as pool:
+
+            def submit(url: str, depth: int) -> None:
+                if url in visited:
+                    return
+                visited.add(url)
+                if depth >= self.max_depth:
+                    logger.warning(f"Max sitemap depth ({self.max_depth}) reached at: {url}")
+                    return
+                pending[pool.submit(self._download, url)] = (url, depth)
+
+            try:
+                for url in sitemap_urls:
+                    submit(url, 0)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url, depth = pending.pop(future)
+                        data = future.result()
+                        if data is None:
+                            continue
+                        for kind, value in self._iterparse(data, url):
+                            if kind == "sitemap":
+                                submit(value, depth + 1)
+                            else:
+                                yield value
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _download(self, url: str) -> bytes | None:
+        try:
+            data, status_code, error = self.http_client.download_bytes(url, max_bytes=self.max_bytes)
+        except Exception as e:
+            logger.warning(f"Failed to download sitemap {url}: {e}")
+            return None
+        if status_code != 200 or not data:
+            if error:
+                logger.debug(f"No sitemap at {url}: {error}")
+            return None
+        return data
+
+    def _iterparse(self, data: bytes, url: str) -> Iterator[tuple[str, SitemapEntry | str]]:
+        """Yield ("sitemap", loc) for index entries and ("url", entry) for pages."""
+        source = self._open(data)
+        try:
+            for _, elem in etree.iterparse(
+                source,
+                events=("end",),
+                resolve_entities=False,
+                no_network=True,
+                huge_tree=True,
+            ):
+                kind = etree.QName(elem).localname if isinstance(elem.tag, str) else None
+                if kind not in ("url", "sitemap"):
+                    continue
+                loc = _child_text(elem, "loc")
+                if loc:
+                    if kind == "sitemap":
+                        yield kind, loc
+                    else:
+                        yield kind, SitemapEntry(
+                            url=loc,
+                            lastmod=_parse_lastmod(_child_text(elem, "lastmod")),
+                            priority=_parse_priority(_child_text(elem, "priority")),
+                        )
+                # Drop the finished element and any siblings before it
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        except (etree.XMLSyntaxError, OSError, EOFError) as e:
+            # Entries read before the error have already been yielded
+            logger.warning(f"Failed to parse sitemap {url}: {e}")
+
+    def _open(self, data: bytes) -> IO[bytes]:
+        if data[:2] == _GZIP_MAGIC:
+            return _LimitedReader(gzip.GzipFile(fileobj=io.BytesIO(data)), self.max_bytes)
+        return io.BytesIO(data)
+
+
+class _LimitedReader(io.RawIOBase):
+    """Fails a read once more than `limit` bytes came out of `raw` (gzip bombs)."""
+
+    def __init__(self, raw: IO[bytes], limit: int):
+        self._raw = raw
+        self._remaining = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self._remaining -= len(data)
+        if self._remaining < 0:
+            raise OSError("decompressed sitemap exceeds the size limit")
+        return data
+
+
+def _child_text(elem, name: str) -> str | None:
+    for child in elem:
+        if isinstance(child.tag, str) and etree.QName(child).localname == name:
+            return child.text.strip() if child.text else None
+    return None
+
+
+def _parse_lastmod(value: str | None) -> datetime | None:
+    """W3C datetime: a date, or a date and time with a timezone designator."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _parse_priority(value: str | None) -> float | None:
+    try:
+        priority = float(value) if value else None
+    except ValueError:
+        return None
+    if priority is None or not 0.0 <= priority <= 1.0:
+        return None
+    return priority
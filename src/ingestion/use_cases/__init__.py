@@ -1,3 +1,4 @@
 from .crawl import CrawlUseCase, CrawlResult
+from .scheduler import CrawlScheduler
 
-__all__ = ["CrawlUseCase", "CrawlResult"]
+__all__ = ["CrawlUseCase", "CrawlResult", "CrawlScheduler"]
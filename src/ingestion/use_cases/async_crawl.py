@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from src.ingestion.crawling import AsyncDomainRateLimiter, AsyncHttpClient, FetchResult
+from src.ingestion.use_cases.results import CrawlResult, ItemResult
+from src.ingestion.use_cases.write_buffer import WriteBuffer
+
+if TYPE_CHECKING:
+    from src.ingestion.use_cases.crawl import CrawlUseCase
+
+logger = logging.getLogger(__name__)
+
+# Repository calls stay synchronous; a few threads are enough to keep them
+# off the event loop because they are issued once per batch, not per URL.
+DB_WORKERS = 4
+
+# Markers passed through the stage queues
+_STOP = object()
+_FLUSH = object()
+
+
+class AsyncCrawlEngine:
+    """Streaming claim -> fetch -> persist pipeline on one event loop.
+
+    Mirrors `ThreadedCrawlEngine` with tasks instead of threads: a claimer
+    task keeps up to `prefetch` claimed items buffered, a dispatcher starts a
+    fetch task per item while fewer than `concurrency` are in flight, and a
+    persister task writes finished items behind them by count, bytes or age
+    (`flush_size` / `flush_bytes` / `flush_interval`) on a database thread.
+    Persistence never blocks claiming or fetching; at most `max_buffered`
+    finished pages, and about `max_buffered_bytes` of them, wait for it
+    before fetch tasks block.
+    """
+
+    def __init__(self, use_case: CrawlUseCase, http_client: AsyncHttpClient):
+        self.use_case = use_case
+        self.http_client = http_client
+
+    def run(self, source, run, robots) -> CrawlResult:
+        return asyncio.run(self._run(source, run, robots))
+
+    async def _run(self, source, run, robots) -> CrawlResult:
+        uc = self.use_case
+        rate_limiter = AsyncDomainRateLimiter(
+            default_delay=uc.delay,
+            adaptive=uc.adaptive_delay,
+            max_connections=uc.host_connections,
+            max_delay=uc.max_delay,
+        )
+        rate_limiter.set_delay(uc._domain, uc._domain_delay(robots), uc._min_domain_delay(robots))
+
+        self._loop = asyncio.get_running_loop()
+        self._db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="crawl-db")
+        self._ready: asyncio.Queue = asyncio.Queue(maxsize=uc.prefetch)
+        self._results: asyncio.Queue = asyncio.Queue(maxsize=uc.max_buffered)
+        self._in_flight: set[asyncio.Task] = set()
+        self._pending = WriteBuffer(uc.flush_size, uc.flush_bytes, uc.flush_interval)
+        # Guards the claimed-but-not-yet-persisted count, the bytes of
+        # finished items not yet persisted and the flush generation
+        self._progress = asyncio.Condition()
+        self._outstanding = 0
+        self._buffered_bytes = 0
+        self._flushes = 0
+        self._pages_crawled = 0
+        self._pages_failed = 0
+
+        stages = [
+            asyncio.create_task(self._claim_loop(source, run), name="crawl-claimer"),
+            asyncio.create_task(self._dispatch_loop(source, run, robots, rate_limiter), name="crawl-dispatcher"),
+            asyncio.create_task(self._persist_loop(), name="crawl-persister"),
+        ]
+        completed = False
+        try:
+            async with self.http_client:
+                await asyncio.gather(*stages)
+            completed = True
+        finally:
+            pending = stages + list(self._in_flight)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if not completed:
+                await self._release_unprocessed()
+            self._db_executor.shutdown(wait=True)
+
+        return CrawlResult(pages_crawled=self._pages_crawled, pages_failed=self._pages_failed)
+
+    async def _db(self, fn, *args):
+        return await self._loop.run_in_executor(self._db_executor, fn, *args)
+
+    async def _claim_loop(self, source, run) -> None:
+        uc = self.use_case
+        claimed = 0
+        while True:
+            budget = uc.max_pages - claimed
+            if budget <= 0:
+                logger.info(f"Reached max pages limit ({uc.max_pages}), stopping crawl")
+                break
+
+            generation = self._flushes
+            items = await self._db(uc._claim, run, source, min(uc.batch_size, budget))
+            if items:
+                claimed += len(items)
+                self._outstanding += len(items)
+                for item in items:
+                    await self._ready.put(item)
+                continue
+
+            # Queue is dry. Once nothing is outstanding here and no flush
+            # has landed since the claim, the run is done unless other
+            # workers still hold items that may queue more links: poll.
+            # Otherwise ask for an early flush (its links may refill the
+            # queue) and retry after it lands.
+            if self._outstanding == 0 and self._flushes == generation:
+                if await self._db(uc._run_finished, run):
+                    break
+                await asyncio.sleep(uc.idle_poll_interval)
+                continue
+            await self._results.put(_FLUSH)
+            async with self._progress:
+                try:
+                    await asyncio.wait_for(
+                        self._progress.wait_for(lambda g=generation: self._flushes != g),
+                        timeout=uc.flush_interval,
+                    )
+                except TimeoutError:
+                    pass
+
+        await self._ready.put(_STOP)
+
+    async def _dispatch_loop(self, source, run, robots, rate_limiter: AsyncDomainRateLimiter) -> None:
+        slots = asyncio.Semaphore(self.use_case.concurrency)
+        while True:
+            item = await self._ready.get()
+            if item is _STOP:
+                break
+            await slots.acquire()
+            task = asyncio.create_task(self._fetch(item, source, run, robots, rate_limiter, slots))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight)
+        await self._results.put(_STOP)
+
+    async def _fetch(
+        self,
+        item,
+        source,
+        run,
+        robots,
+        rate_limiter: AsyncDomainRateLimiter,
+        slots: asyncio.Semaphore,
+    ) -> None:
+        try:
+            try:
+                result = await self._process_item(item, source, run, robots, rate_limiter)
+            except Exception as e:
+                logger.exception(f"Error processing {item.url}")
+                result = ItemResult(item=item, page=None, error=str(e))
+            # The slot stays taken until the result is handed over, so a
+            # persister that falls behind stops new fetches from starting
+            await self._reserve(result.size)
+            await self._results.put(result)
+        finally:
+            slots.release()
+
+    async def _reserve(self, size: int) -> None:
+        """Wait until the finished-but-unpersisted bytes leave room for `size`.
+
+        A result larger than the whole ceiling still goes through once
+        nothing else is buffered.
+        """
+        ceiling = self.use_case.max_buffered_bytes
+        async with self._progress:
+            await self._progress.wait_for(
+                lambda: not self._buffered_bytes or self._buffered_bytes + size <= ceiling
+            )
+            self._buffered_bytes += size
+
+    async def _process_item(
+        self,
+        item,
+        source,
+        run,
+        robots,
+        rate_limiter: AsyncDomainRateLimiter,
+    ) -> ItemResult:
+        validators = self.use_case._take_validators(item)
+        if validators is not None and validators.is_fresh():
+            fetched = FetchResult.still_fresh(validators)
+        else:
+            fetched = await self._fetch_page(item.url, validators, rate_limiter)
+        # Hashing, link extraction and robots checks are CPU-bound; keep them
+        # off the loop so large pages don't stall every other fetch
+        return await asyncio.to_thread(
+            self.use_case._build_result, item, source, run, robots, fetched, validators
+        )
+
+    async def _fetch_page(self, url: str, validators, rate_limiter: AsyncDomainRateLimiter) -> FetchResult:
+        uc = self.use_case
+        domain = uc._urls.canonicalize(url).domain
+        with uc._timed("rate_limit_wait"):
+            await rate_limiter.acquire(domain)
+        started = time.monotonic()
+        fetched = None
+        try:
+            with uc._fetching(), uc._timed("fetch"):
+                fetched = await self.http_client.fetch(url, validators)
+            uc._count_fetch(domain, fetched)
+            return fetched
+        finally:
+            if fetched is None:
+                rate_limiter.release(domain)
+            else:
+                rate_limiter.release(
+                    domain, time.monotonic() - started, fetched.overloaded, fetched.retry_after
+                )
+
+    async def _persist_loop(self) -> None:
+        uc = self.use_case
+        buffer = self._pending
+        stopping = False
+        # The claimer found the queue dry: flush whatever arrives next
+        flush_requested = False
+
+        while not stopping or buffer:
+            if not stopping:
+                try:
+                    value = await asyncio.wait_for(self._results.get(), timeout=buffer.wait_time())
+                except TimeoutError:
+                    value = None
+
+                if value is _STOP:
+                    stopping = True
+                elif value is _FLUSH:
+                    flush_requested = True
+                elif value is not None:
+                    buffer.add(value)
+
+            if not buffer:
+                continue
+            if not (flush_requested or stopping or buffer.due()):
+                continue
+
+            batch_bytes = buffer.size
+            batch = buffer.take()
+            flush_requested = False
+            crawled, failed = await self._db(uc._persist_batch, batch)
+            self._pages_crawled += crawled
+            self._pages_failed += failed
+            async with self._progress:
+                self._outstanding -= len(batch)
+                self._buffered_bytes -= batch_bytes
+                self._flushes += 1
+                self._progress.notify_all()
+
+    async def _release_unprocessed(self) -> None:
+        """Drain the stage buffers after an abort.
+
+        Finished items are written if the database still takes them; the
+        rest are failed, so none stay `processing` until `reset_stale` picks
+        them up. Best effort: the abort may itself be a database failure.
+        """
+        finished = self._pending.take()
+        leftovers = []
+        for q in (self._ready, self._results):
+            while not q.empty():
+                value = q.get_nowait()
+                if isinstance(value, ItemResult):
+                    finished.append(value)
+                elif value is not _STOP and value is not _FLUSH:
+                    leftovers.append(value)
+
+        if finished:
+            try:
+                await self._db(self.use_case._persist_batch, finished)
+                logger.info(f"Wrote {len(finished)} finished items after abort")
+            except Exception:
+                leftovers.extend(result.item for result in finished)
+
+        if not leftovers:
+            return
+        failures = [(item.id, "Crawl aborted before the item was persisted") for item in leftovers]
+        try:
+            await self._db(self.use_case.queue_repo.fail_many, failures)
+            logger.info(f"Released {len(leftovers)} unprocessed queue items after abort")
+        except Exception:
+            logger.warning(f"Could not release {len(leftovers)} queue items after abort")
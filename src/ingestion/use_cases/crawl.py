@@ -1,38 +1,79 @@
 from __future__ import annotations
 
-import hashlib
+import itertools
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Executor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import Literal
 
 from src.domain.models import (
     CrawlRunCreate,
     CrawlSourceCreate,
     CrawledPageCreate,
+    PageHistory,
+    PageValidators,
+    QueueItem,
     QueueItemCreate,
+    RunStatsDelta,
 )
 from src.domain.ports import (
+    BlobStore,
     CrawledPageRepository,
     QueueRepository,
     RunRepository,
     SourceRepository,
 )
-from src.domain.rules import extract_domain, get_base_url, normalize_url, url_hash
+from src.domain.rules import (
+    CARRIED_FORWARD,
+    BestFirstScorer,
+    PriorityScorer,
+    RecrawlPolicy,
+    UrlCanonicalizer,
+    extract_domain,
+    get_base_url,
+)
 from src.ingestion.crawling import (
-    DomainRateLimiter,
+    AsyncHttpClient,
+    CrawlMetrics,
+    FetchBudget,
+    FetchResult,
+    FrontierPriorities,
     HttpClient,
+    NearDuplicateIndex,
+    PageAnalysis,
+    RobotsCache,
     RobotsHandler,
+    SitemapEntry,
     SitemapParser,
-    extract_links,
+    UrlSeenSet,
+    analyze_page,
+    create_analysis_pool,
 )
+from src.ingestion.crawling.simhash import NEAR_DUPLICATE, to_signed
+from src.ingestion.use_cases.async_crawl import AsyncCrawlEngine
+from src.ingestion.use_cases.results import CrawlResult, ItemResult, page_bytes
+from src.ingestion.use_cases.run_stats import RunStatsAggregator
+from src.ingestion.use_cases.threaded_crawl import ThreadedCrawlEngine
+from src.ingestion.use_cases.write_buffer import chunked
 
 logger = logging.getLogger(__name__)
 
+EngineType = Literal["threads", "async"]
+CpuStage = Literal["threads", "processes"]
+
+# Queue rows inserted per request while seeding from sitemaps or adding
+# discovered links
+SEED_CHUNK_SIZE = 1000
 
-@dataclass
-class CrawlResult:
-    pages_crawled: int
-    pages_failed: int
+# Default write-behind sizing: rows and bytes per page insert, and the
+# payload held in memory before fetchers block
+FLUSH_SIZE = 100
+FLUSH_BYTES = 4 * 1024 * 1024
+MAX_BUFFERED_BYTES = 64 * 1024 * 1024
 
 
 class CrawlUseCase:
@@ -43,24 +84,175 @@ class CrawlUseCase:
         page_repo: CrawledPageRepository,
         queue_repo: QueueRepository,
         http_client: HttpClient,
+        blob_store: BlobStore | None = None,
+        robots_cache: RobotsCache | None = None,
         worker_id: str = "default",
         delay: float = 0.5,
+        adaptive_delay: bool = False,
+        min_delay: float = 0.05,
+        max_delay: float = 30.0,
+        host_connections: int | None = None,
+        fetch_budget: FetchBudget | None = None,
         batch_size: int = 10,
         max_depth: int = 10,
         max_pages: int = 1000,
         concurrency: int = 5,
+        engine: EngineType = "threads",
+        async_http_client: AsyncHttpClient | None = None,
+        prefetch: int | None = None,
+        flush_size: int = FLUSH_SIZE,
+        flush_interval: float = 1.0,
+        flush_bytes: int = FLUSH_BYTES,
+        max_buffered: int = 500,
+        max_buffered_bytes: int = MAX_BUFFERED_BYTES,
+        seen_capacity: int | None = None,
+        seen_error_rate: float = 0.01,
+        cpu_stage: CpuStage = "threads",
+        cpu_workers: int | None = None,
+        heartbeat_interval: float = 30.0,
+        stale_timeout_minutes: int = 2,
+        idle_poll_interval: float = 1.0,
+        stats_interval: float = 5.0,
+        metrics: CrawlMetrics | None = None,
+        priority_scorer: PriorityScorer | None = None,
+        incremental: bool = False,
+        recrawl_policy: RecrawlPolicy | None = None,
+        url_canonicalizer: UrlCanonicalizer | None = None,
+        near_duplicate_distance: int | None = None,
+        skip_duplicate_bodies: bool = False,
     ):
         self.source_repo = source_repo
         self.run_repo = run_repo
         self.page_repo = page_repo
         self.queue_repo = queue_repo
         self.http_client = http_client
+        # When set, bodies are stored once per content_hash instead of inline on every row
+        self.blob_store = blob_store
+        # Shared by every run of this use case, so sources on one host fetch robots.txt once
+        self.robots_cache = robots_cache or RobotsCache(http_client)
         self.worker_id = worker_id
         self.delay = delay
+        # Adaptive pacing starts at `delay` and moves between min_delay (or the
+        # robots.txt crawl-delay, if higher) and max_delay
+        self.adaptive_delay = adaptive_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        # In-flight requests allowed per host; None leaves only `concurrency`
+        self.host_connections = host_connections
+        # Process-wide cap on in-flight fetches shared with concurrent runs (serve)
+        self.fetch_budget = fetch_budget
         self.batch_size = batch_size
         self.max_depth = max_depth
         self.max_pages = max_pages
         self.concurrency = concurrency
+        self.engine = engine
+        self.async_http_client = async_http_client
+        if prefetch is None:
+            prefetch = 2 * concurrency
+        if seen_capacity is None:
+            # Most discovered links are duplicates, but a run still sees
+            # several distinct URLs for every page it crawls
+            seen_capacity = max(10 * max_pages, 10_000)
+        for name, value in (
+            ("concurrency", concurrency),
+            ("batch_size", batch_size),
+            ("prefetch", prefetch),
+            ("flush_size", flush_size),
+            ("flush_bytes", flush_bytes),
+            ("max_buffered", max_buffered),
+            ("seen_capacity", seen_capacity),
+            ("cpu_workers", 1 if cpu_workers is None else cpu_workers),
+            ("host_connections", 1 if host_connections is None else host_connections),
+        ):
+            if value < 1:
+                raise ValueError(f"{name} must be at least 1, got {value}")
+        if flush_interval <= 0:
+            raise ValueError(f"flush_interval must be positive, got {flush_interval}")
+        if stats_interval <= 0:
+            raise ValueError(f"stats_interval must be positive, got {stats_interval}")
+        if max_buffered_bytes < flush_bytes:
+            raise ValueError(
+                f"max_buffered_bytes must be at least flush_bytes ({flush_bytes}), got {max_buffered_bytes}"
+            )
+        if stale_timeout_minutes * 60 < 2 * heartbeat_interval:
+            raise ValueError(
+                "stale_timeout_minutes must cover at least two heartbeats, "
+                f"got {stale_timeout_minutes} min for a {heartbeat_interval}s heartbeat"
+            )
+        if fetch_budget is not None and engine != "threads":
+            raise ValueError("A shared fetch budget needs the threads engine")
+        if not 0 <= min_delay <= max_delay:
+            raise ValueError(f"need 0 <= min_delay <= max_delay, got {min_delay} and {max_delay}")
+        if not 0 < seen_error_rate < 1:
+            raise ValueError(f"seen_error_rate must be between 0 and 1, got {seen_error_rate}")
+        if skip_duplicate_bodies and near_duplicate_distance is None:
+            raise ValueError("skip_duplicate_bodies needs a near_duplicate_distance")
+        if near_duplicate_distance is not None:
+            # Validates the distance up front rather than at the first run
+            NearDuplicateIndex(near_duplicate_distance, max_entries=0)
+        # Claimed-but-unstarted items kept ready for idle workers
+        self.prefetch = prefetch
+        # Finished pages are written behind the fetchers once flush_size or
+        # flush_bytes of them accumulate, or the oldest has waited
+        # flush_interval seconds. Each insert stays within flush_size rows and
+        # about flush_bytes, independent of batch_size and page sizes.
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        # Upper bounds on finished pages held in memory awaiting a flush;
+        # fetchers block once either is reached
+        self.max_buffered = max_buffered
+        self.max_buffered_bytes = max_buffered_bytes
+        # Sizing of the per-run filter that drops already-queued links
+        # before they reach the database
+        self.seen_capacity = seen_capacity
+        self.seen_error_rate = seen_error_rate
+        self._seen: UrlSeenSet | None = None
+        # Queue priorities: claims take the highest first, so under max_pages
+        # the budget goes to the links the scorer ranks highest
+        self.priority_scorer = priority_scorer or BestFirstScorer()
+        self._frontier: FrontierPriorities | None = None
+        # Incremental runs fetch only the known URLs the policy thinks
+        # changed, plus URLs new to the source, and carry the rest forward
+        self.incremental = incremental
+        self.recrawl_policy = recrawl_policy or RecrawlPolicy()
+        # Rules that decide when two URLs are the same page; each run
+        # canonicalizes with its own copy, whose cache lives as long as the run
+        self.url_canonicalizer = url_canonicalizer or UrlCanonicalizer()
+        self._urls = self.url_canonicalizer
+        self._domain = ""
+        # When set, every page gets a SimHash, and a page within this many
+        # bits of one crawled earlier in the run is a near-duplicate: its
+        # links are not followed and, with skip_duplicate_bodies, its body
+        # is not stored. Each worker keeps its own index.
+        self.near_duplicate_distance = near_duplicate_distance
+        self.skip_duplicate_bodies = skip_duplicate_bodies
+        self._near_duplicates: NearDuplicateIndex | None = None
+        self._duplicate_lock = threading.Lock()
+        self._duplicate_counts: Counter[str] = Counter()
+        # Per-run state: validators loaded at claim time, keyed by url_hash
+        self._validators: dict[str, PageValidators] = {}
+        self._robots: RobotsHandler | None = None
+        self._stored_hashes: set[str] = set()
+        # Where hashing and link extraction run: in the fetch worker that
+        # downloaded the page, or in a process pool of cpu_workers processes
+        self.cpu_stage = cpu_stage
+        self.cpu_workers = cpu_workers
+        self._cpu_pool: Executor | None = None
+        # Several workers (processes or machines) may crawl one run. Each
+        # refreshes its claims every heartbeat_interval; claims older than
+        # stale_timeout_minutes belong to dead workers and are reclaimed.
+        # A worker whose queue runs dry polls every idle_poll_interval
+        # until no worker holds any item.
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_timeout_minutes = stale_timeout_minutes
+        self.idle_poll_interval = idle_poll_interval
+        self._last_stale_reset = float("-inf")
+        # Run counters are added to the run row every stats_interval seconds
+        self.stats_interval = stats_interval
+        self._stats: RunStatsAggregator | None = None
+        # Optional stage latencies and fetch counters, shared by concurrent runs
+        self.metrics = metrics
 
     def create_source(self, entry_url: str, source_type: str = "full_domain") -> None:
         source = CrawlSourceCreate(
@@ -71,23 +263,86 @@ class CrawlUseCase:
         created = self.source_repo.create(source)
         logger.info(f"Created source: {created.id} for {created.domain}")
 
-    def _process_item(
+    def _timed(self, stage: str):
+        """Time the block as `stage` when metrics are enabled."""
+        return self.metrics.time(stage) if self.metrics is not None else nullcontext()
+
+    def _fetching(self):
+        """Count the block as a request in flight when metrics are enabled."""
+        return self.metrics.in_flight() if self.metrics is not None else nullcontext()
+
+    def _count_fetch(self, domain: str, fetched: FetchResult) -> None:
+        if self.metrics is not None:
+            self.metrics.count_fetch(domain, fetched.status_code)
+
+    def _claim(self, run, source, limit: int) -> list[QueueItem]:
+        """Claim queue items and load their cache validators in one query."""
+        with self._timed("db_claim"):
+            items = self.queue_repo.claim(run.id, self.worker_id, limit)
+        if items:
+            with self._timed("db_validators"):
+                validators = self.page_repo.get_validators(source.id, [item.url_hash for item in items])
+            self._validators.update(validators)
+        return items
+
+    def _take_validators(self, item: QueueItem) -> PageValidators | None:
+        return self._validators.pop(item.url_hash, None)
+
+    def _build_result(
         self,
         item: object,
         source: object,
         run: object,
         robots,
-        rate_limiter: DomainRateLimiter,
-    ) -> tuple[CrawledPageCreate, list[QueueItemCreate], bool, object]:
-        """Process a single queue item. Returns (page, new_queue_items, success)."""
-        domain = extract_domain(item.url)
-        rate_limiter.acquire(domain)
-
-        content, status_code, error = self.http_client.download(item.url)
-
-        content_hash = None
+        fetched: FetchResult,
+        validators: PageValidators | None = None,
+    ) -> ItemResult:
+        """Turn a download outcome into a page row and newly discovered queue items.
+
+        Shared by the thread and asyncio engines so both hash, filter and
+        expand links identically.
+        """
+        if fetched.not_modified and validators is not None:
+            # Record the revalidation without storing the body again; links
+            # are re-expanded from the stored copy when the batch is persisted
+            page = CrawledPageCreate(
+                run_id=run.id,
+                source_id=source.id,
+                url=item.url,
+                url_hash=item.url_hash,
+                content_hash=validators.content_hash,
+                status_code=304,
+                etag=fetched.etag or validators.etag,
+                last_modified=fetched.last_modified or validators.last_modified,
+                max_age=fetched.max_age if fetched.max_age is not None else validators.max_age,
+                unchanged=True,
+            )
+            return ItemResult(item=item, page=page, success=True, relink_from=validators)
+
+        if fetched.skip_reason is not None:
+            # Not an error: the URL answered, but with nothing worth storing
+            page = CrawledPageCreate(
+                run_id=run.id,
+                source_id=source.id,
+                url=item.url,
+                url_hash=item.url_hash,
+                status_code=fetched.status_code,
+                skip_reason=fetched.skip_reason,
+            )
+            return ItemResult(item=item, page=page, success=True)
+
+        content = fetched.content
+        status_code = fetched.status_code
+        success = status_code is not None and 200 <= status_code < 300 and content is not None
+        analysis = None
         if content:
-            content_hash = hashlib.sha256(content.encode('utf-8', errors='replace')).hexdigest()
+            # Links are only needed from successful pages below the depth limit
+            analysis = self._analyze(item, content, self._domain, extract=success, fingerprint=success)
+
+        fingerprint = analysis.simhash if analysis is not None else None
+        duplicate_of = None
+        if fingerprint is not None and self._near_duplicates is not None:
+            duplicate_of = self._near_duplicates.check(fingerprint, item.url)
 
         page = CrawledPageCreate(
             run_id=run.id,
@@ -95,149 +350,506 @@ class CrawlUseCase:
             url=item.url,
             url_hash=item.url_hash,
             content=content,
-            content_hash=content_hash,
+            content_hash=analysis.content_hash if analysis else None,
             status_code=status_code,
-            error=error,
+            error=fetched.error,
+            etag=fetched.etag,
+            last_modified=fetched.last_modified,
+            max_age=fetched.max_age,
+            simhash=to_signed(fingerprint) if fingerprint is not None else None,
         )
 
+        body_bytes = len(content.encode("utf-8")) if content else 0
         new_items = []
-        success = status_code is not None and 200 <= status_code < 300 and content is not None
+        if duplicate_of is not None:
+            # A clone links to the same pages as the original, and its own
+            # clones (print views, sort orders) would only lead to more clones
+            logger.debug(f"{item.url} is a near-duplicate of {duplicate_of}")
+            if self.skip_duplicate_bodies:
+                page = page.model_copy(update={"content": None, "skip_reason": NEAR_DUPLICATE})
+        elif success and analysis is not None:
+            new_items = self._queue_links(item, analysis, robots)
+
+        return ItemResult(
+            item=item,
+            page=page,
+            new_items=new_items,
+            success=success,
+            near_duplicate_of=duplicate_of,
+            body_bytes=body_bytes,
+        )
 
-        if success:
-            if item.depth + 1 < self.max_depth:
-                links = extract_links(content, item.url)
-                for link in links:
-                    normalized = normalize_url(link)
-                    if extract_domain(normalized) != source.domain:
-                        continue
-                    if not robots.can_fetch(normalized):
-                        continue
-                    h = url_hash(normalized)
-                    new_items.append(QueueItemCreate(
-                        run_id=run.id,
-                        url=normalized,
-                        url_hash=h,
-                        depth=item.depth + 1,
-                    ))
-
-        return page, new_items, success, item
+    def _analyze(
+        self, item, content: str, domain: str, extract: bool = True, fingerprint: bool = False
+    ) -> PageAnalysis:
+        """Hash the body and extract its links, in a worker process when configured."""
+        extract = extract and item.depth + 1 < self.max_depth
+        fingerprint = fingerprint and self._near_duplicates is not None
+        body = content.encode('utf-8', errors='replace')
+        with self._timed("link_extraction"):
+            if self._cpu_pool is not None:
+                # Blocks only this fetch worker; the parsing runs without the GIL
+                return self._cpu_pool.submit(
+                    analyze_page, body, item.url, domain, extract, self._urls, fingerprint
+                ).result()
+            return analyze_page(body, item.url, domain, extract, self._urls, fingerprint)
+
+    def _queue_links(self, item, analysis: PageAnalysis, robots) -> list[QueueItemCreate]:
+        with self._timed("robots_check"):
+            allowed = [(url, h) for url, h in analysis.links if robots.can_fetch(url)]
+        return [
+            QueueItemCreate(
+                run_id=item.run_id,
+                url=url,
+                url_hash=h,
+                depth=item.depth + 1,
+            )
+            for url, h in allowed
+        ]
+
+    def _persist_batch(self, results: list[ItemResult]) -> tuple[int, int]:
+        """Write finished items: page rows, queue acks and discovered links.
+
+        Returns (pages_crawled, pages_failed) for the batch.
+        """
+        pages_to_insert = []
+        new_queue_items = []
+        completed_ids = []
+        failures = []
+
+        fingerprinted: Counter[str] = Counter()
+        for result in results:
+            item = result.item
+            if result.page is not None:
+                pages_to_insert.append(result.page)
+                if result.page.simhash is not None:
+                    fingerprinted["pages"] += 1
+                    fingerprinted["bytes"] += result.body_bytes
+                    if result.near_duplicate_of is not None:
+                        fingerprinted["duplicates"] += 1
+                        fingerprinted["duplicate_bytes"] += result.body_bytes
+            new_queue_items.extend(result.new_items)
+
+            if result.success:
+                completed_ids.append(item.id)
+                if result.page is not None and result.page.skip_reason:
+                    logger.info(f"Skipped {item.url} ({result.page.skip_reason})")
+                else:
+                    logger.info(f"Crawled {item.url}")
+            else:
+                error = result.error or (result.page.error if result.page else None)
+                failures.append((item.id, error))
+
+        # Unchanged pages still contribute their links, read from the stored copy
+        relink = [r for r in results if r.relink_from is not None]
+        if relink:
+            bodies = self._load_stored_bodies([r.relink_from for r in relink])
+            for result in relink:
+                body = bodies.get(result.relink_from.content_hash)
+                if body:
+                    analysis = self._analyze(result.item, body, self._domain)
+                    new_queue_items.extend(self._queue_links(result.item, analysis, self._robots))
+
+        # Bodies go to the blob store before the rows that reference them
+        if self.blob_store is not None:
+            with self._timed("body_store"):
+                pages_to_insert = self._store_bodies(self.blob_store, pages_to_insert)
+
+        # Batch insert pages, a bounded payload per request
+        for chunk in chunked(pages_to_insert, self.flush_size, self.flush_bytes, page_bytes):
+            with self._timed("page_insert"):
+                self.page_repo.create_batch(chunk)
+
+        # Acknowledge the batch: at most one call for completions, one for failures
+        with self._timed("ack"):
+            self.queue_repo.complete_many(completed_ids)
+            self.queue_repo.fail_many(failures)
+
+        # Drop links the run has (probably) queued already; they still count
+        # as inlinks of the URL they point to
+        discovered = len(new_queue_items)
+        duplicates: list[str] = []
+        if self._seen is not None:
+            fresh = []
+            for qi in new_queue_items:
+                if self._seen.add(qi.url_hash):
+                    fresh.append(qi)
+                else:
+                    duplicates.append(qi.url_hash)
+            new_queue_items = fresh
+        if self._frontier is not None:
+            self._frontier.forget([result.item.url_hash for result in results])
+            new_queue_items = self._frontier.discover(new_queue_items, duplicates)
+
+        # Batch add new URLs to queue
+        added = 0
+        for chunk in itertools.batched(new_queue_items, SEED_CHUNK_SIZE):
+            with self._timed("queue_upsert"):
+                added += len(self.queue_repo.add_batch(list(chunk)))
+        if added:
+            logger.debug(f"Added {added} new URLs to queue")
+
+        # Pending URLs that gained inlinks move up the queue, in bulk
+        if self._frontier is not None and results:
+            raised = self._frontier.raised()
+            for chunk in itertools.batched(raised, SEED_CHUNK_SIZE):
+                with self._timed("queue_reprioritize"):
+                    self.queue_repo.reprioritize(results[0].item.run_id, list(chunk))
+
+        if fingerprinted:
+            with self._duplicate_lock:
+                self._duplicate_counts.update(fingerprinted)
+
+        if self._stats is not None:
+            self._stats.record(_batch_stats(results, completed_ids, failures, discovered, added))
+        if self.metrics is not None:
+            persisted = time.monotonic()
+            for result in results:
+                self.metrics.observe("fetch_to_persist", persisted - result.finished_at)
+        return len(completed_ids), len(failures)
+
+    def _store_bodies(self, blob_store: BlobStore, pages: list[CrawledPageCreate]) -> list[CrawledPageCreate]:
+        """Write bodies not yet in the blob store and strip them from the page rows."""
+        bodies = {p.content_hash: p.content for p in pages if p.content is not None and p.content_hash}
+        candidates = [h for h in bodies if h not in self._stored_hashes]
+        if candidates:
+            # One existence check per batch; hashes seen earlier in the run skip it
+            missing = set(candidates) - blob_store.existing(candidates)
+            if missing:
+                blob_store.put_many({h: bodies[h] for h in missing})
+                logger.debug(f"Stored {len(missing)} new page bodies")
+            self._stored_hashes.update(candidates)
+        return [
+            p.model_copy(update={"content": None}) if p.content_hash in bodies else p
+            for p in pages
+        ]
+
+    def _load_stored_bodies(self, refs: list[PageValidators]) -> dict[str, str]:
+        """Bodies of earlier crawls keyed by content_hash, wherever they were stored."""
+        hashes = [r.content_hash for r in refs if r.content_hash]
+        bodies = self.blob_store.get_many(hashes) if self.blob_store is not None else {}
+        # Rows written without a blob store (or before one was configured) keep the body inline
+        inline = [r for r in refs if r.content_hash and r.content_hash not in bodies]
+        if inline:
+            contents = self.page_repo.get_contents([r.page_id for r in inline])
+            for r in inline:
+                if r.page_id in contents:
+                    bodies[r.content_hash] = contents[r.page_id]
+        return bodies
 
     def start_run(self, source_id) -> CrawlResult:
         source = self.source_repo.get_by_id(source_id)
         if not source:
             raise ValueError(f"Source {source_id} not found")
+        self._check_engine()
 
         # Create run
-        run = self.run_repo.create(CrawlRunCreate(source_id=source.id))
+        mode = "incremental" if self.incremental else "full"
+        run = self.run_repo.create(CrawlRunCreate(source_id=source.id, mode=mode))
         self.run_repo.mark_started(run.id)
-        logger.info(f"Started run: {run.id}")
-
-        # Setup robots and sitemap
-        base_url = get_base_url(str(source.entry_url))
-        robots = RobotsHandler(base_url, self.http_client)
-        sitemap_parser = SitemapParser(self.http_client)
+        logger.info(f"Started {mode} run: {run.id}")
 
-        # Setup rate limiter with crawl delay from robots.txt
-        rate_limiter = DomainRateLimiter(default_delay=self.delay)
-        if robots.crawl_delay:
-            rate_limiter.set_delay(source.domain, max(self.delay, robots.crawl_delay))
+        history = {}
+        if run.mode == "incremental":
+            history = {h.url_hash: h for h in self.page_repo.get_history(source.id)}
+        robots = self._prepare_run(source, known_urls=len(history))
 
-        # Seed queue from sitemaps
-        sitemap_urls = []
-        for sitemap_url in robots.get_sitemaps():
-            sitemap_urls.extend(sitemap_parser.parse(sitemap_url))
-
-        # Add entry URL and sitemap URLs to queue
-        urls_to_add = [str(source.entry_url)] + sitemap_urls
-        queue_items = []
-        seen_hashes = set()
+        # Seed the queue with the entry URL, then stream sitemap URLs into it
+        # in chunks so a large sitemap is never held in memory as a whole
+        sitemap_parser = SitemapParser(self.http_client)
+        entries = itertools.chain(
+            [SitemapEntry(url=str(source.entry_url))],
+            sitemap_parser.iter_entries(robots.get_sitemaps()),
+        )
+        items = self._seed_items(entries, source, run, robots)
+        if history:
+            items = self._incremental_items(items, history, source, run, robots)
+        seeded = 0
+        for chunk in itertools.batched(items, SEED_CHUNK_SIZE):
+            self.queue_repo.add_batch(list(chunk))
+            seeded += len(chunk)
+        if seeded:
+            logger.info(f"Seeded queue with {seeded} URLs")
+        if history:
+            logger.info(f"Carried forward {self._carried} of {len(history)} known URLs without fetching")
+
+        result = self._crawl(source, run, robots)
+        result.pages_carried = self._carried
+        return result
+
+    def join_run(self, run_id) -> CrawlResult:
+        """Attach this worker to a run started elsewhere and crawl until it is done.
+
+        Workers share the run's queue through SKIP LOCKED claims, so any number
+        can join, on this machine or others, as long as each has its own
+        `worker_id`. The queue is not seeded again.
+        """
+        run = self.run_repo.get_by_id(run_id)
+        if not run:
+            raise ValueError(f"Run {run_id} not found")
+        if run.status in ("completed", "failed"):
+            raise ValueError(f"Run {run_id} is already {run.status}")
+        source = self.source_repo.get_by_id(run.source_id)
+        if not source:
+            raise ValueError(f"Source {run.source_id} not found")
+        self._check_engine()
+
+        logger.info(f"Worker {self.worker_id} joining run: {run.id}")
+        known = []
+        if run.mode == "incremental":
+            # The starting worker queued or carried every known URL
+            known = [h.url_hash for h in self.page_repo.get_history(source.id)]
+        robots = self._prepare_run(source, known_urls=len(known))
+        self._seen.update(known)
+        return self._crawl(source, run, robots)
+
+    def _check_engine(self) -> None:
+        if self.engine == "async" and self.async_http_client is None:
+            raise ValueError("The async engine requires an AsyncHttpClient")
+
+    def _prepare_run(self, source, known_urls: int = 0) -> RobotsHandler:
+        """Reset per-run state and load the source's robots.txt.
+
+        `known_urls` extra seen-set capacity is reserved for the URLs an
+        incremental run marks seen up front.
+        """
+        self._urls = self.url_canonicalizer.copy()
+        # Links are kept when their canonical host matches the entry URL's
+        self._domain = self._urls.canonicalize(str(source.entry_url)).domain
+        base_url = get_base_url(str(source.entry_url))
+        robots = RobotsHandler(base_url, self.http_client, self.robots_cache)
+        self._robots = robots
+        self._validators = {}
+        self._stored_hashes = set()
+        self._seen = UrlSeenSet(self.seen_capacity + known_urls, self.seen_error_rate)
+        self._frontier = FrontierPriorities(self.priority_scorer)
+        self._carried = 0
+        self._stats = None
+        self._near_duplicates = None
+        if self.near_duplicate_distance is not None:
+            self._near_duplicates = NearDuplicateIndex(self.near_duplicate_distance)
+        self._duplicate_counts = Counter()
+        return robots
+
+    def _crawl(self, source, run, robots) -> CrawlResult:
+        # Warm the seen-set from everything already queued for this run,
+        # which also covers rows left by an earlier attempt at it
+        self._seen.update(self.queue_repo.get_url_hashes(run.id))
+
+        # Process queue with the selected engine
+        if self.cpu_stage == "processes":
+            self._cpu_pool = create_analysis_pool(self.cpu_workers)
+        self._stats = RunStatsAggregator(self.run_repo, run.id, self.stats_interval)
+        if self.metrics is not None:
+            self.metrics.track_queue(str(run.id), lambda: self.queue_repo.get_pending_count(run.id))
+        try:
+            with self._heartbeat(run), self._stats.flushing():
+                if self.engine == "async":
+                    async_client = self.async_http_client
+                    assert async_client is not None
+                    result = AsyncCrawlEngine(self, async_client).run(source, run, robots)
+                else:
+                    result = ThreadedCrawlEngine(self).run(source, run, robots)
+        finally:
+            if self._cpu_pool is not None:
+                self._cpu_pool.shutdown(cancel_futures=True)
+                self._cpu_pool = None
+            if self.metrics is not None:
+                self.metrics.untrack_queue(str(run.id))
+
+        stats = self._seen.stats()
+        logger.info(
+            f"Seen-set: {stats.hits}/{stats.checked} links filtered ({stats.hit_rate:.1%}), "
+            f"{stats.added} distinct, {stats.size_bytes} bytes, "
+            f"estimated false-positive rate {stats.estimated_false_positive_rate:.2%}"
+        )
+        if self._near_duplicates is not None:
+            counts = self._duplicate_counts
+            result.near_duplicates = counts["duplicates"]
+            result.near_duplicate_bytes = counts["duplicate_bytes"]
+            logger.info(
+                f"Near-duplicates: {counts['duplicates']}/{counts['pages']} fingerprinted pages "
+                f"({counts['duplicates'] / max(counts['pages'], 1):.1%}), "
+                f"{counts['duplicate_bytes']}/{counts['bytes']} bytes "
+                f"({counts['duplicate_bytes'] / max(counts['bytes'], 1):.1%})"
+            )
+
+        # Only the last worker out marks the run complete
+        if self.queue_repo.get_processing_count(run.id) == 0:
+            self.run_repo.mark_completed(run.id)
+            logger.info(f"Run complete: {result.pages_crawled} crawled, {result.pages_failed} failed")
+        else:
+            logger.info(
+                f"Worker {self.worker_id} done ({result.pages_crawled} crawled, "
+                f"{result.pages_failed} failed); other workers still hold items"
+            )
+
+        return result
+
+    @contextmanager
+    def _heartbeat(self, run):
+        """Refresh this worker's claims in the background while the run is crawled."""
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(self.heartbeat_interval):
+                try:
+                    self.queue_repo.heartbeat(run.id, self.worker_id)
+                except Exception as e:
+                    logger.warning(f"Heartbeat for worker {self.worker_id} failed: {e}")
+
+        thread = threading.Thread(target=beat, name="crawl-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _run_finished(self, run) -> bool:
+        """Whether no worker has anything left to do in the run.
+
+        Engines call this once their own queue is dry. Claims of dead workers
+        are reclaimed first (at most once per heartbeat interval), so their
+        items show up as pending again instead of holding the run open.
+        """
+        now = time.monotonic()
+        if now - self._last_stale_reset >= self.heartbeat_interval:
+            self._last_stale_reset = now
+            reclaimed = self.queue_repo.reset_stale(self.stale_timeout_minutes)
+            if reclaimed:
+                logger.info(f"Reclaimed {reclaimed} queue items from unresponsive workers")
+        return (
+            self.queue_repo.get_pending_count(run.id) == 0
+            and self.queue_repo.get_processing_count(run.id) == 0
+        )
 
-        for url in urls_to_add:
-            normalized = normalize_url(url)
-            if extract_domain(normalized) != source.domain:
+    def _seed_items(self, entries, source, run, robots):
+        """Queue items for in-domain, allowed entries not yet seen in this run."""
+        for entry in entries:
+            canonical = self._urls.canonicalize(entry.url)
+            if canonical.domain != self._domain:
                 continue
+            normalized, h = canonical.url, canonical.url_hash
             if not robots.can_fetch(normalized):
                 continue
-            h = url_hash(normalized)
-            if h in seen_hashes:
+            if h in self._seen:
                 continue
-            seen_hashes.add(h)
-            queue_items.append(QueueItemCreate(
+            # update() keeps seeding out of the link-filter counters
+            self._seen.update([h])
+            item = QueueItemCreate(
                 run_id=run.id,
                 url=normalized,
                 url_hash=h,
-            ))
-
-        if queue_items:
-            self.queue_repo.add_batch(queue_items)
-            logger.info(f"Seeded queue with {len(queue_items)} URLs")
-
-        # Process queue with concurrency
-        pages_crawled = 0
-        pages_failed = 0
-
-        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
-            while True:
-                # Check max pages limit
-                if pages_crawled + pages_failed >= self.max_pages:
-                    logger.info(f"Reached max pages limit ({self.max_pages}), stopping crawl")
-                    break
-
-                items = self.queue_repo.claim(run.id, self.worker_id, self.batch_size)
-                if not items:
-                    break
-
-                # Process batch concurrently
-                futures = {
-                    executor.submit(
-                        self._process_item, item, source, run, robots, rate_limiter
-                    ): item
-                    for item in items
-                }
-
-                pages_to_insert = []
-                all_new_queue_items = []
-
-                for future in as_completed(futures):
-                    try:
-                        page, new_items, success, item = future.result()
-                        pages_to_insert.append(page)
-                        all_new_queue_items.extend(new_items)
-
-                        if success:
-                            self.queue_repo.complete(item.id)
-                            pages_crawled += 1
-                            logger.info(f"Crawled {item.url}")
-                        else:
-                            self.queue_repo.fail(item.id, page.error)
-                            pages_failed += 1
-
-                    except Exception as e:
-                        item = futures[future]
-                        logger.exception(f"Error processing {item.url}")
-                        self.queue_repo.fail(item.id, str(e))
-                        pages_failed += 1
-
-                # Batch insert pages
-                if pages_to_insert:
-                    self.page_repo.create_batch(pages_to_insert)
-
-                # Batch add new URLs to queue
-                if all_new_queue_items:
-                    added = self.queue_repo.add_batch(all_new_queue_items)
-                    if added:
-                        logger.debug(f"Added {len(added)} new URLs to queue")
-
-                # Update run stats
-                self.run_repo.update_stats(
-                    run.id,
-                    pages_found=pages_crawled + pages_failed,
-                    pages_crawled=pages_crawled,
-                    pages_failed=pages_failed,
-                )
-
-        # Mark run complete
-        self.run_repo.mark_completed(run.id)
-        logger.info(f"Run complete: {pages_crawled} crawled, {pages_failed} failed")
-
-        return CrawlResult(pages_crawled=pages_crawled, pages_failed=pages_failed)
+                lastmod=entry.lastmod,
+                sitemap_priority=entry.priority,
+            )
+            yield self._frontier.seed(item) if self._frontier is not None else item
+
+    def _incremental_items(self, items, history: dict[str, PageHistory], source, run, robots):
+        """Filter seed items down to what the recrawl policy wants fetched.
+
+        Every URL in `history` is decided here: known sitemap URLs by their
+        <lastmod>, known URLs the sitemap no longer lists (pages reached by
+        links) by their change history alone. Those not due are recorded
+        for this run with the previous content_hash instead of being
+        fetched, and all of them go into the seen-set so link discovery
+        only queues URLs new to the source. The entry URL is always fetched.
+        Links on carried pages are not followed; `max_staleness` bounds how
+        long a page can go unfetched.
+        """
+        now = datetime.now(timezone.utc)
+        entry_hash = self._urls.canonicalize(str(source.entry_url)).url_hash
+        remaining = dict(history)
+        carried: list[CrawledPageCreate] = []
+
+        def carry(known: PageHistory) -> None:
+            carried.append(self._carried_page(known, source, run))
+            if len(carried) >= SEED_CHUNK_SIZE:
+                self._write_carried(carried)
+
+        for item in items:
+            known = remaining.pop(item.url_hash, None)
+            if item.url_hash == entry_hash or self.recrawl_policy.should_fetch(known, item.lastmod, now):
+                yield item
+            else:
+                if self._frontier is not None:
+                    self._frontier.forget([item.url_hash])
+                carry(known)
+        for known in remaining.values():
+            # Stored under other canonicalization rules; the canonical form
+            # is reached again through the sitemap or links
+            if self._urls.canonicalize(known.url).url_hash != known.url_hash:
+                continue
+            if not robots.can_fetch(known.url):
+                continue
+            if self.recrawl_policy.should_fetch(known, None, now):
+                self._seen.update([known.url_hash])
+                item = QueueItemCreate(run_id=run.id, url=known.url, url_hash=known.url_hash, depth=1)
+                yield self._frontier.seed(item) if self._frontier is not None else item
+            else:
+                carry(known)
+        self._write_carried(carried)
+        self._seen.update(list(history))
+
+    def _write_carried(self, pages: list[CrawledPageCreate]) -> None:
+        """Insert carried-forward rows and empty `pages`."""
+        if pages:
+            self.page_repo.create_batch(pages)
+            self._carried += len(pages)
+            pages.clear()
+
+    def _carried_page(self, known: PageHistory, source, run) -> CrawledPageCreate:
+        return CrawledPageCreate(
+            run_id=run.id,
+            source_id=source.id,
+            url=known.url,
+            url_hash=known.url_hash,
+            content_hash=known.content_hash,
+            unchanged=True,
+            skip_reason=CARRIED_FORWARD,
+        )
+
+    def _domain_delay(self, robots) -> float:
+        """Delay for the source domain, never faster than robots.txt crawl-delay."""
+        if robots.crawl_delay:
+            return max(self.delay, robots.crawl_delay)
+        return self.delay
+
+    def _min_domain_delay(self, robots) -> float:
+        """Floor for adaptive pacing: robots.txt crawl-delay is never undercut."""
+        if not self.adaptive_delay:
+            return self._domain_delay(robots)
+        return max(self.min_delay, robots.crawl_delay or 0.0)
+
+
+def _batch_stats(
+    results: list[ItemResult],
+    completed_ids: list,
+    failures: list,
+    discovered: int,
+    added: int,
+) -> RunStatsDelta:
+    """Counters one persisted batch adds to its run."""
+    status_codes: dict[int, int] = {}
+    downloaded = 0
+    for result in results:
+        page = result.page
+        if page is None:
+            continue
+        if page.status_code is not None:
+            status_codes[page.status_code] = status_codes.get(page.status_code, 0) + 1
+        if page.content is not None:
+            downloaded += len(page.content.encode("utf-8"))
+        else:
+            # Near-duplicate bodies were downloaded even when not stored
+            downloaded += result.body_bytes
+    return RunStatsDelta(
+        pages_found=len(completed_ids) + len(failures),
+        pages_crawled=len(completed_ids),
+        pages_failed=len(failures),
+        bytes_downloaded=downloaded,
+        links_discovered=discovered,
+        links_deduped=discovered - added,
+        status_codes=status_codes,
+    )
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from src.domain.models import CrawledPageCreate, PageValidators, QueueItem, QueueItemCreate
+
+# Rough cost of a row's columns besides its body and URL (ids, hashes, headers)
+ROW_OVERHEAD = 256
+
+
+def page_bytes(page: CrawledPageCreate) -> int:
+    """Approximate size of a page row, in memory and on the wire."""
+    return ROW_OVERHEAD + len(page.url) + len(page.content or "")
+
+
+@dataclass
+class CrawlResult:
+    pages_crawled: int
+    pages_failed: int
+    # Known pages an incremental run recorded from history without fetching
+    pages_carried: int = 0
+    # Pages found to be near-duplicates of an earlier page, and their bytes
+    near_duplicates: int = 0
+    near_duplicate_bytes: int = 0
+
+
+@dataclass
+class ItemResult:
+    """Outcome of processing one claimed queue item, waiting to be persisted."""
+
+    item: QueueItem
+    page: CrawledPageCreate | None
+    new_items: list[QueueItemCreate] = field(default_factory=list)
+    success: bool = False
+    error: str | None = None
+    # Revalidated page whose links come from this stored copy at persist time
+    relink_from: PageValidators | None = None
+    # URL of the earlier page this one nearly duplicates, and the size of
+    # its body, which is not kept on `page` when duplicate bodies are dropped
+    near_duplicate_of: str | None = None
+    body_bytes: int = 0
+    # When the fetch finished (time.monotonic), for write-behind latency
+    finished_at: float = field(default_factory=time.monotonic)
+
+    @cached_property
+    def size(self) -> int:
+        """Approximate bytes held until persisted: the page row plus its new queue rows."""
+        size = page_bytes(self.page) if self.page is not None else ROW_OVERHEAD
+        return size + sum(ROW_OVERHEAD + len(q.url) for q in self.new_items)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+from uuid import UUID
+
+from src.domain.models import RunStatsDelta
+from src.domain.ports import RunRepository
+
+logger = logging.getLogger(__name__)
+
+
+class RunStatsAggregator:
+    """Run counters accumulated in memory and added to the run row on a timer.
+
+    Engines `record` from any thread. While `flushing` is active a
+    background thread sends whatever accumulated every `interval` seconds
+    as one `increment_stats` call, so stats traffic stays at one write per
+    interval however fast pages finish. The database adds the delta to the
+    stored totals, so several workers sharing a run all count. A failed
+    flush keeps its delta for the next one.
+    """
+
+    def __init__(self, run_repo: RunRepository, run_id: UUID, interval: float = 5.0):
+        self.run_repo = run_repo
+        self.run_id = run_id
+        self.interval = interval
+        self._pending = RunStatsDelta()
+        self._lock = threading.Lock()
+        # Keeps the timer's flush and the final one from overlapping
+        self._flush_lock = threading.Lock()
+
+    def record(self, delta: RunStatsDelta) -> None:
+        with self._lock:
+            self._pending = self._pending + delta
+
+    def flush(self) -> bool:
+        """Send the accumulated delta. Returns False if it is kept for a retry."""
+        with self._flush_lock:
+            with self._lock:
+                delta, self._pending = self._pending, RunStatsDelta()
+            if delta.is_empty():
+                return True
+            try:
+                self.run_repo.increment_stats(self.run_id, delta)
+            except Exception as e:
+                logger.warning(f"Flushing stats for run {self.run_id} failed, retrying later: {e}")
+                with self._lock:
+                    self._pending = delta + self._pending
+                return False
+            return True
+
+    @contextmanager
+    def flushing(self) -> Iterator[RunStatsAggregator]:
+        """Flush every `interval` seconds in the background, and once more on exit."""
+        stop = threading.Event()
+
+        def loop() -> None:
+            while not stop.wait(self.interval):
+                self.flush()
+
+        thread = threading.Thread(target=loop, name="crawl-stats", daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            stop.set()
+            thread.join()
+            self.flush()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable
+from uuid import UUID
+
+from src.domain.models import CrawlSource
+from src.domain.ports import SourceRepository
+from src.domain.rules import next_run_at
+from src.ingestion.use_cases.crawl import CrawlUseCase
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlScheduler:
+    """Long-running loop that crawls every due source in one process.
+
+    Each poll starts the due sources that are not already running, up to
+    `max_runs` at a time, each in its own thread with a fresh `CrawlUseCase`
+    from `make_use_case`. Use cases built by one factory should share their
+    HTTP clients, robots cache and `FetchBudget`, so concurrent runs pay no
+    setup cost and split the global fetch budget fairly across hosts.
+
+    A source's `next_run_at` is pushed one interval ahead when its run starts,
+    so other scheduler processes skip it, and set again from the finish
+    time when it ends. One-off sources ("once") are cleared instead.
+    """
+
+    def __init__(
+        self,
+        source_repo: SourceRepository,
+        make_use_case: Callable[[CrawlSource], CrawlUseCase],
+        max_runs: int = 8,
+        poll_interval: float = 30.0,
+    ):
+        if max_runs < 1:
+            raise ValueError(f"max_runs must be at least 1, got {max_runs}")
+        if poll_interval <= 0:
+            raise ValueError(f"poll_interval must be positive, got {poll_interval}")
+        self.source_repo = source_repo
+        self.make_use_case = make_use_case
+        self.max_runs = max_runs
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_runs, thread_name_prefix="crawl-run")
+        self._running: dict[UUID, Future] = {}
+        self._lock = threading.Lock()
+        # Set when a run finishes, so a waiting poll loop can start the next source
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def running(self) -> list[UUID]:
+        with self._lock:
+            return list(self._running)
+
+    def poll_once(self) -> int:
+        """Start due sources that fit in the free run slots. Returns how many started."""
+        with self._lock:
+            free = self.max_runs - len(self._running)
+        if free <= 0:
+            return 0
+
+        running = set(self.running())
+        due = [s for s in self.source_repo.get_due_sources() if s.id not in running]
+        # Longest-overdue first, so no source starves behind newer ones
+        due.sort(key=lambda s: s.next_run_at or datetime.min.replace(tzinfo=timezone.utc))
+        started = 0
+        for source in due[:free]:
+            try:
+                self._lease(source)
+            except Exception:
+                logger.exception(f"Could not reschedule source {source.id}, skipping it this poll")
+                continue
+            with self._lock:
+                self._running[source.id] = self._executor.submit(self._run, source)
+            started += 1
+        if started:
+            logger.info(f"Started {started} due sources ({len(running) + started} running)")
+        return started
+
+    def serve(self) -> None:
+        """Poll until `stop` is called, then wait for the runs in progress."""
+        logger.info(f"Scheduler started: up to {self.max_runs} concurrent runs, polling every {self.poll_interval}s")
+        try:
+            while not self._stopping.is_set():
+                self._wake.clear()
+                try:
+                    self.poll_once()
+                except Exception:
+                    logger.exception("Polling for due sources failed")
+                # A finished run frees a slot: poll again right away
+                self._wake.wait(self.poll_interval)
+        finally:
+            running = self.running()
+            if running:
+                logger.info(f"Stopping: waiting for {len(running)} runs to finish")
+            self.close()
+
+    def stop(self) -> None:
+        """Stop polling; `serve` returns once the current runs finish. Safe from signal handlers."""
+        self._stopping.set()
+        self._wake.set()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _lease(self, source: CrawlSource) -> None:
+        """Move next_run_at off "due" before the run starts."""
+        self.source_repo.update_next_run(source.id, self._next_run(source, datetime.now(timezone.utc)))
+
+    def _next_run(self, source: CrawlSource, after: datetime) -> datetime | None:
+        try:
+            return next_run_at(source.frequency, after)
+        except ValueError:
+            logger.warning(f"Source {source.id} has an invalid frequency {source.frequency!r}; running it once")
+            return None
+
+    def _run(self, source: CrawlSource) -> None:
+        try:
+            logger.info(f"Crawling source {source.id} ({source.domain})")
+            result = self.make_use_case(source).start_run(source.id)
+            logger.info(
+                f"Source {source.id} done: {result.pages_crawled} crawled, {result.pages_failed} failed"
+            )
+        except Exception:
+            logger.exception(f"Run for source {source.id} failed")
+        finally:
+            try:
+                self.source_repo.update_next_run(source.id, self._next_run(source, datetime.now(timezone.utc)))
+            except Exception:
+                logger.exception(f"Could not reschedule source {source.id}")
+            with self._lock:
+                self._running.pop(source.id, None)
+            self._wake.set()
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from src.ingestion.crawling import DomainRateLimiter, FetchResult
+from src.ingestion.use_cases.results import CrawlResult, ItemResult
+from src.ingestion.use_cases.write_buffer import WriteBuffer
+
+if TYPE_CHECKING:
+    from src.ingestion.use_cases.crawl import CrawlUseCase
+
+logger = logging.getLogger(__name__)
+
+# Markers passed through the stage queues
+_STOP = object()
+_WORKER_DONE = object()
+_FLUSH = object()
+
+# How often blocked stages wake up to check whether the run was aborted
+_POLL_INTERVAL = 0.1
+
+
+class ThreadedCrawlEngine:
+    """Streaming claim -> fetch -> persist pipeline on worker threads.
+
+    A claimer thread keeps a bounded buffer of `prefetch` claimed items full,
+    `concurrency` fetch workers pull from it continuously, and the calling
+    thread writes finished items behind them by count, bytes or age
+    (`flush_size` / `flush_bytes` / `flush_interval`). No stage waits for a
+    whole batch, so one slow URL only holds up its own worker. At most
+    `max_buffered` finished pages and about `max_buffered_bytes` of them are
+    held in memory; workers block once the persister falls that far behind.
+    """
+
+    def __init__(self, use_case: CrawlUseCase):
+        self.use_case = use_case
+
+    def run(self, source, run, robots) -> CrawlResult:
+        uc = self.use_case
+        rate_limiter = DomainRateLimiter(
+            default_delay=uc.delay,
+            adaptive=uc.adaptive_delay,
+            max_connections=uc.host_connections,
+            max_delay=uc.max_delay,
+        )
+        rate_limiter.set_delay(uc._domain, uc._domain_delay(robots), uc._min_domain_delay(robots))
+
+        self._work: queue.Queue = queue.Queue(maxsize=uc.prefetch)
+        self._results: queue.Queue = queue.Queue(maxsize=uc.max_buffered)
+        self._abort = threading.Event()
+        self._pending = WriteBuffer(uc.flush_size, uc.flush_bytes, uc.flush_interval)
+        # Guards the claimed-but-not-yet-persisted count, the bytes of
+        # finished items not yet persisted and the flush generation
+        self._progress = threading.Condition()
+        self._outstanding = 0
+        self._buffered_bytes = 0
+        self._flushes = 0
+        # Claimed items and finished results that found the stage buffers
+        # closed by an abort
+        self._unqueued: list = []
+        self._orphans: list[ItemResult] = []
+        self._claim_error: Exception | None = None
+
+        claimer = threading.Thread(
+            target=self._claim_loop, args=(source, run), name="crawl-claimer", daemon=True
+        )
+        workers = [
+            threading.Thread(
+                target=self._fetch_loop,
+                args=(source, run, robots, rate_limiter),
+                name=f"crawl-fetch-{i}",
+                daemon=True,
+            )
+            for i in range(uc.concurrency)
+        ]
+        claimer.start()
+        for worker in workers:
+            worker.start()
+
+        completed = False
+        try:
+            result = self._persist_loop()
+            completed = True
+        finally:
+            self._abort.set()
+            claimer.join()
+            for worker in workers:
+                worker.join()
+            if not completed:
+                self._release_unprocessed()
+
+        if self._claim_error is not None:
+            raise self._claim_error
+        return result
+
+    def _release_unprocessed(self) -> None:
+        """Drain the stage buffers after an abort.
+
+        Finished items are written if the database still takes them; the
+        rest are failed, so none stay `processing` until `reset_stale` picks
+        them up. Best effort: the abort may itself be a database failure.
+        """
+        finished = self._pending.take() + self._orphans
+        leftovers = list(self._unqueued)
+        for q in (self._work, self._results):
+            while True:
+                try:
+                    value = q.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(value, ItemResult):
+                    finished.append(value)
+                elif value not in (_STOP, _WORKER_DONE, _FLUSH):
+                    leftovers.append(value)
+
+        if finished:
+            try:
+                self.use_case._persist_batch(finished)
+                logger.info(f"Wrote {len(finished)} finished items after abort")
+            except Exception:
+                leftovers.extend(result.item for result in finished)
+
+        if not leftovers:
+            return
+        failures = [(item.id, "Crawl aborted before the item was persisted") for item in leftovers]
+        try:
+            self.use_case.queue_repo.fail_many(failures)
+            logger.info(f"Released {len(leftovers)} unprocessed queue items after abort")
+        except Exception:
+            logger.warning(f"Could not release {len(leftovers)} queue items after abort")
+
+    def _put(self, q: queue.Queue, value) -> bool:
+        """Blocking put that gives up once the run is aborted."""
+        while not self._abort.is_set():
+            try:
+                q.put(value, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _claim_loop(self, source, run) -> None:
+        uc = self.use_case
+        claimed = 0
+        try:
+            while not self._abort.is_set():
+                budget = uc.max_pages - claimed
+                if budget <= 0:
+                    logger.info(f"Reached max pages limit ({uc.max_pages}), stopping crawl")
+                    break
+
+                with self._progress:
+                    generation = self._flushes
+
+                items = uc._claim(run, source, min(uc.batch_size, budget))
+                if items:
+                    claimed += len(items)
+                    with self._progress:
+                        self._outstanding += len(items)
+                    for i, item in enumerate(items):
+                        if not self._put(self._work, item):
+                            self._unqueued.extend(items[i:])
+                            return
+                    continue
+
+                # Queue is dry. Once nothing is outstanding here and no flush
+                # has landed since the claim, the run is done unless other
+                # workers still hold items that may queue more links: poll.
+                # Otherwise ask for an early flush (its links may refill the
+                # queue) and retry after it lands.
+                with self._progress:
+                    idle = self._outstanding == 0 and self._flushes == generation
+                if idle:
+                    if uc._run_finished(run):
+                        break
+                    self._abort.wait(uc.idle_poll_interval)
+                    continue
+                if not self._put(self._results, _FLUSH):
+                    return
+                with self._progress:
+                    self._progress.wait_for(
+                        lambda g=generation: self._flushes != g or self._abort.is_set(),
+                        timeout=uc.flush_interval,
+                    )
+        except Exception as e:
+            logger.exception("Claiming queue items failed, stopping crawl")
+            self._claim_error = e
+        finally:
+            for _ in range(uc.concurrency):
+                self._put(self._work, _STOP)
+
+    def _fetch_loop(self, source, run, robots, rate_limiter: DomainRateLimiter) -> None:
+        uc = self.use_case
+        try:
+            while not self._abort.is_set():
+                try:
+                    item = self._work.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if item is _STOP:
+                    break
+
+                try:
+                    validators = uc._take_validators(item)
+                    if validators is not None and validators.is_fresh():
+                        fetched = FetchResult.still_fresh(validators)
+                    else:
+                        fetched = self._fetch(item.url, validators, rate_limiter)
+                    result = uc._build_result(item, source, run, robots, fetched, validators)
+                except Exception as e:
+                    logger.exception(f"Error processing {item.url}")
+                    result = ItemResult(item=item, page=None, error=str(e))
+
+                if not (self._reserve(result.size) and self._put(self._results, result)):
+                    self._orphans.append(result)
+                    break
+        finally:
+            self._put(self._results, _WORKER_DONE)
+
+    def _reserve(self, size: int) -> bool:
+        """Wait until the finished-but-unpersisted bytes leave room for `size`.
+
+        A result larger than the whole ceiling still goes through once
+        nothing else is buffered. Gives up once the run is aborted.
+        """
+        ceiling = self.use_case.max_buffered_bytes
+        with self._progress:
+            while self._buffered_bytes and self._buffered_bytes + size > ceiling:
+                if self._abort.is_set():
+                    return False
+                self._progress.wait(_POLL_INTERVAL)
+            self._buffered_bytes += size
+        return True
+
+    def _fetch(self, url: str, validators, rate_limiter: DomainRateLimiter) -> FetchResult:
+        uc = self.use_case
+        domain = uc._urls.canonicalize(url).domain
+        budget = uc.fetch_budget
+        with uc._timed("rate_limit_wait"):
+            rate_limiter.acquire(domain)
+            if budget is not None:
+                budget.acquire(domain)
+        started = time.monotonic()
+        fetched = None
+        try:
+            with uc._fetching(), uc._timed("fetch"):
+                fetched = uc.http_client.fetch(url, validators)
+            uc._count_fetch(domain, fetched)
+            return fetched
+        finally:
+            if budget is not None:
+                budget.release(domain)
+            if fetched is None:
+                rate_limiter.release(domain)
+            else:
+                rate_limiter.release(
+                    domain, time.monotonic() - started, fetched.overloaded, fetched.retry_after
+                )
+
+    def _persist_loop(self) -> CrawlResult:
+        uc = self.use_case
+        pages_crawled = 0
+        pages_failed = 0
+        buffer = self._pending
+        workers_running = uc.concurrency
+        # The claimer found the queue dry: flush whatever arrives next
+        flush_requested = False
+
+        while workers_running or buffer:
+            if workers_running:
+                try:
+                    value = self._results.get(timeout=buffer.wait_time())
+                except queue.Empty:
+                    value = None
+
+                if value is _WORKER_DONE:
+                    workers_running -= 1
+                elif value is _FLUSH:
+                    flush_requested = True
+                elif value is not None:
+                    buffer.add(value)
+
+            if not buffer:
+                continue
+            if not (flush_requested or workers_running == 0 or buffer.due()):
+                continue
+
+            batch_bytes = buffer.size
+            batch = buffer.take()
+            flush_requested = False
+            crawled, failed = uc._persist_batch(batch)
+            pages_crawled += crawled
+            pages_failed += failed
+            with self._progress:
+                self._outstanding -= len(batch)
+                self._buffered_bytes -= batch_bytes
+                self._flushes += 1
+                self._progress.notify_all()
+
+        return CrawlResult(pages_crawled=pages_crawled, pages_failed=pages_failed)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from src.ingestion.use_cases.results import ItemResult
+
+T = TypeVar("T")
+
+
+class WriteBuffer:
+    """Finished items waiting to be persisted, and when they are due.
+
+    Shared by both engines' persist stages. The buffer is due once it holds
+    `max_rows` items or `max_bytes` of payload (see `ItemResult.size`), or
+    once its oldest item has waited `max_latency` seconds, so each write
+    stays near a fixed payload size however many items a claim returned or
+    however large the pages are. Not thread-safe: only the persister uses it.
+    """
+
+    def __init__(self, max_rows: int, max_bytes: int, max_latency: float):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_latency = max_latency
+        self._items: list[ItemResult] = []
+        self._bytes = 0
+        self._oldest = 0.0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def size(self) -> int:
+        return self._bytes
+
+    def add(self, result: ItemResult) -> None:
+        if not self._items:
+            self._oldest = time.monotonic()
+        self._items.append(result)
+        self._bytes += result.size
+
+    def due(self) -> bool:
+        if not self._items:
+            return False
+        return (
+            len(self._items) >= self.max_rows
+            or self._bytes >= self.max_bytes
+            or time.monotonic() - self._oldest >= self.max_latency
+        )
+
+    def wait_time(self) -> float:
+        """Seconds until the oldest item reaches max_latency (max_latency if empty)."""
+        if not self._items:
+            return self.max_latency
+        return max(0.0, self._oldest + self.max_latency - time.monotonic())
+
+    def take(self) -> list[ItemResult]:
+        items, self._items, self._bytes = self._items, [], 0
+        return items
+
+
+def chunked(values: Iterable[T], max_rows: int, max_bytes: int, size: Callable[[T], int]) -> Iterator[list[T]]:
+    """Split values into lists of at most max_rows and about max_bytes each.
+
+    A single value larger than max_bytes gets a chunk of its own.
+    """
+    chunk: list[T] = []
+    chunk_bytes = 0
+    for value in values:
+        value_bytes = size(value)
+        if chunk and (len(chunk) >= max_rows or chunk_bytes + value_bytes > max_bytes):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(value)
+        chunk_bytes += value_bytes
+    if chunk:
+        yield chunk
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
+import signal
+import socket
 import sys
 from uuid import UUID
 
@@ -15,6 +18,10 @@ logger = logging.getLogger(__name__)
 
 def main():
     parser = argparse.ArgumentParser(description="Web crawler CLI")
+    parser.add_argument(
+        "--backend",
+        help="Storage: supabase, postgres or sqlite:PATH (default: DATABASE_BACKEND, else supabase)",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     # Create source command
@@ -27,56 +34,400 @@ def main():
         help="Crawl type",
     )
 
+    # Options shared by every command that crawls
+    crawl_options = argparse.ArgumentParser(add_help=False)
+    crawl_options.add_argument("--delay", type=float, default=0.5, help="Delay between requests (seconds)")
+    crawl_options.add_argument(
+        "--adaptive-delay",
+        action="store_true",
+        help="Start at --delay, speed up while latency stays flat, back off on 429/503/timeouts",
+    )
+    crawl_options.add_argument(
+        "--min-delay",
+        type=float,
+        default=0.05,
+        help="Fastest --adaptive-delay may go (robots.txt crawl-delay still applies)",
+    )
+    crawl_options.add_argument(
+        "--max-delay",
+        type=float,
+        default=30.0,
+        help="Slowest --adaptive-delay may back off to",
+    )
+    crawl_options.add_argument(
+        "--host-connections",
+        type=int,
+        default=None,
+        help="Maximum in-flight requests per host (default: up to --concurrency)",
+    )
+    crawl_options.add_argument("--batch-size", type=int, default=10, help="Batch size for queue claims")
+    crawl_options.add_argument(
+        "--prefetch",
+        type=int,
+        default=None,
+        help="Claimed items buffered ahead of the fetchers (default: 2 x --concurrency)",
+    )
+    crawl_options.add_argument(
+        "--flush-size",
+        type=int,
+        default=100,
+        help="Finished pages written per flush",
+    )
+    crawl_options.add_argument(
+        "--flush-bytes",
+        type=int,
+        default=4 * 1024 * 1024,
+        help="Approximate payload bytes written per flush",
+    )
+    crawl_options.add_argument(
+        "--flush-interval",
+        type=float,
+        default=1.0,
+        help="Maximum seconds a finished page waits before being flushed",
+    )
+    crawl_options.add_argument(
+        "--max-buffered",
+        type=int,
+        default=500,
+        help="Finished pages held in memory before fetchers block",
+    )
+    crawl_options.add_argument(
+        "--max-buffered-bytes",
+        type=int,
+        default=64 * 1024 * 1024,
+        help="Approximate bytes of finished pages held in memory before fetchers block",
+    )
+    crawl_options.add_argument(
+        "--cpu-stage",
+        choices=["threads", "processes"],
+        default="threads",
+        help="Where link extraction and hashing run: in the fetch workers or a process pool",
+    )
+    crawl_options.add_argument(
+        "--cpu-workers",
+        type=int,
+        default=None,
+        help="Processes for --cpu-stage processes (default: one per CPU)",
+    )
+    crawl_options.add_argument(
+        "--max-bytes",
+        type=int,
+        default=5 * 1024 * 1024,
+        help="Skip responses larger than this many bytes",
+    )
+    crawl_options.add_argument(
+        "--fetch-deadline",
+        type=float,
+        default=30.0,
+        help="Total seconds allowed per request, including reading the body",
+    )
+    crawl_options.add_argument(
+        "--body-store",
+        default="inline",
+        metavar="{inline,postgres,local:DIR}",
+        help="Where page bodies go: inline on each row, the backend's page_bodies table, or files under DIR",
+    )
+    crawl_options.add_argument(
+        "--compress",
+        action="store_true",
+        help="zstd-compress page bodies stored in crawled_pages (needs the 'compression' extra)",
+    )
+    crawl_options.add_argument(
+        "--seen-capacity",
+        type=int,
+        default=None,
+        help="Distinct URLs the in-memory seen-set is sized for (default: 10 x --max-pages, at least 10000)",
+    )
+    crawl_options.add_argument(
+        "--robots-ttl",
+        type=float,
+        default=24 * 60 * 60,
+        help="Seconds a fetched robots.txt is reused, across runs and workers (upper bound on max-age)",
+    )
+    crawl_options.add_argument("--concurrency", type=int, default=5, help="Number of concurrent requests")
+    crawl_options.add_argument("--max-depth", type=int, default=10, help="Maximum crawl depth")
+    crawl_options.add_argument("--max-pages", type=int, default=1000, help="Maximum pages to crawl")
+    crawl_options.add_argument(
+        "--frontier",
+        choices=["best-first", "breadth-first"],
+        default="best-first",
+        help="best-first: claim shallow, well-linked, sitemap-endorsed pages first; breadth-first: discovery order",
+    )
+    crawl_options.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Fetch only new URLs and known ones whose sitemap lastmod or change history says they changed; "
+        "carry the rest forward from earlier runs",
+    )
+    crawl_options.add_argument(
+        "--near-duplicates",
+        type=int,
+        default=None,
+        metavar="BITS",
+        help="Fingerprint pages with SimHash and stop following links from pages within BITS bits "
+        "of one crawled earlier in the run (3 is a good start)",
+    )
+    crawl_options.add_argument(
+        "--skip-duplicate-bodies",
+        action="store_true",
+        help="With --near-duplicates, record near-duplicate pages without storing their bodies",
+    )
+    crawl_options.add_argument(
+        "--engine",
+        choices=["threads", "async"],
+        default="threads",
+        help="threads: worker-thread pool; async: one event loop with --concurrency in-flight fetches",
+    )
+
+    crawl_options.add_argument(
+        "--worker-id",
+        default=f"{socket.gethostname()}-{os.getpid()}",
+        help="Name this worker claims queue items under; must be unique among a run's workers",
+    )
+    crawl_options.add_argument(
+        "--heartbeat-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between refreshes of this worker's queue claims",
+    )
+    crawl_options.add_argument(
+        "--stale-timeout",
+        type=int,
+        default=2,
+        help="Minutes without a heartbeat after which another worker's claims are reclaimed",
+    )
+    crawl_options.add_argument(
+        "--stats-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between writes of this worker's counters to the run",
+    )
+    crawl_options.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port (/metrics, /metrics.json)",
+    )
+    crawl_options.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Write a JSON metrics snapshot to this file every --metrics-interval seconds",
+    )
+    crawl_options.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=10.0,
+        help="Seconds between --metrics-file snapshots",
+    )
+    crawl_options.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        default=None,
+        help="Sample every thread's stack and write PREFIX.folded, PREFIX.cpu.folded (flamegraph input) "
+        "and a per-stage summary to PREFIX.txt",
+    )
+    crawl_options.add_argument(
+        "--profile-interval",
+        type=float,
+        default=0.01,
+        help="Seconds between --profile samples",
+    )
+
     # Run crawl command
-    run_parser = subparsers.add_parser("run", help="Run a crawl for a source")
+    run_parser = subparsers.add_parser("run", parents=[crawl_options], help="Run a crawl for a source")
     run_parser.add_argument("source_id", type=UUID, help="Source ID to crawl")
-    run_parser.add_argument("--delay", type=float, default=0.5, help="Delay between requests (seconds)")
-    run_parser.add_argument("--batch-size", type=int, default=10, help="Batch size for queue claims")
-    run_parser.add_argument("--concurrency", type=int, default=5, help="Number of concurrent requests")
-    run_parser.add_argument("--max-depth", type=int, default=10, help="Maximum crawl depth")
-    run_parser.add_argument("--max-pages", type=int, default=1000, help="Maximum pages to crawl")
+
+    # Attach another worker to a run in progress
+    join_parser = subparsers.add_parser(
+        "join",
+        parents=[crawl_options],
+        help="Add this process as a worker to a running crawl (give each worker its own --worker-id)",
+    )
+    join_parser.add_argument("run_id", type=UUID, help="Run ID to join")
+
+    # Crawl every due source from one long-running process
+    serve_parser = subparsers.add_parser(
+        "serve",
+        parents=[crawl_options],
+        help="Poll for due sources and crawl them concurrently (threads engine)",
+    )
+    serve_parser.add_argument("--max-runs", type=int, default=8, help="Sources crawled at the same time")
+    serve_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between checks for due sources",
+    )
+    serve_parser.add_argument(
+        "--fetch-budget",
+        type=int,
+        default=32,
+        help="In-flight requests across all runs, split fairly between hosts",
+    )
+
+    # Train a zstd dictionary for a source's page bodies
+    train_parser = subparsers.add_parser(
+        "train-dictionary",
+        help="Train a zstd dictionary from a source's stored pages",
+    )
+    train_parser.add_argument("source_id", type=UUID, help="Source ID to train for")
+    train_parser.add_argument("--samples", type=int, default=500, help="Most recent pages to sample")
+    train_parser.add_argument("--dict-size", type=int, default=112_640, help="Dictionary size in bytes")
 
     args = parser.parse_args()
 
     # Import here to avoid circular imports and delay loading
-    from src.infrastructure.db import get_supabase_client
-    from src.infrastructure.repositories import (
-        SupabaseCrawledPageRepository,
-        SupabaseQueueRepository,
-        SupabaseRunRepository,
-        SupabaseSourceRepository,
-    )
-    from src.ingestion.crawling import HttpClient
-    from src.ingestion.use_cases import CrawlUseCase
-
-    # Wire dependencies
-    client = get_supabase_client()
-    source_repo = SupabaseSourceRepository(client)
-    run_repo = SupabaseRunRepository(client)
-    page_repo = SupabaseCrawledPageRepository(client)
-    queue_repo = SupabaseQueueRepository(client)
-    http_client = HttpClient()
-
-    use_case = CrawlUseCase(
+    from src.domain.rules import BestFirstScorer, BreadthFirstScorer
+    from src.infrastructure.backend import create_repositories
+    from src.infrastructure.blob_store import LocalBlobStore
+    from src.ingestion.crawling import (
+        AsyncHttpClient,
+        CrawlMetrics,
+        FetchBudget,
+        HttpClient,
+        RobotsCache,
+        SamplingProfiler,
+    )
+    from src.ingestion.use_cases import CrawlScheduler, CrawlUseCase
+    from src.interfaces.metrics import MetricsDumper, MetricsServer
+
+    # Wire dependencies (Supabase, direct Postgres or a local SQLite file)
+    try:
+        repos = create_repositories(compress=getattr(args, "compress", False), backend=args.backend)
+    except ValueError as e:
+        parser.error(str(e))
+    source_repo = repos.source_repo
+    run_repo = repos.run_repo
+    page_repo = repos.page_repo
+    queue_repo = repos.queue_repo
+    max_bytes = getattr(args, "max_bytes", 5 * 1024 * 1024)
+    fetch_deadline = getattr(args, "fetch_deadline", 30.0)
+    http_client = HttpClient(max_bytes=max_bytes, deadline=fetch_deadline)
+    body_store = getattr(args, "body_store", "inline")
+    blob_store = None
+    if body_store == "postgres":
+        blob_store = repos.blob_store
+    elif body_store.startswith("local:"):
+        blob_store = LocalBlobStore(body_store.removeprefix("local:"))
+    elif body_store != "inline":
+        parser.error(f"invalid --body-store: {body_store}")
+    robots_cache = RobotsCache(
+        http_client,
+        store=repos.robots_store,
+        ttl=getattr(args, "robots_ttl", 24 * 60 * 60),
+    )
+    engine = getattr(args, "engine", "threads")
+    async_http_client = None
+    if engine == "async":
+        async_http_client = AsyncHttpClient(
+            max_connections=getattr(args, "concurrency", 5),
+            max_bytes=max_bytes,
+            deadline=fetch_deadline,
+        )
+
+    fetch_budget = None
+    if args.command == "serve":
+        if engine != "threads":
+            parser.error("serve runs sources on the threads engine")
+        fetch_budget = FetchBudget(args.fetch_budget)
+
+    # Opt-in: without an exporter nothing is timed or counted
+    metrics = None
+    exporters = []
+    metrics_port = getattr(args, "metrics_port", None)
+    metrics_file = getattr(args, "metrics_file", None)
+    if metrics_port is not None or metrics_file:
+        metrics = CrawlMetrics()
+        if metrics_port is not None:
+            exporters.append(MetricsServer(metrics, metrics_port).start())
+        if metrics_file:
+            exporters.append(MetricsDumper(metrics, metrics_file, args.metrics_interval).start())
+
+    use_case_options = dict(
         source_repo=source_repo,
         run_repo=run_repo,
         page_repo=page_repo,
         queue_repo=queue_repo,
         http_client=http_client,
+        blob_store=blob_store,
+        robots_cache=robots_cache,
         delay=getattr(args, "delay", 0.5),
+        adaptive_delay=getattr(args, "adaptive_delay", False),
+        min_delay=getattr(args, "min_delay", 0.05),
+        max_delay=getattr(args, "max_delay", 30.0),
+        host_connections=getattr(args, "host_connections", None),
         batch_size=getattr(args, "batch_size", 10),
         concurrency=getattr(args, "concurrency", 5),
         max_depth=getattr(args, "max_depth", 10),
         max_pages=getattr(args, "max_pages", 1000),
+        fetch_budget=fetch_budget,
+        engine=engine,
+        async_http_client=async_http_client,
+        prefetch=getattr(args, "prefetch", None),
+        flush_size=getattr(args, "flush_size", 100),
+        flush_interval=getattr(args, "flush_interval", 1.0),
+        flush_bytes=getattr(args, "flush_bytes", 4 * 1024 * 1024),
+        max_buffered=getattr(args, "max_buffered", 500),
+        max_buffered_bytes=getattr(args, "max_buffered_bytes", 64 * 1024 * 1024),
+        seen_capacity=getattr(args, "seen_capacity", None),
+        cpu_stage=getattr(args, "cpu_stage", "threads"),
+        cpu_workers=getattr(args, "cpu_workers", None),
+        worker_id=getattr(args, "worker_id", "default"),
+        heartbeat_interval=getattr(args, "heartbeat_interval", 30.0),
+        stale_timeout_minutes=getattr(args, "stale_timeout", 2),
+        stats_interval=getattr(args, "stats_interval", 5.0),
+        metrics=metrics,
+        priority_scorer=BreadthFirstScorer() if getattr(args, "frontier", None) == "breadth-first" else BestFirstScorer(),
+        incremental=getattr(args, "incremental", False),
+        near_duplicate_distance=getattr(args, "near_duplicates", None),
+        skip_duplicate_bodies=getattr(args, "skip_duplicate_bodies", False),
     )
+    use_case = CrawlUseCase(**use_case_options)
+
+    profile = getattr(args, "profile", None)
+    profiler = SamplingProfiler(args.profile_interval).start() if profile else None
+
+    try:
+        if args.command == "create":
+            use_case.create_source(args.url, args.type)
+
+        elif args.command == "run":
+            result = use_case.start_run(args.source_id)
+            logger.info(
+                f"Result: {result.pages_crawled} crawled, {result.pages_failed} failed, {result.pages_carried} carried, "
+                f"{result.near_duplicates} near-duplicates"
+            )
+
+        elif args.command == "join":
+            result = use_case.join_run(args.run_id)
+            logger.info(f"Result: {result.pages_crawled} crawled, {result.pages_failed} failed")
 
-    if args.command == "create":
-        use_case.create_source(args.url, args.type)
+        elif args.command == "serve":
+            def make_use_case(source):
+                # One use case per run: runs keep per-run state on it, but share
+                # the clients, robots cache and fetch budget wired above
+                return CrawlUseCase(**{**use_case_options, "max_pages": source.max_pages or args.max_pages})
 
-    elif args.command == "run":
-        result = use_case.start_run(args.source_id)
-        logger.info(f"Result: {result.pages_crawled} crawled, {result.pages_failed} failed")
+            scheduler = CrawlScheduler(
+                source_repo,
+                make_use_case,
+                max_runs=args.max_runs,
+                poll_interval=args.poll_interval,
+            )
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda *_: scheduler.stop())
+            scheduler.serve()
 
+        elif args.command == "train-dictionary":
+            dict_id = page_repo.train_dictionary(args.source_id, args.samples, args.dict_size)
+            logger.info(f"Trained dictionary {dict_id} for source {args.source_id}")
+    finally:
+        for exporter in exporters:
+            exporter.close()
+        if profiler is not None:
+            profiler.stop()
+            paths = profiler.write(profile)
+            logger.info(f"Profile written to {', '.join(map(str, paths))}\n{profiler.format_summary()}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.ingestion.crawling import CrawlMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsServer:
+    """Serves `CrawlMetrics` over HTTP on a background thread.
+
+    GET /metrics returns the Prometheus text format, GET /metrics.json the
+    same data as JSON.
+    """
+
+    def __init__(self, metrics: CrawlMetrics, port: int, host: str = "0.0.0.0"):
+        self.metrics = metrics
+        handler = _handler(metrics)
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> MetricsServer:
+        self._thread.start()
+        logger.info(f"Serving metrics on port {self.port}")
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def _handler(metrics: CrawlMetrics) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path == "/metrics":
+                body = metrics.render_prometheus().encode()
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                body = json.dumps(metrics.snapshot()).encode()
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            # Scrapes every few seconds would drown the crawl log
+            pass
+
+    return Handler
+
+
+class MetricsDumper:
+    """Writes a JSON snapshot of `CrawlMetrics` to a file every `interval` seconds.
+
+    The file is replaced atomically, so readers never see a partial dump;
+    a final snapshot is written on close.
+    """
+
+    def __init__(self, metrics: CrawlMetrics, path: str | Path, interval: float = 10.0):
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        self.metrics = metrics
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="metrics-dump", daemon=True)
+
+    def start(self) -> MetricsDumper:
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.dump()
+
+    def dump(self) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps(self.metrics.snapshot(), indent=2))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.path}: {e}")
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.dump()
@@ -0,0 +1,25 @@
+alter table "public"."crawl_queue" add column "error" text;
+
+set check_function_bodies = off;
+
+CREATE OR REPLACE FUNCTION public.ack_queue_items(p_ids uuid[], p_status text, p_errors text[] DEFAULT NULL::text[])
+ RETURNS integer
+ LANGUAGE plpgsql
+AS $function$
+declare
+    affected int;
+begin
+    update crawl_queue q
+    set
+        status = p_status,
+        error = a.error
+    from unnest(p_ids, coalesce(p_errors, array[]::text[])) as a(id, error)
+    where q.id = a.id;
+
+    get diagnostics affected = row_count;
+    return affected;
+end;
+$function$
+;
+
+
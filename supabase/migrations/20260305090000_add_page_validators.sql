@@ -0,0 +1,27 @@
+alter table "public"."crawled_pages" add column "etag" text;
+
+alter table "public"."crawled_pages" add column "last_modified" text;
+
+alter table "public"."crawled_pages" add column "max_age" integer;
+
+alter table "public"."crawled_pages" add column "unchanged" boolean not null default false;
+
+set check_function_bodies = off;
+
+CREATE OR REPLACE FUNCTION public.get_page_validators(p_source_id uuid, p_url_hashes text[])
+ RETURNS TABLE(page_id uuid, url_hash text, content_hash text, etag text, last_modified text, max_age integer, crawled_at timestamp with time zone)
+ LANGUAGE sql
+ STABLE
+AS $function$
+    select distinct on (cp.url_hash)
+        cp.id, cp.url_hash, cp.content_hash, cp.etag, cp.last_modified, cp.max_age, cp.crawled_at
+    from crawled_pages cp
+    where cp.url_hash = any(p_url_hashes)
+        and cp.source_id = p_source_id
+        and cp.content is not null
+        and (cp.etag is not null or cp.last_modified is not null or cp.max_age is not null)
+    order by cp.url_hash, cp.crawled_at desc;
+$function$
+;
+
+
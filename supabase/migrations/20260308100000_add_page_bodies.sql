@@ -0,0 +1,87 @@
+  create table "public"."page_bodies" (
+    "content_hash" text not null,
+    "content" text not null,
+    "created_at" timestamp with time zone not null default now()
+      );
+
+
+alter table "public"."page_bodies" enable row level security;
+
+CREATE UNIQUE INDEX page_bodies_pkey ON public.page_bodies USING btree (content_hash);
+
+alter table "public"."page_bodies" add constraint "page_bodies_pkey" PRIMARY KEY using index "page_bodies_pkey";
+
+set check_function_bodies = off;
+
+CREATE OR REPLACE FUNCTION public.get_page_validators(p_source_id uuid, p_url_hashes text[])
+ RETURNS TABLE(page_id uuid, url_hash text, content_hash text, etag text, last_modified text, max_age integer, crawled_at timestamp with time zone)
+ LANGUAGE sql
+ STABLE
+AS $function$
+    select distinct on (cp.url_hash)
+        cp.id, cp.url_hash, cp.content_hash, cp.etag, cp.last_modified, cp.max_age, cp.crawled_at
+    from crawled_pages cp
+    where cp.url_hash = any(p_url_hashes)
+        and cp.source_id = p_source_id
+        and cp.content_hash is not null
+        and not cp.unchanged
+        and (cp.etag is not null or cp.last_modified is not null or cp.max_age is not null)
+    order by cp.url_hash, cp.crawled_at desc;
+$function$
+;
+
+CREATE OR REPLACE FUNCTION public.get_unparsed_pages(p_limit integer DEFAULT 100)
+ RETURNS SETOF public.crawled_pages
+ LANGUAGE sql
+AS $function$
+    select cp.*
+    from crawled_pages cp
+    left join parsed_pages pp on pp.page_id = cp.id
+    where pp.id is null and cp.content_hash is not null and not cp.unchanged
+    order by cp.crawled_at desc
+    limit p_limit;
+$function$
+;
+
+grant delete on table "public"."page_bodies" to "anon";
+
+grant insert on table "public"."page_bodies" to "anon";
+
+grant references on table "public"."page_bodies" to "anon";
+
+grant select on table "public"."page_bodies" to "anon";
+
+grant trigger on table "public"."page_bodies" to "anon";
+
+grant truncate on table "public"."page_bodies" to "anon";
+
+grant update on table "public"."page_bodies" to "anon";
+
+grant delete on table "public"."page_bodies" to "authenticated";
+
+grant insert on table "public"."page_bodies" to "authenticated";
+
+grant references on table "public"."page_bodies" to "authenticated";
+
+grant select on table "public"."page_bodies" to "authenticated";
+
+grant trigger on table "public"."page_bodies" to "authenticated";
+
+grant truncate on table "public"."page_bodies" to "authenticated";
+
+grant update on table "public"."page_bodies" to "authenticated";
+
+grant delete on table "public"."page_bodies" to "service_role";
+
+grant insert on table "public"."page_bodies" to "service_role";
+
+grant references on table "public"."page_bodies" to "service_role";
+
+grant select on table "public"."page_bodies" to "service_role";
+
+grant trigger on table "public"."page_bodies" to "service_role";
+
+grant truncate on table "public"."page_bodies" to "service_role";
+
+grant update on table "public"."page_bodies" to "service_role";
+
@@ -0,0 +1,68 @@
+alter table "public"."crawled_pages" add column "content_encoding" text;
+
+alter table "public"."crawled_pages" add column "content_zstd" bytea;
+
+
+  create table "public"."compression_dictionaries" (
+    "dict_id" bigint not null,
+    "source_id" uuid not null,
+    "data" bytea not null,
+    "sample_count" integer not null,
+    "created_at" timestamp with time zone not null default now()
+      );
+
+
+alter table "public"."compression_dictionaries" enable row level security;
+
+CREATE INDEX compression_dictionaries_source_idx ON public.compression_dictionaries USING btree (source_id, created_at DESC);
+
+CREATE UNIQUE INDEX compression_dictionaries_pkey ON public.compression_dictionaries USING btree (dict_id);
+
+alter table "public"."compression_dictionaries" add constraint "compression_dictionaries_pkey" PRIMARY KEY using index "compression_dictionaries_pkey";
+
+alter table "public"."compression_dictionaries" add constraint "compression_dictionaries_source_id_fkey" FOREIGN KEY (source_id) REFERENCES public.crawl_sources(id) ON DELETE CASCADE not valid;
+
+alter table "public"."compression_dictionaries" validate constraint "compression_dictionaries_source_id_fkey";
+
+grant delete on table "public"."compression_dictionaries" to "anon";
+
+grant insert on table "public"."compression_dictionaries" to "anon";
+
+grant references on table "public"."compression_dictionaries" to "anon";
+
+grant select on table "public"."compression_dictionaries" to "anon";
+
+grant trigger on table "public"."compression_dictionaries" to "anon";
+
+grant truncate on table "public"."compression_dictionaries" to "anon";
+
+grant update on table "public"."compression_dictionaries" to "anon";
+
+grant delete on table "public"."compression_dictionaries" to "authenticated";
+
+grant insert on table "public"."compression_dictionaries" to "authenticated";
+
+grant references on table "public"."compression_dictionaries" to "authenticated";
+
+grant select on table "public"."compression_dictionaries" to "authenticated";
+
+grant trigger on table "public"."compression_dictionaries" to "authenticated";
+
+grant truncate on table "public"."compression_dictionaries" to "authenticated";
+
+grant update on table "public"."compression_dictionaries" to "authenticated";
+
+grant delete on table "public"."compression_dictionaries" to "service_role";
+
+grant insert on table "public"."compression_dictionaries" to "service_role";
+
+grant references on table "public"."compression_dictionaries" to "service_role";
+
+grant select on table "public"."compression_dictionaries" to "service_role";
+
+grant trigger on table "public"."compression_dictionaries" to "service_role";
+
+grant truncate on table "public"."compression_dictionaries" to "service_role";
+
+grant update on table "public"."compression_dictionaries" to "service_role";
+
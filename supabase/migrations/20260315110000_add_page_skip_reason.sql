@@ -0,0 +1,3 @@
+alter table "public"."crawled_pages" add column "skip_reason" text;
+
+
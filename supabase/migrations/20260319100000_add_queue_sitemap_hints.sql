@@ -0,0 +1,5 @@
+alter table "public"."crawl_queue" add column "lastmod" timestamp with time zone;
+
+alter table "public"."crawl_queue" add column "sitemap_priority" real;
+
+
@@ -0,0 +1,59 @@
+
+  create table "public"."robots_cache" (
+    "host" text not null,
+    "status_code" integer,
+    "body" text,
+    "fetched_at" timestamp with time zone not null,
+    "expires_at" timestamp with time zone not null
+      );
+
+
+alter table "public"."robots_cache" enable row level security;
+
+CREATE UNIQUE INDEX robots_cache_pkey ON public.robots_cache USING btree (host);
+
+alter table "public"."robots_cache" add constraint "robots_cache_pkey" PRIMARY KEY using index "robots_cache_pkey";
+
+grant delete on table "public"."robots_cache" to "anon";
+
+grant insert on table "public"."robots_cache" to "anon";
+
+grant references on table "public"."robots_cache" to "anon";
+
+grant select on table "public"."robots_cache" to "anon";
+
+grant trigger on table "public"."robots_cache" to "anon";
+
+grant truncate on table "public"."robots_cache" to "anon";
+
+grant update on table "public"."robots_cache" to "anon";
+
+grant delete on table "public"."robots_cache" to "authenticated";
+
+grant insert on table "public"."robots_cache" to "authenticated";
+
+grant references on table "public"."robots_cache" to "authenticated";
+
+grant select on table "public"."robots_cache" to "authenticated";
+
+grant trigger on table "public"."robots_cache" to "authenticated";
+
+grant truncate on table "public"."robots_cache" to "authenticated";
+
+grant update on table "public"."robots_cache" to "authenticated";
+
+grant delete on table "public"."robots_cache" to "service_role";
+
+grant insert on table "public"."robots_cache" to "service_role";
+
+grant references on table "public"."robots_cache" to "service_role";
+
+grant select on table "public"."robots_cache" to "service_role";
+
+grant trigger on table "public"."robots_cache" to "service_role";
+
+grant truncate on table "public"."robots_cache" to "service_role";
+
+grant update on table "public"."robots_cache" to "service_role";
+
+
@@ -0,0 +1,55 @@
+set check_function_bodies = off;
+
+CREATE OR REPLACE FUNCTION public.heartbeat_queue_items(p_run_id uuid, p_worker_id text)
+ RETURNS integer
+ LANGUAGE plpgsql
+AS $function$
+declare
+    affected int;
+begin
+    update crawl_queue
+    set claimed_at = now()
+    where run_id = p_run_id
+        and worker_id = p_worker_id
+        and status = 'processing';
+
+    get diagnostics affected = row_count;
+    return affected;
+end;
+$function$
+;
+
+CREATE OR REPLACE FUNCTION public.reset_stale_queue_items(p_timeout_minutes integer DEFAULT 5)
+ RETURNS integer
+ LANGUAGE plpgsql
+AS $function$
+declare
+    affected int;
+    exhausted int;
+begin
+    update crawl_queue
+    set
+        status = 'pending',
+        worker_id = null,
+        claimed_at = null
+    where status = 'processing'
+        and claimed_at < now() - (p_timeout_minutes || ' minutes')::interval
+        and attempts < max_attempts;
+
+    get diagnostics affected = row_count;
+
+    update crawl_queue
+    set
+        status = 'failed',
+        error = 'Worker stopped responding'
+    where status = 'processing'
+        and claimed_at < now() - (p_timeout_minutes || ' minutes')::interval
+        and attempts >= max_attempts;
+
+    get diagnostics exhausted = row_count;
+    return affected + exhausted;
+end;
+$function$
+;
+
+
@@ -0,0 +1,40 @@
+set check_function_bodies = off;
+
+alter table "public"."crawl_runs" add column "bytes_downloaded" bigint not null default 0;
+
+alter table "public"."crawl_runs" add column "links_discovered" bigint not null default 0;
+
+alter table "public"."crawl_runs" add column "links_deduped" bigint not null default 0;
+
+alter table "public"."crawl_runs" add column "status_codes" jsonb not null default '{}'::jsonb;
+
+CREATE OR REPLACE FUNCTION public.increment_run_stats(p_run_id uuid, p_pages_found integer DEFAULT 0, p_pages_crawled integer DEFAULT 0, p_pages_failed integer DEFAULT 0, p_bytes_downloaded bigint DEFAULT 0, p_links_discovered bigint DEFAULT 0, p_links_deduped bigint DEFAULT 0, p_status_codes jsonb DEFAULT '{}'::jsonb)
+ RETURNS SETOF crawl_runs
+ LANGUAGE sql
+AS $function$
+    update crawl_runs r
+    set
+        pages_found = r.pages_found + p_pages_found,
+        pages_crawled = r.pages_crawled + p_pages_crawled,
+        pages_failed = r.pages_failed + p_pages_failed,
+        bytes_downloaded = r.bytes_downloaded + p_bytes_downloaded,
+        links_discovered = r.links_discovered + p_links_discovered,
+        links_deduped = r.links_deduped + p_links_deduped,
+        status_codes = (
+            select coalesce(jsonb_object_agg(code, total), '{}')
+            from (
+                select code, sum(count::bigint) as total
+                from (
+                    select * from jsonb_each_text(r.status_codes)
+                    union all
+                    select * from jsonb_each_text(p_status_codes)
+                ) as counts(code, count)
+                group by code
+            ) as merged
+        )
+    where r.id = p_run_id
+    returning r.*;
+$function$
+;
+
+
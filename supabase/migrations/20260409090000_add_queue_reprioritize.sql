@@ -0,0 +1,24 @@
+set check_function_bodies = off;
+
+CREATE OR REPLACE FUNCTION public.reprioritize_queue_items(p_run_id uuid, p_url_hashes text[], p_priorities integer[])
+ RETURNS integer
+ LANGUAGE plpgsql
+AS $function$
+declare
+    affected int;
+begin
+    update crawl_queue q
+    set priority = a.priority
+    from unnest(p_url_hashes, p_priorities) as a(url_hash, priority)
+    where q.run_id = p_run_id
+        and q.url_hash = a.url_hash
+        and q.status = 'pending'
+        and q.priority < a.priority;
+
+    get diagnostics affected = row_count;
+    return affected;
+end;
+$function$
+;
+
+
@@ -0,0 +1,35 @@
+alter table "public"."crawl_runs" add column "mode" text not null default 'full'::text;
+
+alter table "public"."crawl_runs" add constraint "valid_run_mode" CHECK ((mode = ANY (ARRAY['full'::text, 'incremental'::text]))) not valid;
+
+alter table "public"."crawl_runs" validate constraint "valid_run_mode";
+
+set check_function_bodies = off;
+
+CREATE OR REPLACE FUNCTION public.get_page_history(p_source_id uuid)
+ RETURNS TABLE(url_hash text, url text, content_hash text, first_crawled_at timestamp with time zone, verified_at timestamp with time zone, changes integer)
+ LANGUAGE sql
+ STABLE
+AS $function$
+    select
+        url_hash,
+        (array_agg(url order by crawled_at desc))[1],
+        (array_agg(content_hash order by crawled_at desc))[1],
+        min(crawled_at),
+        max(crawled_at),
+        (count(*) filter (where previous_hash <> content_hash))::int
+    from (
+        select
+            url_hash, url, content_hash, crawled_at,
+            lag(content_hash) over (partition by url_hash order by crawled_at) as previous_hash
+        from crawled_pages
+        where source_id = p_source_id
+            and content_hash is not null
+            and skip_reason is distinct from 'carried_forward'
+    ) as observed
+    group by url_hash
+    order by url_hash;
+$function$
+;
+
+
@@ -0,0 +1,18 @@
+-- url_hash is now the first 16 bytes of SHA-256 of the URL, base64url
+-- without padding (22 characters), in place of the 64-character hex digest.
+-- Re-key stored rows so validators and history still match; rebuild the
+-- indexes afterwards so they shrink.
+
+update "public"."crawled_pages"
+set url_hash = rtrim(translate(encode(substring(sha256(convert_to(url, 'UTF8')) from 1 for 16), 'base64'), '+/', '-_'), '=')
+where length(url_hash) = 64;
+
+update "public"."crawl_queue"
+set url_hash = rtrim(translate(encode(substring(sha256(convert_to(url, 'UTF8')) from 1 for 16), 'base64'), '+/', '-_'), '=')
+where length(url_hash) = 64;
+
+reindex index "public"."crawled_pages_url_hash_idx";
+
+reindex index "public"."crawled_pages_url_latest_idx";
+
+reindex index "public"."crawl_queue_run_url_idx";
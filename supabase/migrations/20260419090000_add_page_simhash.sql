@@ -0,0 +1 @@
+alter table "public"."crawled_pages" add column "simhash" bigint;
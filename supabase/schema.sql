@@ -4,6 +4,7 @@ create table crawl_sources (
     domain text not null,
     entry_url text not null,
     type text not null,
+    -- once, hourly, daily, weekly or an interval such as 30m, 6h, 2d, 1w
     frequency text not null default 'once',
     max_pages int,
     status text not null default 'active',
@@ -20,15 +21,21 @@ create table crawl_runs (
     id uuid primary key default gen_random_uuid(),
     source_id uuid not null references crawl_sources(id) on delete cascade,
     status text not null default 'pending',
+    mode text not null default 'full',
     started_at timestamptz,
     completed_at timestamptz,
     pages_found int not null default 0,
     pages_crawled int not null default 0,
     pages_failed int not null default 0,
+    bytes_downloaded bigint not null default 0,
+    links_discovered bigint not null default 0,
+    links_deduped bigint not null default 0,
+    status_codes jsonb not null default '{}',
     error text,
     created_at timestamptz not null default now(),
 
-    constraint valid_run_status check (status in ('pending', 'running', 'completed', 'failed'))
+    constraint valid_run_status check (status in ('pending', 'running', 'completed', 'failed')),
+    constraint valid_run_mode check (mode in ('full', 'incremental'))
 );
 
 -- Indexes for common queries
@@ -51,6 +58,19 @@ create table crawled_pages (
     content text,
     status_code int,
     error text,
+    -- Null: plain text in content. 'zstd-v1': zstd frame in content_zstd,
+    -- possibly compressed with a compression_dictionaries entry
+    content_encoding text,
+    content_zstd bytea,
+    etag text,
+    last_modified text,
+    max_age int,
+    unchanged boolean not null default false,
+    -- Fetched but not stored: 'content_type', 'too_large', 'deadline' or
+    -- 'near_duplicate'
+    skip_reason text,
+    -- SimHash of the visible text, stored signed
+    simhash bigint,
     crawled_at timestamptz not null default now()
 );
 
@@ -76,6 +96,36 @@ create table parsed_pages (
 create index parsed_pages_page_idx on parsed_pages(page_id);
 create index parsed_pages_parsed_at_idx on parsed_pages(parsed_at desc);
 
+-- Page bodies: content-addressed, stored once per distinct content_hash.
+-- crawled_pages rows leave content null when their body lives here.
+create table page_bodies (
+    content_hash text primary key,
+    content text not null,
+    created_at timestamptz not null default now()
+);
+
+-- Trained zstd dictionaries for page bodies, per source.
+-- dict_id is the id zstd embeds in every frame compressed with it.
+create table compression_dictionaries (
+    dict_id bigint primary key,
+    source_id uuid not null references crawl_sources(id) on delete cascade,
+    data bytea not null,
+    sample_count int not null,
+    created_at timestamptz not null default now()
+);
+
+create index compression_dictionaries_source_idx on compression_dictionaries(source_id, created_at desc);
+
+-- robots.txt per host (scheme://authority), shared by every source and worker.
+-- body is null when the fetch did not return 200 (no restrictions).
+create table robots_cache (
+    host text primary key,
+    status_code int,
+    body text,
+    fetched_at timestamptz not null,
+    expires_at timestamptz not null
+);
+
 -- Queue: distributed crawl queue for multiple workers
 create table crawl_queue (
     id uuid primary key default gen_random_uuid(),
@@ -84,11 +134,14 @@ create table crawl_queue (
     url_hash text not null,
     priority int not null default 0,
     depth int not null default 0,
+    lastmod timestamptz,
+    sitemap_priority real,
     status text not null default 'pending',
     worker_id text,
     claimed_at timestamptz,
     attempts int not null default 0,
     max_attempts int not null default 3,
+    error text,
     created_at timestamptz not null default now(),
 
     constraint valid_queue_status check (status in ('pending', 'processing', 'completed', 'failed'))
@@ -108,6 +161,9 @@ alter table crawl_runs enable row level security;
 alter table crawled_pages enable row level security;
 alter table parsed_pages enable row level security;
 alter table crawl_queue enable row level security;
+alter table page_bodies enable row level security;
+alter table compression_dictionaries enable row level security;
+alter table robots_cache enable row level security;
 
 -- RPC: Atomically claim queue items using FOR UPDATE SKIP LOCKED
 create or replace function claim_queue_items(
@@ -139,7 +195,10 @@ begin
 end;
 $$;
 
--- RPC: Reset stale queue items that have been processing too long
+-- RPC: Reset stale queue items that have been processing too long.
+-- Live workers keep claimed_at fresh with heartbeat_queue_items, so a stale
+-- claim means its worker died. Items out of attempts fail instead of
+-- staying 'processing' forever, which would keep their run from completing.
 create or replace function reset_stale_queue_items(
     p_timeout_minutes int default 5
 )
@@ -148,6 +207,7 @@ language plpgsql
 as $$
 declare
     affected int;
+    exhausted int;
 begin
     update crawl_queue
     set
@@ -158,11 +218,198 @@ begin
         and claimed_at < now() - (p_timeout_minutes || ' minutes')::interval
         and attempts < max_attempts;
 
+    get diagnostics affected = row_count;
+
+    update crawl_queue
+    set
+        status = 'failed',
+        error = 'Worker stopped responding'
+    where status = 'processing'
+        and claimed_at < now() - (p_timeout_minutes || ' minutes')::interval
+        and attempts >= max_attempts;
+
+    get diagnostics exhausted = row_count;
+    return affected + exhausted;
+end;
+$$;
+
+-- RPC: Extend a live worker's claims so reset_stale_queue_items leaves them alone
+create or replace function heartbeat_queue_items(
+    p_run_id uuid,
+    p_worker_id text
+)
+returns int
+language plpgsql
+as $$
+declare
+    affected int;
+begin
+    update crawl_queue
+    set claimed_at = now()
+    where run_id = p_run_id
+        and worker_id = p_worker_id
+        and status = 'processing';
+
+    get diagnostics affected = row_count;
+    return affected;
+end;
+$$;
+
+-- RPC: Add a worker's counter deltas to a run in one atomic statement.
+-- Workers flush on a timer, so totals stay correct however many share a run.
+create or replace function increment_run_stats(
+    p_run_id uuid,
+    p_pages_found int default 0,
+    p_pages_crawled int default 0,
+    p_pages_failed int default 0,
+    p_bytes_downloaded bigint default 0,
+    p_links_discovered bigint default 0,
+    p_links_deduped bigint default 0,
+    p_status_codes jsonb default '{}'
+)
+returns setof crawl_runs
+language sql
+as $$
+    update crawl_runs r
+    set
+        pages_found = r.pages_found + p_pages_found,
+        pages_crawled = r.pages_crawled + p_pages_crawled,
+        pages_failed = r.pages_failed + p_pages_failed,
+        bytes_downloaded = r.bytes_downloaded + p_bytes_downloaded,
+        links_discovered = r.links_discovered + p_links_discovered,
+        links_deduped = r.links_deduped + p_links_deduped,
+        status_codes = (
+            select coalesce(jsonb_object_agg(code, total), '{}')
+            from (
+                select code, sum(count::bigint) as total
+                from (
+                    select * from jsonb_each_text(r.status_codes)
+                    union all
+                    select * from jsonb_each_text(p_status_codes)
+                ) as counts(code, count)
+                group by code
+            ) as merged
+        )
+    where r.id = p_run_id
+    returning r.*;
+$$;
+
+-- RPC: Acknowledge a batch of processed queue items in one statement
+create or replace function ack_queue_items(
+    p_ids uuid[],
+    p_status text,
+    p_errors text[] default null
+)
+returns int
+language plpgsql
+as $$
+declare
+    affected int;
+begin
+    update crawl_queue q
+    set
+        status = p_status,
+        error = a.error
+    from unnest(p_ids, coalesce(p_errors, array[]::text[])) as a(id, error)
+    where q.id = a.id;
+
     get diagnostics affected = row_count;
     return affected;
 end;
 $$;
 
+-- RPC: Raise the priority of pending queue items in one statement.
+-- Only raises: workers send a URL's new priority as more pages link to it,
+-- and two workers' counts must not undo each other.
+create or replace function reprioritize_queue_items(
+    p_run_id uuid,
+    p_url_hashes text[],
+    p_priorities int[]
+)
+returns int
+language plpgsql
+as $$
+declare
+    affected int;
+begin
+    update crawl_queue q
+    set priority = a.priority
+    from unnest(p_url_hashes, p_priorities) as a(url_hash, priority)
+    where q.run_id = p_run_id
+        and q.url_hash = a.url_hash
+        and q.status = 'pending'
+        and q.priority < a.priority;
+
+    get diagnostics affected = row_count;
+    return affected;
+end;
+$$;
+
+-- RPC: Per-URL crawl history of a source, for incremental runs to decide
+-- what to fetch. Rows an incremental run carried forward are not
+-- observations and are left out.
+create or replace function get_page_history(
+    p_source_id uuid
+)
+returns table (
+    url_hash text,
+    url text,
+    content_hash text,
+    first_crawled_at timestamptz,
+    verified_at timestamptz,
+    changes int
+)
+language sql
+stable
+as $$
+    select
+        url_hash,
+        (array_agg(url order by crawled_at desc))[1],
+        (array_agg(content_hash order by crawled_at desc))[1],
+        min(crawled_at),
+        max(crawled_at),
+        (count(*) filter (where previous_hash <> content_hash))::int
+    from (
+        select
+            url_hash, url, content_hash, crawled_at,
+            lag(content_hash) over (partition by url_hash order by crawled_at) as previous_hash
+        from crawled_pages
+        where source_id = p_source_id
+            and content_hash is not null
+            and skip_reason is distinct from 'carried_forward'
+    ) as observed
+    group by url_hash
+    order by url_hash;
+$$;
+
+-- RPC: Latest cache validators per URL for a batch, from full (non-304) crawls
+create or replace function get_page_validators(
+    p_source_id uuid,
+    p_url_hashes text[]
+)
+returns table (
+    page_id uuid,
+    url_hash text,
+    content_hash text,
+    etag text,
+    last_modified text,
+    max_age int,
+    crawled_at timestamptz
+)
+language sql
+stable
+as $$
+    select distinct on (cp.url_hash)
+        cp.id, cp.url_hash, cp.content_hash, cp.etag, cp.last_modified, cp.max_age, cp.crawled_at
+    from crawled_pages cp
+    where cp.url_hash = any(p_url_hashes)
+        and cp.source_id = p_source_id
+        and cp.content_hash is not null
+        and not cp.unchanged
+        and (cp.etag is not null or cp.last_modified is not null or cp.max_age is not null)
+    order by cp.url_hash, cp.crawled_at desc;
+$$;
+
 -- RPC: Get crawled pages that haven't been parsed yet
 create or replace function get_unparsed_pages(
     p_limit int default 100
@@ -173,7 +420,7 @@ as $$
     select cp.*
     from crawled_pages cp
     left join parsed_pages pp on pp.page_id = cp.id
-    where pp.id is null and cp.content is not null
+    where pp.id is null and cp.content_hash is not null and not cp.unchanged
     order by cp.crawled_at desc
     limit p_limit;
 $$;
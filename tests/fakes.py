@@ -0,0 +1,409 @@
+"""In-memory implementations of the domain ports and HTTP clients for tests."""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from src.domain.models import (
+    CrawledPage,
+    CrawledPageCreate,
+    CrawlRun,
+    PageHistory,
+    PageValidators,
+    CrawlRunCreate,
+    CrawlSource,
+    CrawlSourceCreate,
+    QueueItem,
+    QueueItemCreate,
+    RobotsRecord,
+    RunStatsDelta,
+    RunStatus,
+    SourceStatus,
+)
+from src.ingestion.crawling import FetchResult
+from src.ingestion.crawling.fetch import conditional_headers
+
+
+class InMemorySourceRepository:
+    def __init__(self):
+        self.sources: dict[UUID, CrawlSource] = {}
+
+    def create(self, source: CrawlSourceCreate) -> CrawlSource:
+        created = CrawlSource(**source.model_dump(), id=uuid4(), created_at=datetime.now())
+        self.sources[created.id] = created
+        return created
+
+    def get_by_id(self, id: UUID) -> CrawlSource | None:
+        return self.sources.get(id)
+
+    def list(self, status: SourceStatus | None = None) -> list[CrawlSource]:
+        return [s for s in self.sources.values() if status is None or s.status == status]
+
+    def update_status(self, id: UUID, status: SourceStatus) -> CrawlSource:
+        self.sources[id] = self.sources[id].model_copy(update={"status": status})
+        return self.sources[id]
+
+    def update_next_run(self, id: UUID, next_run_at: datetime | None) -> CrawlSource:
+        self.sources[id] = self.sources[id].model_copy(update={"next_run_at": next_run_at})
+        return self.sources[id]
+
+    def delete(self, id: UUID) -> None:
+        self.sources.pop(id, None)
+
+    def get_due_sources(self) -> list[CrawlSource]:
+        now = datetime.now(timezone.utc)
+        return [
+            s for s in self.sources.values()
+            if s.status == "active" and s.next_run_at is not None and s.next_run_at <= now
+        ]
+
+
+class InMemoryRunRepository:
+    def __init__(self):
+        self.runs: dict[UUID, CrawlRun] = {}
+        self.increments = 0
+        self._lock = threading.Lock()
+
+    def create(self, run: CrawlRunCreate) -> CrawlRun:
+        created = CrawlRun(id=uuid4(), source_id=run.source_id, mode=run.mode, created_at=datetime.now())
+        self.runs[created.id] = created
+        return created
+
+    def get_by_id(self, id: UUID) -> CrawlRun | None:
+        return self.runs.get(id)
+
+    def list_by_source(self, source_id: UUID) -> list[CrawlRun]:
+        return [r for r in self.runs.values() if r.source_id == source_id]
+
+    def _update(self, id: UUID, **fields) -> CrawlRun:
+        self.runs[id] = self.runs[id].model_copy(update=fields)
+        return self.runs[id]
+
+    def update_status(self, id: UUID, status: RunStatus) -> CrawlRun:
+        return self._update(id, status=status)
+
+    def update_stats(self, id: UUID, pages_found: int, pages_crawled: int, pages_failed: int) -> CrawlRun:
+        return self._update(id, pages_found=pages_found, pages_crawled=pages_crawled, pages_failed=pages_failed)
+
+    def increment_stats(self, id: UUID, delta: RunStatsDelta) -> CrawlRun:
+        with self._lock:
+            self.increments += 1
+            run = self.runs[id]
+            codes = dict(run.status_codes)
+            for code, count in delta.status_codes.items():
+                codes[code] = codes.get(code, 0) + count
+            fields = delta.model_dump(exclude={"status_codes"})
+            return self._update(
+                id, status_codes=codes, **{name: getattr(run, name) + value for name, value in fields.items()}
+            )
+
+    def mark_started(self, id: UUID) -> CrawlRun:
+        return self._update(id, status="running", started_at=datetime.now())
+
+    def mark_completed(self, id: UUID, error: str | None = None) -> CrawlRun:
+        status = "failed" if error else "completed"
+        return self._update(id, status=status, completed_at=datetime.now(), error=error)
+
+
+class InMemoryCrawledPageRepository:
+    def __init__(self):
+        self.pages: list[CrawledPage] = []
+        self._lock = threading.Lock()
+
+    def create(self, page: CrawledPageCreate) -> CrawledPage:
+        return self.create_batch([page])[0]
+
+    def create_batch(self, pages: list[CrawledPageCreate]) -> list[CrawledPage]:
+        created = [CrawledPage(**p.model_dump(), id=uuid4(), crawled_at=datetime.now()) for p in pages]
+        with self._lock:
+            self.pages.extend(created)
+        return created
+
+    def get_by_id(self, id: UUID) -> CrawledPage | None:
+        return next((p for p in self.pages if p.id == id), None)
+
+    def list_by_run(self, run_id: UUID) -> list[CrawledPage]:
+        return [p for p in self.pages if p.run_id == run_id]
+
+    def get_latest_by_url(self, source_id: UUID, url_hash: str) -> CrawledPage | None:
+        matches = [p for p in self.pages if p.source_id == source_id and p.url_hash == url_hash]
+        return matches[-1] if matches else None
+
+    def get_validators(self, source_id: UUID, url_hashes: list[str]) -> dict[str, PageValidators]:
+        wanted = set(url_hashes)
+        validators = {}
+        for p in self.pages:
+            if p.source_id != source_id or p.url_hash not in wanted or p.content_hash is None or p.unchanged:
+                continue
+            if p.etag is None and p.last_modified is None and p.max_age is None:
+                continue
+            validators[p.url_hash] = PageValidators(
+                page_id=p.id,
+                url_hash=p.url_hash,
+                content_hash=p.content_hash,
+                etag=p.etag,
+                last_modified=p.last_modified,
+                max_age=p.max_age,
+                crawled_at=p.crawled_at,
+            )
+        return validators
+
+    def get_history(self, source_id: UUID) -> list[PageHistory]:
+        history: dict[str, PageHistory] = {}
+        for p in sorted(self.pages, key=lambda p: p.crawled_at):
+            if p.source_id != source_id or p.content_hash is None or p.skip_reason == "carried_forward":
+                continue
+            seen = history.get(p.url_hash)
+            if seen is None:
+                history[p.url_hash] = PageHistory(
+                    url_hash=p.url_hash,
+                    url=p.url,
+                    content_hash=p.content_hash,
+                    first_crawled_at=p.crawled_at,
+                    verified_at=p.crawled_at,
+                )
+                continue
+            history[p.url_hash] = seen.model_copy(
+                update={
+                    "url": p.url,
+                    "content_hash": p.content_hash,
+                    "verified_at": p.crawled_at,
+                    "changes": seen.changes + (p.content_hash != seen.content_hash),
+                }
+            )
+        return [history[key] for key in sorted(history)]
+
+    def get_contents(self, ids: list[UUID]) -> dict[UUID, str]:
+        wanted = set(ids)
+        return {p.id: p.content for p in self.pages if p.id in wanted and p.content is not None}
+
+
+class InMemoryQueueRepository:
+    """Queue with the same claim ordering and duplicate handling as the SQL one."""
+
+    def __init__(self):
+        self.items: dict[tuple[UUID, str], QueueItem] = {}
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, item: QueueItemCreate) -> QueueItem:
+        return self.add_batch([item])[0]
+
+    def add_batch(self, items: list[QueueItemCreate]) -> list[QueueItem]:
+        self._count("add_batch")
+        added = []
+        with self._lock:
+            for item in items:
+                key = (item.run_id, item.url_hash)
+                if key in self.items:
+                    continue
+                created = QueueItem(**item.model_dump(), id=uuid4(), created_at=datetime.now())
+                self.items[key] = created
+                added.append(created)
+        return added
+
+    def claim(self, run_id: UUID, worker_id: str, limit: int = 10) -> list[QueueItem]:
+        with self._lock:
+            pending = [q for q in self.items.values() if q.run_id == run_id and q.status == "pending"]
+            pending.sort(key=lambda q: (-q.priority, q.created_at))
+            claimed = []
+            for q in pending[:limit]:
+                updated = q.model_copy(update={
+                    "status": "processing",
+                    "worker_id": worker_id,
+                    "claimed_at": datetime.now(),
+                    "attempts": q.attempts + 1,
+                })
+                self.items[(q.run_id, q.url_hash)] = updated
+                claimed.append(updated)
+            return claimed
+
+    def _count(self, method: str) -> None:
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+    def _set_status(self, updates: dict[UUID, tuple[str, str | None]]) -> list[QueueItem]:
+        with self._lock:
+            changed = []
+            for key, q in self.items.items():
+                if q.id in updates:
+                    status, error = updates[q.id]
+                    self.items[key] = q.model_copy(update={"status": status, "error": error})
+                    changed.append(self.items[key])
+            return changed
+
+    def complete(self, id: UUID) -> QueueItem:
+        self._count("complete")
+        return self._set_status({id: ("completed", None)})[0]
+
+    def fail(self, id: UUID, error: str | None = None) -> QueueItem:
+        self._count("fail")
+        return self._set_status({id: ("failed", error)})[0]
+
+    def complete_many(self, ids: list[UUID]) -> int:
+        if not ids:
+            return 0
+        self._count("complete_many")
+        return len(self._set_status({id: ("completed", None) for id in ids}))
+
+    def fail_many(self, failures: list[tuple[UUID, str | None]]) -> int:
+        if not failures:
+            return 0
+        self._count("fail_many")
+        return len(self._set_status({id: ("failed", error) for id, error in failures}))
+
+    def reset_stale(self, timeout_minutes: int = 5) -> int:
+        self._count("reset_stale")
+        cutoff = datetime.now() - timedelta(minutes=timeout_minutes)
+        with self._lock:
+            reset = 0
+            for key, q in self.items.items():
+                if q.status != "processing" or q.claimed_at is None or q.claimed_at >= cutoff:
+                    continue
+                if q.attempts < q.max_attempts:
+                    update = {"status": "pending", "worker_id": None, "claimed_at": None}
+                else:
+                    update = {"status": "failed", "error": "Worker stopped responding"}
+                self.items[key] = q.model_copy(update=update)
+                reset += 1
+            return reset
+
+    def heartbeat(self, run_id: UUID, worker_id: str) -> int:
+        self._count("heartbeat")
+        with self._lock:
+            held = [
+                key for key, q in self.items.items()
+                if q.run_id == run_id and q.worker_id == worker_id and q.status == "processing"
+            ]
+            for key in held:
+                self.items[key] = self.items[key].model_copy(update={"claimed_at": datetime.now()})
+            return len(held)
+
+    def reprioritize(self, run_id: UUID, priorities: list[tuple[str, int]]) -> int:
+        if not priorities:
+            return 0
+        self._count("reprioritize")
+        with self._lock:
+            raised = 0
+            for h, priority in priorities:
+                q = self.items.get((run_id, h))
+                if q is not None and q.status == "pending" and q.priority < priority:
+                    self.items[(run_id, h)] = q.model_copy(update={"priority": priority})
+                    raised += 1
+            return raised
+
+    def get_pending_count(self, run_id: UUID) -> int:
+        with self._lock:
+            return sum(1 for q in self.items.values() if q.run_id == run_id and q.status == "pending")
+
+    def get_processing_count(self, run_id: UUID) -> int:
+        with self._lock:
+            return sum(1 for q in self.items.values() if q.run_id == run_id and q.status == "processing")
+
+    def get_url_hashes(self, run_id: UUID) -> list[str]:
+        return [q.url_hash for q in self.items.values() if q.run_id == run_id]
+
+    def by_status(self, status: str) -> list[QueueItem]:
+        return [q for q in self.items.values() if q.status == status]
+
+
+class InMemoryBlobStore:
+    def __init__(self):
+        self.blobs: dict[str, str] = {}
+        self.writes = 0
+
+    def existing(self, content_hashes: list[str]) -> set[str]:
+        return {h for h in content_hashes if h in self.blobs}
+
+    def put_many(self, blobs: dict[str, str]) -> int:
+        self.writes += len(blobs)
+        self.blobs.update(blobs)
+        return len(blobs)
+
+    def get_many(self, content_hashes: list[str]) -> dict[str, str]:
+        return {h: self.blobs[h] for h in content_hashes if h in self.blobs}
+
+
+class InMemoryRobotsStore:
+    def __init__(self):
+        self.records: dict[str, RobotsRecord] = {}
+
+    def get(self, host: str) -> RobotsRecord | None:
+        return self.records.get(host)
+
+    def save(self, record: RobotsRecord) -> None:
+        self.records[record.host] = record
+
+
+class FakeSite:
+    """Pages keyed by URL; anything else is a 404. URLs in `broken` raise.
+
+    Pages listed in `etags` are served with that ETag and answer a matching
+    If-None-Match with 304. URLs in `skips` come back skipped with that reason.
+    `files` holds raw bodies (e.g. gzipped sitemaps) served by `download_bytes`.
+    """
+
+    def __init__(
+        self,
+        pages: dict[str, str],
+        broken: set[str] | None = None,
+        etags: dict[str, str] | None = None,
+        skips: dict[str, str] | None = None,
+        files: dict[str, bytes] | None = None,
+    ):
+        self.pages = pages
+        self.broken = broken or set()
+        self.etags = etags or {}
+        self.skips = skips or {}
+        self.files = files or {}
+        self.requested: list[str] = []
+
+    def respond(self, url: str, validators: PageValidators | None = None) -> FetchResult:
+        self.requested.append(url)
+        if url in self.broken:
+            raise RuntimeError(f"boom: {url}")
+        if url in self.skips:
+            return FetchResult.skipped(self.skips[url], 200)
+        if url not in self.pages:
+            return FetchResult(content=None, status_code=404, error="Not Found")
+        etag = self.etags.get(url)
+        if etag is not None and conditional_headers(validators).get("If-None-Match") == etag:
+            return FetchResult(content=None, status_code=304, etag=etag)
+        return FetchResult(content=self.pages[url], status_code=200, etag=etag)
+
+
+class FakeHttpClient:
+    def __init__(self, site: FakeSite):
+        self.site = site
+
+    def download(self, url: str) -> tuple[str | None, int | None, str | None]:
+        fetched = self.site.respond(url)
+        return fetched.content, fetched.status_code, fetched.error
+
+    def fetch_resource(self, url: str) -> FetchResult:
+        return self.site.respond(url)
+
+    def download_bytes(self, url: str, max_bytes: int | None = None) -> tuple[bytes | None, int | None, str | None]:
+        if url in self.site.files:
+            self.site.requested.append(url)
+            return self.site.files[url], 200, None
+        content, status_code, error = self.download(url)
+        return (content.encode() if content is not None else None), status_code, error
+
+    def fetch(self, url: str, validators: PageValidators | None = None) -> FetchResult:
+        return self.site.respond(url, validators)
+
+
+class FakeAsyncHttpClient:
+    def __init__(self, site: FakeSite):
+        self.site = site
+
+    async def fetch(self, url: str, validators: PageValidators | None = None) -> FetchResult:
+        return self.site.respond(url, validators)
+
+    async def __aenter__(self) -> FakeAsyncHttpClient:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
@@ -0,0 +1,65 @@
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("zstandard")
+
+from src.infrastructure.compression import ZstdBodyCodec, from_bytea, to_bytea  # noqa: E402
+
+
+class InMemoryDictionaryStore:
+    def __init__(self):
+        self.by_id: dict[int, bytes] = {}
+        self.latest: dict = {}
+
+    def get_latest(self, source_id):
+        return self.latest.get(source_id)
+
+    def get(self, dict_id):
+        return self.by_id.get(dict_id)
+
+    def save(self, source_id, dict_id, data, sample_count):
+        self.by_id[dict_id] = data
+        self.latest[source_id] = data
+
+
+def _pages(n: int) -> list[str]:
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+    return [
+        f"<html><head><title>Article {i}</title></head><body><nav><ul>{nav}</ul></nav>"
+        f"<main><h1>Article {i}</h1><p>Body text number {i * 7919}.</p></main>"
+        f"<footer>Copyright Example Corp. All rights reserved.</footer></body></html>"
+        for i in range(n)
+    ]
+
+
+def test_round_trip_without_dictionary():
+    codec = ZstdBodyCodec()
+    body = _pages(1)[0]
+
+    encoded = codec.encode(body)
+
+    assert len(encoded) < len(body)
+    assert codec.decode(encoded) == body
+
+
+def test_trained_dictionary_is_used_for_its_source_and_found_on_decode():
+    store = InMemoryDictionaryStore()
+    source_id = uuid4()
+    pages = _pages(400)
+    trainer = ZstdBodyCodec(store)
+    trainer.train(source_id, pages[:300], dict_size=16_384)
+    sample = pages[350]
+
+    with_dict = trainer.encode(sample, source_id)
+    without_dict = trainer.encode(sample, uuid4())
+
+    assert len(with_dict) < len(without_dict)
+    # A fresh codec (another process) resolves the dictionary from the frame's id
+    assert ZstdBodyCodec(store).decode(with_dict) == sample
+
+
+def test_bytea_hex_round_trip():
+    data = bytes(range(256))
+    assert to_bytea(data).startswith("\\x")
+    assert from_bytea(to_bytea(data)) == data
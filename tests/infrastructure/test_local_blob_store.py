@@ -0,0 +1,17 @@
+from src.infrastructure.blob_store import LocalBlobStore
+
+
+def test_round_trip_and_existence(tmp_path):
+    store = LocalBlobStore(tmp_path / "bodies")
+
+    assert store.put_many({"ab" * 32: "<html>one</html>", "cd" * 32: "<html>two</html>"}) == 2
+    assert store.existing(["ab" * 32, "ef" * 32]) == {"ab" * 32}
+    assert store.get_many(["cd" * 32, "ef" * 32]) == {"cd" * 32: "<html>two</html>"}
+
+
+def test_existing_body_is_not_rewritten(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    store.put_many({"ab" * 32: "first"})
+
+    assert store.put_many({"ab" * 32: "second"}) == 0
+    assert store.get_many(["ab" * 32]) == {"ab" * 32: "first"}
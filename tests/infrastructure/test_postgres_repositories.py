@@ -0,0 +1,237 @@
+"""Postgres repositories against a real server.
+
+Set TEST_DATABASE_URL to a database the tests may write to; every test
+module run gets a fresh schema loaded from supabase/schema.sql.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("psycopg")
+pytest.importorskip("psycopg_pool")
+
+import psycopg  # noqa: E402
+from psycopg.conninfo import make_conninfo  # noqa: E402
+
+from src.domain.models import (  # noqa: E402
+    CrawledPageCreate,
+    CrawlRunCreate,
+    CrawlSourceCreate,
+    ParsedPageCreate,
+    QueueItemCreate,
+    RobotsRecord,
+    RunStatsDelta,
+)
+from src.domain.rules import CARRIED_FORWARD, url_hash  # noqa: E402
+from src.infrastructure.blob_store import PostgresBlobStore  # noqa: E402
+from src.infrastructure.db import create_postgres_pool  # noqa: E402
+from src.infrastructure.db.postgres import COPY_MIN_ROWS  # noqa: E402
+from src.infrastructure.repositories import (  # noqa: E402
+    PostgresCrawledPageRepository,
+    PostgresParsedPageRepository,
+    PostgresQueueRepository,
+    PostgresRobotsStore,
+    PostgresRunRepository,
+    PostgresSourceRepository,
+)
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+SCHEMA = "answer_engine_test"
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+
+@pytest.fixture(scope="module")
+def pool():
+    schema_sql = (Path(__file__).parents[2] / "supabase" / "schema.sql").read_text()
+    conninfo = make_conninfo(DATABASE_URL, options=f"-c search_path={SCHEMA}")
+    with psycopg.connect(conninfo, autocommit=True) as conn:
+        conn.execute(f"drop schema if exists {SCHEMA} cascade")
+        conn.execute(f"create schema {SCHEMA}")
+        conn.execute(schema_sql)
+    pool = create_postgres_pool(conninfo, max_size=4)
+    yield pool
+    pool.close()
+    with psycopg.connect(DATABASE_URL, autocommit=True) as conn:
+        conn.execute(f"drop schema {SCHEMA} cascade")
+
+
+@pytest.fixture
+def run(pool):
+    source = PostgresSourceRepository(pool).create(
+        CrawlSourceCreate(domain="example.com", entry_url="https://example.com/", type="full_domain")
+    )
+    runs = PostgresRunRepository(pool)
+    created = runs.create(CrawlRunCreate(source_id=source.id))
+    return runs.mark_started(created.id)
+
+
+def _items(run_id, n: int, prefix: str = "p") -> list[QueueItemCreate]:
+    urls = [f"https://example.com/{prefix}{i}" for i in range(n)]
+    return [QueueItemCreate(run_id=run_id, url=u, url_hash=url_hash(u), depth=1) for u in urls]
+
+
+def test_sources_and_runs_round_trip(pool, run):
+    sources = PostgresSourceRepository(pool)
+    runs = PostgresRunRepository(pool)
+
+    assert runs.get_by_id(run.id).status == "running"
+    updated = runs.update_stats(run.id, pages_found=5, pages_crawled=3, pages_failed=1)
+    assert (updated.pages_found, updated.pages_crawled, updated.pages_failed) == (5, 3, 1)
+    assert runs.mark_completed(run.id, error="boom").status == "failed"
+
+    past = datetime.now(timezone.utc) - timedelta(minutes=1)
+    sources.update_next_run(run.source_id, past)
+    assert run.source_id in {s.id for s in sources.get_due_sources()}
+    sources.update_next_run(run.source_id, None)
+    assert run.source_id not in {s.id for s in sources.get_due_sources()}
+
+
+def test_stat_increments_add_up(pool, run):
+    runs = PostgresRunRepository(pool)
+
+    runs.increment_stats(run.id, RunStatsDelta(pages_crawled=2, links_discovered=9, status_codes={200: 2}))
+    updated = runs.increment_stats(
+        run.id, RunStatsDelta(pages_failed=1, links_deduped=4, bytes_downloaded=2**40, status_codes={200: 1, 500: 1})
+    )
+
+    assert (updated.pages_crawled, updated.pages_failed, updated.bytes_downloaded) == (2, 1, 2**40)
+    assert (updated.links_discovered, updated.links_deduped) == (9, 4)
+    assert updated.status_codes == {200: 3, 500: 1}
+
+
+@pytest.mark.parametrize("n", [3, COPY_MIN_ROWS * 2])
+def test_add_batch_skips_duplicates_on_both_insert_paths(pool, run, n):
+    queue = PostgresQueueRepository(pool)
+    items = _items(run.id, n)
+
+    added = queue.add_batch(items + items[:1])
+    again = queue.add_batch(items[:2])
+
+    assert sorted(q.url for q in added) == sorted(i.url for i in items)
+    assert again == []
+    assert queue.get_pending_count(run.id) == n
+    assert sorted(queue.get_url_hashes(run.id)) == sorted(i.url_hash for i in items)
+
+
+def test_claim_ack_heartbeat_and_stale_reset(pool, run):
+    queue = PostgresQueueRepository(pool)
+    queue.add_batch(_items(run.id, 4))
+
+    claimed = queue.claim(run.id, "w1", limit=3)
+    assert len(claimed) == 3
+    assert queue.get_processing_count(run.id) == 3
+    assert queue.complete_many([claimed[0].id]) == 1
+    assert queue.fail_many([(claimed[1].id, "nope")]) == 1
+    assert queue.heartbeat(run.id, "w1") == 1
+
+    with pool.connection() as conn:
+        conn.execute("update crawl_queue set claimed_at = now() - interval '10 minutes' where id = %s", (claimed[2].id,))
+    assert queue.reset_stale(timeout_minutes=2) == 1
+    assert queue.get_processing_count(run.id) == 0
+    assert queue.get_pending_count(run.id) == 2
+
+
+def test_reprioritize_only_raises_pending_items(pool, run):
+    queue = PostgresQueueRepository(pool)
+    first, second, third = _items(run.id, 3)
+    queue.add_batch([first, second, third])
+    (claimed,) = queue.claim(run.id, "w1", limit=1)
+    assert claimed.url_hash == first.url_hash
+
+    raised = queue.reprioritize(run.id, [(third.url_hash, 5), (second.url_hash, -1), (first.url_hash, 9)])
+
+    assert raised == 1
+    assert queue.claim(run.id, "w1", limit=1)[0].url_hash == third.url_hash
+
+
+@pytest.mark.parametrize("n", [2, COPY_MIN_ROWS + 1])
+def test_page_batches_round_trip(pool, run, n):
+    pages = PostgresCrawledPageRepository(pool)
+    batch = [
+        CrawledPageCreate(
+            run_id=run.id,
+            source_id=run.source_id,
+            url=f"https://example.com/{i}",
+            url_hash=f"h{i}",
+            content_hash=f"c{i}",
+            content=f"<html>{i}\ttab\\slash\nline</html>",
+            status_code=200,
+            etag=f'"e{i}"',
+        )
+        for i in range(n)
+    ]
+
+    created = pages.create_batch(batch)
+
+    assert [p.url for p in created] == [p.url for p in batch]
+    assert pages.get_contents([created[0].id]) == {created[0].id: batch[0].content}
+    validators = pages.get_validators(run.source_id, ["h0", "h1", "missing"])
+    assert set(validators) == {"h0", "h1"}
+    assert validators["h0"].page_id == created[0].id
+    assert pages.get_latest_by_url(run.source_id, "h1").body() == batch[1].content
+
+
+def test_page_history_counts_changes_and_skips_carried_rows(pool, run):
+    pages = PostgresCrawledPageRepository(pool)
+    rows = [("c1", False, None), ("c2", False, None), ("c2", True, None), ("c2", True, CARRIED_FORWARD)]
+    created = [
+        pages.create(
+            CrawledPageCreate(
+                run_id=run.id, source_id=run.source_id, url="https://example.com/a", url_hash="a",
+                content_hash=content_hash, unchanged=unchanged, skip_reason=skip_reason,
+            )
+        )
+        for content_hash, unchanged, skip_reason in rows
+    ]
+
+    (history,) = pages.get_history(run.source_id)
+    assert (history.url_hash, history.content_hash, history.changes) == ("a", "c2", 1)
+    assert (history.first_crawled_at, history.verified_at) == (created[0].crawled_at, created[2].crawled_at)
+    assert PostgresRunRepository(pool).create(CrawlRunCreate(source_id=run.source_id, mode="incremental")).mode == "incremental"
+
+
+def test_parsed_pages_upsert(pool, run):
+    (page,) = PostgresCrawledPageRepository(pool).create_batch([
+        CrawledPageCreate(run_id=run.id, source_id=run.source_id, url="https://example.com/x", url_hash="x")
+    ])
+    parsed = PostgresParsedPageRepository(pool)
+
+    parsed.create(ParsedPageCreate(page_id=page.id, title="one", metadata={"lang": "en"}))
+    updated = parsed.upsert(ParsedPageCreate(page_id=page.id, title="two", metadata={"lang": "de"}))
+
+    assert updated.title == "two"
+    assert parsed.get_by_page_id(page.id).metadata == {"lang": "de"}
+
+
+def test_robots_store_and_blob_store(pool):
+    robots = PostgresRobotsStore(pool)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    host = f"https://{uuid4().hex}.example"
+    robots.save(RobotsRecord(host=host, status_code=404, fetched_at=now, expires_at=now))
+    robots.save(RobotsRecord(host=host, status_code=200, body="User-agent: *", fetched_at=now, expires_at=now))
+    assert robots.get(host).body == "User-agent: *"
+    assert robots.get("https://missing.example") is None
+
+    blobs = PostgresBlobStore(pool)
+    assert blobs.put_many({"b1": "one", "b2": "two"}) == 2
+    blobs.put_many({"b1": "one"})
+    assert blobs.existing(["b1", "b3"]) == {"b1"}
+    assert blobs.get_many(["b1", "b2"]) == {"b1": "one", "b2": "two"}
+
+
+def test_compressed_bodies_round_trip(pool, run):
+    pytest.importorskip("zstandard")
+    pages = PostgresCrawledPageRepository(pool, compress=True)
+    body = "<html>" + "compressible " * 200 + "</html>"
+
+    (page,) = pages.create_batch([
+        CrawledPageCreate(run_id=run.id, source_id=run.source_id, url="https://example.com/z", url_hash="z", content=body)
+    ])
+
+    assert pages.get_by_id(page.id).body() == body
+    assert pages.get_contents([page.id]) == {page.id: body}
@@ -0,0 +1,300 @@
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.domain.models import (
+    CrawledPageCreate,
+    CrawlRunCreate,
+    CrawlSourceCreate,
+    ParsedPageCreate,
+    QueueItemCreate,
+    RobotsRecord,
+    RunStatsDelta,
+)
+from src.domain.rules import CARRIED_FORWARD, url_hash
+from src.infrastructure.backend import create_repositories
+from src.infrastructure.blob_store import SqliteBlobStore
+from src.infrastructure.db import SqliteDatabase
+from src.infrastructure.db.sqlite import ADDED_COLUMNS, SCHEMA
+from src.infrastructure.repositories import (
+    SqliteCrawledPageRepository,
+    SqliteParsedPageRepository,
+    SqliteQueueRepository,
+    SqliteRobotsStore,
+    SqliteRunRepository,
+    SqliteSourceRepository,
+)
+from src.ingestion.use_cases import CrawlUseCase
+from tests.fakes import FakeHttpClient, FakeSite
+
+
+@pytest.fixture
+def db(tmp_path):
+    return SqliteDatabase(tmp_path / "crawl.db")
+
+
+@pytest.fixture
+def run(db):
+    source = SqliteSourceRepository(db).create(
+        CrawlSourceCreate(domain="example.com", entry_url="https://example.com/", type="full_domain")
+    )
+    runs = SqliteRunRepository(db)
+    return runs.mark_started(runs.create(CrawlRunCreate(source_id=source.id)).id)
+
+
+def _items(run_id, n: int) -> list[QueueItemCreate]:
+    urls = [f"https://example.com/p{i}" for i in range(n)]
+    return [QueueItemCreate(run_id=run_id, url=u, url_hash=url_hash(u), priority=i % 3) for i, u in enumerate(urls)]
+
+
+def test_sources_and_runs_round_trip(db, run):
+    sources = SqliteSourceRepository(db)
+    runs = SqliteRunRepository(db)
+
+    assert runs.get_by_id(run.id).started_at is not None
+    updated = runs.update_stats(run.id, pages_found=5, pages_crawled=3, pages_failed=1)
+    assert (updated.pages_found, updated.pages_crawled, updated.pages_failed) == (5, 3, 1)
+    assert runs.mark_completed(run.id).status == "completed"
+    assert [r.id for r in runs.list_by_source(run.source_id)] == [run.id]
+
+    sources.update_next_run(run.source_id, datetime.now(timezone.utc) - timedelta(minutes=1))
+    assert [s.id for s in sources.get_due_sources()] == [run.source_id]
+    sources.update_next_run(run.source_id, datetime.now(timezone.utc) + timedelta(hours=1))
+    assert sources.get_due_sources() == []
+
+
+def test_concurrent_stat_increments_all_count(db, run):
+    runs = SqliteRunRepository(db)
+    delta = RunStatsDelta(pages_found=1, pages_crawled=1, bytes_downloaded=100, status_codes={200: 1, 404: 1})
+
+    threads = [
+        threading.Thread(target=lambda: [runs.increment_stats(run.id, delta) for _ in range(10)])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stored = runs.get_by_id(run.id)
+    assert (stored.pages_found, stored.pages_crawled, stored.bytes_downloaded) == (40, 40, 4000)
+    assert stored.status_codes == {200: 40, 404: 40}
+
+
+def test_older_files_gain_new_columns(tmp_path):
+    path = tmp_path / "old.db"
+    added = {column for _, column, _ in ADDED_COLUMNS}
+    old_schema = "\n".join(line for line in SCHEMA.splitlines() if line.strip().split(" ")[0] not in added)
+    with sqlite3.connect(path) as conn:
+        conn.executescript(old_schema)
+
+    db = SqliteDatabase(path)
+
+    for table, column, _ in ADDED_COLUMNS:
+        columns = {row["name"] for row in db.read().execute(f"pragma table_info({table})")}
+        assert column in columns
+
+
+def test_older_files_are_rekeyed_to_short_url_hashes(tmp_path):
+    path = tmp_path / "old.db"
+    url = "https://example.com/a"
+    SqliteDatabase(path)
+    with sqlite3.connect(path) as conn:
+        conn.execute("pragma user_version = 0")
+        conn.execute("insert into crawl_sources (id, domain, entry_url, type, created_at) values ('s', 'example.com', ?, 'full_domain', '')", (url,))
+        conn.execute("insert into crawl_runs (id, source_id, created_at) values ('r', 's', '')")
+        conn.execute(
+            "insert into crawled_pages (id, run_id, source_id, url, url_hash, crawled_at) values ('p', 'r', 's', ?, ?, '')",
+            (url, hashlib.sha256(url.encode()).hexdigest()),
+        )
+
+    db = SqliteDatabase(path)
+
+    assert db.read().execute("select url_hash from crawled_pages").fetchone()["url_hash"] == url_hash(url)
+    assert db.read().execute("pragma user_version").fetchone()["user_version"] == 1
+
+
+def test_queue_claims_by_priority_and_skips_duplicates(db, run):
+    queue = SqliteQueueRepository(db)
+    items = _items(run.id, 9)
+
+    assert len(queue.add_batch(items + items[:2])) == 9
+    assert queue.add_batch(items[:1]) == []
+    claimed = queue.claim(run.id, "w1", limit=4)
+
+    assert [q.priority for q in claimed] == [2, 2, 2, 1]
+    assert all(q.status == "processing" and q.attempts == 1 for q in claimed)
+    assert queue.get_pending_count(run.id) == 5
+    assert queue.complete_many([q.id for q in claimed[:2]]) == 2
+    assert queue.fail_many([(claimed[2].id, "boom")]) == 1
+    assert queue.get_processing_count(run.id) == 1
+
+
+def test_reprioritize_only_raises_pending_items(db, run):
+    queue = SqliteQueueRepository(db)
+    items = _items(run.id, 3)
+    queue.add_batch(items)
+    (claimed,) = queue.claim(run.id, "w1", limit=1)
+    low = next(i for i in items if i.priority == 0)
+    high = next(i for i in items if i.priority == 1)
+
+    raised = queue.reprioritize(run.id, [(low.url_hash, 5), (high.url_hash, 0), (claimed.url_hash, 9)])
+
+    assert raised == 1
+    assert queue.claim(run.id, "w1", limit=1)[0].url_hash == low.url_hash
+
+
+def test_concurrent_claims_never_overlap(db, run):
+    queue = SqliteQueueRepository(db)
+    queue.add_batch(_items(run.id, 200))
+    claimed: dict[str, list] = {}
+
+    def worker(name: str) -> None:
+        mine = claimed.setdefault(name, [])
+        while batch := queue.claim(run.id, name, limit=3):
+            mine.extend(q.id for q in batch)
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    ids = [id for mine in claimed.values() for id in mine]
+    assert len(ids) == len(set(ids)) == 200
+
+
+def test_stale_claims_are_reset_unless_heartbeating(db, run):
+    queue = SqliteQueueRepository(db)
+    queue.add_batch(_items(run.id, 2))
+    live, dead = queue.claim(run.id, "live", limit=1)[0], queue.claim(run.id, "dead", limit=1)[0]
+    long_ago = (datetime.now(timezone.utc) - timedelta(minutes=10)).isoformat()
+    with db.transaction() as conn:
+        conn.execute("update crawl_queue set claimed_at = ?", (long_ago,))
+
+    assert queue.heartbeat(run.id, "live") == 1
+    assert queue.reset_stale(timeout_minutes=2) == 1
+    assert queue.get_pending_count(run.id) == 1
+    assert [q.id for q in queue.claim(run.id, "again")] == [dead.id]
+    assert live.id != dead.id
+
+
+def test_pages_validators_and_contents(db, run):
+    pages = SqliteCrawledPageRepository(db)
+    first = pages.create_batch([
+        CrawledPageCreate(
+            run_id=run.id, source_id=run.source_id, url="https://example.com/a", url_hash="a",
+            content_hash="c1", content="old", etag='"1"',
+        ),
+    ])[0]
+    second = pages.create(
+        CrawledPageCreate(
+            run_id=run.id, source_id=run.source_id, url="https://example.com/a", url_hash="a",
+            content_hash="c2", content="new", etag='"2"', unchanged=False,
+        )
+    )
+
+    validators = pages.get_validators(run.source_id, ["a", "b"])
+    assert list(validators) == ["a"]
+    assert validators["a"].etag == '"2"'
+    assert pages.get_contents([first.id, second.id]) == {first.id: "old", second.id: "new"}
+    assert pages.get_latest_by_url(run.source_id, "a").id == second.id
+    assert {p.id for p in pages.list_by_run(run.id)} == {first.id, second.id}
+
+    parsed = SqliteParsedPageRepository(db)
+    assert {p.id for p in parsed.list_unparsed()} == {first.id, second.id}
+    parsed.create(ParsedPageCreate(page_id=first.id, title="one", metadata={"lang": "en"}))
+    parsed.upsert(ParsedPageCreate(page_id=first.id, title="two", metadata={"lang": "de"}))
+    assert parsed.get_by_page_id(first.id).metadata == {"lang": "de"}
+    assert [p.id for p in parsed.list_unparsed()] == [second.id]
+
+
+def test_page_history_counts_changes_and_skips_carried_rows(db, run):
+    pages = SqliteCrawledPageRepository(db)
+    rows = [("a", "c1", False, None), ("a", "c2", False, None), ("a", "c2", True, None), ("b", "c1", False, None)]
+    created = [
+        pages.create(
+            CrawledPageCreate(
+                run_id=run.id, source_id=run.source_id, url=f"https://example.com/{h}", url_hash=h,
+                content_hash=content_hash, unchanged=unchanged, skip_reason=skip_reason,
+            )
+        )
+        for h, content_hash, unchanged, skip_reason in rows
+    ]
+    pages.create(
+        CrawledPageCreate(
+            run_id=run.id, source_id=run.source_id, url="https://example.com/a", url_hash="a",
+            content_hash="c2", unchanged=True, skip_reason=CARRIED_FORWARD,
+        )
+    )
+
+    a, b = pages.get_history(run.source_id)
+    assert (a.url_hash, a.content_hash, a.changes) == ("a", "c2", 1)
+    assert (a.first_crawled_at, a.verified_at) == (created[0].crawled_at, created[2].crawled_at)
+    assert (b.url_hash, b.changes) == ("b", 0)
+    assert SqliteRunRepository(db).create(CrawlRunCreate(source_id=run.source_id, mode="incremental")).mode == "incremental"
+
+
+def test_compressed_bodies_round_trip(db, run):
+    pytest.importorskip("zstandard")
+    pages = SqliteCrawledPageRepository(db, compress=True)
+    body = "<html>" + "compressible " * 200 + "</html>"
+
+    (page,) = pages.create_batch([
+        CrawledPageCreate(run_id=run.id, source_id=run.source_id, url="https://example.com/z", url_hash="z", content=body)
+    ])
+
+    assert pages.get_by_id(page.id).body() == body
+
+
+def test_robots_and_blob_stores(db):
+    robots = SqliteRobotsStore(db)
+    now = datetime.now(timezone.utc)
+    robots.save(RobotsRecord(host="https://a.example", status_code=404, fetched_at=now, expires_at=now))
+    robots.save(RobotsRecord(host="https://a.example", status_code=200, body="x", fetched_at=now, expires_at=now))
+    assert robots.get("https://a.example").body == "x"
+    assert robots.get("https://b.example") is None
+
+    blobs = SqliteBlobStore(db)
+    blobs.put_many({"b1": "one", "b2": "two"})
+    blobs.put_many({"b1": "one"})
+    assert blobs.existing(["b1", "b3"]) == {"b1"}
+    assert blobs.get_many(["b1", "b2"]) == {"b1": "one", "b2": "two"}
+
+
+def test_crawl_runs_end_to_end_on_sqlite(tmp_path):
+    links = [f"/p{i}" for i in range(30)]
+    pages = {"https://example.com/": "".join(f'<a href="{link}">x</a>' for link in links)}
+    pages.update({f"https://example.com{link}": '<a href="/">home</a>' for link in links})
+    site = FakeSite(pages)
+    repos = create_repositories(backend=f"sqlite:{tmp_path / 'crawl.db'}")
+    uc = CrawlUseCase(
+        source_repo=repos.source_repo,
+        run_repo=repos.run_repo,
+        page_repo=repos.page_repo,
+        queue_repo=repos.queue_repo,
+        http_client=FakeHttpClient(site),
+        delay=0,
+        concurrency=4,
+        flush_interval=0.05,
+    )
+    source = repos.source_repo.create(
+        CrawlSourceCreate(domain="example.com", entry_url="https://example.com/", type="full_domain")
+    )
+
+    result = uc.start_run(source.id)
+
+    (run,) = repos.run_repo.list_by_source(source.id)
+    assert result.pages_crawled == 31
+    assert run.status == "completed"
+    assert len(repos.page_repo.list_by_run(run.id)) == 31
+    assert repos.queue_repo.get_pending_count(run.id) == 0
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown database backend"):
+        create_repositories(backend=f"mysql:{uuid4()}")
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from src.ingestion.crawling import FetchBudget
+
+
+def _acquire_in_thread(budget: FetchBudget, host: str) -> threading.Thread:
+    thread = threading.Thread(target=budget.acquire, args=(host,), daemon=True)
+    thread.start()
+    thread.join(timeout=0.05)
+    return thread
+
+
+def test_a_single_host_may_use_the_whole_budget():
+    budget = FetchBudget(3)
+    for _ in range(3):
+        budget.acquire("a.example")
+
+    assert budget.in_flight() == {"a.example": 3}
+    assert _acquire_in_thread(budget, "a.example").is_alive()
+
+
+def test_waiting_hosts_get_freed_slots_before_a_host_over_its_share():
+    budget = FetchBudget(2)
+    budget.acquire("a.example")
+    budget.acquire("a.example")
+
+    a_waiter = _acquire_in_thread(budget, "a.example")
+    b_waiter = _acquire_in_thread(budget, "b.example")
+    assert a_waiter.is_alive() and b_waiter.is_alive()
+
+    # a.example is over its share of 1 while b.example waits
+    budget.release("a.example")
+    b_waiter.join(timeout=1)
+    assert not b_waiter.is_alive()
+    assert a_waiter.is_alive()
+
+    budget.release("a.example")
+    a_waiter.join(timeout=1)
+    assert not a_waiter.is_alive()
+    assert budget.in_flight() == {"a.example": 1, "b.example": 1}
+
+
+def test_budget_must_be_positive():
+    with pytest.raises(ValueError):
+        FetchBudget(0)
+
+
+def test_budget_caps_concurrent_fetches_under_load():
+    budget = FetchBudget(4)
+    peak = 0
+    current = 0
+    lock = threading.Lock()
+
+    def fetch(host: str) -> None:
+        nonlocal peak, current
+        budget.acquire(host)
+        with lock:
+            current += 1
+            peak = max(peak, current)
+        time.sleep(0.005)
+        with lock:
+            current -= 1
+        budget.release(host)
+
+    threads = [threading.Thread(target=fetch, args=(f"h{i % 3}",)) for i in range(30)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert peak <= 4
+    assert budget.in_flight() == {}
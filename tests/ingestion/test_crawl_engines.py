@@ -0,0 +1,415 @@
+import pytest
+
+from src.domain.models import CrawlSourceCreate
+from src.domain.rules import BestFirstScorer, BreadthFirstScorer
+from src.ingestion.use_cases import CrawlUseCase
+from tests.fakes import (
+    FakeAsyncHttpClient,
+    FakeHttpClient,
+    FakeSite,
+    InMemoryBlobStore,
+    InMemoryCrawledPageRepository,
+    InMemoryQueueRepository,
+    InMemoryRunRepository,
+    InMemorySourceRepository,
+)
+
+BASE = "https://example.com"
+
+
+def _page(*links: str) -> str:
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><body>{anchors}</body></html>"
+
+
+def _chain_site(length: int, broken: set[str] | None = None) -> FakeSite:
+    """Home links to /p0..; each page also links to the next one."""
+    pages = {f"{BASE}/": _page(*(f"/p{i}" for i in range(length)))}
+    for i in range(length):
+        pages[f"{BASE}/p{i}"] = _page(f"/p{i + 1}", "/")
+    return FakeSite(pages, broken)
+
+
+def _crawl(site: FakeSite, engine: str, queue_repo: InMemoryQueueRepository | None = None, **kwargs):
+    source_repo = InMemorySourceRepository()
+    run_repo = InMemoryRunRepository()
+    page_repo = InMemoryCrawledPageRepository()
+    queue_repo = queue_repo or InMemoryQueueRepository()
+    uc = CrawlUseCase(
+        source_repo=source_repo,
+        run_repo=run_repo,
+        page_repo=page_repo,
+        queue_repo=queue_repo,
+        http_client=FakeHttpClient(site),
+        delay=0,
+        engine=engine,
+        async_http_client=FakeAsyncHttpClient(site),
+        flush_interval=0.05,
+        **kwargs,
+    )
+    source = source_repo.create(CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain"))
+    result = uc.start_run(source.id)
+    (run,) = run_repo.runs.values()
+    return result, run, page_repo, queue_repo
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_crawl_terminates_after_visiting_every_reachable_page(engine):
+    site = _chain_site(20)
+
+    result, run, page_repo, queue_repo = _crawl(site, engine, concurrency=4, batch_size=3)
+
+    # 21 real pages plus /p20, which every chain end links to and 404s
+    assert result.pages_crawled == 21
+    assert result.pages_failed == 1
+    assert run.status == "completed"
+    assert run.pages_crawled == 21
+    assert len(page_repo.pages) == 22
+    assert queue_repo.by_status("pending") == []
+    assert queue_repo.by_status("processing") == []
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_crawl_stops_at_max_pages(engine):
+    site = _chain_site(50)
+
+    result, _, page_repo, queue_repo = _crawl(site, engine, concurrency=8, batch_size=4, max_pages=10)
+
+    assert result.pages_crawled + result.pages_failed == 10
+    assert len(page_repo.pages) == 10
+    assert queue_repo.by_status("processing") == []
+    assert queue_repo.by_status("pending")
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+@pytest.mark.parametrize("frontier", ["best-first", "breadth-first"])
+def test_page_budget_goes_to_the_best_scored_links(engine, frontier):
+    # Listing pages are linked first, so discovery order would crawl them first
+    listings = [f"/list?page={i}" for i in range(2, 6)]
+    articles = [f"/a{i}" for i in range(4)]
+    pages = {f"{BASE}/": _page(*listings, *articles)}
+    pages.update({f"{BASE}{path}": _page("/") for path in listings + articles})
+    scorer = BestFirstScorer() if frontier == "best-first" else BreadthFirstScorer()
+
+    _, _, page_repo, _ = _crawl(
+        FakeSite(pages), engine, concurrency=1, batch_size=1, max_pages=5, priority_scorer=scorer
+    )
+
+    crawled = sorted(p.url.removeprefix(BASE) for p in page_repo.pages)
+    expected = articles if frontier == "best-first" else listings
+    assert crawled == sorted(["/", *expected])
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_pending_links_move_up_as_inlinks_arrive(engine):
+    pages = {
+        f"{BASE}/": _page("/a", "/b", "/c"),
+        f"{BASE}/a": _page("/other", "/target"),
+        f"{BASE}/b": _page("/target"),
+        f"{BASE}/c": _page("/target"),
+    }
+
+    # One page per flush, so later inlinks arrive after /target was written
+    _, _, _, queue_repo = _crawl(
+        FakeSite(pages), engine, concurrency=1, batch_size=1, max_pages=4, flush_size=1
+    )
+
+    pending = {q.url.removeprefix(BASE): q.priority for q in queue_repo.by_status("pending")}
+    assert pending["/target"] > pending["/other"]
+    assert queue_repo.calls["reprioritize"] >= 1
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_fetch_exception_fails_queue_item(engine):
+    site = _chain_site(3, broken={f"{BASE}/p1"})
+
+    result, _, page_repo, queue_repo = _crawl(site, engine, concurrency=2)
+
+    (failed,) = [q for q in queue_repo.by_status("failed") if q.url == f"{BASE}/p1"]
+    assert failed.error is not None and "boom" in failed.error
+    assert result.pages_failed >= 1
+    # The exception produces no page row, but the rest of the crawl continues
+    assert f"{BASE}/p1" not in {p.url for p in page_repo.pages}
+    assert f"{BASE}/p2" in {p.url for p in page_repo.pages}
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_queue_items_are_acknowledged_per_batch(engine):
+    site = _chain_site(30)
+
+    result, _, _, queue_repo = _crawl(site, engine, concurrency=4, batch_size=10, flush_size=10)
+
+    # One ack call per flushed batch, never one per item
+    assert "complete" not in queue_repo.calls
+    assert "fail" not in queue_repo.calls
+    assert queue_repo.calls["complete_many"] < result.pages_crawled
+    assert len(queue_repo.by_status("completed")) == result.pages_crawled
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_page_writes_are_bounded_by_bytes_not_claim_size(engine):
+    site = _chain_site(30)
+    page_repo = InMemoryCrawledPageRepository()
+    inserts: list[int] = []
+    create_batch = page_repo.create_batch
+
+    def recording_create_batch(pages):
+        inserts.append(len(pages))
+        return create_batch(pages)
+
+    page_repo.create_batch = recording_create_batch
+    source_repo = InMemorySourceRepository()
+    uc = CrawlUseCase(
+        source_repo=source_repo,
+        run_repo=InMemoryRunRepository(),
+        page_repo=page_repo,
+        queue_repo=InMemoryQueueRepository(),
+        http_client=FakeHttpClient(site),
+        delay=0,
+        engine=engine,
+        async_http_client=FakeAsyncHttpClient(site),
+        concurrency=4,
+        batch_size=10,
+        flush_interval=0.05,
+        # Every page is over the limit, and one is all the memory allowed
+        flush_bytes=1,
+        max_buffered_bytes=1,
+    )
+    source = source_repo.create(CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain"))
+
+    result = uc.start_run(source.id)
+
+    assert result.pages_crawled == 31
+    assert set(inserts) == {1}
+
+
+def test_abort_writes_finished_items_and_releases_the_rest():
+    site = _chain_site(30)
+    source_repo = InMemorySourceRepository()
+    run_repo = InMemoryRunRepository()
+    queue_repo = InMemoryQueueRepository()
+    page_repo = InMemoryCrawledPageRepository()
+
+    complete_many = queue_repo.complete_many
+    calls = 0
+
+    def flaky_complete_many(ids):
+        nonlocal calls
+        calls += 1
+        if calls == 3:
+            raise RuntimeError("database went away")
+        return complete_many(ids)
+
+    queue_repo.complete_many = flaky_complete_many
+    uc = CrawlUseCase(
+        source_repo=source_repo,
+        run_repo=run_repo,
+        page_repo=page_repo,
+        queue_repo=queue_repo,
+        http_client=FakeHttpClient(site),
+        delay=0,
+        concurrency=4,
+        batch_size=5,
+        flush_size=1,
+        flush_interval=0.05,
+    )
+    source = source_repo.create(CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain"))
+
+    with pytest.raises(RuntimeError):
+        uc.start_run(source.id)
+
+    # Only the single-item batch whose write failed is left for reset_stale
+    assert len(queue_repo.by_status("processing")) <= 1
+    completed = {q.url for q in queue_repo.by_status("completed")}
+    assert len(completed) > 2
+    assert completed <= {p.url for p in page_repo.pages}
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_run_stats_are_flushed_as_coalesced_increments(engine):
+    site = _chain_site(20)
+    run_repo = InMemoryRunRepository()
+    source_repo = InMemorySourceRepository()
+    uc = CrawlUseCase(
+        source_repo=source_repo,
+        run_repo=run_repo,
+        page_repo=InMemoryCrawledPageRepository(),
+        queue_repo=InMemoryQueueRepository(),
+        http_client=FakeHttpClient(site),
+        delay=0,
+        engine=engine,
+        async_http_client=FakeAsyncHttpClient(site),
+        concurrency=4,
+        batch_size=3,
+        flush_size=3,
+        flush_interval=0.05,
+        stats_interval=60,
+    )
+    source = source_repo.create(CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain"))
+
+    uc.start_run(source.id)
+
+    (run,) = run_repo.runs.values()
+    # Many batches, but only the final flush reached the run row
+    assert run_repo.increments == 1
+    assert (run.pages_found, run.pages_crawled, run.pages_failed) == (22, 21, 1)
+    assert run.status_codes == {200: 21, 404: 1}
+    assert run.bytes_downloaded == sum(len(body.encode()) for body in site.pages.values())
+    # Home links to every page; each page links home and to its neighbour
+    assert run.links_discovered == 20 + 2 * 20
+    assert run.links_discovered - run.links_deduped == 21
+
+
+def test_already_queued_links_are_not_sent_to_the_database():
+    site = _chain_site(10)
+    queue_repo = InMemoryQueueRepository()
+    sent: list[str] = []
+    add_batch = queue_repo.add_batch
+
+    def recording_add_batch(items):
+        sent.extend(item.url for item in items)
+        return add_batch(items)
+
+    queue_repo.add_batch = recording_add_batch
+    _crawl(site, "threads", queue_repo=queue_repo, concurrency=2)
+
+    # Every page links back home and to its neighbour; each URL ships once
+    assert len(sent) == len(set(sent)) == 12
+
+
+def test_skipped_download_is_recorded_without_error():
+    site = _chain_site(3)
+    site.skips = {f"{BASE}/p1": "content_type"}
+
+    result, _, page_repo, queue_repo = _crawl(site, "threads")
+
+    (page,) = [p for p in page_repo.pages if p.url == f"{BASE}/p1"]
+    assert page.skip_reason == "content_type"
+    assert page.error is None and page.content is None
+    assert all(q.status == "completed" for q in queue_repo.items.values() if q.url == f"{BASE}/p1")
+    assert result.pages_failed == 1  # only the 404 at the end of the chain
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_process_cpu_stage_matches_in_thread_results(engine):
+    in_thread, _, thread_pages, _ = _crawl(_chain_site(8), engine, concurrency=3)
+    in_processes, _, process_pages, _ = _crawl(_chain_site(8), engine, concurrency=3, cpu_stage="processes", cpu_workers=2)
+
+    assert in_processes == in_thread
+    assert {(p.url, p.content_hash) for p in process_pages.pages} == {
+        (p.url, p.content_hash) for p in thread_pages.pages
+    }
+
+
+def test_async_engine_requires_async_client():
+    site = _chain_site(1)
+    with pytest.raises(ValueError):
+        _crawl_without_async_client(site)
+
+
+def _crawl_without_async_client(site: FakeSite):
+    source_repo = InMemorySourceRepository()
+    uc = CrawlUseCase(
+        source_repo=source_repo,
+        run_repo=InMemoryRunRepository(),
+        page_repo=InMemoryCrawledPageRepository(),
+        queue_repo=InMemoryQueueRepository(),
+        http_client=FakeHttpClient(site),
+        engine="async",
+    )
+    source = source_repo.create(CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain"))
+    uc.start_run(source.id)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"concurrency": 0},
+        {"prefetch": 0},
+        {"max_buffered": 0},
+        {"flush_size": 0},
+        {"flush_interval": 0},
+        {"flush_bytes": 0},
+        {"flush_bytes": 1024, "max_buffered_bytes": 512},
+        {"stats_interval": 0},
+    ],
+)
+def test_rejects_non_positive_pipeline_settings(kwargs):
+    with pytest.raises(ValueError):
+        CrawlUseCase(
+            source_repo=InMemorySourceRepository(),
+            run_repo=InMemoryRunRepository(),
+            page_repo=InMemoryCrawledPageRepository(),
+            queue_repo=InMemoryQueueRepository(),
+            http_client=FakeHttpClient(FakeSite({})),
+            **kwargs,
+        )
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+@pytest.mark.parametrize("blob_store", [None, InMemoryBlobStore], ids=["inline", "blob-store"])
+def test_recrawl_revalidates_unchanged_pages(engine, blob_store):
+    site = _chain_site(5)
+    site.etags = {url: f'"{i}"' for i, url in enumerate(site.pages)}
+    source_repo = InMemorySourceRepository()
+    page_repo = InMemoryCrawledPageRepository()
+    uc = CrawlUseCase(
+        source_repo=source_repo,
+        run_repo=InMemoryRunRepository(),
+        page_repo=page_repo,
+        queue_repo=InMemoryQueueRepository(),
+        http_client=FakeHttpClient(site),
+        blob_store=blob_store() if blob_store else None,
+        delay=0,
+        engine=engine,
+        async_http_client=FakeAsyncHttpClient(site),
+        flush_interval=0.05,
+    )
+    source = source_repo.create(CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain"))
+    first = uc.start_run(source.id)
+    stored = len(page_repo.pages)
+
+    second = uc.start_run(source.id)
+
+    recrawled = page_repo.pages[stored:]
+    assert second.pages_crawled == first.pages_crawled == 6
+    # Every page answered 304, yet its links were still followed
+    unchanged = [p for p in recrawled if p.unchanged]
+    assert len(unchanged) == 6
+    assert all(p.content is None and p.status_code == 304 for p in unchanged)
+    assert all(p.content_hash is not None and p.etag is not None for p in unchanged)
+
+
+def test_blob_store_keeps_one_copy_per_distinct_body():
+    # Every page shares the same body, so only the home page differs
+    pages = {f"{BASE}/": _page(*(f"/p{i}" for i in range(10)))}
+    pages.update({f"{BASE}/p{i}": _page("/") for i in range(10)})
+    site = FakeSite(pages)
+    blob_store = InMemoryBlobStore()
+
+    result, _, page_repo, _ = _crawl(site, "threads", blob_store=blob_store, flush_size=3)
+
+    assert result.pages_crawled == 11
+    assert len(blob_store.blobs) == blob_store.writes == 2
+    assert all(p.content is None and p.content_hash in blob_store.blobs for p in page_repo.pages)
+
+
+def test_sitemap_urls_are_seeded_in_chunks_with_their_hints(monkeypatch):
+    monkeypatch.setattr("src.ingestion.use_cases.crawl.SEED_CHUNK_SIZE", 4)
+    urls = [f"{BASE}/s{i}" for i in range(9)]
+    sitemap = "".join(
+        f"<url><loc>{u}</loc><lastmod>2026-01-0{i + 1}</lastmod><priority>0.5</priority></url>"
+        for i, u in enumerate(urls)
+    )
+    pages = {f"{BASE}/": _page(), **{u: _page() for u in urls}}
+    pages[f"{BASE}/sitemap.xml"] = f"<urlset>{sitemap}<url><loc>https://other.org/x</loc></url></urlset>"
+
+    result, run, page_repo, queue_repo = _crawl(FakeSite(pages), "threads")
+
+    seeded = {q.url: q for q in queue_repo.items.values()}
+    assert set(seeded) == {f"{BASE}/", *urls}
+    assert seeded[f"{BASE}/s2"].lastmod is not None and seeded[f"{BASE}/s2"].lastmod.day == 3
+    assert seeded[f"{BASE}/s2"].sitemap_priority == 0.5
+    # entry URL + 9 sitemap URLs in chunks of 4, before any links are queued
+    assert queue_repo.calls["add_batch"] >= 3
+    assert result.pages_crawled == 10
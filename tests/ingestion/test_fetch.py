@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.domain.models import PageValidators
+from src.ingestion.crawling.fetch import FetchResult, conditional_headers, parse_max_age, parse_retry_after
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("public, max-age=3600", 3600),
+        ('max-age="60", must-revalidate', 60),
+        ("s-maxage=10", None),
+        ("no-cache, max-age=3600", None),
+        ("no-store", None),
+    ],
+)
+def test_parse_max_age(header, expected):
+    assert parse_max_age(header) == expected
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("soon") is None
+    in_a_minute = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 55 < parse_retry_after(in_a_minute.strftime("%a, %d %b %Y %H:%M:%S GMT")) <= 60
+
+
+def test_http_error_keeps_retry_after_for_pushback_only():
+    throttled = FetchResult.http_error(429, "Too Many Requests", {"Retry-After": "5"})
+    missing = FetchResult.http_error(404, "Not Found", {"Retry-After": "5"})
+
+    assert throttled.overloaded and throttled.retry_after == 5
+    assert not missing.overloaded and missing.retry_after is None
+    assert FetchResult.http_error(None, "timed out").overloaded
+
+
+def _validators(**kwargs) -> PageValidators:
+    defaults = {"page_id": uuid4(), "url_hash": "abc", "crawled_at": datetime.now(timezone.utc)}
+    return PageValidators(**{**defaults, **kwargs})
+
+
+def test_conditional_headers():
+    assert conditional_headers(None) == {}
+    assert conditional_headers(_validators(etag='"v1"', last_modified="Wed, 01 Jan 2025 00:00:00 GMT")) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+
+
+def test_is_fresh_respects_max_age():
+    crawled_at = datetime.now(timezone.utc) - timedelta(seconds=100)
+
+    assert _validators(max_age=3600, crawled_at=crawled_at).is_fresh()
+    assert not _validators(max_age=60, crawled_at=crawled_at).is_fresh()
+    assert not _validators(max_age=None, crawled_at=crawled_at).is_fresh()
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.domain.models import QueueItemCreate
+from src.domain.rules import BestFirstScorer, BreadthFirstScorer, url_hash
+from src.ingestion.crawling import FrontierPriorities
+
+BASE = "https://example.com"
+RUN_ID = uuid4()
+
+
+def _item(path: str, depth: int = 1, **hints) -> QueueItemCreate:
+    url = f"{BASE}{path}"
+    return QueueItemCreate(run_id=RUN_ID, url=url, url_hash=url_hash(url), depth=depth, **hints)
+
+
+def test_shallow_sitemap_endorsed_and_fresh_pages_score_higher():
+    scorer = BestFirstScorer()
+    now = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+    assert scorer.score(f"{BASE}/a", 1) > scorer.score(f"{BASE}/a", 3)
+    assert scorer.score(f"{BASE}/a", 1, sitemap_priority=0.9) > scorer.score(f"{BASE}/a", 1, sitemap_priority=0.2)
+    fresh = scorer.score(f"{BASE}/a", 1, lastmod=now - timedelta(days=1), now=now)
+    stale = scorer.score(f"{BASE}/a", 1, lastmod=now - timedelta(days=365), now=now)
+    assert fresh > stale > scorer.score(f"{BASE}/a", 1) - 1
+    # Naive lastmod values are taken as UTC
+    assert scorer.score(f"{BASE}/a", 1, lastmod=datetime(2026, 5, 31), now=now) == fresh
+
+
+@pytest.mark.parametrize("path", ["/blog?page=3", "/blog/page/3", "/blog/p/3", "/list?offset=40"])
+def test_pagination_is_penalised(path):
+    scorer = BestFirstScorer()
+
+    assert scorer.score(f"{BASE}{path}", 1) <= scorer.score(f"{BASE}/blog", 1) - scorer.pagination_weight
+
+
+def test_query_strings_and_deep_paths_are_penalised():
+    scorer = BestFirstScorer()
+    plain = scorer.score(f"{BASE}/shop/shoes", 1)
+
+    assert scorer.score(f"{BASE}/shop/shoes?color=red&size=9", 1) == plain - 2 * scorer.query_weight
+    assert scorer.score(f"{BASE}/a/b/c/d/e/f", 1) == scorer.score(f"{BASE}/a/b/c/d", 1) - 2 * scorer.segment_weight
+
+
+def test_inlink_bonus_grows_with_doublings_up_to_a_cap():
+    scorer = BestFirstScorer()
+
+    assert scorer.inlink_bonus(0) == 0
+    assert scorer.inlink_bonus(1) < scorer.inlink_bonus(3) < scorer.inlink_bonus(7)
+    assert scorer.inlink_bonus(10**6) == scorer.max_inlink_bonus
+
+
+def test_breadth_first_scores_everything_zero():
+    scorer = BreadthFirstScorer()
+    frontier = FrontierPriorities(scorer)
+
+    (item,) = frontier.discover([_item("/a?page=2", depth=5)], [])
+    frontier.discover([], [item.url_hash] * 10)
+
+    assert item.priority == 0
+    assert frontier.raised() == []
+
+
+def test_links_in_the_same_batch_count_before_the_priority_is_written():
+    frontier = FrontierPriorities(BestFirstScorer())
+    a, b = _item("/a"), _item("/b")
+
+    scored = frontier.discover([a, b], [a.url_hash, a.url_hash])
+
+    assert scored[0].priority > scored[1].priority
+    assert frontier.raised() == []
+
+
+def test_further_inlinks_raise_pending_priorities_once():
+    scorer = BestFirstScorer()
+    frontier = FrontierPriorities(scorer)
+    (a,) = frontier.discover([_item("/a")], [])
+
+    frontier.discover([], [a.url_hash, a.url_hash])
+    raised = frontier.raised()
+
+    assert raised == [(a.url_hash, a.priority - scorer.inlink_bonus(1) + scorer.inlink_bonus(3))]
+    assert frontier.raised() == []
+
+
+def test_claimed_and_untracked_urls_are_not_raised():
+    frontier = FrontierPriorities(BestFirstScorer(), max_tracked=1)
+    seed = frontier.seed(_item("/", depth=0))
+    (extra,) = frontier.discover([_item("/over-capacity")], [])
+
+    frontier.forget([seed.url_hash])
+    frontier.discover([], [seed.url_hash, extra.url_hash])
+
+    assert len(frontier) == 0
+    assert frontier.raised() == []
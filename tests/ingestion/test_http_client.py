@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.ingestion.crawling import AsyncHttpClient, HttpClient
+from src.ingestion.crawling.fetch import SKIP_CONTENT_TYPE, SKIP_DEADLINE, SKIP_TOO_LARGE
+
+PAGE = b"<html><body>hello</body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/page":
+            self._send("text/html; charset=utf-8", PAGE)
+        elif self.path == "/robots.txt":
+            self._send("text/plain", b"User-agent: *\nDisallow:\n")
+        elif self.path == "/file.pdf":
+            self._send("application/pdf", b"%PDF" + b"0" * 1000)
+        elif self.path == "/declared-big":
+            self._send("text/html", b"x" * 4096)
+        elif self.path == "/undeclared-big":
+            # HTTP/1.0 without Content-Length: the size is only known by reading
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            self.wfile.write(b"x" * 4096)
+        elif self.path == "/slow":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            for _ in range(20):
+                self.wfile.write(b"x" * 10)
+                self.wfile.flush()
+                time.sleep(0.05)
+        else:
+            self.send_error(404)
+
+    def _send(self, content_type: str, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def _sync_fetch(base_url, path, **kwargs):
+    return HttpClient(**kwargs).fetch(base_url + path)
+
+
+def _async_fetch(base_url, path, **kwargs):
+    async def go():
+        async with AsyncHttpClient(**kwargs) as client:
+            return await client.fetch(base_url + path)
+
+    return asyncio.run(go())
+
+
+@pytest.fixture(params=[_sync_fetch, _async_fetch], ids=["sync", "async"])
+def fetch(request, base_url):
+    return lambda path, **kwargs: request.param(base_url, path, **kwargs)
+
+
+def test_html_is_read(fetch):
+    fetched = fetch("/page")
+    assert fetched.content == PAGE.decode()
+    assert fetched.skip_reason is None
+
+
+def test_non_html_is_skipped_from_headers(fetch):
+    fetched = fetch("/file.pdf")
+    assert fetched.content is None
+    assert fetched.skip_reason == SKIP_CONTENT_TYPE
+    assert fetched.error is None
+
+
+@pytest.mark.parametrize("path", ["/declared-big", "/undeclared-big"])
+def test_body_over_cap_is_skipped(fetch, path):
+    fetched = fetch(path, max_bytes=1024)
+    assert fetched.content is None
+    assert fetched.skip_reason == SKIP_TOO_LARGE
+
+
+def test_total_deadline_is_enforced(fetch):
+    start = time.monotonic()
+    fetched = fetch("/slow", deadline=0.2)
+    assert fetched.skip_reason == SKIP_DEADLINE
+    assert time.monotonic() - start < 0.9
+
+
+def test_download_accepts_non_html_text(base_url):
+    content, status_code, error = HttpClient().download(base_url + "/robots.txt")
+    assert status_code == 200 and error is None
+    assert content.startswith("User-agent")
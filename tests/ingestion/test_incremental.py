@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.domain.models import CrawlSourceCreate, PageHistory
+from src.domain.rules import CARRIED_FORWARD, RecrawlPolicy
+from src.ingestion.use_cases import CrawlUseCase
+from tests.fakes import (
+    FakeAsyncHttpClient,
+    FakeHttpClient,
+    FakeSite,
+    InMemoryCrawledPageRepository,
+    InMemoryQueueRepository,
+    InMemoryRunRepository,
+    InMemorySourceRepository,
+)
+
+BASE = "https://example.com"
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def _history(first_days_ago: float, verified_days_ago: float, changes: int) -> PageHistory:
+    return PageHistory(
+        url_hash="h",
+        url=f"{BASE}/a",
+        content_hash="c",
+        first_crawled_at=NOW - timedelta(days=first_days_ago),
+        verified_at=NOW - timedelta(days=verified_days_ago),
+        changes=changes,
+    )
+
+
+def test_unknown_urls_are_always_fetched():
+    assert RecrawlPolicy().should_fetch(None, now=NOW)
+
+
+def test_lastmod_decides_when_present():
+    policy = RecrawlPolicy()
+    history = _history(first_days_ago=100, verified_days_ago=2, changes=50)
+
+    assert policy.should_fetch(history, lastmod=NOW - timedelta(days=1), now=NOW)
+    # A frequently changing page is still carried if its lastmod predates our copy
+    assert not policy.should_fetch(history, lastmod=NOW - timedelta(days=3), now=NOW)
+    # Naive lastmod values are taken as UTC
+    assert policy.should_fetch(history, lastmod=datetime(2026, 5, 31), now=NOW)
+
+
+def test_change_history_estimates_when_to_refetch():
+    policy = RecrawlPolicy()
+    stable = _history(first_days_ago=100, verified_days_ago=5, changes=0)
+    volatile = _history(first_days_ago=100, verified_days_ago=5, changes=60)
+
+    assert policy.change_probability(stable, NOW) < 0.1
+    assert not policy.should_fetch(stable, now=NOW)
+    assert policy.should_fetch(volatile, now=NOW)
+
+
+def test_nothing_is_carried_past_max_staleness():
+    policy = RecrawlPolicy(max_staleness=timedelta(days=30))
+    history = _history(first_days_ago=400, verified_days_ago=30, changes=0)
+
+    assert policy.should_fetch(history, lastmod=NOW - timedelta(days=90), now=NOW)
+
+
+def test_rejects_threshold_outside_unit_interval():
+    with pytest.raises(ValueError):
+        RecrawlPolicy(change_threshold=0)
+
+
+def _page(*links: str) -> str:
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><body>{anchors}</body></html>"
+
+
+def _sitemap(lastmods: dict[str, str]) -> str:
+    entries = "".join(f"<url><loc>{BASE}{path}</loc><lastmod>{day}</lastmod></url>" for path, day in lastmods.items())
+    return f"<urlset>{entries}</urlset>"
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_incremental_run_fetches_only_changed_and_new_urls(engine):
+    lastmods = {f"/s{i}": "2026-01-01" for i in range(4)}
+    pages = {
+        f"{BASE}/": _page("/p0", "/p1", "/p2"),
+        f"{BASE}/sitemap.xml": _sitemap(lastmods),
+        **{f"{BASE}{path}": _page("/") for path in lastmods},
+        **{f"{BASE}/p{i}": _page("/") for i in range(3)},
+    }
+    site = FakeSite(pages)
+    source_repo = InMemorySourceRepository()
+    run_repo = InMemoryRunRepository()
+    page_repo = InMemoryCrawledPageRepository()
+    uc = CrawlUseCase(
+        source_repo=source_repo,
+        run_repo=run_repo,
+        page_repo=page_repo,
+        queue_repo=InMemoryQueueRepository(),
+        http_client=FakeHttpClient(site),
+        delay=0,
+        engine=engine,
+        async_http_client=FakeAsyncHttpClient(site),
+        flush_interval=0.05,
+        incremental=True,
+    )
+    source = source_repo.create(CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain"))
+    # Without history an incremental run crawls everything
+    first = uc.start_run(source.id)
+    assert (first.pages_crawled, first.pages_carried) == (8, 0)
+
+    # /s1 changed since, and the home page now links to a new page
+    lastmods["/s1"] = "2099-01-01"
+    pages[f"{BASE}/sitemap.xml"] = _sitemap(lastmods)
+    pages[f"{BASE}/"] = _page("/p0", "/p1", "/p2", "/new")
+    pages[f"{BASE}/new"] = _page("/p0")
+    stored = len(page_repo.pages)
+    site.requested.clear()
+
+    second = uc.start_run(source.id)
+
+    fetched = {url for url in site.requested if not url.endswith((".txt", ".xml"))}
+    assert fetched == {f"{BASE}/", f"{BASE}/s1", f"{BASE}/new"}
+    assert (second.pages_crawled, second.pages_carried) == (3, 6)
+    run = max(run_repo.runs.values(), key=lambda r: r.created_at)
+    assert run.mode == "incremental"
+    carried = [p for p in page_repo.pages[stored:] if p.skip_reason == CARRIED_FORWARD]
+    assert {p.url for p in carried} == {f"{BASE}/s0", f"{BASE}/s2", f"{BASE}/s3", *(f"{BASE}/p{i}" for i in range(3))}
+    assert all(p.unchanged and p.content is None and p.content_hash for p in carried)
+    # Carried rows are not observations: history still dates /s0 to the first run
+    history = {h.url: h for h in page_repo.get_history(source.id)}
+    assert history[f"{BASE}/s0"].verified_at < history[f"{BASE}/s1"].verified_at
+    assert f"{BASE}/new" in history
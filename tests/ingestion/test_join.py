@@ -0,0 +1,157 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.domain.models import CrawlRunCreate, CrawlSourceCreate, QueueItemCreate
+from src.domain.rules import url_hash
+from src.ingestion.use_cases import CrawlUseCase
+from tests.fakes import (
+    FakeAsyncHttpClient,
+    FakeHttpClient,
+    FakeSite,
+    InMemoryCrawledPageRepository,
+    InMemoryQueueRepository,
+    InMemoryRunRepository,
+    InMemorySourceRepository,
+)
+
+BASE = "https://example.com"
+
+
+def _page(*links: str) -> str:
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><body>{anchors}</body></html>"
+
+
+class _Repos:
+    def __init__(self):
+        self.sources = InMemorySourceRepository()
+        self.runs = InMemoryRunRepository()
+        self.pages = InMemoryCrawledPageRepository()
+        self.queue = InMemoryQueueRepository()
+        self.source = self.sources.create(
+            CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain")
+        )
+
+    def worker(self, site: FakeSite, worker_id: str, http_client=None, **kwargs) -> CrawlUseCase:
+        return CrawlUseCase(
+            source_repo=self.sources,
+            run_repo=self.runs,
+            page_repo=self.pages,
+            queue_repo=self.queue,
+            http_client=http_client or FakeHttpClient(site),
+            delay=0,
+            async_http_client=FakeAsyncHttpClient(site),
+            flush_interval=0.05,
+            worker_id=worker_id,
+            idle_poll_interval=0.01,
+            **kwargs,
+        )
+
+
+class _GatedHttpClient(FakeHttpClient):
+    """Holds every page fetch but the entry URL until `gate` is set."""
+
+    def __init__(self, site: FakeSite, gate: threading.Event):
+        super().__init__(site)
+        self.gate = gate
+
+    def fetch(self, url, validators=None):
+        if url != f"{BASE}/":
+            assert self.gate.wait(5)
+        return super().fetch(url, validators)
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_joined_worker_shares_the_run_and_waits_for_the_others(engine):
+    links = [f"/p{i}" for i in range(20)]
+    site = FakeSite({f"{BASE}/": _page(*links), **{f"{BASE}{link}": _page("/") for link in links}})
+    repos = _Repos()
+    gate = threading.Event()
+    # The first worker stalls on its first claim, so the joined one has to
+    # crawl the rest and then wait for it instead of completing the run
+    first = repos.worker(site, "a", http_client=_GatedHttpClient(site, gate), batch_size=1, concurrency=1)
+    results = {}
+    starter = threading.Thread(target=lambda: results.update(a=first.start_run(repos.source.id)))
+    starter.start()
+    while not repos.queue.get_processing_count(_run_id(repos)):
+        threading.Event().wait(0.01)
+
+    second = repos.worker(site, "b", engine=engine)
+    joiner = threading.Thread(target=lambda: results.update(b=second.join_run(_run_id(repos))))
+    joiner.start()
+    while len(site.requested) < 10:
+        threading.Event().wait(0.01)
+    assert joiner.is_alive()
+    gate.set()
+    starter.join(5)
+    joiner.join(5)
+
+    pages = [u for u in site.requested if "sitemap" not in u and "robots" not in u]
+    assert sorted(pages) == sorted([f"{BASE}/"] + [f"{BASE}{link}" for link in links])
+    assert results["a"].pages_crawled + results["b"].pages_crawled == 21
+    assert results["b"].pages_crawled > 0
+    (run,) = repos.runs.runs.values()
+    assert run.status == "completed"
+    # Both workers' counts add up on the shared run row
+    assert run.pages_crawled == 21
+    assert run.status_codes == {200: 21}
+
+
+def test_items_of_a_dead_worker_are_reclaimed():
+    site = FakeSite({f"{BASE}/": _page("/a"), f"{BASE}/a": _page("/")})
+    repos = _Repos()
+    run = repos.runs.create(CrawlRunCreate(source_id=repos.source.id))
+    repos.runs.mark_started(run.id)
+    for url in (f"{BASE}/", f"{BASE}/a"):
+        repos.queue.add(QueueItemCreate(run_id=run.id, url=url, url_hash=url_hash(url)))
+    # A worker claimed the entry page, then died without finishing it
+    (dead,) = repos.queue.claim(run.id, "dead", limit=1)
+    key = (run.id, dead.url_hash)
+    repos.queue.items[key] = dead.model_copy(update={"claimed_at": datetime.now() - timedelta(minutes=10)})
+
+    result = repos.worker(site, "b", heartbeat_interval=0.1).join_run(run.id)
+
+    assert result.pages_crawled == 2
+    assert repos.queue.get_processing_count(run.id) == 0
+    assert repos.runs.get_by_id(run.id).status == "completed"
+
+
+def test_heartbeat_keeps_claims_of_a_slow_worker(monkeypatch):
+    repos = _Repos()
+    run = repos.runs.create(CrawlRunCreate(source_id=repos.source.id))
+    url = f"{BASE}/"
+    repos.queue.add(QueueItemCreate(run_id=run.id, url=url, url_hash=url_hash(url)))
+    (item,) = repos.queue.claim(run.id, "a")
+    repos.queue.items[(run.id, item.url_hash)] = item.model_copy(
+        update={"claimed_at": datetime.now() - timedelta(minutes=10)}
+    )
+    uc = repos.worker(FakeSite({}), "a", heartbeat_interval=0.01)
+
+    with uc._heartbeat(run):
+        while not repos.queue.calls.get("heartbeat"):
+            threading.Event().wait(0.01)
+
+    assert repos.queue.reset_stale(timeout_minutes=2) == 0
+
+
+def test_cannot_join_a_finished_run():
+    repos = _Repos()
+    run = repos.runs.create(CrawlRunCreate(source_id=repos.source.id))
+    repos.runs.mark_completed(run.id)
+
+    with pytest.raises(ValueError, match="already completed"):
+        repos.worker(FakeSite({}), "b").join_run(run.id)
+
+
+def test_stale_timeout_must_outlast_heartbeats():
+    with pytest.raises(ValueError, match="stale_timeout_minutes"):
+        _Repos().worker(FakeSite({}), "a", heartbeat_interval=90, stale_timeout_minutes=2)
+
+
+def _run_id(repos: _Repos):
+    while not repos.runs.runs:
+        threading.Event().wait(0.01)
+    (run,) = repos.runs.runs.values()
+    return run.id
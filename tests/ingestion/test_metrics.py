@@ -0,0 +1,129 @@
+import json
+import threading
+import urllib.request
+
+import pytest
+
+from src.domain.models import CrawlSourceCreate
+from src.ingestion.crawling import CrawlMetrics
+from src.ingestion.use_cases import CrawlUseCase
+from src.interfaces.metrics import MetricsDumper, MetricsServer
+from tests.fakes import (
+    FakeAsyncHttpClient,
+    FakeHttpClient,
+    FakeSite,
+    InMemoryCrawledPageRepository,
+    InMemoryQueueRepository,
+    InMemoryRunRepository,
+    InMemorySourceRepository,
+)
+
+BASE = "https://example.com"
+
+
+def _site() -> FakeSite:
+    links = "".join(f'<a href="/p{i}">p{i}</a>' for i in range(6))
+    pages = {f"{BASE}/": f"<html><body>{links}</body></html>"}
+    pages.update({f"{BASE}/p{i}": '<html><body><a href="/">home</a></body></html>' for i in range(5)})
+    return FakeSite(pages)
+
+
+def test_histogram_buckets_and_quantiles():
+    metrics = CrawlMetrics(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.05, 0.05, 0.5, 5.0):
+        metrics.observe("fetch", seconds)
+
+    stage = metrics.snapshot()["stages"]["fetch"]
+
+    assert stage["count"] == 5
+    assert stage["sum_seconds"] == pytest.approx(5.605)
+    assert stage["buckets"] == {"0.01": 1, "0.1": 2, "1.0": 1, "+Inf": 1}
+    assert stage["p50_seconds"] == 0.1
+    assert stage["p99_seconds"] == float("inf")
+
+
+def test_prometheus_rendering():
+    metrics = CrawlMetrics(buckets=(0.1, 1.0))
+    metrics.observe("page_insert", 0.5)
+    metrics.count_fetch('ex"ample.com', 200)
+    metrics.count_fetch("example.com", None)
+    metrics.track_queue("run-1", lambda: 7)
+    metrics.track_queue("run-2", lambda: 1 / 0)
+
+    text = metrics.render_prometheus()
+
+    assert 'crawl_stage_seconds_bucket{stage="page_insert",le="0.1"} 0' in text
+    assert 'crawl_stage_seconds_bucket{stage="page_insert",le="+Inf"} 1' in text
+    assert 'crawl_stage_seconds_count{stage="page_insert"} 1' in text
+    assert 'crawl_fetches_total{domain="ex\\"ample.com",status="200"} 1' in text
+    assert 'crawl_fetches_total{domain="example.com",status="error"} 1' in text
+    assert "crawl_fetches_in_flight 0" in text
+    # A failing gauge callback drops only its own sample
+    assert 'crawl_queue_pending{run_id="run-1"} 7' in text
+    assert "run-2" not in text
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_crawl_records_every_stage(engine):
+    site = _site()
+    metrics = CrawlMetrics()
+    source_repo = InMemorySourceRepository()
+    uc = CrawlUseCase(
+        source_repo=source_repo,
+        run_repo=InMemoryRunRepository(),
+        page_repo=InMemoryCrawledPageRepository(),
+        queue_repo=InMemoryQueueRepository(),
+        http_client=FakeHttpClient(site),
+        delay=0,
+        engine=engine,
+        async_http_client=FakeAsyncHttpClient(site),
+        flush_interval=0.05,
+        metrics=metrics,
+    )
+    source = source_repo.create(CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain"))
+
+    uc.start_run(source.id)
+
+    snapshot = metrics.snapshot()
+    assert {
+        "fetch",
+        "rate_limit_wait",
+        "link_extraction",
+        "robots_check",
+        "db_claim",
+        "db_validators",
+        "page_insert",
+        "queue_upsert",
+        "ack",
+    } <= set(snapshot["stages"])
+    assert snapshot["stages"]["fetch"]["count"] == 7
+    assert snapshot["fetches_by_status"] == {"200": 6, "404": 1}
+    assert snapshot["fetches_by_domain"] == {"example.com": 7}
+    assert snapshot["fetches_in_flight"] == 0
+    # The run's queue gauge goes away with the run
+    assert snapshot["queue_pending"] == {}
+
+
+def test_metrics_server_and_dumper(tmp_path):
+    metrics = CrawlMetrics()
+    metrics.count_fetch("example.com", 200)
+    server = MetricsServer(metrics, port=0, host="127.0.0.1").start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert 'crawl_fetches_total{domain="example.com",status="200"} 1' in response.read().decode()
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics.json") as response:
+            assert json.load(response)["fetches_by_status"] == {"200": 1}
+    finally:
+        server.close()
+
+    path = tmp_path / "metrics.json"
+    dumper = MetricsDumper(metrics, path, interval=0.01).start()
+    for _ in range(100):
+        if path.exists():
+            break
+        threading.Event().wait(0.01)
+    metrics.count_fetch("example.com", 500)
+    dumper.close()
+
+    assert json.loads(path.read_text())["fetches_by_status"] == {"200": 1, "500": 1}
@@ -0,0 +1,21 @@
+import hashlib
+
+from src.domain.rules import url_hash
+from src.ingestion.crawling import analyze_page
+
+
+def test_links_are_normalized_deduplicated_and_same_domain():
+    body = (
+        '<a href="/a/">A</a><a href="/a#top">A again</a>'
+        '<a href="https://other.example/x">off-site</a><a href="mailto:me@example.com">mail</a>'
+    ).encode()
+
+    analysis = analyze_page(body, "https://example.com/", "example.com")
+
+    assert analysis.content_hash == hashlib.sha256(body).hexdigest()
+    assert analysis.links == [("https://example.com/a", url_hash("https://example.com/a"))]
+
+
+def test_extraction_can_be_skipped():
+    analysis = analyze_page(b'<a href="/a">A</a>', "https://example.com/", "example.com", extract=False)
+    assert analysis.links == []
@@ -0,0 +1,126 @@
+import re
+import threading
+import time
+
+import pytest
+
+from src.domain.models import CrawlSourceCreate
+from src.ingestion.crawling import SamplingProfiler
+from src.ingestion.use_cases import CrawlUseCase as RealCrawlUseCase
+from tests.fakes import (
+    FakeAsyncHttpClient,
+    FakeHttpClient,
+    FakeSite,
+    InMemoryCrawledPageRepository,
+    InMemoryQueueRepository,
+    InMemoryRunRepository,
+    InMemorySourceRepository,
+)
+
+BASE = "https://example.com"
+
+
+# Stand-ins whose qualified names match the stage table
+class HttpClient:
+    def fetch(self, ready: threading.Event, release: threading.Event) -> None:
+        ready.set()
+        release.wait()
+
+
+class CrawlUseCase:
+    def _analyze(self, ready: threading.Event, release: threading.Event) -> None:
+        ready.set()
+        while not release.is_set():
+            sum(range(1000))
+
+
+class PageRepository:
+    def create_batch(self, ready: threading.Event, release: threading.Event) -> None:
+        CrawlUseCase()._analyze(ready, release)
+
+
+def _start(target, name: str, release: threading.Event) -> threading.Thread:
+    ready = threading.Event()
+    thread = threading.Thread(target=target, args=(ready, release), name=name, daemon=True)
+    thread.start()
+    ready.wait()
+    return thread
+
+
+def test_samples_are_charged_to_the_innermost_stage_and_outermost_repository_method():
+    release = threading.Event()
+    threads = [
+        _start(HttpClient().fetch, "crawl-fetch-0", release),
+        _start(HttpClient().fetch, "crawl-fetch-1", release),
+        _start(PageRepository().create_batch, "crawl-db-0", release),
+    ]
+    # A long interval so only the explicit samples below are taken
+    profiler = SamplingProfiler(interval=60).start()
+    try:
+        for _ in range(5):
+            time.sleep(0.01)
+            profiler.sample()
+    finally:
+        release.set()
+        profiler.stop()
+        for thread in threads:
+            thread.join()
+
+    summary = profiler.summary()
+    stages = summary["stages"]
+    assert summary["samples"] == 5
+    assert stages["fetch"]["samples"] == 10
+    assert stages["link_extraction"]["samples"] == 5
+    assert set(summary["repository_methods"]) == {"PageRepository.create_batch"}
+    # The CPU-bound thread burned CPU, the blocked fetchers hardly any
+    assert stages["link_extraction"]["cpu_seconds"] > stages["fetch"]["cpu_seconds"]
+
+    wall = profiler.collapsed("wall")
+    fetch_stack = next(line for line in wall if line.startswith("crawl-fetch;"))
+    # Numbered threads share one root frame
+    assert fetch_stack.endswith(" 10")
+    assert f"{__name__}:HttpClient.fetch;threading:Event.wait" in fetch_stack
+    assert "link_extraction" in profiler.format_summary()
+
+
+def test_rejects_non_positive_interval():
+    with pytest.raises(ValueError):
+        SamplingProfiler(interval=0)
+
+
+def test_collapsed_rejects_unknown_weight():
+    with pytest.raises(ValueError):
+        SamplingProfiler().collapsed("memory")
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_profiled_crawl_writes_flamegraph_stacks_and_summary(tmp_path, engine):
+    links = "".join(f'<a href="/p{i}">p{i}</a>' for i in range(40))
+    pages = {f"{BASE}/": f"<html><body>{links}</body></html>"}
+    pages.update({f"{BASE}/p{i}": '<html><body><a href="/">home</a></body></html>' for i in range(40)})
+    site = FakeSite(pages)
+    source_repo = InMemorySourceRepository()
+    use_case = RealCrawlUseCase(
+        source_repo=source_repo,
+        run_repo=InMemoryRunRepository(),
+        page_repo=InMemoryCrawledPageRepository(),
+        queue_repo=InMemoryQueueRepository(),
+        http_client=FakeHttpClient(site),
+        async_http_client=FakeAsyncHttpClient(site) if engine == "async" else None,
+        engine=engine,
+        delay=0,
+        concurrency=8,
+    )
+    source = source_repo.create(CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain"))
+
+    with SamplingProfiler(interval=0.001) as profiler:
+        result = use_case.start_run(source.id)
+    paths = profiler.write(tmp_path / "crawl")
+
+    assert result.pages_crawled == 41
+    assert [path.name for path in paths] == ["crawl.folded", "crawl.cpu.folded", "crawl.txt"]
+    for path in paths[:2]:
+        for line in path.read_text().splitlines():
+            assert re.fullmatch(r"[^;]+(;[^;]+)* \d+", line)
+    assert profiler.summary()["samples"] > 0
+    assert paths[2].read_text().startswith("Profiled ")
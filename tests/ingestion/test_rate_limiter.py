@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+
+from src.ingestion.crawling import AsyncDomainRateLimiter, DomainRateLimiter
+from src.ingestion.crawling.rate_limiter import LATENCY_WINDOW, MIN_BACKOFF_DELAY
+
+
+def test_async_limiter_spaces_requests_to_the_same_domain():
+    async def scenario():
+        limiter = AsyncDomainRateLimiter(default_delay=0.05)
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire("example.com")
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) >= 0.1
+
+
+def test_async_limiter_does_not_delay_other_domains():
+    async def scenario():
+        limiter = AsyncDomainRateLimiter(default_delay=1.0)
+        await limiter.acquire("a.example")
+        start = time.monotonic()
+        await limiter.acquire("b.example")
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) < 0.5
+
+
+def test_cancelled_waiter_does_not_keep_its_slot():
+    async def scenario():
+        limiter = AsyncDomainRateLimiter(default_delay=0.2)
+        await limiter.acquire("example.com")
+        waiter = asyncio.create_task(limiter.acquire("example.com"))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        # The next caller waits out the original delay only, not a second one
+        start = time.monotonic()
+        await limiter.acquire("example.com")
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) < 0.3
+
+
+def _respond(limiter: DomainRateLimiter, times: int, latency: float, domain: str = "example.com") -> None:
+    for _ in range(times):
+        limiter.acquire(domain)
+        limiter.release(domain, latency)
+
+
+def test_adaptive_limiter_speeds_up_while_latency_is_flat_but_not_past_the_floor():
+    limiter = DomainRateLimiter(adaptive=True)
+    limiter.set_delay("example.com", 0.02, min_delay=0.0195)
+
+    _respond(limiter, LATENCY_WINDOW, latency=0.1)
+    assert limiter.get_delay("example.com") < 0.02
+
+    _respond(limiter, 2 * LATENCY_WINDOW, latency=0.1)
+    assert limiter.get_delay("example.com") == 0.0195
+
+
+def test_adaptive_limiter_backs_off_when_p95_rises():
+    limiter = DomainRateLimiter(adaptive=True)
+    limiter.set_delay("example.com", 0.01, min_delay=0.0)
+
+    _respond(limiter, LATENCY_WINDOW, latency=0.1)
+    fast = limiter.get_delay("example.com")
+    _respond(limiter, LATENCY_WINDOW, latency=0.5)
+
+    assert limiter.get_delay("example.com") >= 2 * fast
+
+
+def test_pushback_halves_the_rate_once_per_congestion_event():
+    limiter = DomainRateLimiter(adaptive=True, max_delay=10)
+    limiter.set_delay("example.com", 0.0, min_delay=0.0)
+    for _ in range(3):
+        limiter.acquire("example.com")
+
+    # Three in-flight requests all come back 429: one back-off, not three
+    for _ in range(3):
+        limiter.release("example.com", latency=0.01, overloaded=True)
+    assert limiter.get_delay("example.com") == MIN_BACKOFF_DELAY
+
+    limiter.acquire("example.com")
+    time.sleep(0.01)
+    limiter.release("example.com", latency=0.001, overloaded=True)
+    assert limiter.get_delay("example.com") == 2 * MIN_BACKOFF_DELAY
+
+
+def test_fixed_delay_is_unchanged_by_feedback():
+    limiter = DomainRateLimiter(default_delay=0.0)
+    limiter.acquire("example.com")
+    limiter.release("example.com", latency=0.01, overloaded=True)
+
+    assert limiter.get_delay("example.com") == 0.0
+
+
+def test_retry_after_holds_back_the_next_request():
+    limiter = DomainRateLimiter(default_delay=0.0)
+    limiter.acquire("example.com")
+    limiter.release("example.com", overloaded=True, retry_after=0.2)
+
+    start = time.monotonic()
+    limiter.acquire("example.com")
+    assert time.monotonic() - start >= 0.15
+
+
+def test_in_flight_requests_are_capped_per_host():
+    limiter = DomainRateLimiter(default_delay=0.0, max_connections=2)
+    limiter.acquire("example.com")
+    limiter.acquire("example.com")
+    limiter.acquire("other.example")  # other hosts are not affected
+
+    third = threading.Thread(target=limiter.acquire, args=("example.com",))
+    third.start()
+    third.join(timeout=0.1)
+    assert third.is_alive()
+
+    limiter.release("example.com")
+    third.join(timeout=1)
+    assert not third.is_alive()
+
+
+def test_async_connection_cap_survives_cancelled_waiters():
+    async def scenario():
+        limiter = AsyncDomainRateLimiter(default_delay=0.0, max_connections=1)
+        await limiter.acquire("example.com")
+        waiter = asyncio.create_task(limiter.acquire("example.com"))
+        await asyncio.sleep(0.02)
+        assert not waiter.done()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        limiter.release("example.com")
+        await asyncio.wait_for(limiter.acquire("example.com"), timeout=0.5)
+
+    asyncio.run(scenario())
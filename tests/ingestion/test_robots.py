@@ -0,0 +1,141 @@
+from urllib.robotparser import RobotFileParser
+
+import pytest
+
+from src.ingestion.crawling import FetchResult, RobotsCache, RobotsRules
+from tests.fakes import InMemoryRobotsStore
+
+BASE = "https://example.com"
+
+ROBOTS = """
+User-agent: otherbot
+Disallow: /
+
+User-agent: *
+Disallow: /private
+Allow: /private/public
+Disallow: /*.pdf$
+Disallow: /search?*q=
+Allow: /fun$
+Disallow: /fun
+Crawl-delay: 2
+
+Sitemap: https://example.com/sitemap-a.xml
+"""
+
+
+@pytest.mark.parametrize(
+    ("path", "allowed"),
+    [
+        ("/", True),
+        ("/private", False),
+        ("/private/secret", False),
+        ("/private/public/page", True),  # longer Allow wins
+        ("/docs/a.pdf", False),
+        ("/docs/a.pdf?download=1", True),  # $ anchors the end
+        ("/search?lang=en&q=x", False),
+        ("/search", True),
+        ("/fun", True),
+        ("/funny", False),
+        ("/%7Eprivate", True),
+        ("/priv%61te", False),  # escaped unreserved characters are decoded
+    ],
+)
+def test_longest_match_with_wildcards(path, allowed):
+    rules = RobotsRules.parse(ROBOTS)
+
+    assert rules.can_fetch(BASE + path) is allowed
+
+
+def test_group_selection_crawl_delay_and_sitemaps():
+    rules = RobotsRules.parse(ROBOTS)
+    other = RobotsRules.parse(ROBOTS, user_agent="OtherBot")
+
+    assert rules.crawl_delay == 2
+    assert rules.sitemaps == ["https://example.com/sitemap-a.xml"]
+    assert not other.can_fetch(f"{BASE}/anything")
+    assert other.can_fetch(f"{BASE}/robots.txt")
+
+
+def test_allow_wins_a_tie():
+    rules = RobotsRules([(False, "/page"), (True, "/page")])
+
+    assert rules.can_fetch(f"{BASE}/page")
+
+
+def test_agrees_with_robotparser_on_plain_prefix_rules():
+    text = "User-agent: *\n" + "".join(f"Disallow: /section{i}/\n" for i in range(200))
+    rules = RobotsRules.parse(text)
+    reference = RobotFileParser()
+    reference.parse(text.splitlines())
+
+    for i in range(0, 400, 7):
+        url = f"{BASE}/section{i}/page?x=1"
+        assert rules.can_fetch(url) == reference.can_fetch("*", url)
+
+
+class _RobotsClient:
+    def __init__(self, result: FetchResult):
+        self.result = result
+        self.requests = 0
+
+    def fetch_resource(self, url: str) -> FetchResult:
+        self.requests += 1
+        return self.result
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_shares_one_download_per_host_until_the_ttl():
+    client = _RobotsClient(FetchResult(content=ROBOTS, status_code=200))
+    clock = _Clock()
+    cache = RobotsCache(client, ttl=60, clock=clock)
+
+    assert cache.get(BASE) is cache.get(BASE + "/")
+    clock.now += 59
+    cache.get(BASE)
+    assert client.requests == 1
+
+    clock.now += 2
+    cache.get(BASE)
+    assert client.requests == 2
+
+
+def test_cache_honours_a_shorter_max_age_and_retries_errors_sooner():
+    clock = _Clock()
+    fresh = _RobotsClient(FetchResult(content=ROBOTS, status_code=200, max_age=10))
+    cache = RobotsCache(fresh, ttl=60, clock=clock)
+    cache.get(BASE)
+    clock.now += 11
+    cache.get(BASE)
+    assert fresh.requests == 2
+
+    failing = _RobotsClient(FetchResult(content=None, status_code=503))
+    cache = RobotsCache(failing, ttl=60, error_ttl=5, clock=clock)
+    assert cache.get(BASE).can_fetch(f"{BASE}/private")
+    clock.now += 6
+    cache.get(BASE)
+    assert failing.requests == 2
+
+
+def test_stored_entries_survive_a_new_cache():
+    store = InMemoryRobotsStore()
+    clock = _Clock()
+    first = _RobotsClient(FetchResult(content=ROBOTS, status_code=200))
+    RobotsCache(first, store=store, ttl=60, clock=clock).get(BASE)
+
+    second = _RobotsClient(FetchResult(content=None, status_code=404))
+    rules = RobotsCache(second, store=store, ttl=60, clock=clock).get(BASE)
+
+    assert second.requests == 0
+    assert not rules.can_fetch(f"{BASE}/private")
+
+    clock.now += 61
+    RobotsCache(second, store=store, ttl=60, clock=clock).get(BASE)
+    assert second.requests == 1
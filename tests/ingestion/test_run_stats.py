@@ -0,0 +1,68 @@
+import threading
+from uuid import uuid4
+
+from src.domain.models import CrawlRunCreate, RunStatsDelta
+from src.ingestion.use_cases.run_stats import RunStatsAggregator
+from tests.fakes import InMemoryRunRepository
+
+
+def _run(repo: InMemoryRunRepository):
+    return repo.create(CrawlRunCreate(source_id=uuid4()))
+
+
+def test_deltas_are_coalesced_into_one_increment():
+    repo = InMemoryRunRepository()
+    run = _run(repo)
+    stats = RunStatsAggregator(repo, run.id, interval=60)
+
+    for code in (200, 200, 404):
+        stats.record(RunStatsDelta(pages_found=1, pages_crawled=1, bytes_downloaded=10, status_codes={code: 1}))
+    assert repo.increments == 0
+    stats.flush()
+    stats.flush()
+
+    assert repo.increments == 1
+    stored = repo.get_by_id(run.id)
+    assert (stored.pages_found, stored.pages_crawled, stored.bytes_downloaded) == (3, 3, 30)
+    assert stored.status_codes == {200: 2, 404: 1}
+
+
+def test_failed_flush_keeps_the_delta_for_the_next_one():
+    repo = InMemoryRunRepository()
+    run = _run(repo)
+    increment_stats = repo.increment_stats
+    attempts = []
+
+    def flaky_increment_stats(id, delta):
+        attempts.append(delta)
+        if len(attempts) == 1:
+            raise ConnectionError("down")
+        return increment_stats(id, delta)
+
+    repo.increment_stats = flaky_increment_stats
+    stats = RunStatsAggregator(repo, run.id, interval=60)
+
+    stats.record(RunStatsDelta(pages_crawled=2))
+    assert stats.flush() is False
+    stats.record(RunStatsDelta(pages_crawled=3))
+    assert stats.flush() is True
+
+    assert repo.get_by_id(run.id).pages_crawled == 5
+
+
+def test_flushing_sends_on_a_timer_and_on_exit():
+    repo = InMemoryRunRepository()
+    run = _run(repo)
+    stats = RunStatsAggregator(repo, run.id, interval=0.01)
+
+    with stats.flushing():
+        stats.record(RunStatsDelta(links_discovered=4))
+        for _ in range(100):
+            if repo.increments:
+                break
+            threading.Event().wait(0.01)
+        assert repo.increments == 1
+        stats.record(RunStatsDelta(links_deduped=1))
+
+    stored = repo.get_by_id(run.id)
+    assert (stored.links_discovered, stored.links_deduped) == (4, 1)
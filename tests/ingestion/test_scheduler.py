@@ -0,0 +1,140 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.domain.models import CrawlSourceCreate
+from src.domain.rules import frequency_interval
+from src.ingestion.crawling import FetchBudget
+from src.ingestion.use_cases import CrawlScheduler, CrawlUseCase
+from tests.fakes import (
+    FakeHttpClient,
+    FakeSite,
+    InMemoryCrawledPageRepository,
+    InMemoryQueueRepository,
+    InMemoryRunRepository,
+    InMemorySourceRepository,
+)
+
+
+@pytest.mark.parametrize(
+    "frequency, expected",
+    [
+        ("once", None),
+        ("daily", timedelta(days=1)),
+        ("Hourly", timedelta(hours=1)),
+        ("6h", timedelta(hours=6)),
+        ("30m", timedelta(minutes=30)),
+        ("2w", timedelta(weeks=2)),
+    ],
+)
+def test_frequency_interval(frequency, expected):
+    assert frequency_interval(frequency) == expected
+
+
+@pytest.mark.parametrize("frequency", ["sometimes", "0h", "5y"])
+def test_frequency_interval_rejects_unknown_values(frequency):
+    with pytest.raises(ValueError):
+        frequency_interval(frequency)
+
+
+class _Env:
+    def __init__(self, site: FakeSite, broken_sources: set[str] = frozenset()):
+        self.sources = InMemorySourceRepository()
+        self.runs = InMemoryRunRepository()
+        self.pages = InMemoryCrawledPageRepository()
+        self.queue = InMemoryQueueRepository()
+        self.http_client = FakeHttpClient(site)
+        self.budget = FetchBudget(4)
+        self.broken_sources = broken_sources
+
+    def add_source(self, domain: str, frequency: str, due: bool = True):
+        source = self.sources.create(
+            CrawlSourceCreate(domain=domain, entry_url=f"https://{domain}/", type="full_domain", frequency=frequency)
+        )
+        offset = timedelta(minutes=-5 if due else 5)
+        return self.sources.update_next_run(source.id, datetime.now(timezone.utc) + offset)
+
+    def make_use_case(self, source) -> CrawlUseCase:
+        if source.domain in self.broken_sources:
+            raise RuntimeError("boom")
+        return CrawlUseCase(
+            source_repo=self.sources,
+            run_repo=self.runs,
+            page_repo=self.pages,
+            queue_repo=self.queue,
+            http_client=self.http_client,
+            delay=0,
+            flush_interval=0.05,
+            fetch_budget=self.budget,
+        )
+
+
+def _site() -> FakeSite:
+    pages = {}
+    for domain in ("a.example", "b.example", "c.example"):
+        pages[f"https://{domain}/"] = '<a href="/1">1</a><a href="/2">2</a>'
+        pages[f"https://{domain}/1"] = "<p>one</p>"
+        pages[f"https://{domain}/2"] = "<p>two</p>"
+    return FakeSite(pages)
+
+
+def _wait_idle(scheduler: CrawlScheduler) -> None:
+    deadline = time.monotonic() + 5
+    while scheduler.running() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not scheduler.running()
+
+
+def test_due_sources_run_concurrently_and_are_rescheduled():
+    env = _Env(_site())
+    daily = env.add_source("a.example", "daily")
+    once = env.add_source("b.example", "once")
+    later = env.add_source("c.example", "daily", due=False)
+    scheduler = CrawlScheduler(env.sources, env.make_use_case, max_runs=4, poll_interval=0.05)
+
+    assert scheduler.poll_once() == 2
+    _wait_idle(scheduler)
+    scheduler.close()
+
+    assert {r.source_id for r in env.runs.runs.values()} == {daily.id, once.id}
+    assert all(r.status == "completed" for r in env.runs.runs.values())
+    assert len(env.pages.pages) == 6
+    next_daily = env.sources.get_by_id(daily.id).next_run_at
+    assert next_daily is not None and next_daily > datetime.now(timezone.utc) + timedelta(hours=23)
+    assert env.sources.get_by_id(once.id).next_run_at is None
+    assert env.sources.get_by_id(later.id).next_run_at == later.next_run_at
+    assert env.budget.in_flight() == {}
+
+
+def test_failed_runs_are_still_rescheduled_and_slots_are_respected():
+    env = _Env(_site(), broken_sources={"a.example"})
+    broken = env.add_source("a.example", "6h")
+    env.add_source("b.example", "once")
+    scheduler = CrawlScheduler(env.sources, env.make_use_case, max_runs=1, poll_interval=0.05)
+
+    assert scheduler.poll_once() == 1
+    _wait_idle(scheduler)
+    assert scheduler.poll_once() == 1
+    _wait_idle(scheduler)
+    assert scheduler.poll_once() == 0
+    scheduler.close()
+
+    assert env.sources.get_by_id(broken.id).next_run_at > datetime.now(timezone.utc) + timedelta(hours=5)
+    assert len(env.runs.runs) == 1
+
+
+def test_serve_returns_after_stop():
+    env = _Env(_site())
+    env.add_source("a.example", "daily")
+    scheduler = CrawlScheduler(env.sources, env.make_use_case, poll_interval=10)
+
+    thread = threading.Thread(target=scheduler.serve)
+    thread.start()
+    time.sleep(0.05)
+    scheduler.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert len(env.runs.runs) == 1
@@ -0,0 +1,47 @@
+import pytest
+
+from src.domain.rules import url_hash
+from src.ingestion.crawling import UrlSeenSet
+
+
+def _hashes(n: int, prefix: str = "https://example.com/p") -> list[str]:
+    return [url_hash(f"{prefix}{i}") for i in range(n)]
+
+
+def test_add_reports_new_then_seen():
+    seen = UrlSeenSet(capacity=100)
+    h = url_hash("https://example.com/")
+
+    assert seen.add(h) is True
+    assert seen.add(h) is False
+    assert h in seen
+    stats = seen.stats()
+    assert (stats.checked, stats.hits, stats.added) == (2, 1, 1)
+    assert stats.hit_rate == 0.5
+
+
+def test_false_positive_rate_stays_near_target_at_capacity():
+    seen = UrlSeenSet(capacity=20_000, error_rate=0.01)
+    seen.update(_hashes(20_000))
+
+    unseen = _hashes(20_000, prefix="https://other.example/q")
+    false_positives = sum(h in seen for h in unseen)
+
+    assert false_positives / len(unseen) < 0.02
+    assert seen.stats().estimated_false_positive_rate < 0.02
+    # About 1.2 bytes per URL at a 1% error rate
+    assert seen.stats().size_bytes < 2 * 20_000
+
+
+def test_update_does_not_count_as_lookups():
+    seen = UrlSeenSet(capacity=100)
+    seen.update(_hashes(10))
+
+    stats = seen.stats()
+    assert (stats.checked, stats.hits, stats.added) == (0, 0, 10)
+
+
+@pytest.mark.parametrize("kwargs", [{"capacity": 0}, {"capacity": 10, "error_rate": 0}, {"capacity": 10, "error_rate": 1}])
+def test_rejects_invalid_sizing(kwargs):
+    with pytest.raises(ValueError):
+        UrlSeenSet(**kwargs)
@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from src.domain.models import CrawlSourceCreate
+from src.ingestion.crawling import NearDuplicateIndex, simhash
+from src.ingestion.crawling.simhash import NEAR_DUPLICATE, to_signed
+from src.ingestion.use_cases import CrawlUseCase
+from tests.fakes import (
+    FakeAsyncHttpClient,
+    FakeHttpClient,
+    FakeSite,
+    InMemoryCrawledPageRepository,
+    InMemoryQueueRepository,
+    InMemoryRunRepository,
+    InMemorySourceRepository,
+)
+
+BASE = "https://example.com"
+
+
+def _text(seed: int, words: int = 2000) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(500)]
+    return [rng.choice(vocabulary) for _ in range(words)]
+
+
+def _html(words: list[str], title: str = "Page", links: str = "") -> str:
+    return f"<html><head><title>{title}</title><script>var x = 1;</script></head><body>{links}<p>{' '.join(words)}</p></body></html>"
+
+
+def _distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def test_fingerprints_ignore_markup_and_track_text_changes():
+    words = _text(1)
+    original = simhash(_html(words))
+    edited = list(words)
+    for i in range(0, 2000, 400):
+        edited[i] = "changed"
+
+    assert original == simhash(_html(words).replace("<p>", "<p class=\"x\">"))
+    assert _distance(original, simhash(_html(edited))) <= 4
+    assert _distance(original, simhash(_html(_text(2)))) > 16
+
+
+def test_short_pages_have_no_fingerprint():
+    assert simhash("<p>too few words to compare</p>") is None
+    with pytest.raises(ValueError):
+        simhash("<p>text</p>", shingle_size=0)
+
+
+def test_signed_form_fits_a_bigint_and_matches_in_the_index():
+    fingerprint = 1 << 63 | 5
+
+    assert to_signed(fingerprint) == -(1 << 63) + 5
+    assert to_signed(5) == 5
+    index = NearDuplicateIndex()
+    index.check(fingerprint, "a")
+    assert index.check(to_signed(fingerprint), "b") == "a"
+
+
+def test_index_finds_fingerprints_within_distance():
+    index = NearDuplicateIndex(max_distance=3)
+    base = 0x0123_4567_89AB_CDEF
+
+    assert index.check(base, "a") is None
+    # Three bits apart, each in a different band
+    assert index.check(base ^ (1 | 1 << 20 | 1 << 40), "b") == "a"
+    assert index.check(base ^ 0b1111, "c") is None
+    assert len(index) == 2
+
+
+def test_index_stops_growing_at_max_entries():
+    index = NearDuplicateIndex(max_distance=0, max_entries=1)
+
+    assert index.check(1, "a") is None
+    assert index.check(2, "b") is None
+    assert index.check(2, "c") is None
+    assert index.check(1, "d") == "a"
+    assert len(index) == 1
+
+
+@pytest.mark.parametrize("kwargs", [{"max_distance": -1}, {"max_distance": 32}, {"max_entries": -1}])
+def test_index_rejects_invalid_settings(kwargs):
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(**kwargs)
+
+
+@pytest.mark.parametrize("engine", ["threads", "async"])
+def test_near_duplicates_are_not_expanded_and_bodies_can_be_dropped(engine):
+    words = _text(3)
+    pages = {
+        f"{BASE}/": _html(_text(4), links='<a href="/a">a</a>'),
+        f"{BASE}/a": _html(words, links='<a href="/a?view=print">print</a><a href="/b">b</a>'),
+        # The print view repeats /a under another title and links deeper
+        f"{BASE}/a?view=print": _html(words, title="Print", links='<a href="/b">b</a><a href="/print-only">x</a>'),
+        f"{BASE}/b": _html(_text(5)),
+        f"{BASE}/print-only": _html(_text(6)),
+    }
+    site = FakeSite(pages)
+    source_repo = InMemorySourceRepository()
+    page_repo = InMemoryCrawledPageRepository()
+    uc = CrawlUseCase(
+        source_repo=source_repo,
+        run_repo=InMemoryRunRepository(),
+        page_repo=page_repo,
+        queue_repo=InMemoryQueueRepository(),
+        http_client=FakeHttpClient(site),
+        delay=0,
+        engine=engine,
+        async_http_client=FakeAsyncHttpClient(site),
+        flush_interval=0.05,
+        near_duplicate_distance=3,
+        skip_duplicate_bodies=True,
+    )
+    source = source_repo.create(CrawlSourceCreate(domain="example.com", entry_url=f"{BASE}/", type="full_domain"))
+
+    result = uc.start_run(source.id)
+
+    stored = {p.url: p for p in page_repo.pages}
+    assert set(stored) == {f"{BASE}/", f"{BASE}/a", f"{BASE}/a?view=print", f"{BASE}/b"}
+    clone = stored[f"{BASE}/a?view=print"]
+    assert clone.skip_reason == NEAR_DUPLICATE and clone.content is None
+    assert _distance(clone.simhash, stored[f"{BASE}/a"].simhash) <= 3
+    assert stored[f"{BASE}/a"].content is not None
+    assert result.near_duplicates == 1
+    assert result.near_duplicate_bytes == len(pages[f"{BASE}/a?view=print"].encode())
+
+
+def test_skipping_duplicate_bodies_needs_a_distance():
+    with pytest.raises(ValueError):
+        CrawlUseCase(
+            source_repo=InMemorySourceRepository(),
+            run_repo=InMemoryRunRepository(),
+            page_repo=InMemoryCrawledPageRepository(),
+            queue_repo=InMemoryQueueRepository(),
+            http_client=FakeHttpClient(FakeSite({})),
+            skip_duplicate_bodies=True,
+        )
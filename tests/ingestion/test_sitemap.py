@@ -0,0 +1,73 @@
+import gzip
+from datetime import datetime, timezone
+
+from src.ingestion.crawling import SitemapEntry, SitemapParser
+from tests.fakes import FakeHttpClient, FakeSite
+
+BASE = "https://example.com"
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(*urls: str, extra: str = "") -> str:
+    body = "".join(f"<url><loc>{u}</loc>{extra}</url>" for u in urls)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{body}</urlset>'
+
+
+def _index(*sitemaps: str) -> str:
+    body = "".join(f"<sitemap><loc>{s}</loc></sitemap>" for s in sitemaps)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex {NS}>{body}</sitemapindex>'
+
+
+def test_entries_keep_lastmod_and_priority():
+    site = FakeSite({
+        f"{BASE}/sitemap.xml": _urlset(
+            f"{BASE}/a", extra="<lastmod>2026-03-01T10:00:00+00:00</lastmod><priority>0.8</priority>"
+        ).replace("</urlset>", f"<url><loc>{BASE}/b</loc><priority>7</priority></url></urlset>"),
+    })
+
+    entries = list(SitemapParser(FakeHttpClient(site)).iter_entries([f"{BASE}/sitemap.xml"]))
+
+    assert entries == [
+        SitemapEntry(f"{BASE}/a", datetime(2026, 3, 1, 10, tzinfo=timezone.utc), 0.8),
+        SitemapEntry(f"{BASE}/b"),  # out-of-range priority is dropped
+    ]
+
+
+def test_index_children_are_followed_including_gzip():
+    child_a = [f"{BASE}/a{i}" for i in range(50)]
+    child_b = [f"{BASE}/b{i}" for i in range(50)]
+    site = FakeSite(
+        {
+            f"{BASE}/sitemap.xml": _index(f"{BASE}/a.xml", f"{BASE}/b.xml.gz", f"{BASE}/nested.xml"),
+            f"{BASE}/a.xml": _urlset(*child_a),
+            f"{BASE}/nested.xml": _index(f"{BASE}/a.xml", f"{BASE}/c.xml"),
+            f"{BASE}/c.xml": _urlset(f"{BASE}/c"),
+        },
+        files={f"{BASE}/b.xml.gz": gzip.compress(_urlset(*child_b).encode())},
+    )
+
+    urls = SitemapParser(FakeHttpClient(site), max_workers=3).parse(f"{BASE}/sitemap.xml")
+
+    assert sorted(urls) == sorted(child_a + child_b + [f"{BASE}/c"])
+    # a.xml is referenced twice but downloaded once
+    assert site.requested.count(f"{BASE}/a.xml") == 1
+
+
+def test_malformed_sitemap_keeps_entries_read_before_the_error():
+    broken = _urlset(f"{BASE}/a", f"{BASE}/b").replace("</urlset>", "<url><loc>")
+    site = FakeSite({f"{BASE}/sitemap.xml": broken})
+
+    assert SitemapParser(FakeHttpClient(site)).parse(f"{BASE}/sitemap.xml") == [f"{BASE}/a", f"{BASE}/b"]
+
+
+def test_decompressed_size_is_capped():
+    urls = [f"{BASE}/{'x' * 200}{i}" for i in range(200)]
+    site = FakeSite({}, files={f"{BASE}/sitemap.xml.gz": gzip.compress(_urlset(*urls).encode())})
+
+    parsed = SitemapParser(FakeHttpClient(site), max_bytes=4096).parse(f"{BASE}/sitemap.xml.gz")
+
+    assert len(parsed) < len(urls)
+
+
+def test_missing_sitemap_yields_nothing():
+    assert SitemapParser(FakeHttpClient(FakeSite({}))).parse(f"{BASE}/sitemap.xml") == []
@@ -0,0 +1,61 @@
+import pickle
+
+import pytest
+
+from src.domain.rules import UrlCanonicalizer, hash_canonical, normalize_url, url_hash
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        "https://example.com/shop/shoes?size=9&color=red",
+        "HTTPS://EXAMPLE.com:443/shop/shoes/?color=red&size=9",
+        "https://example.com/shop/shoes?utm_source=news&color=red&utm_medium=email&size=9#reviews",
+        "https://example.com/shop/shoes;jsessionid=A1B2?color=red&size=9&PHPSESSID=xyz&gclid=123",
+        "https://example.com/shop/%73hoes?color=%72ed&size=9",
+    ],
+)
+def test_equivalent_urls_share_one_canonical_form(variant):
+    canonical = UrlCanonicalizer().canonicalize(variant)
+
+    assert canonical.url == "https://example.com/shop/shoes?color=red&size=9"
+    assert canonical.url_hash == url_hash("https://example.com/shop/shoes?color=red&size=9")
+    assert canonical.domain == "example.com"
+
+
+def test_escapes_are_uppercased_and_unsafe_characters_encoded():
+    canonical = UrlCanonicalizer().canonicalize("http://example.com:8080/a%2fb/café?q=a b")
+
+    assert canonical.url == "http://example.com:8080/a%2Fb/caf%C3%A9?q=a%20b"
+    assert canonical.domain == "example.com:8080"
+
+
+def test_rules_can_be_switched_off():
+    canonicalizer = UrlCanonicalizer(
+        strip_params=frozenset(), strip_prefixes=(), sort_query=False, drop_default_port=False
+    )
+
+    canonical = canonicalizer.canonicalize("https://Example.com:443/a?utm_source=x&b=1&a=2")
+
+    assert canonical.url == "https://example.com:443/a?utm_source=x&b=1&a=2"
+
+
+def test_results_are_memoised_and_bounded():
+    canonicalizer = UrlCanonicalizer(max_cached=4)
+    first = canonicalizer.canonicalize("https://example.com/a/")
+
+    assert canonicalizer.canonicalize("https://example.com/a/") is first
+    # The canonical form is cached as well
+    assert canonicalizer.canonicalize(first.url) is first
+    for i in range(10):
+        canonicalizer.canonicalize(f"https://example.com/{i}")
+    assert len(canonicalizer._cache) <= 4
+    assert canonicalizer.copy()._cache == {}
+    assert pickle.loads(pickle.dumps(canonicalizer))._cache == {}
+
+
+def test_url_hash_is_a_short_digest_of_the_canonical_url():
+    h = url_hash("https://example.com/a#top")
+
+    assert len(h) == 22
+    assert h == hash_canonical(normalize_url("https://example.com/a"))
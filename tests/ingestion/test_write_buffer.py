@@ -0,0 +1,57 @@
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from src.domain.models import CrawledPageCreate, QueueItem
+from src.ingestion.use_cases.results import ItemResult
+from src.ingestion.use_cases.write_buffer import WriteBuffer, chunked
+
+
+def _result(content: str = "") -> ItemResult:
+    run_id, source_id = uuid4(), uuid4()
+    item = QueueItem(
+        id=uuid4(), run_id=run_id, url="https://example.com/", url_hash="h", created_at=datetime.now(timezone.utc)
+    )
+    page = CrawledPageCreate(
+        run_id=run_id, source_id=source_id, url=item.url, url_hash=item.url_hash, content=content
+    )
+    return ItemResult(item=item, page=page, success=True)
+
+
+def test_buffer_is_due_by_rows():
+    buffer = WriteBuffer(max_rows=2, max_bytes=10**9, max_latency=60)
+    buffer.add(_result())
+    assert not buffer.due()
+    buffer.add(_result())
+    assert buffer.due()
+
+
+def test_buffer_is_due_by_bytes():
+    buffer = WriteBuffer(max_rows=100, max_bytes=5000, max_latency=60)
+    buffer.add(_result("x" * 1000))
+    assert not buffer.due()
+    buffer.add(_result("x" * 5000))
+    assert buffer.due()
+    assert buffer.size >= 6000
+
+
+def test_buffer_is_due_by_age_and_take_empties_it():
+    buffer = WriteBuffer(max_rows=100, max_bytes=10**9, max_latency=0.01)
+    assert not buffer.due()
+    assert buffer.wait_time() == 0.01
+    buffer.add(_result())
+    time.sleep(0.02)
+    assert buffer.due()
+    assert buffer.wait_time() == 0.0
+
+    assert len(buffer.take()) == 1
+    assert len(buffer) == 0 and buffer.size == 0 and not buffer.due()
+
+
+def test_chunked_limits_rows_and_bytes():
+    sizes = [3, 3, 3, 10, 1, 1, 1, 1]
+
+    chunks = list(chunked(sizes, max_rows=3, max_bytes=6, size=lambda n: n))
+
+    # An oversized value travels alone
+    assert chunks == [[3, 3], [3], [10], [1, 1, 1], [1]]